@@ -17,11 +17,37 @@ import json
 import argparse
 import subprocess
 import re
+import time
 from pathlib import Path
 from typing import Dict, List, Any, Tuple
 from collections import defaultdict
 import hashlib
 
+from coverage_ingest import ingest_coverage
+from swiftlint_ingest import SwiftLintIngestor, superseded_patterns
+from audio_assets import analyze_audio_assets
+from audio_fingerprint import analyze_audio_duplicates
+from loop_loudness import analyze_loop_loudness
+from image_assets import analyze_image_assets
+from localization import analyze_localization
+from pbxproj import analyze_project
+from file_classifier import route_files
+from budgets import AnalysisBudget, fallback_line_counts
+from rule_engine import DEFAULT_RULE_SECONDS, RuleEngine, SourceFile
+from rule_packs import RULE_PACKS_DIR, RuleSet, load_rule_packs
+from realtime_audio import analyze_realtime_safety
+from main_thread import analyze_main_thread
+from frame_cost import analyze_frame_cost
+from lifecycle import analyze_lifecycles
+from captures import analyze_captures
+from recording_storage import analyze_recording_storage
+from dsp_loops import analyze_dsp_loops
+from observation import analyze_observation
+from launch import analyze_launch
+from dead_code import analyze_dead_code
+from sound_references import analyze_sound_references
+from scoring import SCORING, collect_facts, score_facts
+
 # Analysis results structure
 class PRAnalysis:
     def __init__(self, pr_number: str, base_ref: str, head_ref: str):
@@ -36,74 +62,45 @@ class PRAnalysis:
             'patterns': {},
             'safety': {},
             'soundscape_specific': {},
+            'assets': {},
+            'localization': {},
+            'project': {},
+            'file_classes': {},
+            'budgets': {},
             'files': {}
         }
+        # Inputs to scoring, kept so scores can be recomputed without re-analyzing
+        self.raw_facts = {}
         
     def to_dict(self) -> Dict:
         return {
             'pr_number': self.pr_number,
             'base_ref': self.base_ref,
             'head_ref': self.head_ref,
-            'metrics': self.metrics
+            'metrics': self.metrics,
+            'raw_facts': self.raw_facts
         }
 
+class _PackTable:
+    """Class attribute read from the current rule packs when it is accessed"""
+    
+    def __init__(self, name: str):
+        self.name = name
+    
+    def __get__(self, instance, owner):
+        return getattr(owner.rules(), self.name)
+
 class CodeAnalyzer:
     """Analyzes code for various quality metrics"""
     
-    SOUNDSCAPE_COMPONENTS = {
-        'AudioEngine': ['AudioEngine.swift', 'BinauralBeatEngine.swift'],
-        'Sleep Recording': ['SleepRecordingService.swift', 'SoundEventDetector.swift'],
-        'Paywall': ['PaywallService.swift', 'PremiumManager.swift', 'SubscriptionService.swift'],
-        'UI': ['View.swift', 'ContentView.swift'],
-        'Data': ['Repository.swift', 'DataSource.swift', 'Service.swift'],
-        'Insights': ['InsightsService.swift', 'AnalyticsService.swift']
-    }
-    
-    RISK_PATTERNS = {
-        'high': [
-            r'AVAudioSession\.sharedInstance',
-            r'AVAudioRecorder\(',
-            r'UserDefaults\.standard',
-            r'\.task\s*{',  # Unstructured concurrency
-            r'DispatchQueue\.main',  # Unsafe threading
-            r'fatalError\(',
-            r'try!\s',  # Force try
-            r'as!\s',   # Force cast
-        ],
-        'medium': [
-            r'@Published',
-            r'@StateObject',
-            r'\.onAppear',
-            r'FileManager\.default',
-            r'NotificationCenter',
-            r'Combine',
-        ],
-        'low': [
-            r'print\(',
-            r'// TODO',
-            r'// FIXME',
-        ]
-    }
+    # Rules and components live in .github/rules/; set with --rule-packs
+    rule_packs_dir = RULE_PACKS_DIR
+    rule_seconds = DEFAULT_RULE_SECONDS
     
-    SWIFT_PATTERNS = {
-        'good': {
-            'Main Actor': r'@MainActor',
-            'Async/Await': r'async\s+(throws\s+)?->',
-            'Protocol-Oriented': r'protocol\s+\w+',
-            'Dependency Injection': r'init\([^)]*\)',
-            'Error Handling': r'do\s*{[^}]*try[^}]*}\s*catch',
-            'Observable': r'@Observable',
-            'Environment': r'@Environment',
-        },
-        'bad': {
-            'Force Unwrap': r'!\s*(?![=])',
-            'Force Try': r'try!\s',
-            'Force Cast': r'as!\s',
-            'ImplicitlyUnwrappedOptional': r':\s*\w+!',
-            'Global State': r'static\s+var\s+\w+\s*=',
-            'Retain Cycle Risk': r'\[weak\s+self\]',  # Good if present, bad if missing in closures
-        }
-    }
+    # Pack tables for callers that read them directly, loaded on first access
+    SOUNDSCAPE_COMPONENTS = _PackTable('components')
+    RISK_PATTERNS = _PackTable('risk_patterns')
+    SWIFT_PATTERNS = _PackTable('swift_patterns')
     
     @staticmethod
     def get_git_diff(base_ref: str, head_ref: str = 'HEAD') -> str:
@@ -120,6 +117,16 @@ class CodeAnalyzer:
             print(f"Error getting git diff: {e}")
             return ""
     
+    @staticmethod
+    def rules() -> RuleSet:
+        """Current rule packs (recompiled only when a pack file changes)"""
+        return load_rule_packs(CodeAnalyzer.rule_packs_dir)
+    
+    @staticmethod
+    def rule_engine() -> RuleEngine:
+        """Rule engine loaded with every pattern in the current rule packs"""
+        return CodeAnalyzer.rules().engine(CodeAnalyzer.rule_seconds)
+    
     @staticmethod
     def get_changed_files(base_ref: str, head_ref: str = 'HEAD') -> List[Dict[str, Any]]:
         """Get list of changed files with stats"""
@@ -154,7 +161,31 @@ class CodeAnalyzer:
             return []
     
     @staticmethod
-    def analyze_complexity(filepath: str) -> Dict[str, Any]:
+    def get_added_lines(diff_content: str) -> Dict[str, set]:
+        """Map each file in a unified diff to the new-side line numbers it adds"""
+        added_lines = defaultdict(set)
+        current_file = None
+        new_line = 0
+        
+        for line in diff_content.split('\n'):
+            if line.startswith('+++ '):
+                target = line[4:].strip()
+                current_file = target[2:] if target.startswith('b/') else None
+            elif line.startswith('@@'):
+                match = re.match(r'@@ -\d+(?:,\d+)? \+(\d+)(?:,\d+)? @@', line)
+                new_line = int(match.group(1)) if match else 0
+            elif current_file is None or line.startswith('---'):
+                continue
+            elif line.startswith('+'):
+                added_lines[current_file].add(new_line)
+                new_line += 1
+            elif line.startswith(' '):
+                new_line += 1
+        
+        return dict(added_lines)
+    
+    @staticmethod
+    def analyze_complexity(filepath: str, timeout: float = None) -> Dict[str, Any]:
         """Analyze cyclomatic complexity using lizard"""
         if not filepath.endswith('.swift'):
             return {}
@@ -163,7 +194,8 @@ class CodeAnalyzer:
             result = subprocess.run(
                 ['lizard', filepath, '-l', 'swift'],
                 capture_output=True,
-                text=True
+                text=True,
+                timeout=timeout
             )
             
             output = result.stdout
@@ -202,13 +234,20 @@ class CodeAnalyzer:
             
             return complexity_data
             
+        except subprocess.TimeoutExpired:
+            return {'degraded': f"lizard timed out after {timeout:g}s"}
         except Exception as e:
             print(f"Error analyzing complexity for {filepath}: {e}")
             return {}
     
     @staticmethod
-    def analyze_code_quality(filepath: str) -> Dict[str, Any]:
-        """Analyze code quality metrics"""
+    def analyze_code_quality(filepath: str, skip_patterns: frozenset = frozenset(),
+                             deadline: float = None) -> Dict[str, Any]:
+        """Analyze code quality metrics, skipping patterns covered by other tools
+        
+        Pattern scanning stops once the monotonic deadline passes, and the
+        result is marked degraded.
+        """
         if not os.path.exists(filepath) or not filepath.endswith('.swift'):
             return {}
         
@@ -246,36 +285,33 @@ class CodeAnalyzer:
                 else:
                     quality_metrics['code_lines'] += 1
             
-            # Analyze risk patterns
-            high_risk_count = 0
-            medium_risk_count = 0
-            
-            for risk_level, patterns in CodeAnalyzer.RISK_PATTERNS.items():
-                for pattern in patterns:
-                    matches = re.findall(pattern, content)
-                    if matches:
-                        quality_metrics['risk_factors'].append({
-                            'level': risk_level,
-                            'pattern': pattern,
-                            'count': len(matches)
-                        })
-                        if risk_level == 'high':
-                            high_risk_count += len(matches)
-                        elif risk_level == 'medium':
-                            medium_risk_count += len(matches)
+            rules = CodeAnalyzer.rules()
+            engine = rules.engine(CodeAnalyzer.rule_seconds)
+            source = SourceFile(content)
             
-            # Determine overall risk level
-            if high_risk_count > 3:
-                quality_metrics['risk_level'] = 'high'
-            elif high_risk_count > 0 or medium_risk_count > 5:
-                quality_metrics['risk_level'] = 'medium'
+            # Only the rules whose path and file-type scope covers this file
+            for rule in rules.rules_for(filepath):
+                if rule['pattern'] in skip_patterns or rule.get('name') in skip_patterns:
+                    continue
+                if deadline and time.monotonic() > deadline:
+                    quality_metrics['degraded'] = 'pattern scan stopped at the file time budget'
+                    break
+                count, complete = engine.count(rule['pattern'], source, deadline)
+                if not complete:
+                    quality_metrics['degraded'] = f"rule {rule['id']} stopped at its match-time budget"
+                if not count:
+                    continue
+                if rule['kind'] == 'risk':
+                    quality_metrics['risk_factors'].append({
+                        'level': rule['level'],
+                        'pattern': rule['pattern'],
+                        'rule': rule['id'],
+                        'count': count
+                    })
+                else:
+                    quality_metrics['patterns'][rule['group']][rule['name']] = count
             
-            # Analyze Swift patterns
-            for pattern_type, patterns in CodeAnalyzer.SWIFT_PATTERNS.items():
-                for name, pattern in patterns.items():
-                    matches = re.findall(pattern, content)
-                    if matches:
-                        quality_metrics['patterns'][pattern_type][name] = len(matches)
+            quality_metrics['risk_level'] = CodeAnalyzer.assess_risk_level(quality_metrics['risk_factors'])
             
             return quality_metrics
             
@@ -284,26 +320,21 @@ class CodeAnalyzer:
             return {}
     
     @staticmethod
-    def identify_component(filepath: str) -> str:
-        """Identify which soundScape component this file belongs to"""
-        for component, patterns in CodeAnalyzer.SOUNDSCAPE_COMPONENTS.items():
-            for pattern in patterns:
-                if pattern in filepath:
-                    return component
-        
-        # Fallback based on path
-        if 'Service' in filepath:
-            return 'Service Layer'
-        elif 'View' in filepath or 'Presentation' in filepath:
-            return 'UI Layer'
-        elif 'Repository' in filepath or 'DataSource' in filepath:
-            return 'Data Layer'
-        elif 'Entity' in filepath or 'Domain' in filepath:
-            return 'Domain Layer'
-        elif 'Test' in filepath:
-            return 'Tests'
+    def assess_risk_level(risk_factors: List[Dict[str, Any]]) -> str:
+        """Determine overall risk level from risk factor counts"""
+        high_risk_count = sum(rf['count'] for rf in risk_factors if rf['level'] == 'high')
+        medium_risk_count = sum(rf['count'] for rf in risk_factors if rf['level'] == 'medium')
         
-        return 'Other'
+        if high_risk_count > SCORING['high_risk_hits']:
+            return 'high'
+        elif high_risk_count > 0 or medium_risk_count > SCORING['medium_risk_hits']:
+            return 'medium'
+        return 'low'
+    
+    @staticmethod
+    def identify_component(filepath: str) -> str:
+        """Identify which soundScape component (or layer) this file belongs to"""
+        return CodeAnalyzer.rules().path_rules.classify(filepath)
     
     @staticmethod
     def calculate_code_duplication(files: List[str]) -> Dict[str, Any]:
@@ -370,18 +401,12 @@ def analyze_test_coverage(changed_files: List[Dict], test_files: List[str]) -> D
     }
     
     # Calculate coverage score
-    if test_coverage['test_to_code_ratio'] >= 0.5:
-        test_coverage['coverage_score'] = 90
-        test_coverage['test_quality'] = 'excellent'
-    elif test_coverage['test_to_code_ratio'] >= 0.3:
-        test_coverage['coverage_score'] = 70
-        test_coverage['test_quality'] = 'good'
-    elif test_coverage['test_to_code_ratio'] >= 0.1:
-        test_coverage['coverage_score'] = 50
-        test_coverage['test_quality'] = 'moderate'
-    else:
-        test_coverage['coverage_score'] = 20
-        test_coverage['test_quality'] = 'poor'
+    qualities = ['excellent', 'good', 'moderate', 'poor']
+    for (minimum, score), quality in zip(SCORING['coverage_ratio_scores'], qualities):
+        if test_coverage['test_to_code_ratio'] >= minimum:
+            test_coverage['coverage_score'] = score
+            test_coverage['test_quality'] = quality
+            break
     
     # Identify untested components
     tested_components = set()
@@ -396,6 +421,19 @@ def analyze_test_coverage(changed_files: List[Dict], test_files: List[str]) -> D
     
     return test_coverage
 
+def apply_line_coverage(test_coverage: Dict[str, Any], line_coverage: Dict[str, Any]):
+    """Replace the ratio-based coverage score with measured coverage of added lines"""
+    test_coverage['line_coverage'] = line_coverage
+    
+    percent = line_coverage['coverage_percent']
+    if percent is None:
+        return
+    
+    test_coverage['coverage_score'] = round(percent)
+    test_coverage['coverage_source'] = line_coverage['format']
+    steps = SCORING['coverage_percent_qualities']
+    test_coverage['test_quality'] = next((quality for minimum, quality in steps if percent >= minimum), steps[-1][1])
+
 def analyze_architecture_quality(files: List[Dict], diff_content: str) -> Dict[str, Any]:
     """Analyze architecture and design patterns"""
     architecture = {
@@ -436,15 +474,16 @@ def analyze_architecture_quality(files: List[Dict], diff_content: str) -> Dict[s
     })
     
     # Calculate scores
-    violation_penalty = len(architecture['solid_principles']['violations']) * 10
+    violation_penalty = len(architecture['solid_principles']['violations']) * SCORING['violation_penalty']
     architecture['solid_principles']['score'] = max(0, 100 - violation_penalty)
     
     # Separation of concerns
+    architecture['separation_of_concerns']['layers'] = len(layer_distribution)
     if len(layer_distribution) >= 2:
-        architecture['separation_of_concerns']['score'] = 80
+        architecture['separation_of_concerns']['score'] = SCORING['separation_scores']['layered']
         architecture['separation_of_concerns']['details'] = dict(layer_distribution)
     else:
-        architecture['separation_of_concerns']['score'] = 40
+        architecture['separation_of_concerns']['score'] = SCORING['separation_scores']['single_layer']
     
     # Overall architecture score
     architecture['architecture_score'] = int(
@@ -460,9 +499,32 @@ def main():
     parser.add_argument('--base-ref', required=True, help='Base branch reference')
     parser.add_argument('--head-ref', required=True, help='Head branch reference')
     parser.add_argument('--output-dir', required=True, help='Output directory for results')
+    parser.add_argument('--coverage-json', help='llvm-cov or xccov JSON coverage export for the head ref')
+    parser.add_argument('--swiftlint-report', help='SwiftLint JSON report (swiftlint lint --reporter json)')
+    parser.add_argument('--asset-budget-mb', type=float, default=5.0, help='Maximum size of a single asset in MB')
+    parser.add_argument('--bundle-budget-mb', type=float, default=50.0, help='Maximum size of SoundScape/Resources in MB')
+    parser.add_argument('--loop-check', action='store_true', help='Check changed sounds for loop-seam clicks and loudness jumps (needs numpy)')
+    parser.add_argument('--pcm-renders', help='Directory of locally rendered WAV files named after each sound')
+    parser.add_argument('--recording-budget-mb', type=float, default=150.0, help='Disk use per 8-hour night of a changed sleep recorder in MB')
+    parser.add_argument('--image-max-pixels', type=int, default=1024 * 1024, help='Pixel count target for catalog images')
+    parser.add_argument('--image-max-kb', type=int, default=512, help='File size target for catalog images in KB')
+    parser.add_argument('--max-file-kb', type=int, default=512, help='Files larger than this get a cheap fallback analysis')
+    parser.add_argument('--max-file-lines', type=int, default=10000, help='Files longer than this get a cheap fallback analysis')
+    parser.add_argument('--file-timeout', type=float, default=10.0, help='Wall-time budget in seconds per file and analyzer')
+    parser.add_argument('--phase-timeout', type=float, default=120.0, help='Wall-time budget in seconds per analysis phase')
+    parser.add_argument('--record-history', action='store_true', help='Append codebase counts to the history in .pr-analysis-cache (default-branch runs)')
+    parser.add_argument('--rule-packs', default=RULE_PACKS_DIR, help='Directory of TOML/YAML rule packs')
+    parser.add_argument('--rule-timeout', type=float, default=DEFAULT_RULE_SECONDS, help='Match-time budget in seconds per rule and file')
     
     args = parser.parse_args()
     
+    CodeAnalyzer.rule_packs_dir = args.rule_packs
+    try:
+        CodeAnalyzer.rules()
+    except (OSError, ValueError) as e:
+        print(f"Error loading rule packs: {e}")
+        return 1
+    
     # Create output directory
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -477,9 +539,23 @@ def main():
     # Get changed files
     changed_files = CodeAnalyzer.get_changed_files(args.base_ref, args.head_ref)
     diff_content = CodeAnalyzer.get_git_diff(args.base_ref, args.head_ref)
+    added_lines = CodeAnalyzer.get_added_lines(diff_content)
     
     print(f"   Changed files: {len(changed_files)}")
     
+    # Classify each path once and route it to the analyzers that apply
+    routes, analysis.metrics['file_classes'] = route_files(changed_files)
+    code_files = routes['code']
+    budget = AnalysisBudget(
+        max_file_bytes=args.max_file_kb * 1024,
+        max_file_lines=args.max_file_lines,
+        file_seconds=args.file_timeout,
+        phase_seconds=args.phase_timeout
+    )
+    excluded = analysis.metrics['file_classes']['excluded_from_code_analysis']
+    if excluded:
+        print(f"   Excluding {len(excluded)} generated or vendored files from code analysis")
+    
     # Basic metrics
     total_added = sum(f['added'] for f in changed_files)
     total_deleted = sum(f['deleted'] for f in changed_files)
@@ -505,34 +581,44 @@ def main():
         'complexity_distribution': {'low': 0, 'medium': 0, 'high': 0}
     }
     
-    for file_info in changed_files:
-        if file_info['path'].endswith('.swift'):
-            file_complexity = CodeAnalyzer.analyze_complexity(file_info['path'])
-            if file_complexity and 'functions' in file_complexity:
-                complexity_metrics['total_functions'] += len(file_complexity['functions'])
-                
-                for func in file_complexity['functions']:
-                    cc = func['complexity']
-                    if cc <= 5:
-                        complexity_metrics['complexity_distribution']['low'] += 1
-                    elif cc <= 10:
-                        complexity_metrics['complexity_distribution']['medium'] += 1
-                    else:
-                        complexity_metrics['complexity_distribution']['high'] += 1
-                        complexity_metrics['high_complexity_functions'].append({
-                            'file': file_info['path'],
-                            'function': func['name'],
-                            'complexity': cc
-                        })
+    all_complexities = []
+    functions = []
+    budget.start_phase('complexity')
+    for file_info in code_files:
+        reason = budget.over_budget(file_info['path'], 'complexity')
+        if reason:
+            budget.degrade(file_info['path'], 'complexity', reason)
+            continue
+        file_complexity = CodeAnalyzer.analyze_complexity(file_info['path'], timeout=budget.file_seconds)
+        if file_complexity.get('degraded'):
+            budget.degrade(file_info['path'], 'complexity', file_complexity['degraded'])
+        if file_complexity and 'functions' in file_complexity:
+            complexity_metrics['total_functions'] += len(file_complexity['functions'])
+            
+            for func in file_complexity['functions']:
+                cc = func['complexity']
+                all_complexities.append(cc)
+                functions.append({
+                    'file': file_info['path'],
+                    'function': func['name'],
+                    'complexity': cc,
+                    'nloc': func['nloc']
+                })
+                if cc <= 5:
+                    complexity_metrics['complexity_distribution']['low'] += 1
+                elif cc <= 10:
+                    complexity_metrics['complexity_distribution']['medium'] += 1
+                else:
+                    complexity_metrics['complexity_distribution']['high'] += 1
+                    complexity_metrics['high_complexity_functions'].append({
+                        'file': file_info['path'],
+                        'function': func['name'],
+                        'complexity': cc
+                    })
+    
+    budget.end_phase('complexity')
     
     if complexity_metrics['total_functions'] > 0:
-        all_complexities = []
-        for file_info in changed_files:
-            if file_info['path'].endswith('.swift'):
-                fc = CodeAnalyzer.analyze_complexity(file_info['path'])
-                if fc and 'functions' in fc:
-                    all_complexities.extend([f['complexity'] for f in fc['functions']])
-        
         if all_complexities:
             complexity_metrics['avg_complexity'] = round(sum(all_complexities) / len(all_complexities), 2)
             complexity_metrics['max_complexity'] = max(all_complexities)
@@ -541,27 +627,158 @@ def main():
     
     # Architecture analysis
     print("🏗️  Analyzing architecture...")
-    analysis.metrics['architecture'] = analyze_architecture_quality(changed_files, diff_content)
+    analysis.metrics['architecture'] = analyze_architecture_quality(code_files, diff_content)
     
     # Test coverage analysis
     print("🧪 Analyzing test coverage...")
-    test_files = [f for f in changed_files if 'Test' in f['path']]
-    analysis.metrics['testing'] = analyze_test_coverage(changed_files, test_files)
+    test_files = [f for f in code_files if 'Test' in f['path']]
+    analysis.metrics['testing'] = analyze_test_coverage(code_files, test_files)
+    
+    if args.coverage_json:
+        print("🧪 Ingesting coverage export...")
+        source_lines = {
+            f['path']: added_lines[f['path']] for f in code_files
+            if f['path'] in added_lines and 'Test' not in f['path']
+        }
+        try:
+            apply_line_coverage(
+                analysis.metrics['testing'],
+                ingest_coverage(args.coverage_json, source_lines, CodeAnalyzer.identify_component)
+            )
+        except (OSError, ValueError) as e:
+            print(f"Error reading coverage export: {e}")
     
     # Code reusability
     print("♻️  Analyzing code reusability...")
-    swift_files = [f['path'] for f in changed_files if f['path'].endswith('.swift')]
-    analysis.metrics['patterns']['reusability'] = CodeAnalyzer.calculate_code_duplication(swift_files)
+    budget.start_phase('duplication')
+    duplication_files = []
+    for file_info in code_files:
+        reason = budget.check_file(file_info['path'])
+        if reason:
+            budget.degrade(file_info['path'], 'duplication', reason)
+        else:
+            duplication_files.append(file_info['path'])
+    analysis.metrics['patterns']['reusability'] = CodeAnalyzer.calculate_code_duplication(duplication_files)
+    budget.end_phase('duplication')
+    
+    # SwiftLint violations on added lines
+    swiftlint = None
+    skip_patterns = frozenset()
+    if args.swiftlint_report:
+        print("🧹 Ingesting SwiftLint report...")
+        swiftlint = SwiftLintIngestor(added_lines)
+        try:
+            swiftlint.ingest(args.swiftlint_report)
+            analysis.metrics['safety']['swiftlint'] = swiftlint.summarize()
+            skip_patterns = frozenset(superseded_patterns())
+        except (OSError, ValueError) as e:
+            print(f"Error reading SwiftLint report: {e}")
+            swiftlint = None
     
     # File-by-file analysis
     print("📁 Analyzing individual files...")
-    for file_info in changed_files:
-        if file_info['path'].endswith('.swift'):
-            file_metrics = CodeAnalyzer.analyze_code_quality(file_info['path'])
-            analysis.metrics['files'][file_info['path']] = {
-                **file_info,
-                **file_metrics
+    budget.start_phase('quality')
+    CodeAnalyzer.rule_seconds = args.rule_timeout
+    analysis.metrics['rule_engine'] = CodeAnalyzer.rule_engine().report()
+    analysis.metrics['rule_packs'] = CodeAnalyzer.rules().summary()
+    for file_info in code_files:
+        reason = budget.over_budget(file_info['path'], 'quality')
+        if reason:
+            budget.degrade(file_info['path'], 'quality', reason)
+            file_metrics = {
+                **fallback_line_counts(file_info['path'], budget.max_file_bytes),
+                'risk_level': 'unknown',
+                'risk_factors': [],
+                'patterns': {'good': {}, 'bad': {}},
+                'component': CodeAnalyzer.identify_component(file_info['path']),
             }
+        else:
+            file_metrics = CodeAnalyzer.analyze_code_quality(file_info['path'], skip_patterns, budget.file_deadline())
+            if file_metrics.get('degraded'):
+                budget.degrade(file_info['path'], 'quality', file_metrics.pop('degraded'))
+        if swiftlint and file_metrics:
+            file_metrics['risk_factors'].extend(swiftlint.risk_factors(file_info['path']))
+            file_metrics['risk_level'] = CodeAnalyzer.assess_risk_level(file_metrics['risk_factors'])
+        analysis.metrics['files'][file_info['path']] = {
+            **file_info,
+            **file_metrics
+        }
+    budget.end_phase('quality')
+    
+    # Each phase below checks the budget before every file its analyzer reads
+    sources = [f['path'] for f in code_files if 'Test' not in f['path']]
+    
+    # Real-time audio thread safety
+    print("🎚️  Checking audio render and tap callbacks...")
+    analysis.metrics['realtime_audio'] = budget.run_phase(
+        'realtime', analyze_realtime_safety, [f['path'] for f in code_files], added_lines
+    )
+    
+    # Main-thread blocking in UI and @MainActor code
+    print("🧵 Checking main-thread code paths for blocking work...")
+    analysis.metrics['main_thread'] = budget.run_phase('main_thread', analyze_main_thread, sources, added_lines)
+    
+    # Per-frame work in TimelineView / Canvas visualizations
+    print("🎞️  Estimating per-frame render cost...")
+    analysis.metrics['frame_cost'] = budget.run_phase('frame_cost', analyze_frame_cost, sources, added_lines, args.base_ref)
+    
+    # Timers, tasks and observers that outlive their owner
+    print("⏲️  Pairing timers, tasks and observers with their cancellation...")
+    analysis.metrics['lifecycle'] = budget.run_phase('lifecycle', analyze_lifecycles, sources, added_lines)
+    
+    # Closures that keep their owner alive
+    print("🔁 Checking closure captures for retain cycles...")
+    analysis.metrics['captures'] = budget.run_phase('captures', analyze_captures, sources, added_lines)
+    
+    # Disk used per night by the sleep recorder
+    print("💾 Estimating sleep recording storage per night...")
+    analysis.metrics['recording_storage'] = budget.run_phase(
+        'recording_storage',
+        analyze_recording_storage,
+        [f['path'] for f in code_files],
+        added_lines,
+        args.base_ref,
+        budget_bytes=int(args.recording_budget_mb * 1024 * 1024)
+    )
+    
+    # Scalar sample loops with an Accelerate equivalent
+    print("🧮 Looking for scalar DSP loops that vDSP could replace...")
+    analysis.metrics['dsp_loops'] = budget.run_phase(
+        'dsp_loops', analyze_dsp_loops, sources, added_lines, args.head_ref, record=args.record_history
+    )
+    
+    # How many views each changed observable property re-evaluates
+    print("🔄 Mapping observation fan-out of changed properties...")
+    analysis.metrics['observation'] = budget.run_phase('observation', analyze_observation, sources, added_lines)
+    
+    # Blocking work reachable from the @main App before the first frame
+    print("🚀 Tracing the app launch path...")
+    analysis.metrics['launch'] = budget.run_phase('launch', analyze_launch, sources, added_lines)
+    
+    print("🪦 Updating the symbol index for dead code...")
+    try:
+        analysis.metrics['dead_code'] = budget.run_phase(
+            'dead_code', analyze_dead_code, [f['path'] for f in routes['symbols']], args.base_ref
+        )
+    except (OSError, ValueError, subprocess.CalledProcessError) as e:
+        print(f"Error analyzing dead code: {e}")
+    
+    print("🔇 Cross-referencing sound resources with code...")
+    try:
+        analysis.metrics['sound_references'] = budget.run_phase(
+            'sound_references', analyze_sound_references, [f['path'] for f in routes['symbols'] + routes['audio']],
+            args.base_ref
+        )
+    except (OSError, ValueError, subprocess.CalledProcessError) as e:
+        print(f"Error analyzing sound references: {e}")
+    
+    for path, reasons in budget.degraded.items():
+        if path in analysis.metrics['files']:
+            analysis.metrics['files'][path]['degraded'] = True
+            analysis.metrics['files'][path]['degraded_reasons'] = reasons
+    analysis.metrics['budgets'] = budget.summary()
+    if budget.degraded:
+        print(f"   ⏳ {len(budget.degraded)} files exceeded analysis budgets and were analyzed in degraded mode")
     
     # SoundScape-specific analysis
     print("🎵 Analyzing SoundScape-specific patterns...")
@@ -575,29 +792,60 @@ def main():
     }
     
     # Identify affected features
-    for component, patterns in CodeAnalyzer.SOUNDSCAPE_COMPONENTS.items():
-        for file_info in changed_files:
-            if any(pattern in file_info['path'] for pattern in patterns):
-                soundscape_metrics['affected_features'].append(component)
-                break
-    
-    soundscape_metrics['affected_features'] = list(set(soundscape_metrics['affected_features']))
+    rules = CodeAnalyzer.rules()
+    path_labels = rules.path_rules.classify_all(f['path'] for f in changed_files)
+    soundscape_metrics['affected_features'] = sorted({
+        label for labels in path_labels.values() for label in labels if label not in rules.layers
+    })
     analysis.metrics['soundscape_specific'] = soundscape_metrics
     
-    # Calculate overall quality score
-    scores = {
-        'complexity': 100 - min(complexity_metrics['avg_complexity'] * 5, 100),
-        'architecture': analysis.metrics['architecture']['architecture_score'],
-        'testing': analysis.metrics['testing']['coverage_score'],
-        'reusability': analysis.metrics['patterns']['reusability']['duplication_score'],
-    }
+    # Asset analysis
+    print("🔊 Analyzing audio assets...")
+    analysis.metrics['assets']['audio'] = analyze_audio_assets(
+        routes['audio'],
+        args.base_ref,
+        asset_budget_bytes=int(args.asset_budget_mb * 1024 * 1024),
+        bundle_budget_bytes=int(args.bundle_budget_mb * 1024 * 1024)
+    )
+    
+    print("🧬 Fingerprinting sounds for duplicates...")
+    try:
+        analysis.metrics['assets']['duplicates'] = budget.run_phase(
+            'audio_duplicates', analyze_audio_duplicates, [f['path'] for f in routes['audio']], args.pcm_renders,
+            sized=False
+        )
+    except (OSError, ValueError, subprocess.CalledProcessError) as e:
+        print(f"Error fingerprinting sounds: {e}")
+    
+    print("🖼️  Analyzing image assets...")
+    analysis.metrics['assets']['images'] = analyze_image_assets(
+        routes['images'],
+        max_pixels=args.image_max_pixels,
+        max_bytes=args.image_max_kb * 1024
+    )
+    
+    print("🌍 Analyzing string catalogs...")
+    analysis.metrics['localization'] = analyze_localization(routes['localization'], diff_content, args.base_ref)
+    
+    print("🧩 Checking Xcode project membership...")
+    try:
+        analysis.metrics['project'] = analyze_project(routes['project'], args.base_ref)
+    except (OSError, ValueError, subprocess.CalledProcessError) as e:
+        print(f"Error analyzing project file: {e}")
+    
+    if args.loop_check:
+        print("🔁 Checking loop seams and loudness...")
+        sound_paths = [f['path'] for f in routes['audio'] if os.path.exists(f['path'])]
+        analysis.metrics['assets']['loop_loudness'] = analyze_loop_loudness(sound_paths, args.pcm_renders)
     
-    overall_score = sum(scores.values()) / len(scores)
+    # Calculate overall quality score from the raw facts, as rescore.py does
+    analysis.raw_facts = collect_facts(analysis.metrics, functions)
+    score = score_facts([analysis.raw_facts])[0]
     
     analysis.metrics['quality_score'] = {
-        'overall': round(overall_score, 2),
-        'breakdown': scores,
-        'grade': 'A' if overall_score >= 90 else 'B' if overall_score >= 80 else 'C' if overall_score >= 70 else 'D' if overall_score >= 60 else 'F'
+        'overall': score['overall'],
+        'breakdown': score['breakdown'],
+        'grade': score['grade']
     }
     
     # Save results
@@ -606,7 +854,7 @@ def main():
         json.dump(analysis.to_dict(), f, indent=2)
     
     print(f"\n✅ Analysis complete!")
-    print(f"   Overall Quality Score: {overall_score:.2f}/100 (Grade: {analysis.metrics['quality_score']['grade']})")
+    print(f"   Overall Quality Score: {score['overall']:.2f}/100 (Grade: {analysis.metrics['quality_score']['grade']})")
     print(f"   Results saved to: {output_file}")
     
     return 0
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Audio Asset Analysis for PR Assessment
+
+Scans MP3 frame headers and ID3 tags without decoding audio, using
+memory-mapped reads, and reports duration, bitrate, sample rate, VBR/CBR
+and the size delta for each changed sound asset.
+"""
+
+import mmap
+import os
+import subprocess
+from typing import Any, Dict, List, Optional
+
+AUDIO_EXTENSIONS = ('.mp3', '.m4a', '.aac', '.wav', '.caf', '.aiff')
+
+SOUNDS_DIR = 'SoundScape/Resources/Sounds'
+RESOURCES_DIR = 'SoundScape/Resources'
+
+# Defaults for the budgets checked by analyze_audio_assets
+DEFAULT_ASSET_BUDGET_BYTES = 5 * 1024 * 1024
+DEFAULT_BUNDLE_BUDGET_BYTES = 50 * 1024 * 1024
+
+# Bitrate tables in kbps, indexed by [version_family][layer][bitrate_index]
+BITRATES = {
+    'v1': {
+        1: [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+        2: [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+        3: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    },
+    'v2': {
+        1: [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+        2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+        3: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    },
+}
+
+SAMPLE_RATES = {
+    3: [44100, 48000, 32000],  # MPEG-1
+    2: [22050, 24000, 16000],  # MPEG-2
+    0: [11025, 12000, 8000],   # MPEG-2.5
+}
+
+VERSION_NAMES = {3: 'MPEG-1', 2: 'MPEG-2', 0: 'MPEG-2.5'}
+
+def parse_frame_header(data, offset: int) -> Optional[Dict[str, int]]:
+    """Decode the 4-byte MPEG audio frame header at offset, or None"""
+    if offset + 4 > len(data) or data[offset] != 0xFF or (data[offset + 1] & 0xE0) != 0xE0:
+        return None
+
+    b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+    version = (b1 >> 3) & 0x03
+    layer = 4 - ((b1 >> 1) & 0x03)
+    bitrate_index = (b2 >> 4) & 0x0F
+    sample_rate_index = (b2 >> 2) & 0x03
+    padding = (b2 >> 1) & 0x01
+
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    family = 'v1' if version == 3 else 'v2'
+    bitrate = BITRATES[family][layer][bitrate_index] * 1000
+    sample_rate = SAMPLE_RATES[version][sample_rate_index]
+
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples = 1152 if (layer == 2 or version == 3) else 576
+        length = (samples // 8) * bitrate // sample_rate + padding
+
+    return {
+        'version': version,
+        'layer': layer,
+        'bitrate': bitrate,
+        'sample_rate': sample_rate,
+        'samples': samples,
+        'length': length,
+        'channels': 1 if (b3 >> 6) == 3 else 2,
+    }
+
+def _syncsafe(data: bytes) -> int:
+    return (data[0] << 21) | (data[1] << 14) | (data[2] << 7) | data[3]
+
+def parse_id3v2(data) -> Dict[str, Any]:
+    """Read the ID3v2 header size and text frames, if present"""
+    if len(data) < 10 or data[:3] != b'ID3':
+        return {'size': 0}
+
+    major = data[3]
+    flags = data[5]
+    size = 10 + _syncsafe(data[6:10]) + (10 if flags & 0x10 else 0)
+    tags = {'version': f"2.{major}", 'size': size, 'frames': {}}
+
+    offset = 10
+    end = min(size, len(data))
+    while major >= 3 and offset + 10 <= end:
+        frame_id = bytes(data[offset:offset + 4])
+        if not frame_id.strip(b'\x00') or not frame_id.isalnum():
+            break
+        frame_size = _syncsafe(data[offset + 4:offset + 8]) if major == 4 else int.from_bytes(data[offset + 4:offset + 8], 'big')
+        body = bytes(data[offset + 10:offset + 10 + frame_size])
+        if frame_id.startswith(b'T') and body:
+            encoding = {0: 'latin-1', 1: 'utf-16', 2: 'utf-16-be', 3: 'utf-8'}.get(body[0], 'latin-1')
+            tags['frames'][frame_id.decode('ascii')] = body[1:].decode(encoding, errors='replace').strip('\x00')
+        offset += 10 + frame_size
+
+    return tags
+
+def xing_frames(data, offset: int, header: Dict[str, int]) -> Optional[Dict[str, Any]]:
+    """Frame count from a Xing/Info or VBRI header in the first frame"""
+    if header['version'] == 3:
+        side_info = 17 if header['channels'] == 1 else 32
+    else:
+        side_info = 9 if header['channels'] == 1 else 17
+
+    tag_offset = offset + 4 + side_info
+    tag = bytes(data[tag_offset:tag_offset + 4])
+    if tag in (b'Xing', b'Info'):
+        flags = int.from_bytes(data[tag_offset + 4:tag_offset + 8], 'big')
+        if flags & 0x01:
+            frames = int.from_bytes(data[tag_offset + 8:tag_offset + 12], 'big')
+            return {'frames': frames, 'vbr': tag == b'Xing', 'header': tag.decode('ascii')}
+
+    vbri_offset = offset + 36
+    if bytes(data[vbri_offset:vbri_offset + 4]) == b'VBRI':
+        frames = int.from_bytes(data[vbri_offset + 14:vbri_offset + 18], 'big')
+        return {'frames': frames, 'vbr': True, 'header': 'VBRI'}
+
+    return None
+
+def scan_mp3(filepath: str) -> Dict[str, Any]:
+    """Derive stream properties by hopping frame headers"""
+    file_size = os.path.getsize(filepath)
+    if file_size == 0:
+        return {'error': 'empty file'}
+
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        id3 = parse_id3v2(data)
+        audio_end = file_size - (128 if file_size >= 128 and data[file_size - 128:file_size - 125] == b'TAG' else 0)
+
+        # Find the first frame whose successor is also a valid header to avoid false syncs
+        offset = id3['size']
+        first = None
+        while offset < min(audio_end, id3['size'] + 64 * 1024):
+            offset = data.find(b'\xff', offset, audio_end)
+            if offset < 0:
+                break
+            header = parse_frame_header(data, offset)
+            if header and header['length'] > 0 and parse_frame_header(data, offset + header['length']):
+                first = header
+                break
+            offset += 1
+
+        if first is None:
+            return {'error': 'no MPEG audio frames found', 'id3': id3}
+
+        audio_start = offset
+        xing = xing_frames(data, offset, first)
+        bitrates = set()
+        frames = 0
+
+        if xing and xing['frames']:
+            frames = xing['frames']
+            vbr = xing['vbr']
+        else:
+            while offset < audio_end:
+                header = parse_frame_header(data, offset)
+                if header is None or header['length'] <= 0:
+                    break
+                bitrates.add(header['bitrate'])
+                frames += 1
+                offset += header['length']
+            vbr = len(bitrates) > 1
+
+    duration = frames * first['samples'] / first['sample_rate']
+    audio_bytes = audio_end - audio_start
+
+    return {
+        'format': f"{VERSION_NAMES[first['version']]} Layer {'I' * first['layer']}",
+        'duration_seconds': round(duration, 2),
+        'frames': frames,
+        'sample_rate': first['sample_rate'],
+        'channels': first['channels'],
+        'bitrate_kbps': round(audio_bytes * 8 / duration / 1000) if duration else 0,
+        'encoding': 'VBR' if vbr else 'CBR',
+        'vbr_header': xing['header'] if xing else None,
+        'id3': {'version': id3.get('version'), 'size': id3['size'], 'frames': id3.get('frames', {})},
+    }
+
+def git_blob_size(ref: str, path: str) -> int:
+    """Size of path at ref, or 0 if it does not exist there"""
+    result = subprocess.run(
+        ['git', 'cat-file', '-s', f"{ref}:{path}"],
+        capture_output=True,
+        text=True
+    )
+    return int(result.stdout.strip()) if result.returncode == 0 else 0
+
+def directory_size(path: str) -> int:
+    """Total bytes of all files under path"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return total
+
+def analyze_audio_assets(changed_files: List[Dict[str, Any]], base_ref: str,
+                         asset_budget_bytes: int = DEFAULT_ASSET_BUDGET_BYTES,
+                         bundle_budget_bytes: int = DEFAULT_BUNDLE_BUDGET_BYTES) -> Dict[str, Any]:
+    """Report properties, size deltas and budget violations for changed sounds"""
+    assets = {}
+    violations = []
+
+    for file_info in changed_files:
+        path = file_info['path']
+        if not path.lower().endswith(AUDIO_EXTENSIONS):
+            continue
+
+        base_size = git_blob_size(base_ref, path)
+        head_size = os.path.getsize(path) if os.path.exists(path) else 0
+        asset = {
+            'status': 'added' if base_size == 0 else 'deleted' if head_size == 0 else 'modified',
+            'base_bytes': base_size,
+            'head_bytes': head_size,
+            'size_delta_bytes': head_size - base_size,
+        }
+
+        if head_size and path.lower().endswith('.mp3'):
+            try:
+                asset.update(scan_mp3(path))
+            except (OSError, ValueError) as e:
+                asset['error'] = str(e)
+
+        if head_size > asset_budget_bytes:
+            violations.append(
+                f"{path} is {head_size / 1024 / 1024:.2f} MB, above the per-asset budget of {asset_budget_bytes / 1024 / 1024:.2f} MB"
+            )
+
+        assets[path] = asset
+
+    resources_bytes = directory_size(RESOURCES_DIR) if os.path.isdir(RESOURCES_DIR) else 0
+    if resources_bytes > bundle_budget_bytes:
+        violations.append(
+            f"{RESOURCES_DIR} is {resources_bytes / 1024 / 1024:.2f} MB, above the bundle budget of {bundle_budget_bytes / 1024 / 1024:.2f} MB"
+        )
+
+    return {
+        'assets': assets,
+        'total_size_delta_bytes': sum(a['size_delta_bytes'] for a in assets.values()),
+        'resources_bytes': resources_bytes,
+        'asset_budget_bytes': asset_budget_bytes,
+        'bundle_budget_bytes': bundle_budget_bytes,
+        'budget_violations': violations,
+    }
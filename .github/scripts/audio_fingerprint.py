@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Duplicate Sound Detection for PR Assessment
+
+Fingerprints every sound in Resources/Sounds and reports the assets a PR
+adds or changes that duplicate one already in the catalog. Three
+fingerprints are kept per sound:
+
+- a SHA-256 of the MPEG frames alone, so a copy with different ID3 tags
+  is still an exact duplicate
+- a loudness envelope read from the MP3 side info without decoding: the
+  global gain of each granule follows the level of the audio, so a
+  re-encode of the same sound at another bitrate keeps its shape
+- optionally, the RMS envelope of the decoded audio, when NumPy is
+  installed and a WAV render is found in --pcm-renders or made with ffmpeg
+
+Fingerprints are cached per git blob SHA in
+`.pr-analysis-cache/audio-fingerprints.json`, so only new or changed
+sounds are scanned.
+"""
+
+import hashlib
+import mmap
+import os
+import tempfile
+from typing import Any, Callable, Dict, List, Optional
+
+from audio_assets import SOUNDS_DIR, xing_frames, parse_frame_header, parse_id3v2
+from blob_cache import BlobCache, head_sha, tracked_blobs
+from loop_loudness import PCMBuffer, np, render_to_wav
+
+INDEX_PATH = '.pr-analysis-cache/audio-fingerprints.json'
+
+# Bump when the cached fingerprint layout changes
+INDEX_VERSION = 1
+
+# Length of one envelope point
+WINDOW_SECONDS = 0.5
+# Durations of near duplicates differ by at most this fraction
+DURATION_TOLERANCE = 0.02
+# Envelope correlation at which two sounds are the same recording
+NEAR_DUPLICATE_SIMILARITY = 0.9
+# Envelope points two sounds may be shifted by, for encoder delay and trimmed silence
+MAX_LAG_WINDOWS = 2
+
+def _bits(data, offset: int, start: int, count: int) -> int:
+    """count bits starting start bits into data[offset:]"""
+    value = int.from_bytes(data[offset + start // 8:offset + (start + count + 7) // 8], 'big')
+    return (value >> (-(start + count) % 8)) & ((1 << count) - 1)
+
+def _global_gain(data, offset: int, header: Dict[str, int]) -> Optional[float]:
+    """Mean global gain over the granules and channels of a Layer III frame"""
+    if header['layer'] != 3:
+        return None
+    side_info = offset + 4 + (0 if data[offset + 1] & 0x01 else 2)
+    channels = header['channels']
+    if header['version'] == 3:
+        # main_data_begin, private bits and scfsi, then two granules of 59 bits per channel
+        first, block, granules = 9 + (5 if channels == 1 else 3) + 4 * channels, 59, 2
+    else:
+        first, block, granules = 8 + (1 if channels == 1 else 2), 63, 1
+    gains = [
+        _bits(data, side_info, first + block * i + 21, 8)
+        for i in range(granules * channels)
+    ]
+    return sum(gains) / len(gains)
+
+def fingerprint_mp3(filepath: str) -> Dict[str, Any]:
+    """Frame hash, duration and side-info loudness envelope of an MP3, without decoding"""
+    file_size = os.path.getsize(filepath)
+    if file_size == 0:
+        return {'error': 'empty file'}
+
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        id3_size = parse_id3v2(data)['size']
+        audio_end = file_size - (128 if file_size >= 128 and data[file_size - 128:file_size - 125] == b'TAG' else 0)
+
+        offset = id3_size
+        first = None
+        while offset < min(audio_end, id3_size + 64 * 1024):
+            offset = data.find(b'\xff', offset, audio_end)
+            if offset < 0:
+                break
+            header = parse_frame_header(data, offset)
+            if header and header['length'] > 0 and parse_frame_header(data, offset + header['length']):
+                first = header
+                break
+            offset += 1
+
+        if first is None:
+            return {'error': 'no MPEG audio frames found'}
+
+        if xing_frames(data, offset, first):
+            # The Xing/Info frame carries no audio
+            offset += first['length']
+
+        digest = hashlib.sha256()
+        per_window = max(1, round(WINDOW_SECONDS * first['sample_rate'] / first['samples']))
+        envelope, window, frames = [], [], 0
+        while offset < audio_end:
+            header = parse_frame_header(data, offset)
+            if header is None or header['length'] <= 0:
+                break
+            digest.update(data[offset:offset + header['length']])
+            frames += 1
+            gain = _global_gain(data, offset, header)
+            if gain is not None:
+                window.append(gain)
+                if len(window) == per_window:
+                    envelope.append(round(sum(window) / len(window), 1))
+                    window = []
+            offset += header['length']
+
+    return {
+        'audio_sha256': digest.hexdigest(),
+        'bytes': file_size,
+        'duration_seconds': round(frames * first['samples'] / first['sample_rate'], 2),
+        'sample_rate': first['sample_rate'],
+        'channels': first['channels'],
+        'envelope': envelope,
+    }
+
+def decoded_envelope(wav_path: str) -> List[float]:
+    """RMS level in dB of each window of a WAV render"""
+    pcm = PCMBuffer(wav_path)
+    size = int(WINDOW_SECONDS * pcm.sample_rate)
+    envelope = []
+    for start in range(0, pcm.frames - size + 1, size):
+        samples = pcm.read(start, start + size)
+        rms = float(np.sqrt(np.mean(samples * samples)))
+        envelope.append(round(20 * np.log10(max(rms, 1e-9)), 1))
+    return envelope
+
+def similarity(a: List[float], b: List[float]) -> Optional[float]:
+    """Best Pearson correlation of two envelopes over small shifts, or None if either is flat"""
+    best = None
+    for lag in range(-MAX_LAG_WINDOWS, MAX_LAG_WINDOWS + 1):
+        x = a[max(lag, 0):]
+        y = b[max(-lag, 0):]
+        n = min(len(x), len(y))
+        if n < 4:
+            continue
+        x, y = x[:n], y[:n]
+        mean_x, mean_y = sum(x) / n, sum(y) / n
+        cov = sum((p - mean_x) * (q - mean_y) for p, q in zip(x, y))
+        var_x = sum((p - mean_x) ** 2 for p in x)
+        var_y = sum((q - mean_y) ** 2 for q in y)
+        if var_x and var_y:
+            r = cov / (var_x * var_y) ** 0.5
+            best = r if best is None else max(best, r)
+    return best
+
+def _same_length(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    longer = max(a['duration_seconds'], b['duration_seconds'])
+    return abs(a['duration_seconds'] - b['duration_seconds']) <= longer * DURATION_TOLERANCE
+
+def compare(a: Dict[str, Any], b: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """How b duplicates a: the kind of match and its similarity, or None"""
+    if a['audio_sha256'] == b['audio_sha256']:
+        return {'kind': 'exact', 'similarity': 1.0}
+    if not _same_length(a, b):
+        return None
+    # The decoded envelope is the better measure when both sounds have one
+    if a.get('decoded') and b.get('decoded'):
+        score, source = similarity(a['decoded'], b['decoded']), 'decoded'
+    else:
+        score, source = similarity(a['envelope'], b['envelope']), 'frames'
+    if score is None or score < NEAR_DUPLICATE_SIMILARITY:
+        return None
+    return {'kind': 'near', 'similarity': round(score, 3), 'measured_on': source}
+
+def tracked_sounds() -> Dict[str, str]:
+    """Blob SHA of every tracked MP3 in the sounds directory"""
+    return {path: sha for path, sha in tracked_blobs(SOUNDS_DIR).items() if path.lower().endswith('.mp3')}
+
+def _fingerprint(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        return fingerprint_mp3(path)
+    except (OSError, ValueError) as e:
+        print(f"Error fingerprinting {path}: {e}")
+        return None
+
+def _decoded(entry: Dict[str, Any], path: str, renders: Dict[str, str], temp_dir: str):
+    """Add the decoded envelope to a fingerprint, if a render is available"""
+    if np is None or 'decoded' in entry:
+        return
+    stem = os.path.splitext(os.path.basename(path))[0]
+    source = renders.get(stem) or render_to_wav(path, temp_dir)
+    if source:
+        try:
+            entry['decoded'] = decoded_envelope(source)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error decoding {path} for fingerprinting: {e}")
+
+def analyze_audio_duplicates(changed_paths: List[str], render_dir: Optional[str] = None,
+                             index_path: str = INDEX_PATH,
+                             admit: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
+    """New or changed sounds that exactly or nearly duplicate another sound in the catalog"""
+    cache = BlobCache(index_path, INDEX_VERSION, 'audio fingerprints')
+    changed = {p for p in changed_paths if p.lower().endswith('.mp3') and os.path.exists(p)}
+    blobs = tracked_sounds()
+    catalog, shas, skipped = {}, {}, set()
+    for path in sorted(set(blobs) | changed):
+        if not os.path.exists(path):
+            continue
+        if admit and not admit(path):
+            # Keep the cached fingerprint of an unchanged sound for the next run
+            if path in blobs and path not in changed:
+                skipped.add(blobs[path])
+            continue
+        sha = head_sha(path, blobs, changed)
+        entry = cache.get(sha, lambda: _fingerprint(path)) if sha else None
+        if entry is not None and 'error' not in entry:
+            catalog[path], shas[path] = entry, sha
+
+    renders = {}
+    if render_dir and os.path.isdir(render_dir):
+        for name in os.listdir(render_dir):
+            if name.lower().endswith('.wav'):
+                renders[os.path.splitext(name)[0]] = os.path.join(render_dir, name)
+
+    duplicates = []
+    with tempfile.TemporaryDirectory(prefix='fingerprint_') as temp_dir:
+        for path in sorted(changed & set(catalog)):
+            entry = catalog[path]
+            candidates = [p for p in catalog if p != path and _same_length(entry, catalog[p])]
+            # Decode only sounds that already match on duration
+            for p in [path] + candidates if candidates else []:
+                _decoded(catalog[p], p, renders, temp_dir)
+            matches = []
+            for other in candidates:
+                match = compare(entry, catalog[other])
+                if match:
+                    matches.append({'path': other, **match})
+            if matches:
+                matches.sort(key=lambda m: -m['similarity'])
+                duplicates.append({'path': path, 'bytes': entry['bytes'], 'matches': matches})
+
+    cache.save(set(shas.values()) | skipped)
+
+    issues = []
+    for duplicate in duplicates:
+        best = duplicate['matches'][0]
+        what = "an exact copy" if best['kind'] == 'exact' else f"a near duplicate ({best['similarity']:.2f} similar)"
+        issues.append(
+            f"{duplicate['path']} is {what} of {best['path']}, "
+            f"wasting {duplicate['bytes'] / 1024:.0f} KB"
+        )
+
+    return {
+        'sounds': len(catalog),
+        'fingerprinted': cache.built,
+        'decoded': np is not None and any('decoded' in entry for entry in catalog.values()),
+        'duplicates': duplicates,
+        'wasted_bytes': sum(d['bytes'] for d in duplicates),
+        'issues': issues,
+    }
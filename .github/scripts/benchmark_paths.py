@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark for Component Classification
+
+Classifies synthetic changed-file lists shaped like the SoundScape tree with
+the compiled path-rule matcher and with the substring scan it replaced. The
+run fails if the two disagree on any path's component or on the PR's
+affected features.
+"""
+
+import argparse
+import random
+import sys
+import time
+from typing import Dict, List
+
+from path_rules import PathRuleMatcher
+from rule_packs import RULE_PACKS_DIR, load_rule_packs
+
+DIRECTORIES = [
+    'SoundScape/Sources/Data/Services',
+    'SoundScape/Sources/Data/Repositories',
+    'SoundScape/Sources/Domain/Entities',
+    'SoundScape/Sources/Presentation/Views',
+    'SoundScape/Sources/Presentation/Views/Mixer',
+    'SoundScape/Sources/Presentation/ViewModels',
+    'SoundScape/Tests',
+    'SoundScapeWidget',
+]
+STEMS = [
+    'AudioEngine', 'BinauralBeatEngine', 'SleepRecordingService', 'PaywallService', 'ContentView',
+    'MixerView', 'SoundRepository', 'InsightsService', 'SleepTimer', 'Haptics', 'Settings', 'AppState',
+]
+
+DEFAULT_COUNTS = [100, 1000, 10000]
+
+def synthetic_paths(count: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    paths = []
+    for index in range(count):
+        directory = rng.choice(DIRECTORIES)
+        if rng.random() < 0.5:
+            directory += f"/Feature{index % 50}"
+        paths.append(f"{directory}/{rng.choice(STEMS)}{index}.swift")
+    return paths
+
+def legacy_component(path: str, components: Dict[str, List[str]], layers: Dict[str, List[str]]) -> str:
+    """The substring scan that identify_component used before path rules"""
+    for table in (components, layers):
+        for name, patterns in table.items():
+            if any(pattern in path for pattern in patterns):
+                return name
+    return 'Other'
+
+def legacy_features(paths: List[str], components: Dict[str, List[str]]) -> List[str]:
+    features = []
+    for name, patterns in components.items():
+        for path in paths:
+            if any(pattern in path for pattern in patterns):
+                features.append(name)
+                break
+    return sorted(features)
+
+def run_benchmark(counts: List[int] = None, rules_dir: str = RULE_PACKS_DIR) -> Dict[int, Dict]:
+    rules = load_rule_packs(rules_dir)
+    results = {}
+    for count in counts or DEFAULT_COUNTS:
+        paths = synthetic_paths(count)
+
+        start = time.perf_counter()
+        legacy = {path: legacy_component(path, rules.components, rules.layers) for path in paths}
+        affected = legacy_features(paths, rules.components)
+        legacy_seconds = time.perf_counter() - start
+
+        # A fresh matcher per run, so the timing includes compiling the rules
+        start = time.perf_counter()
+        matcher = PathRuleMatcher(rules.path_rules.rules)
+        labels = matcher.classify_all(paths)
+        compiled = {path: path_labels[0] if path_labels else 'Other' for path, path_labels in labels.items()}
+        features = sorted({label for path_labels in labels.values() for label in path_labels if label not in rules.layers})
+        compiled_seconds = time.perf_counter() - start
+
+        results[count] = {
+            'legacy_seconds': legacy_seconds,
+            'compiled_seconds': compiled_seconds,
+            'mismatches': [path for path in paths if legacy[path] != compiled[path]],
+            'features_match': affected == features,
+        }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark component classification of changed paths')
+    parser.add_argument('--counts', help='Comma-separated numbers of paths')
+    parser.add_argument('--rule-packs', default=RULE_PACKS_DIR, help='Directory of TOML/YAML rule packs')
+    args = parser.parse_args()
+
+    counts = [int(c) for c in args.counts.split(',')] if args.counts else DEFAULT_COUNTS
+    results = run_benchmark(counts, args.rule_packs)
+
+    print(f"{'Paths':>8}{'Substring scan':>18}{'Path rules':>14}")
+    failed = False
+    for count, result in results.items():
+        status = '✅' if not result['mismatches'] and result['features_match'] else '❌'
+        failed |= status == '❌'
+        print(f"{count:>8}{result['legacy_seconds'] * 1000:>16.1f}ms{result['compiled_seconds'] * 1000:>12.1f}ms {status}")
+        for path in result['mismatches'][:5]:
+            print(f"   ❌ {path} classified differently")
+
+    if failed:
+        print("\n❌ Path rules disagree with the substring scan")
+        sys.exit(1)
+    print("\n✅ Path rules match the substring scan on every path")
+
+if __name__ == '__main__':
+    main()
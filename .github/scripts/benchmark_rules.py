@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Adversarial Benchmark for the Rule Engine
+
+Builds inputs designed to trigger backtracking in the analyzer's rule
+patterns, scans them at doubling sizes and fits the growth exponent of the
+worst-case scan time. The run fails if any rule grows faster than linearly.
+"""
+
+import argparse
+import math
+import sys
+import time
+from typing import Callable, Dict, List
+
+from analyze_pr import CodeAnalyzer
+from rule_engine import RuleEngine, SourceFile
+
+# Each generator returns roughly n characters of hostile Swift-like text
+ADVERSARIAL_CORPUS: Dict[str, Callable[[int], str]] = {
+    'unclosed do blocks': lambda n: 'do {' * (n // 4),
+    'do blocks full of try': lambda n: 'do { ' + 'try ' * (n // 4),
+    'nested init calls': lambda n: 'init(' * (n // 5),
+    'long whitespace runs': lambda n: ('!' + ' ' * 999) * (n // 1000),
+    'bang runs': lambda n: '!' * n,
+    'colon runs': lambda n: (': ' + 'a' * 98) * (n // 100),
+    'one long line': lambda n: ('let value = optional! ?? fallback; do { try run() } ' * (n // 52 + 1))[:n],
+    'deep braces': lambda n: '{' * (n // 2) + '}' * (n // 2),
+    'unterminated comment and string': lambda n: '/* "' + 'x' * (n - 4),
+}
+
+DEFAULT_SIZES = [16 * 1024, 32 * 1024, 64 * 1024, 128 * 1024]
+
+# Log-log slope above which scan time is treated as super-linear
+MAX_EXPONENT = 1.35
+
+def scan_seconds(engine: RuleEngine, patterns: List[str], content: str, repeats: int = 3) -> float:
+    """Best-of-N time to tokenize and scan content with every rule"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        source = SourceFile(content)
+        for pattern in patterns:
+            engine.count(pattern, source)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def growth_exponent(sizes: List[int], seconds: List[float]) -> float:
+    """Least-squares slope of log(time) against log(size)"""
+    xs = [math.log(s) for s in sizes]
+    ys = [math.log(max(t, 1e-6)) for t in seconds]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    denominator = sum((x - mean_x) ** 2 for x in xs)
+    return numerator / denominator if denominator else 0.0
+
+def run_benchmark(sizes: List[int] = None, repeats: int = 3) -> Dict[str, Dict]:
+    sizes = sizes or DEFAULT_SIZES
+    patterns = list(CodeAnalyzer.rule_engine().rules)
+    engine = RuleEngine(rule_seconds=60).load(patterns)
+
+    results = {}
+    for name, generate in ADVERSARIAL_CORPUS.items():
+        seconds = [scan_seconds(engine, patterns, generate(size), repeats) for size in sizes]
+        results[name] = {'seconds': seconds, 'exponent': growth_exponent(sizes, seconds)}
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark rule scan time on adversarial inputs')
+    parser.add_argument('--sizes', help='Comma-separated input sizes in bytes')
+    parser.add_argument('--repeats', type=int, default=3, help='Runs per size (best time is kept)')
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',')] if args.sizes else DEFAULT_SIZES
+    results = run_benchmark(sizes, args.repeats)
+
+    print(f"{'Input':<34}" + ''.join(f"{s // 1024:>9} KB" for s in sizes) + "   Exponent")
+    failed = False
+    for name, result in results.items():
+        times = ''.join(f"{t * 1000:>9.1f}ms" for t in result['seconds'])
+        status = '✅' if result['exponent'] <= MAX_EXPONENT else '❌'
+        failed |= result['exponent'] > MAX_EXPONENT
+        print(f"{name:<34}{times}   {result['exponent']:.2f} {status}")
+
+    if failed:
+        print(f"\n❌ Scan time grows faster than linearly (exponent > {MAX_EXPONENT})")
+        sys.exit(1)
+    print("\n✅ Worst-case scan time grows linearly with input size")
+
+if __name__ == '__main__':
+    main()
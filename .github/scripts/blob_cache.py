@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Per-Blob Index Cache for PR Assessment
+
+Analyzers that look at every tracked file of a kind keep one entry per git
+blob SHA in a versioned JSON file under `.pr-analysis-cache/`. A run only
+reads the files whose content is not cached yet, and saving drops the
+entries of blobs no longer in use. Source indexes are built for the working
+tree and, for the PR's changed files, for the base ref read from git, so an
+analyzer can compare the two.
+"""
+
+import json
+import os
+import subprocess
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from pbxproj import blob_sha
+
+class BlobCache:
+    """Entries keyed by blob SHA, stored in one JSON file"""
+
+    def __init__(self, path: str, version: int, label: str):
+        self.path = path
+        self.version = version
+        self.label = label
+        self.blobs: Dict[str, Any] = self._load()
+        self.built = 0
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, 'r') as f:
+                cached = json.load(f)
+            if cached.get('version') == self.version:
+                return cached['blobs']
+        except (OSError, ValueError, KeyError):
+            pass
+        return {}
+
+    def get(self, sha: str, build: Callable[[], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """Entry for a blob, made with build() on a cache miss; None if build() gives none"""
+        entry = self.blobs.get(sha)
+        if entry is None:
+            entry = build()
+            if entry is None:
+                return None
+            self.blobs[sha] = entry
+            self.built += 1
+        return entry
+
+    def save(self, keep: Set[str]):
+        """Write the cache back, keeping only the blobs still in use"""
+        self.blobs = {sha: entry for sha, entry in self.blobs.items() if sha in keep}
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'w') as f:
+                json.dump({'version': self.version, 'blobs': self.blobs}, f)
+        except OSError as e:
+            print(f"Warning: could not cache {self.label}: {e}")
+
+def tracked_blobs(pathspec: str = '*.swift') -> Dict[str, str]:
+    """Blob SHA of every tracked file matching pathspec, as staged in the index"""
+    result = subprocess.run(['git', 'ls-files', '-s', '--', pathspec], capture_output=True, text=True)
+    blobs = {}
+    for line in result.stdout.splitlines() if result.returncode == 0 else []:
+        meta, _, path = line.partition('\t')
+        blobs[path] = meta.split()[1]
+    return blobs
+
+def head_sha(path: str, blobs: Dict[str, str], changed: Set[str]) -> Optional[str]:
+    """Blob SHA of a working tree file: the staged one unless the file changed or is untracked"""
+    return blob_sha(None, path) if path in changed or path not in blobs else blobs[path]
+
+def read_blob(sha: str) -> Optional[str]:
+    result = subprocess.run(['git', 'cat-file', 'blob', sha], capture_output=True, text=True)
+    return result.stdout if result.returncode == 0 else None
+
+def index_sources(cache: BlobCache, index_source: Callable[[str], Dict[str, Any]], paths: List[str],
+                  changed: Set[str], blobs: Dict[str, str], base_ref: Optional[str] = None,
+                  admit: Optional[Callable[[str], bool]] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Index entries of paths in the working tree and at base_ref, saving the cache with the blobs used"""
+    def read_file(path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return index_source(f.read())
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error indexing {path} for the {cache.label}: {e}")
+            return None
+
+    def read_base(sha: str) -> Optional[Dict[str, Any]]:
+        content = read_blob(sha)
+        return None if content is None else index_source(content)
+
+    head, used, skipped = {}, set(), set()
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        if admit and not admit(path):
+            skipped.add(path)
+            continue
+        sha = head_sha(path, blobs, changed)
+        entry = cache.get(sha, lambda: read_file(path)) if sha else None
+        if entry is not None:
+            head[path] = entry
+            used.add(sha)
+
+    # The base differs from head only in the PR's changed files; files over budget are left out of both
+    base = dict(head)
+    for path in (changed & set(paths)) - skipped if base_ref else set():
+        sha = blob_sha(base_ref, path)
+        entry = cache.get(sha, lambda: read_base(sha)) if sha else None
+        if entry is None:
+            base.pop(path, None)
+        else:
+            base[path] = entry
+            used.add(sha)
+
+    cache.save(used)
+    return head, base
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Analysis Budgets for PR Assessment
+
+Per-file limits on bytes, lines and wall time, and per-phase wall-time
+limits. Files over a limit get a cheap line-count analysis instead of the
+full one and are recorded as degraded, which bounds the job's latency.
+Analyzers run as a phase get an `admit(path)` callback and call it before
+reading each file, so a phase that runs out of time degrades the files it
+has not reached, and whole-project indexes obey the same file limits.
+"""
+
+import os
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_MAX_FILE_BYTES = 512 * 1024
+DEFAULT_MAX_FILE_LINES = 10000
+DEFAULT_FILE_SECONDS = 10.0
+DEFAULT_PHASE_SECONDS = 120.0
+
+READ_CHUNK = 64 * 1024
+
+class AnalysisBudget:
+    """Tracks file and phase budgets and the files that exceeded them"""
+
+    def __init__(self, max_file_bytes: int = DEFAULT_MAX_FILE_BYTES, max_file_lines: int = DEFAULT_MAX_FILE_LINES,
+                 file_seconds: float = DEFAULT_FILE_SECONDS, phase_seconds: float = DEFAULT_PHASE_SECONDS):
+        self.max_file_bytes = max_file_bytes
+        self.max_file_lines = max_file_lines
+        self.file_seconds = file_seconds
+        self.phase_seconds = phase_seconds
+        self.phase_started: Dict[str, float] = {}
+        self.phase_elapsed: Dict[str, float] = {}
+        self.degraded: Dict[str, List[Dict[str, str]]] = defaultdict(list)
+        self._file_checks: Dict[str, Optional[str]] = {}
+
+    def check_file(self, filepath: str) -> Optional[str]:
+        """Reason the file exceeds the size budgets, or None (cached per path)"""
+        if filepath not in self._file_checks:
+            self._file_checks[filepath] = self._check_file(filepath)
+        return self._file_checks[filepath]
+
+    def _check_file(self, filepath: str) -> Optional[str]:
+        try:
+            size = os.path.getsize(filepath)
+        except OSError:
+            return None
+        if size > self.max_file_bytes:
+            return f"{size / 1024:.0f} KB exceeds the {self.max_file_bytes / 1024:.0f} KB file budget"
+
+        # Count newlines in chunks and stop as soon as the budget is passed
+        lines = 0
+        with open(filepath, 'rb') as f:
+            for chunk in iter(lambda: f.read(READ_CHUNK), b''):
+                lines += chunk.count(b'\n')
+                if lines > self.max_file_lines:
+                    return f"more than {self.max_file_lines:,} lines exceeds the line budget"
+        return None
+
+    def start_phase(self, phase: str):
+        self.phase_started[phase] = time.monotonic()
+
+    def end_phase(self, phase: str):
+        if phase in self.phase_started:
+            self.phase_elapsed[phase] = round(time.monotonic() - self.phase_started[phase], 3)
+
+    def phase_exhausted(self, phase: str) -> Optional[str]:
+        """Reason the phase is out of time, or None"""
+        started = self.phase_started.get(phase)
+        if started is not None and time.monotonic() - started > self.phase_seconds:
+            return f"{phase} phase exceeded its {self.phase_seconds:g}s budget"
+        return None
+
+    def file_deadline(self) -> float:
+        """Monotonic deadline for work on a single file"""
+        return time.monotonic() + self.file_seconds
+
+    def over_budget(self, filepath: str, phase: str) -> Optional[str]:
+        """Reason the file must not get the full analysis in this phase, or None"""
+        return self.check_file(filepath) or self.phase_exhausted(phase)
+
+    def admit(self, filepath: str, phase: str, sized: bool = True) -> bool:
+        """Whether the file gets the full analysis in this phase, recording it as degraded if not
+
+        Binary assets pass sized=False: the byte and line budgets are for source
+        files, so only the phase budget applies to them.
+        """
+        reason = self.over_budget(filepath, phase) if sized else self.phase_exhausted(phase)
+        if reason:
+            self.degrade(filepath, phase, reason)
+        return reason is None
+
+    def degrade(self, filepath: str, phase: str, reason: str):
+        entry = {'phase': phase, 'reason': reason}
+        if entry not in self.degraded[filepath]:
+            self.degraded[filepath].append(entry)
+
+    def run_phase(self, phase: str, analyze: Callable[..., Dict[str, Any]], *args, sized: bool = True,
+                  **kwargs) -> Dict[str, Any]:
+        """Run an analyzer as a timed phase, passing it the admit check for each file it reads"""
+        self.start_phase(phase)
+        try:
+            return analyze(*args, admit=lambda path: self.admit(path, phase, sized), **kwargs)
+        finally:
+            self.end_phase(phase)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'limits': {
+                'max_file_bytes': self.max_file_bytes,
+                'max_file_lines': self.max_file_lines,
+                'file_seconds': self.file_seconds,
+                'phase_seconds': self.phase_seconds,
+            },
+            'phase_seconds': dict(self.phase_elapsed),
+            'degraded_files': dict(self.degraded),
+        }
+
+def fallback_line_counts(filepath: str, max_bytes: int = DEFAULT_MAX_FILE_BYTES) -> Dict[str, Any]:
+    """Line totals from at most max_bytes of the file, without pattern scanning"""
+    total = blank = comment = 0
+    read = 0
+    with open(filepath, 'rb') as f:
+        for line in f:
+            read += len(line)
+            total += 1
+            stripped = line.strip()
+            if not stripped:
+                blank += 1
+            elif stripped.startswith((b'//', b'/*', b'*')):
+                comment += 1
+            if read >= max_bytes:
+                break
+
+    return {
+        'total_lines': total,
+        'code_lines': total - blank - comment,
+        'comment_lines': comment,
+        'blank_lines': blank,
+        'truncated': read >= max_bytes,
+    }
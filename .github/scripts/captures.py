@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Closure Capture and Retain-Cycle Analysis for PR Assessment
+
+Services such as the recorder, the audio engine and the content player live
+for the whole night. If one of them keeps a closure that captures `self`
+strongly, the two keep each other alive and memory climbs until the app
+quits. This analyzer walks the closures in every class and actor. It reports
+the ones that capture `self` without `[weak self]` or `[unowned self]` and
+are kept by the instance or by something longer-lived. That covers closures
+stored in properties, Combine sinks kept in a cancellable, NotificationCenter
+and remote-command registrations, audio taps and time observers, and
+completion handlers handed to an object the instance owns.
+"""
+
+import os
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from swift_index import Scope, SwiftIndex, index_file
+
+KINDS = {
+    'property': 'Stored closure',
+    'sink': 'Combine sink',
+    'observer': 'Observer registration',
+    'handler': 'Completion handler',
+}
+
+# Calls whose receiver keeps the closure until it is explicitly removed
+RETAINING_CALLS = {
+    'installTap': 'audio tap block',
+    'addPeriodicTimeObserver': 'periodic time observer',
+    'addBoundaryTimeObserver': 'boundary time observer',
+    'setEventHandler': 'dispatch source event handler',
+    'setCancelHandler': 'dispatch source cancel handler',
+    'observe': 'key-value observation',
+}
+
+# Registrations with app-lifetime centers, kept however the token is stored
+CENTER_CALLS = {
+    'addObserver': 'NotificationCenter observer block',
+    'addTarget': 'remote command target',
+}
+
+# Closures that run before the call returns, or run once and are released
+NON_ESCAPING = {
+    'map', 'flatMap', 'compactMap', 'filter', 'forEach', 'reduce', 'sorted', 'sort', 'first', 'firstIndex',
+    'last', 'lastIndex', 'contains', 'allSatisfy', 'removeAll', 'min', 'max', 'partition', 'prefix', 'drop',
+    'sync', 'withLock', 'performAndWait', 'withAnimation', 'withTransaction', 'withCheckedContinuation',
+    'withCheckedThrowingContinuation', 'withTaskGroup', 'withThrowingTaskGroup', 'async', 'asyncAfter',
+    'perform', 'run', 'append', 'insert', 'update', 'onAppear', 'onDisappear', 'onChange', 'onReceive', 'task',
+}
+
+HANDLER_LABELS = {'completion', 'completionHandler', 'handler', 'completionBlock', 'resultHandler'}
+
+def _text(index: SwiftIndex, position: int) -> str:
+    return index.tokens[position].text if 0 <= position < len(index.tokens) else ''
+
+def reference_types(index: SwiftIndex) -> Set[str]:
+    """Names of the classes and actors declared in the file"""
+    return {t.name for t in index.types() if t.keyword in ('class', 'actor')}
+
+def stored_properties(index: SwiftIndex, type_name: str) -> Set[str]:
+    """Instance properties declared on the type, in its body or an extension"""
+    return {
+        d.name for d in index.declarations
+        if d.kind == 'property' and d.parent is not None and d.parent.kind == 'type'
+        and d.parent.name == type_name and 'static' not in d.modifiers
+    }
+
+def _capture_list(index: SwiftIndex, closure: Scope) -> List[str]:
+    """Tokens of the closure's capture list, e.g. ['weak', 'self'] for `{ [weak self] in`"""
+    if _text(index, closure.start + 1) != '[':
+        return []
+    texts = []
+    position = closure.start + 2
+    while position < closure.end and _text(index, position) != ']':
+        texts.append(_text(index, position))
+        position += 1
+    return texts
+
+def strong_self(index: SwiftIndex, closure: Scope) -> Optional[int]:
+    """Token index of the first strong use of `self` in the closure, or None if it captures self weakly
+
+    Nested closures count: an outer closure has to hold `self` strongly to
+    hand it to an inner `[weak self]` closure. `self?` is a weak binding from
+    an enclosing closure and does not count.
+    """
+    captures = _capture_list(index, closure)
+    for i, text in enumerate(captures[:-1]):
+        if text in ('weak', 'unowned') and captures[i + 1] == 'self':
+            return None
+    for position in range(closure.start + 1, closure.end):
+        if _text(index, position) == 'self' and _text(index, position + 1) != '?':
+            return position
+    return None
+
+def _call_position(index: SwiftIndex, closure: Scope) -> Optional[int]:
+    """Token index of the callee the closure is passed to, or None for a bare closure"""
+    previous = closure.start - 1
+    text = _text(index, previous)
+    open_paren = index.call_open(previous)
+    if open_paren is not None:
+        return open_paren - 1
+    if index.tokens[previous].kind in ('identifier', 'keyword') and text != 'in':
+        return previous
+    if text in (':', '(', ','):
+        depth = 0
+        for position in range(previous, -1, -1):
+            t = _text(index, position)
+            if t in (')', ']', '}'):
+                depth += 1
+            elif t in ('(', '[', '{'):
+                if depth == 0:
+                    return position - 1 if t == '(' else None
+                depth -= 1
+    return None
+
+def _chain_start(index: SwiftIndex, position: int, closing: Dict[int, Scope]) -> int:
+    """First token of the member chain ending at position, across calls and trailing closures"""
+    while True:
+        text = _text(index, position)
+        open_paren = index.call_open(position)
+        if open_paren is not None:
+            position = open_paren - 1
+            continue
+        if text == '}' and position in closing:
+            position = closing[position].start - 1
+            continue
+        if _text(index, position - 1) == '.':
+            position -= 3 if _text(index, position - 2) in ('?', '!') else 2
+            continue
+        return position
+
+def _owner_root(index: SwiftIndex, start: int) -> str:
+    """Root of a member chain, looking through `self.`: `self.engine.inputNode` gives engine"""
+    if _text(index, start) == 'self' and _text(index, start + 1) == '.':
+        return _text(index, start + 2)
+    return _text(index, start)
+
+def _assigned_property(index: SwiftIndex, start: int, properties: Set[str]) -> Optional[str]:
+    """Property the expression starting at start is assigned to: `name =`, `self.name =` or `owned.name =`"""
+    if _text(index, start - 1) != '=':
+        return None
+    position = start - 2
+    while _text(index, position) in ('?', '!'):
+        position -= 1
+    name = _text(index, position)
+    if _text(index, position - 1) == '.':
+        owner = position - 2
+        while _text(index, owner) in ('?', '!'):
+            owner -= 1
+        root = _text(index, owner)
+        if root == 'self':
+            return name if name in properties else None
+        return f"{root}.{name}" if root in properties else None
+    if _text(index, position - 1) in ('let', 'var'):
+        # A type-level `lazy var name = { ... }` is stored; a local is not
+        return name if index.scope_at(position).kind == 'type' else None
+    if _text(index, position - 1) == ':':
+        return None
+    return name if name in properties else None
+
+def _stored_in(index: SwiftIndex, closure: Scope) -> Optional[str]:
+    """Cancellable set the chain after the closure stores into: `.store(in: &cancellables)`"""
+    position = closure.end + 1
+    while _text(index, position) == ')':
+        position += 1
+    for p in range(position, min(position + 8, len(index.tokens))):
+        if _text(index, p) == 'store' and _text(index, p - 1) == '.' and _text(index, p + 2) == 'in':
+            return _text(index, p + 5 if _text(index, p + 4) == '&' else p + 4)
+    return None
+
+def retention(index: SwiftIndex, closure: Scope, properties: Set[str],
+              closing: Dict[int, Scope]) -> Optional[tuple]:
+    """(kind, detail) when the closure is kept by the instance or an app-lifetime object, else None"""
+    if _text(index, closure.end + 1) == '(':
+        # { ... }() runs once, e.g. a lazy property initializer
+        return None
+
+    callee = _call_position(index, closure)
+    if callee is None:
+        name = _assigned_property(index, closure.start, properties)
+        return ('property', f"stored in `{name}`") if name else None
+
+    call = _text(index, callee)
+    start = _chain_start(index, callee, closing)
+    root = _owner_root(index, start)
+
+    if call == 'sink':
+        target = _stored_in(index, closure) or _assigned_property(index, start, properties)
+        return ('sink', f"sink kept in `{target}`") if target else None
+    if call in CENTER_CALLS and (call != 'addObserver' or _text(index, callee + 2) == 'forName'):
+        return 'observer', CENTER_CALLS[call]
+    if call in RETAINING_CALLS:
+        return 'handler', f"{RETAINING_CALLS[call]} (`{call}`)"
+    if call in NON_ESCAPING:
+        return None
+
+    name = _assigned_property(index, start, properties)
+    if name:
+        return 'property', f"`{call}` result stored in `{name}`"
+    if root in properties and start != callee and (closure.label in HANDLER_LABELS or closure.label is None):
+        return 'handler', f"handler passed to `{root}.{call}`, which holds it until it runs"
+    return None
+
+def analyze_index(index: SwiftIndex) -> List[Dict[str, Any]]:
+    """Closures in classes and actors that capture self strongly and are kept alive"""
+    classes = reference_types(index)
+    closing = {scope.end: scope for scope in index.scopes if scope.kind == 'closure'}
+    properties = {name: stored_properties(index, name) for name in classes}
+
+    findings = []
+    for scope in index.scopes:
+        if scope.kind != 'closure' or scope.end is None:
+            continue
+        owner = scope.enclosing_type()
+        if owner is None or owner.name not in classes:
+            continue
+        capture = strong_self(index, scope)
+        if capture is None:
+            continue
+        kept = retention(index, scope, properties[owner.name], closing)
+        if kept is None:
+            continue
+        findings.append({
+            'line': scope.line,
+            'capture_line': index.line(capture),
+            'type': owner.name,
+            'function': index.function_at(scope.start),
+            'kind': kept[0],
+            'detail': kept[1],
+        })
+    return findings
+
+def analyze_captures(files: List[str], added_lines: Dict[str, Set[int]],
+                     admit: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
+    """Find likely retain cycles through closures in changed Swift files"""
+    results = {'findings': [], 'by_type': {}, 'by_kind': {}, 'issues': []}
+
+    for path in files:
+        if not path.endswith('.swift') or not os.path.exists(path):
+            continue
+        if admit and not admit(path):
+            continue
+        try:
+            findings = analyze_index(index_file(path))
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error scanning {path} for closure captures: {e}")
+            continue
+
+        added = added_lines.get(path, set())
+        for finding in findings:
+            finding = {
+                'path': path,
+                **finding,
+                'new': finding['line'] in added or finding['capture_line'] in added,
+            }
+            results['findings'].append(finding)
+            results['by_kind'][finding['kind']] = results['by_kind'].get(finding['kind'], 0) + 1
+            results['by_type'][finding['type']] = results['by_type'].get(finding['type'], 0) + 1
+            if finding['new']:
+                results['issues'].append(
+                    f"{path}:{finding['line']} in {finding['function']}: {KINDS[finding['kind']].lower()} "
+                    f"({finding['detail']}) captures self strongly, so {finding['type']} is never released"
+                )
+
+    return results
@@ -12,28 +12,14 @@ import argparse
 from pathlib import Path
 from typing import Dict, Any, List, Tuple
 
+from scoring import SCORING, THRESHOLDS, THRESHOLD_CHECKS, WARNING_THRESHOLDS, score_facts
+
 class QualityChecker:
     """Checks PR against quality thresholds"""
     
-    # Define quality thresholds
-    THRESHOLDS = {
-        'minimum_overall_score': 60,  # F grade cutoff
-        'minimum_test_coverage_score': 50,  # Must have some tests
-        'maximum_avg_complexity': 15,  # Reasonable complexity limit
-        'minimum_architecture_score': 60,  # Basic architecture quality
-        'maximum_high_risk_files': 10,  # Limit dangerous code
-        'minimum_duplication_score': 70,  # Allow some duplication
-    }
-    
-    # Warning thresholds (won't fail, but will warn)
-    WARNING_THRESHOLDS = {
-        'recommended_overall_score': 80,
-        'recommended_test_coverage_score': 70,
-        'recommended_avg_complexity': 7,
-        'recommended_architecture_score': 80,
-        'recommended_high_risk_files': 3,
-        'recommended_duplication_score': 85,
-    }
+    # Thresholds live with the scoring so rescore.py and this gate agree
+    THRESHOLDS = THRESHOLDS
+    WARNING_THRESHOLDS = WARNING_THRESHOLDS
     
     def __init__(self, analysis_dir: Path, fail_on_regression: bool = False):
         self.analysis_dir = analysis_dir
@@ -41,10 +27,64 @@ class QualityChecker:
         self.failures = []
         self.warnings = []
         
+    # How each scored check reads in a failure or warning
+    CHECK_LABELS = {
+        'overall_score': 'Overall score',
+        'test_coverage': 'Test coverage score',
+        'avg_complexity': 'Average complexity',
+        'architecture': 'Architecture score',
+        'high_risk_files': 'High-risk files count',
+        'duplication': 'Duplication score',
+    }
+    
     def check_analysis(self, analysis: Dict[str, Any]) -> Tuple[bool, List[str], List[str]]:
         """Check analysis against thresholds"""
         metrics = analysis['metrics']
         
+        # Analyses with raw facts get the same verdict rescore.py computes
+        if analysis.get('raw_facts'):
+            self.check_facts(analysis['raw_facts'], metrics)
+        else:
+            self.check_metrics(metrics)
+        
+        self.check_issues(metrics)
+        
+        passed = len(self.failures) == 0
+        
+        return passed, self.failures, self.warnings
+    
+    def check_facts(self, facts: Dict[str, Any], metrics: Dict[str, Any]):
+        """Failures and warnings from scoring the raw facts"""
+        score = score_facts([facts])[0]
+        values = {**score['breakdown'], **score}
+        for check, column, direction, threshold, warning in THRESHOLD_CHECKS:
+            relation = 'is below' if direction == 'min' else 'exceeds'
+            value = values[column]
+            if check in score['failures']:
+                bound = 'minimum' if direction == 'min' else 'maximum'
+                self.failures.append(
+                    f"{self.CHECK_LABELS[check]} {value:g} {relation} {bound} threshold of {SCORING['thresholds'][threshold]}"
+                )
+            elif check in score['warnings']:
+                self.warnings.append(
+                    f"{self.CHECK_LABELS[check]} {value:g} {relation} recommended threshold of "
+                    f"{SCORING['warning_thresholds'][warning]}"
+                )
+        
+        if 'layer_violations' in score['failures']:
+            violations = metrics.get('architecture', {}).get('solid_principles', {}).get('violations', [])
+            for violation in violations:
+                self.failures.append(f"Critical architecture violation: {violation}")
+        
+        if 'critical_complexity' in score['failures']:
+            self.failures.append(
+                f"Found {score['counts']['critical_complexity']} functions with extremely high complexity "
+                f"(>{SCORING['critical_complexity']})"
+            )
+        # Blocking issues are listed one by one with the real-time audio hazards
+    
+    def check_metrics(self, metrics: Dict[str, Any]):
+        """Failures and warnings from the summary metrics of an analysis without raw facts"""
         # Check overall score
         overall_score = metrics['quality_score']['overall']
         if overall_score < self.THRESHOLDS['minimum_overall_score']:
@@ -121,15 +161,83 @@ class QualityChecker:
         
         # Check for high complexity functions
         high_cc_functions = metrics['complexity'].get('high_complexity_functions', [])
-        critical_cc_functions = [f for f in high_cc_functions if f['complexity'] > 20]
+        critical_cc_functions = [f for f in high_cc_functions if f['complexity'] > SCORING['critical_complexity']]
         if critical_cc_functions:
             self.failures.append(
-                f"Found {len(critical_cc_functions)} functions with extremely high complexity (>20)"
+                f"Found {len(critical_cc_functions)} functions with extremely high complexity "
+                f"(>{SCORING['critical_complexity']})"
             )
+    
+    def check_issues(self, metrics: Dict[str, Any]):
+        """Failures and warnings from the issues the analyzers reported"""
+        # Check asset size budgets
+        audio = metrics.get('assets', {}).get('audio', {})
+        for violation in audio.get('budget_violations', []):
+            self.warnings.append(f"Asset size budget exceeded: {violation}")
         
-        passed = len(self.failures) == 0
+        loops = metrics.get('assets', {}).get('loop_loudness', {})
+        for issue in loops.get('issues', []):
+            self.warnings.append(f"Sound loop/loudness issue: {issue}")
         
-        return passed, self.failures, self.warnings
+        duplicates = metrics.get('assets', {}).get('duplicates', {})
+        for issue in duplicates.get('issues', []):
+            self.warnings.append(f"Duplicate audio: {issue}")
+        
+        images = metrics.get('assets', {}).get('images', {})
+        for issue in images.get('issues', []):
+            self.warnings.append(f"Image asset issue: {issue}")
+        
+        localization = metrics.get('localization', {})
+        for issue in localization.get('issues', []):
+            self.warnings.append(f"Localization issue: {issue}")
+        
+        project = metrics.get('project', {})
+        for issue in project.get('issues', []):
+            self.warnings.append(f"Xcode project issue: {issue}")
+        
+        realtime = metrics.get('realtime_audio', {})
+        for issue in realtime.get('issues', []):
+            self.failures.append(f"Real-time audio hazard: {issue}")
+        
+        main_thread = metrics.get('main_thread', {})
+        for issue in main_thread.get('issues', []):
+            self.warnings.append(f"Main-thread blocking: {issue}")
+        
+        frame_cost = metrics.get('frame_cost', {})
+        for issue in frame_cost.get('issues', []):
+            self.warnings.append(f"Per-frame render cost: {issue}")
+        
+        lifecycle = metrics.get('lifecycle', {})
+        for issue in lifecycle.get('issues', []):
+            self.warnings.append(f"Lifecycle leak: {issue}")
+        
+        captures = metrics.get('captures', {})
+        for issue in captures.get('issues', []):
+            self.warnings.append(f"Retain cycle: {issue}")
+        
+        recording_storage = metrics.get('recording_storage', {})
+        for issue in recording_storage.get('issues', []):
+            self.warnings.append(f"Recording storage: {issue}")
+        
+        dsp_loops = metrics.get('dsp_loops', {})
+        for issue in dsp_loops.get('issues', []):
+            self.warnings.append(f"Scalar DSP loop: {issue}")
+        
+        observation = metrics.get('observation', {})
+        for issue in observation.get('issues', []):
+            self.warnings.append(f"Observation fan-out: {issue}")
+        
+        launch = metrics.get('launch', {})
+        for issue in launch.get('issues', []):
+            self.warnings.append(f"Launch path: {issue}")
+        
+        dead_code = metrics.get('dead_code', {})
+        for issue in dead_code.get('issues', []):
+            self.warnings.append(f"Dead code: {issue}")
+        
+        sound_references = metrics.get('sound_references', {})
+        for issue in sound_references.get('issues', []):
+            self.warnings.append(f"Unreferenced sound: {issue}")
     
     def print_results(self, passed: bool, pr_number: str):
         """Print check results"""
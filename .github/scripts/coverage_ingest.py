@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Coverage Ingestion for PR Assessment
+
+Stream-parses llvm-cov (`llvm-cov export -format=text`) and xccov
+(`xcrun xccov view --archive --json`) coverage exports, builds a line-hit
+bitmap for every changed file and reports coverage of exactly the lines a
+PR adds.
+"""
+
+import os
+import re
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import json_stream
+
+LLVM_FORMAT = 'llvm-cov'
+XCCOV_FORMAT = 'xccov'
+
+class LineBitmap:
+    """Compact per-line bit set (one bit per source line)"""
+
+    def __init__(self):
+        self.bits = bytearray()
+
+    def set(self, line: int):
+        index = line >> 3
+        if index >= len(self.bits):
+            self.bits.extend(bytes(index - len(self.bits) + 1))
+        self.bits[index] |= 1 << (line & 7)
+
+    def __contains__(self, line: int) -> bool:
+        index = line >> 3
+        return index < len(self.bits) and bool(self.bits[index] & (1 << (line & 7)))
+
+class FileCoverage:
+    """Executable and hit bitmaps for one source file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.executable = LineBitmap()
+        self.hit = LineBitmap()
+
+    def record(self, line: int, count: int):
+        self.executable.set(line)
+        if count > 0:
+            self.hit.set(line)
+
+def detect_format(filepath: str) -> str:
+    """Guess the export format from the head of the file"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        head = f.read(4096)
+    if 'llvm.coverage.json.export' in head or re.match(r'\s*\{\s*"data"\s*:', head):
+        return LLVM_FORMAT
+    return XCCOV_FORMAT
+
+def llvm_line_counts(segments: List[List]) -> Iterable[Tuple[int, int]]:
+    """Derive (line, execution_count) pairs from llvm-cov segments
+
+    Mirrors LineCoverageStats in llvm-cov: a line is executable when a counted
+    region starts on it or a counted region wraps into it, and its count is
+    the maximum over those regions.
+    """
+    if not segments:
+        return
+
+    def starts_region(segment: List) -> bool:
+        is_gap = len(segment) > 5 and segment[5]
+        return bool(segment[3]) and bool(segment[4]) and not is_gap
+
+    by_line = defaultdict(list)
+    for segment in segments:
+        by_line[segment[0]].append(segment)
+
+    wrapped = None
+    first_line = segments[0][0]
+    last_line = segments[-1][0]
+    for line in range(first_line, last_line + 1):
+        line_segments = by_line.get(line, [])
+        region_starts = [s for s in line_segments if starts_region(s)]
+        skipped = bool(line_segments) and not line_segments[0][3] and line_segments[0][4]
+
+        mapped = not skipped and ((wrapped is not None and wrapped[3]) or region_starts)
+        if mapped:
+            count = wrapped[2] if wrapped is not None else 0
+            for segment in region_starts:
+                count = max(count, segment[2])
+            yield line, count
+
+        if line_segments:
+            wrapped = line_segments[-1]
+
+class RepoPathMatcher:
+    """Matches absolute tool-reported paths to repo-relative changed paths"""
+
+    def __init__(self, paths: Iterable[str]):
+        self._by_basename = defaultdict(list)
+        for path in paths:
+            self._by_basename[os.path.basename(path)].append(path)
+
+    def match(self, reported_path: str) -> Optional[str]:
+        normalized = reported_path.replace('\\', '/')
+        for candidate in self._by_basename.get(os.path.basename(normalized), []):
+            if normalized == candidate or normalized.endswith('/' + candidate):
+                return candidate
+        return None
+
+class CoverageIngestor:
+    """Maps a coverage export onto the lines a PR added"""
+
+    def __init__(self, added_lines: Dict[str, Set[int]]):
+        self.added_lines = added_lines
+        self.coverage: Dict[str, FileCoverage] = {}
+        self.paths = RepoPathMatcher(added_lines)
+
+    def _coverage_for(self, export_path: str) -> Optional[FileCoverage]:
+        path = self.paths.match(export_path)
+        if path is None:
+            return None
+        if path not in self.coverage:
+            self.coverage[path] = FileCoverage(path)
+        return self.coverage[path]
+
+    def ingest(self, filepath: str) -> str:
+        """Stream the export and fill bitmaps for changed files only"""
+        export_format = detect_format(filepath)
+        with open(filepath, 'r', encoding='utf-8') as f:
+            if export_format == LLVM_FORMAT:
+                for file_entry in json_stream.items(f, 'data.item.files.item'):
+                    file_coverage = self._coverage_for(file_entry.get('filename', ''))
+                    if file_coverage is None:
+                        continue
+                    for line, count in llvm_line_counts(file_entry.get('segments', [])):
+                        file_coverage.record(line, count)
+            else:
+                for export_path, lines in json_stream.kvitems(f, ''):
+                    file_coverage = self._coverage_for(export_path)
+                    if file_coverage is None or not isinstance(lines, list):
+                        continue
+                    for entry in lines:
+                        if entry.get('isExecutable'):
+                            file_coverage.record(entry['line'], entry.get('executionCount') or 0)
+        return export_format
+
+    def summarize(self, component_of: Callable[[str], str]) -> Dict[str, Any]:
+        """Coverage of added lines per file, per component and overall"""
+        files = {}
+        components = defaultdict(lambda: {'added_executable_lines': 0, 'added_covered_lines': 0})
+
+        for path, added in sorted(self.added_lines.items()):
+            file_coverage = self.coverage.get(path)
+            if file_coverage is None:
+                continue
+
+            executable = sorted(line for line in added if line in file_coverage.executable)
+            uncovered = [line for line in executable if line not in file_coverage.hit]
+            covered = len(executable) - len(uncovered)
+
+            files[path] = {
+                'added_executable_lines': len(executable),
+                'added_covered_lines': covered,
+                'coverage_percent': round(covered / len(executable) * 100, 2) if executable else None,
+                'uncovered_ranges': compress_ranges(uncovered),
+            }
+
+            component = components[component_of(path)]
+            component['added_executable_lines'] += len(executable)
+            component['added_covered_lines'] += covered
+
+        for stats in components.values():
+            total = stats['added_executable_lines']
+            stats['coverage_percent'] = round(stats['added_covered_lines'] / total * 100, 2) if total else None
+
+        total_executable = sum(f['added_executable_lines'] for f in files.values())
+        total_covered = sum(f['added_covered_lines'] for f in files.values())
+
+        return {
+            'files_matched': len(files),
+            'files_missing': sorted(set(self.added_lines) - set(files)),
+            'added_executable_lines': total_executable,
+            'added_covered_lines': total_covered,
+            'coverage_percent': round(total_covered / total_executable * 100, 2) if total_executable else None,
+            'files': files,
+            'components': dict(components),
+        }
+
+def compress_ranges(lines: List[int]) -> List[str]:
+    """Collapse sorted line numbers into 'start-end' ranges"""
+    ranges = []
+    start = prev = None
+    for line in lines:
+        if start is None:
+            start = prev = line
+        elif line == prev + 1:
+            prev = line
+        else:
+            ranges.append(f"{start}-{prev}" if start != prev else str(start))
+            start = prev = line
+    if start is not None:
+        ranges.append(f"{start}-{prev}" if start != prev else str(start))
+    return ranges
+
+def ingest_coverage(filepath: str, added_lines: Dict[str, Set[int]],
+                    component_of: Callable[[str], str]) -> Dict[str, Any]:
+    """Analyze a coverage export against the PR's added lines"""
+    ingestor = CoverageIngestor(added_lines)
+    export_format = ingestor.ingest(filepath)
+    summary = ingestor.summarize(component_of)
+    summary['format'] = export_format
+    return summary
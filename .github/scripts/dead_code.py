@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Dead Code Analysis for PR Assessment
+
+Keeps a declaration/reference index of every Swift file in the app and
+widget targets. The index is cached per git blob SHA in
+`.pr-analysis-cache/symbol-index.json`, so a run only re-indexes the files
+whose content changed since the cache was written. A type, function or
+property is dead when nothing in a target that compiles it names it outside
+its own declaration. The PR's changed files are indexed at the base ref
+as well, and the two dead sets are compared to show the dead code the PR
+creates and the dead code it removes.
+"""
+
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from blob_cache import BlobCache, index_sources, tracked_blobs
+from pbxproj import expected_target, load_index
+from swift_index import SwiftIndex, tracked_swift_files
+
+INDEX_PATH = '.pr-analysis-cache/symbol-index.json'
+
+# Bump when the cached entry layout changes
+INDEX_VERSION = 1
+
+# Targets whose code ships in the app binary
+TARGETS = ('SoundScape', 'SoundScapeWidgetExtension')
+
+# Members the frameworks call by name through protocol conformances
+ENTRY_POINT_MEMBERS = {
+    'body', 'init', 'deinit', 'subscript', 'id', 'hash', 'encode', 'description', 'debugDescription', 'rawValue',
+    'allCases', 'wrappedValue', 'projectedValue', 'makeUIView', 'updateUIView', 'makeUIViewController',
+    'updateUIViewController', 'makeCoordinator', 'dismantleUIView', 'makeBody', 'path', 'placeholder',
+    'getSnapshot', 'getTimeline', 'snapshot', 'timeline', 'recommendations', 'perform', 'title',
+    'parameterSummary', 'openAppWhenRun', 'appShortcuts', 'shortcutTileColor', 'defaultQuery',
+    'typeDisplayRepresentation', 'displayRepresentation', 'caseDisplayRepresentations', 'entities',
+    'suggestedEntities', 'previews', 'CodingKeys', 'main', 'currentValue', 'previewValue', 'date',
+    'sizeThatFits', 'placeSubviews', 'makeCache', 'updateCache', 'animatableData', 'reduce', 'defaultValue',
+}
+
+# Types the system instantiates itself
+ENTRY_POINT_TYPES = {
+    'App', 'Widget', 'WidgetBundle', 'ControlWidget', 'AppIntent', 'AudioPlaybackIntent', 'AppShortcutsProvider',
+    'PreviewProvider', 'XCTestCase', 'AppEntity', 'AppEnum', 'EntityQuery', 'TimelineProvider',
+    'AppIntentTimelineProvider', 'ControlValueProvider',
+}
+
+ENTRY_POINT_ATTRIBUTES = {'@main', '@objc', '@IBAction', '@IBOutlet', '@NSManaged', '@UIApplicationMain'}
+
+CODABLE = {'Codable', 'Decodable', 'Encodable'}
+
+IDENTIFIER = re.compile(r'^[A-Za-z_]\w*$')
+
+def _span(index: SwiftIndex, declaration) -> int:
+    """Last line of a declaration, its closing brace for declarations with a body"""
+    return index.line(declaration.end) if declaration.end is not None else declaration.line
+
+def _exempt(declaration) -> bool:
+    """Whether the frameworks reach the declaration without naming it in the project"""
+    if declaration.name in ENTRY_POINT_MEMBERS or not IDENTIFIER.match(declaration.name):
+        return True
+    if ENTRY_POINT_ATTRIBUTES.intersection(declaration.attributes) or 'override' in declaration.modifiers:
+        return True
+    if declaration.kind == 'type' and ENTRY_POINT_TYPES.intersection(declaration.inherits):
+        return True
+    owner = declaration.parent
+    if owner is None or owner.kind != 'type':
+        return False
+    if ENTRY_POINT_TYPES.intersection(owner.inherits):
+        return True
+    if declaration.kind == 'function' and any(p.endswith(('Delegate', 'DataSource')) for p in owner.inherits):
+        # Delegate callbacks are called by the framework
+        return True
+    # Stored properties of Codable types are read by the synthesized coding
+    return declaration.kind == 'property' and declaration.end is None and bool(CODABLE.intersection(owner.inherits))
+
+def index_source(content: str) -> Dict[str, Any]:
+    """Declarations, references and protocol requirements in one Swift source"""
+    index = SwiftIndex(content)
+    declarations, protocol_members = [], set()
+    for declaration in index.declarations:
+        parent = declaration.parent
+        if declaration.keyword == 'extension':
+            continue
+        if parent is not None and parent.kind not in ('type', 'file'):
+            continue
+        if parent is not None and parent.keyword == 'protocol':
+            protocol_members.add(declaration.name)
+            continue
+        declarations.append({
+            'name': declaration.name.split('.')[-1],
+            'kind': declaration.kind,
+            'keyword': declaration.keyword,
+            'container': parent.name if parent is not None and parent.kind == 'type' else '',
+            'line': declaration.line,
+            'end_line': _span(index, declaration),
+            'exempt': _exempt(declaration),
+        })
+
+    references: Dict[str, List[int]] = {}
+    for position, token in enumerate(index.tokens):
+        if token.kind not in ('identifier', 'keyword') or not IDENTIFIER.match(token.text):
+            continue
+        if position and index.tokens[position - 1].text == 'extension':
+            # Extending a type does not use it
+            continue
+        references.setdefault(token.text, []).append(index.line(position))
+    return {'declarations': declarations, 'references': references, 'protocol_members': sorted(protocol_members)}
+
+def target_membership(paths: List[str], ref: Optional[str] = None) -> Dict[str, Set[str]]:
+    """Shipping targets that compile each file at ref, from the project's Sources phases or the path for new files"""
+    project = load_index(ref) or {'files': {}, 'targets': {}}
+    members: Dict[str, Set[str]] = {}
+    for target in TARGETS:
+        for _, reference in project['targets'].get(target, {}).get('Sources', []):
+            path = project['files'].get(reference)
+            if path:
+                members.setdefault(os.path.join('SoundScape', path), set()).add(target)
+    return {path: members.get(path) or ({expected_target(path)} & set(TARGETS)) for path in paths}
+
+def dead_symbols(entries: Dict[str, Dict[str, Any]], targets: Dict[str, Set[str]]) -> Dict[str, Dict[str, Any]]:
+    """Declarations nothing in their targets names outside the declaration, keyed path:container.name"""
+    protocol_members = {name for entry in entries.values() for name in entry['protocol_members']}
+    references: Dict[str, List[Tuple[str, int]]] = {}
+    spans: Dict[str, List[Tuple[str, int, int]]] = {}
+    for path, entry in entries.items():
+        for name, lines in entry['references'].items():
+            references.setdefault(name, []).extend((path, line) for line in lines)
+        for declaration in entry['declarations']:
+            spans.setdefault(declaration['name'], []).append((path, declaration['line'], declaration['end_line']))
+
+    dead = {}
+    for path, entry in entries.items():
+        for declaration in entry['declarations']:
+            name = declaration['name']
+            if declaration['exempt'] or name in protocol_members:
+                continue
+            used = any(
+                targets.get(ref_path, set()) & targets[path]
+                and not any(ref_path == p and start <= line <= end for p, start, end in spans[name])
+                for ref_path, line in references.get(name, [])
+            )
+            if not used:
+                key = f"{path}:{declaration['container'] + '.' if declaration['container'] else ''}{name}"
+                dead[key] = {'path': path, **declaration, 'targets': sorted(targets[path])}
+    return dead
+
+def analyze_dead_code(files: List[str], base_ref: Optional[str] = None,
+                      index_path: str = INDEX_PATH,
+                      admit: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
+    """Unreferenced symbols across the shipping targets, and those the PR creates or removes"""
+    cache = BlobCache(index_path, INDEX_VERSION, 'symbol index')
+    changed = {path for path in files if path.endswith('.swift')}
+    blobs = tracked_blobs()
+    # Deleted files stay in, with their base targets, so their base references count
+    paths = sorted(set(blobs or tracked_swift_files()) | changed)
+    targets = {path: members for path, members in target_membership(paths).items() if members}
+    deleted = [path for path in changed if not os.path.exists(path)]
+    if base_ref and deleted:
+        targets.update((path, members) for path, members in target_membership(deleted, base_ref).items() if members)
+    head_entries, base_entries = index_sources(cache, index_source, list(targets), changed, blobs, base_ref, admit)
+
+    head = dead_symbols(head_entries, targets)
+    base = dead_symbols(base_entries, targets) if base_ref else head
+    created = [head[key] for key in sorted(set(head) - set(base))]
+    removed = [base[key] for key in sorted(set(base) - set(head))]
+
+    by_target: Dict[str, Dict[str, int]] = {}
+    for symbol in head.values():
+        for target in symbol['targets']:
+            totals = by_target.setdefault(target, {'symbols': 0, 'lines': 0})
+            totals['symbols'] += 1
+            totals['lines'] += symbol['end_line'] - symbol['line'] + 1
+
+    issues = [
+        f"{s['path']}:{s['line']}: {s['keyword']} `{s['name']}`"
+        f"{' in ' + s['container'] if s['container'] else ''} is never referenced"
+        for s in created
+    ]
+    return {
+        'dead': len(head),
+        'dead_lines': sum(s['end_line'] - s['line'] + 1 for s in head.values()),
+        'by_target': by_target,
+        'created': created,
+        'removed': removed,
+        'files': len(head_entries),
+        'reindexed': cache.built,
+        'symbols': sorted(head.values(), key=lambda s: -(s['end_line'] - s['line']))[:50],
+        'issues': issues,
+    }
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Scalar DSP Loop Analysis for PR Assessment
+
+Audio taps, render blocks and the sleep-sound detector walk sample buffers
+one element at a time. Most of those loops are a sum, an RMS, a peak or an
+element-wise gain, and Accelerate has a vectorized routine for each of them.
+This analyzer finds `for` loops that index audio buffers, either channel
+data and buffer pointers or `[Float]` sample arrays. It classifies each
+statement in the loop body, then flags the loops whose whole body maps onto
+`vDSP` or `vForce` calls and estimates how many scalar operations they run per
+buffer. The count of such loops across the codebase is kept in a history file
+in the analysis cache. Pushes to the default branch append to it and pull
+requests only read it, so the report shows the trend across merged commits.
+"""
+
+import json
+import os
+import re
+import subprocess
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import swift_tokens
+from frame_cost import RANGE, evaluate
+from swift_index import Scope, SwiftIndex, index_file, tracked_swift_files
+
+HISTORY_PATH = '.pr-analysis-cache/dsp-loops-history.json'
+MAX_HISTORY = 200
+
+# Frames per buffer when the file does not set a tap buffer size
+DEFAULT_BUFFER_FRAMES = 1024
+
+# Expressions that produce raw sample storage
+BUFFER_SOURCES = {
+    'floatChannelData', 'int16ChannelData', 'int32ChannelData', 'mData', 'assumingMemoryBound',
+    'UnsafeMutableBufferPointer', 'UnsafeBufferPointer', 'UnsafeMutablePointer', 'UnsafePointer',
+    'UnsafeMutableAudioBufferListPointer',
+}
+SAMPLE_TYPES = {'Float', 'Double', 'Float32', 'Float64', 'Int16', 'Int32'}
+
+VDSP_EQUIVALENTS = {
+    'sum': 'vDSP.sum',
+    'sum_of_squares': 'vDSP.sumOfSquares / vDSP.rootMeanSquare',
+    'sum_of_magnitudes': 'vDSP.sumOfMagnitudes',
+    'peak': 'vDSP.maximumMagnitude',
+    'maximum': 'vDSP.maximum',
+    'minimum': 'vDSP.minimum',
+    'scale': 'vDSP.multiply(_:_:) with a scalar',
+    'multiply': 'vDSP.multiply',
+    'add': 'vDSP.add',
+    'subtract': 'vDSP.subtract',
+    'multiply_add': 'vDSP.add(multiplication:_:)',
+    'fill': 'vDSP.fill',
+    'clip': 'vDSP.clip',
+    'absolute': 'vDSP.absolute',
+    'convert': 'vDSP.convertElements',
+    'transcendental': 'vForce',
+}
+
+ABS = r'(?:abs|fabs|fabsf)'
+# Statements after normalization: X reads the buffer at the loop index, Y writes it,
+# acc is a variable the loop assigns and k is a loop-invariant value
+STATEMENTS = [
+    (re.compile(r'^acc \+= X$'), 'sum'),
+    (re.compile(r'^acc \+= X \* X$'), 'sum_of_squares'),
+    (re.compile(rf'^acc \+= {ABS} \( X \)$'), 'sum_of_magnitudes'),
+    (re.compile(rf'^acc = max \( (acc , {ABS} \( X \)|{ABS} \( X \) , acc) \)$'), 'peak'),
+    (re.compile(rf'^if {ABS} \( X \) > acc \{{ acc = {ABS} \( X \) \}}$'), 'peak'),
+    (re.compile(r'^acc = max \( (acc , X|X , acc) \)$'), 'maximum'),
+    (re.compile(r'^if X > acc \{ acc = X \}$'), 'maximum'),
+    (re.compile(r'^acc = min \( (acc , X|X , acc) \)$'), 'minimum'),
+    (re.compile(r'^if X < acc \{ acc = X \}$'), 'minimum'),
+    (re.compile(r'^Y \*= k$'), 'scale'),
+    (re.compile(r'^Y = (X \* k|k \* X|X / k)$'), 'scale'),
+    (re.compile(r'^Y = X \* X$'), 'multiply'),
+    (re.compile(r'^Y (= X \+|\+=) X$'), 'add'),
+    (re.compile(r'^Y (= X -|-=) X$'), 'subtract'),
+    (re.compile(r'^Y = (X \* k|k \* X) \+ X$|^Y \+= (X \* k|k \* X)$'), 'multiply_add'),
+    (re.compile(r'^Y = k$'), 'fill'),
+    (re.compile(r'^Y = (min \( max \( X , k \) , k \)|max \( min \( X , k \) , k \))$'), 'clip'),
+    (re.compile(rf'^Y = {ABS} \( X \)$'), 'absolute'),
+    (re.compile(r'^Y = (Float|Double|Int16|Int32) \( X \)( \* k| / k)?$'), 'convert'),
+    (re.compile(r'^Y = (sin|cos|tan|exp|log|sqrt|tanh|pow|sinf|cosf|expf|logf|sqrtf) \( X( , k)? \)$'),
+     'transcendental'),
+]
+
+OPERATORS = {'+', '-', '*', '/', '<', '>'}
+CONTINUATIONS = {'=', '+', '-', '*', '/', ',', '(', '[', '&', '|', '.'}
+
+def _text(index: SwiftIndex, position: int) -> str:
+    return index.tokens[position].text if 0 <= position < len(index.tokens) else ''
+
+def find_buffers(index: SwiftIndex) -> Set[str]:
+    """Names bound to sample storage: channel data, buffer pointers and `[Float]`-style arrays"""
+    buffers: Set[str] = set()
+    tokens = index.tokens
+    for position, token in enumerate(tokens):
+        # samples: [Float], let data: UnsafeMutablePointer<Float>
+        if token.kind == 'identifier' and _text(index, position + 1) == ':':
+            following = _text(index, position + 2)
+            if (following == '[' and _text(index, position + 3) in SAMPLE_TYPES
+                    and _text(index, position + 4) == ']') or following in BUFFER_SOURCES \
+                    or (following == 'ContiguousArray' and _text(index, position + 4) in SAMPLE_TYPES):
+                buffers.add(token.text)
+        # let left = buffer.floatChannelData![0], if let data = buffer.mData?.assumingMemoryBound(...)
+        if token.text in ('let', 'var') and tokens[position + 1].kind == 'identifier' \
+                and _text(index, position + 2) == '=':
+            end = position + 3
+            while end < len(tokens) and index.line(end) == index.line(position) and _text(index, end) not in (',', '{'):
+                end += 1
+            value = {t.text for t in tokens[position + 3:end]}
+            if value & BUFFER_SOURCES or (_text(index, position + 3) in buffers and _text(index, position + 4) == '['):
+                buffers.add(_text(index, position + 1))
+    return buffers
+
+def _for_header(index: SwiftIndex, loop: Scope) -> Optional[tuple]:
+    """(loop variables, token index of `in`) for a for-in loop"""
+    position = loop.start - 1
+    while position > 0 and not (_text(index, position) == 'for' and index.tokens[position].kind == 'keyword'):
+        position -= 1
+    names, p = [], position + 1
+    while p < loop.start and _text(index, p) != 'in':
+        if index.tokens[p].kind == 'identifier' and _text(index, p) != 'case':
+            names.append(_text(index, p))
+        p += 1
+    return (names, p) if p < loop.start else None
+
+def _sequence(index: SwiftIndex, loop: Scope, start: int) -> List[str]:
+    texts = [t.text for t in index.tokens[start + 1:loop.start]]
+    return texts[:texts.index('where')] if 'where' in texts else texts
+
+def buffer_frames(index: SwiftIndex) -> int:
+    """Frames per buffer: the tap's `bufferSize:` or an `AVAudioFrameCount(...)` literal"""
+    for position, token in enumerate(index.tokens):
+        if token.text == 'bufferSize' and _text(index, position + 1) == ':':
+            value = evaluate([_text(index, position + 2)])
+            if value:
+                return int(value)
+        if token.text == 'AVAudioFrameCount' and _text(index, position + 1) == '(':
+            value = evaluate([_text(index, position + 2)])
+            if value and _text(index, position + 3) == ')':
+                return int(value)
+    return DEFAULT_BUFFER_FRAMES
+
+def _iterations(index: SwiftIndex, loop: Scope, start: int, frames: int) -> int:
+    # The tokenizer reads `0..<3` as `0..` `<` `3`, so ranges are split in the source text
+    source = index.content[index.tokens[start + 1].start:index.tokens[loop.start].start]
+    bounds = RANGE.match(source)
+    if bounds:
+        lower, upper = (evaluate([t.text for t in swift_tokens.tokenize(side)]) for side in bounds.group(1, 3))
+        if lower is not None and upper is not None:
+            return max(0, int(upper - lower) + (bounds.group(2) == '...'))
+    return frames
+
+def _statements(index: SwiftIndex, loop: Scope) -> List[List[int]]:
+    """Token indexes of each statement in the loop body, with braced blocks kept whole"""
+    statements, current, depth = [], [], 0
+    for position in range(loop.start + 1, loop.end):
+        text = _text(index, position)
+        if current and depth == 0 and (text == ';' or (
+                index.line(position) != index.line(position - 1)
+                and _text(index, position - 1) not in CONTINUATIONS and text not in ('.', 'else'))):
+            statements.append(current)
+            current = []
+        if text == ';':
+            continue
+        depth += text in ('(', '[', '{')
+        depth -= text in (')', ']', '}')
+        current.append(position)
+    if current:
+        statements.append(current)
+    return statements
+
+def normalize(index: SwiftIndex, statement: List[int], variables: List[str], element: bool,
+              buffers: Set[str], assigned: Set[str]) -> str:
+    """Statement text with buffer accesses, accumulators and invariants replaced by X/Y, acc and k"""
+    out, p = [], 0
+    while p < len(statement):
+        position = statement[p]
+        text, kind = _text(index, position), index.tokens[position].kind
+        if text == 'self' and _text(index, position + 1) == '.':
+            p += 2
+            continue
+        if kind == 'identifier' and _text(index, position + 1) == '[' and _text(index, position + 2) in variables \
+                and _text(index, position + 3) == ']':
+            # Any array indexed by the loop variable, including output buffers
+            out.append('Y' if not out else 'X')
+            p += 4
+            continue
+        if element and text in variables:
+            out.append('X')
+        elif text in assigned:
+            out.append('acc')
+        elif kind == 'number' or (kind == 'identifier' and text not in variables and text not in buffers
+                                  and _text(index, position + 1) != '('):
+            # Loop-invariant value, including member chains such as Float.pi
+            while p + 2 < len(statement) and _text(index, statement[p + 1]) == '.':
+                p += 2
+            out.append('k')
+        else:
+            out.append(text)
+        p += 1
+    # Swift compound operators arrive as two tokens; products of invariants are invariant
+    normalized = re.sub(r'([+\-*/]) =', r'\1=', ' '.join(out))
+    while re.search(r'\bk [*/] k\b', normalized):
+        normalized = re.sub(r'\bk [*/] k\b', 'k', normalized, count=1)
+    return normalized
+
+def _assigned(index: SwiftIndex, statements: List[List[int]], buffers: Set[str]) -> Set[str]:
+    """Plain variables the loop body assigns"""
+    names = set()
+    for statement in statements:
+        for position in statement:
+            text = _text(index, position)
+            following = _text(index, position + 1)
+            if index.tokens[position].kind == 'identifier' and text not in buffers and (
+                    (following == '=' and _text(index, position + 2) != '=')
+                    or (following in ('+', '-', '*', '/') and _text(index, position + 2) == '=')):
+                names.add(text)
+    return names
+
+def analyze_loop(index: SwiftIndex, loop: Scope, buffers: Set[str], frames: int) -> Optional[Dict[str, Any]]:
+    """Operations of a for loop that walks a sample buffer, or None if it does not touch one"""
+    header = _for_header(index, loop)
+    if header is None:
+        return None
+    variables, in_position = header
+    sequence = _sequence(index, loop, in_position)
+    element = bool(sequence) and sequence[0] in buffers and (len(sequence) == 1 or sequence[1:3] == ['.', 'enumerated'])
+    if element and sequence[1:3] == ['.', 'enumerated'] and len(variables) == 2:
+        variables = variables[1:]
+    body = range(loop.start + 1, loop.end)
+    indexes_buffer = any(
+        _text(index, p) in buffers and _text(index, p + 1) == '[' and _text(index, p + 2) in variables
+        for p in body
+    )
+    if not element and not indexes_buffer:
+        return None
+
+    statements = _statements(index, loop)
+    assigned = _assigned(index, statements, buffers)
+    operations = []
+    for statement in statements:
+        text = normalize(index, statement, variables, element, buffers, assigned)
+        operations.append(next((name for pattern, name in STATEMENTS if pattern.match(text)), None))
+
+    per_iteration = sum(
+        1 for p in body
+        if _text(index, p) in OPERATORS or _text(index, p) == '[' or (
+            _text(index, p) == '(' and index.tokens[p - 1].kind == 'identifier')
+    )
+    iterations = _iterations(index, loop, in_position, frames)
+    recognized = [op for op in operations if op]
+    return {
+        'line': loop.line,
+        'function': index.function_at(loop.start),
+        'operations': sorted(set(recognized)),
+        'vectorizable': bool(operations) and len(recognized) == len(operations),
+        'suggestions': sorted({VDSP_EQUIVALENTS[op] for op in recognized}),
+        'iterations': iterations,
+        'ops_per_buffer': iterations * max(1, per_iteration),
+    }
+
+def analyze_index(index: SwiftIndex) -> List[Dict[str, Any]]:
+    """Buffer loops in one file"""
+    buffers = find_buffers(index)
+    if not buffers:
+        return []
+    frames = buffer_frames(index)
+    loops = []
+    for scope in index.scopes:
+        if scope.kind == 'control' and scope.keyword == 'for' and scope.end is not None:
+            loop = analyze_loop(index, scope, buffers, frames)
+            if loop:
+                loops.append(loop)
+    return loops
+
+def resolve_commit(ref: str) -> Optional[str]:
+    result = subprocess.run(['git', 'rev-parse', ref], capture_output=True, text=True)
+    return result.stdout.strip() if result.returncode == 0 else None
+
+def count_codebase(paths: List[str], admit: Optional[Callable[[str], bool]] = None) -> Dict[str, int]:
+    """Buffer loops and vectorizable ones across the given Swift files"""
+    counts = {'loops': 0, 'vectorizable': 0}
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        if admit and not admit(path):
+            continue
+        try:
+            loops = analyze_index(index_file(path))
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error scanning {path} for DSP loops: {e}")
+            continue
+        counts['loops'] += len(loops)
+        counts['vectorizable'] += sum(1 for loop in loops if loop['vectorizable'])
+    return counts
+
+def record_history(counts: Dict[str, int], commit: Optional[str], path: str = HISTORY_PATH) -> List[Dict[str, Any]]:
+    """Append this run's codebase counts to the history file, once per commit"""
+    history = []
+    if os.path.exists(path):
+        try:
+            with open(path, 'r') as f:
+                history = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: could not read DSP loop history: {e}")
+    if commit and not any(entry['commit'] == commit for entry in history):
+        history.append({'commit': commit, 'date': datetime.now(timezone.utc).isoformat(timespec='seconds'), **counts})
+        history = history[-MAX_HISTORY:]
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump(history, f, indent=2)
+        except OSError as e:
+            print(f"Warning: could not write DSP loop history: {e}")
+    return history
+
+def analyze_dsp_loops(files: List[str], added_lines: Dict[str, Set[int]], head_ref: Optional[str] = None,
+                      codebase_files: Optional[List[str]] = None, history_path: str = HISTORY_PATH,
+                      record: bool = False, admit: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
+    """Scalar buffer loops in changed Swift files, plus the codebase-wide count over time"""
+    results = {'findings': [], 'by_operation': {}, 'codebase': {}, 'history': [], 'issues': []}
+
+    for path in files:
+        if not path.endswith('.swift') or not os.path.exists(path):
+            continue
+        if admit and not admit(path):
+            continue
+        try:
+            loops = analyze_index(index_file(path))
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error scanning {path} for DSP loops: {e}")
+            continue
+
+        added = added_lines.get(path, set())
+        for loop in loops:
+            finding = {'path': path, **loop, 'new': loop['line'] in added}
+            results['findings'].append(finding)
+            for operation in loop['operations']:
+                results['by_operation'][operation] = results['by_operation'].get(operation, 0) + 1
+            if finding['new'] and loop['vectorizable']:
+                results['issues'].append(
+                    f"{path}:{loop['line']} in {loop['function']}: scalar {', '.join(loop['operations'])} loop runs "
+                    f"~{loop['ops_per_buffer']:,} operations per buffer; use {', '.join(loop['suggestions'])}"
+                )
+
+    codebase_files = tracked_swift_files() if codebase_files is None else codebase_files
+    results['codebase'] = count_codebase(codebase_files, admit)
+    # Only default-branch runs append; PR heads read the history without adding to it
+    commit = resolve_commit(head_ref) if record and head_ref else None
+    results['history'] = record_history(results['codebase'], commit, history_path)[-10:]
+
+    return results
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Changed File Classification for PR Assessment
+
+Classifies each changed path once, from its extension, `.gitattributes`
+linguist attributes, vendored directory names and a sniff of its first
+bytes, and routes it to the analyzers that apply. Generated, vendored and
+binary files are skipped by the code analyzers.
+"""
+
+import os
+import re
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from audio_assets import AUDIO_EXTENSIONS
+from image_assets import IMAGE_EXTENSIONS, VECTOR_EXTENSIONS
+
+EXTENSION_KINDS = {
+    '.swift': 'swift',
+    **{extension: 'audio' for extension in AUDIO_EXTENSIONS},
+    **{extension: 'image' for extension in IMAGE_EXTENSIONS + VECTOR_EXTENSIONS},
+    '.xcstrings': 'localization', '.strings': 'localization', '.stringsdict': 'localization',
+    '.pbxproj': 'project',
+    '.json': 'data', '.plist': 'data', '.entitlements': 'data', '.resolved': 'data', '.xcconfig': 'data',
+    '.md': 'docs', '.txt': 'docs',
+    '.yml': 'config', '.yaml': 'config', '.toml': 'config',
+    '.py': 'script', '.sh': 'script',
+}
+
+# Kinds that never contain text worth sniffing
+BINARY_KINDS = {'audio', 'image'}
+
+# Files whose content is written by tools rather than by hand
+GENERATED_NAMES = {'Package.resolved', 'project.pbxproj', 'contents.xcworkspacedata'}
+GENERATED_SUFFIXES = ('.generated.swift', '.pb.swift', '+CoreDataProperties.swift', '+CoreDataClass.swift')
+GENERATED_MARKERS = (b'@generated', b'autogenerated', b'auto-generated')
+# Phrases that also occur in handwritten comments, so they only count in the file's leading comment header
+GENERATED_HEADER_PHRASES = re.compile(rb'\bgenerated by\b|\bdo not edit\b')
+COMMENT_PREFIXES = (b'//', b'/*', b'*', b'#')
+
+VENDORED_DIRS = {'Pods', 'Carthage', 'vendor', 'Vendor', 'SourcePackages', '.build', 'DerivedData', 'node_modules'}
+
+SNIFF_BYTES = 1024
+
+# Analyzers each kind is routed to; deleted files only reach the deletion-aware ones.
+# 'symbols' feeds the whole-project Swift indexes, which re-read changed files at the base ref
+ROUTES = {
+    'swift': ['code', 'project', 'symbols'],
+    'audio': ['audio'],
+    'image': ['images'],
+    'localization': ['localization'],
+    'project': ['project'],
+}
+DELETION_AWARE = {'audio', 'images', 'localization', 'project', 'symbols'}
+
+def glob_to_regex(pattern: str) -> re.Pattern:
+    """Translate a gitattributes pattern to a regex over repo-relative paths"""
+    anchored = '/' in pattern.rstrip('/')
+    pattern = pattern.strip('/')
+    parts = []
+    index = 0
+    while index < len(pattern):
+        if pattern.startswith('**/', index):
+            parts.append('(?:.*/)?')
+            index += 3
+        elif pattern.startswith('**', index):
+            parts.append('.*')
+            index += 2
+        elif pattern[index] == '*':
+            parts.append('[^/]*')
+            index += 1
+        elif pattern[index] == '?':
+            parts.append('[^/]')
+            index += 1
+        else:
+            parts.append(re.escape(pattern[index]))
+            index += 1
+    prefix = '' if anchored else '(?:.*/)?'
+    return re.compile(f"^{prefix}{''.join(parts)}(?:/.*)?$")
+
+class GitAttributes:
+    """Linguist attributes from a .gitattributes file (last match wins)"""
+
+    def __init__(self, filepath: str = '.gitattributes'):
+        self.rules: List[Tuple[re.Pattern, Dict[str, bool]]] = []
+        if not os.path.exists(filepath):
+            return
+
+        with open(filepath, 'r', encoding='utf-8') as f:
+            for line in f:
+                fields = line.split()
+                if not fields or fields[0].startswith('#'):
+                    continue
+                attributes = {}
+                for field in fields[1:]:
+                    name, _, value = field.lstrip('-!').partition('=')
+                    if name in ('linguist-generated', 'linguist-vendored'):
+                        attributes[name] = not field.startswith(('-', '!')) and value.lower() not in ('false', '0')
+                if attributes:
+                    self.rules.append((glob_to_regex(fields[0]), attributes))
+
+    def lookup(self, path: str, attribute: str) -> Optional[bool]:
+        result = None
+        for regex, attributes in self.rules:
+            if attribute in attributes and regex.match(path):
+                result = attributes[attribute]
+        return result
+
+def sniff(filepath: str) -> Tuple[bool, bool]:
+    """(is_binary, has_generated_marker) from the first bytes of a file"""
+    try:
+        with open(filepath, 'rb') as f:
+            head = f.read(SNIFF_BYTES)
+    except OSError:
+        return False, False
+    if b'\x00' in head:
+        return True, False
+    lowered = head.lower()
+    if any(marker in lowered for marker in GENERATED_MARKERS):
+        return False, True
+    header = []
+    for line in lowered.splitlines():
+        stripped = line.strip()
+        if stripped and not stripped.startswith(COMMENT_PREFIXES):
+            break
+        header.append(stripped)
+    return False, bool(GENERATED_HEADER_PHRASES.search(b'\n'.join(header)))
+
+class FileClassifier:
+    """Classifies changed paths and routes them to analyzers"""
+
+    def __init__(self, attributes: Optional[GitAttributes] = None):
+        self.attributes = attributes or GitAttributes()
+
+    def classify(self, path: str) -> Dict[str, Any]:
+        name = os.path.basename(path)
+        extension = os.path.splitext(name)[1].lower()
+        kind = EXTENSION_KINDS.get(extension, 'other')
+        exists = os.path.isfile(path)
+
+        generated = self.attributes.lookup(path, 'linguist-generated')
+        # An explicit attribute, including an opt-out, overrides the header markers
+        explicit = generated is not None
+        vendored = self.attributes.lookup(path, 'linguist-vendored')
+        if vendored is None:
+            vendored = any(part in VENDORED_DIRS for part in path.split('/')[:-1])
+        if generated is None:
+            generated = name in GENERATED_NAMES or name.endswith(GENERATED_SUFFIXES)
+
+        binary = kind in BINARY_KINDS
+        if exists and kind not in BINARY_KINDS and not generated:
+            binary, marked = sniff(path)
+            if not explicit:
+                generated = marked and kind in ('swift', 'other')
+
+        # Files inside asset catalog sets (Contents.json included) belong to the image check
+        if '.imageset/' in path or '.appiconset/' in path:
+            kind = 'image'
+
+        analyzers = list(ROUTES.get(kind, []))
+        if kind == 'swift' and (generated or vendored or binary):
+            analyzers.remove('code')
+        if not exists:
+            analyzers = [a for a in analyzers if a in DELETION_AWARE]
+
+        return {
+            'kind': kind,
+            'generated': bool(generated),
+            'vendored': bool(vendored),
+            'binary': binary,
+            'deleted': not exists,
+            'analyzers': analyzers,
+        }
+
+def route_files(changed_files: List[Dict[str, Any]],
+                classifier: Optional[FileClassifier] = None) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, Any]]:
+    """Group changed files by analyzer, with a summary of excluded files"""
+    classifier = classifier or FileClassifier()
+    routes = defaultdict(list)
+    kinds = defaultdict(int)
+    excluded = []
+
+    for file_info in changed_files:
+        classification = classifier.classify(file_info['path'])
+        kinds[classification['kind']] += 1
+        for analyzer in classification['analyzers']:
+            routes[analyzer].append(file_info)
+        if classification['generated'] or classification['vendored']:
+            reason = 'generated' if classification['generated'] else 'vendored'
+            excluded.append({'path': file_info['path'], 'reason': reason})
+
+    summary = {
+        'by_kind': dict(kinds),
+        'excluded_from_code_analysis': excluded,
+        'routed': {analyzer: len(files) for analyzer, files in routes.items()},
+    }
+    return routes, summary
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Per-Frame Render Cost Analysis for PR Assessment
+
+Finds the closures SwiftUI runs on every frame (`TimelineView` content, and
+the `Canvas` renderers inside it), reads their frame rate from the schedule
+and flags work that repeats every frame: allocation, `Path` rebuilding,
+array growth and trigonometry in loops. Calls to the view's own functions
+and computed properties are followed. Each closure gets an estimated
+operation count per second, compared against the base revision, so a PR
+that makes the frame heavier is caught before it drains the battery during
+overnight playback.
+"""
+
+import math
+import os
+import re
+import subprocess
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import swift_tokens
+from swift_index import Scope, SwiftIndex, index_file
+from swift_tokens import Token
+
+# Frame rate of `.animation` without a minimum interval
+DISPLAY_FPS = 60
+
+# Size in points assumed for `size.width` / `size.height` in loop bounds
+VIEW_EXTENT = {'width': 400, 'height': 200}
+
+# Iterations assumed for loops whose bounds cannot be read statically
+DEFAULT_ITERATIONS = 32
+
+# Relative cost of one occurrence, in operations
+OPERATION_COSTS = {
+    'allocation': 20,
+    'path': 10,
+    'array_growth': 10,
+    'trigonometry': 4,
+    'path_element': 2,
+}
+
+CATEGORIES = {
+    'allocation': 'Allocation',
+    'path': 'Path rebuilding',
+    'array_growth': 'Array growth',
+    'trigonometry': 'Trigonometry in a loop',
+}
+
+# Operations per second a single per-frame closure may spend
+FRAME_OPS_BUDGET = 100_000
+
+# A per-frame closure is heavier when its cost grows by more than this
+GROWTH_TOLERANCE = 0.10
+
+# How deep calls to the view's own functions are followed
+MAX_CALL_DEPTH = 3
+
+TRIG_FUNCTIONS = {'sin', 'cos', 'tan', 'asin', 'acos', 'atan', 'atan2', 'sinh', 'cosh', 'tanh',
+                  'sqrt', 'pow', 'exp', 'log', 'log2', 'log10', 'fmod', 'hypot'}
+ITERATING_CALLEES = {'map', 'compactMap', 'flatMap', 'filter', 'forEach', 'reduce', 'contains', 'first',
+                     'allSatisfy', 'sorted', 'min', 'max'}
+ALLOCATING_TYPES = {'Array', 'ContiguousArray', 'Dictionary', 'Set', 'String', 'Data', 'AttributedString',
+                    'NSAttributedString', 'UIImage', 'UIBezierPath'}
+ALLOCATING_METHODS = {'map', 'compactMap', 'flatMap', 'filter', 'sorted', 'joined', 'components', 'split',
+                      'shuffled'}
+GROWTH_METHODS = {'append', 'insert', 'reserveCapacity'}
+PATH_ELEMENTS = {'move', 'addLine', 'addLines', 'addCurve', 'addQuadCurve', 'addArc', 'addEllipse', 'addRect',
+                 'addRoundedRect', 'addPath', 'closeSubpath'}
+CONVERSIONS = {'Int', 'Double', 'Float', 'CGFloat', 'TimeInterval'}
+
+# Closures that run later rather than as part of the frame
+DEFERRED_CALLEES = {'scheduledTimer', 'Timer', 'asyncAfter', 'async', 'sink', 'onReceive', 'onAppear',
+                    'onDisappear', 'onChange', 'task', 'publish'}
+
+RANGE = re.compile(r'^\s*\(?\s*(.+?)\s*(\.\.<|\.\.\.)\s*(.+?)\s*\)?\s*$', re.S)
+
+class _Expression:
+    """Evaluates simple numeric Swift expressions: literals, + - * /, conversions and view size"""
+
+    def __init__(self, tokens: List[str]):
+        self.tokens = tokens
+        self.position = 0
+
+    def value(self) -> Optional[float]:
+        try:
+            result = self._sum()
+        except (ValueError, ZeroDivisionError, IndexError):
+            return None
+        return result if self.position == len(self.tokens) else None
+
+    def _peek(self) -> str:
+        return self.tokens[self.position] if self.position < len(self.tokens) else ''
+
+    def _take(self) -> str:
+        self.position += 1
+        return self.tokens[self.position - 1]
+
+    def _sum(self) -> float:
+        result = self._product()
+        while self._peek() in ('+', '-'):
+            result = result + self._product() if self._take() == '+' else result - self._product()
+        return result
+
+    def _product(self) -> float:
+        result = self._factor()
+        while self._peek() in ('*', '/'):
+            result = result * self._factor() if self._take() == '*' else result / self._factor()
+        return result
+
+    def _factor(self) -> float:
+        text = self._take()
+        if text == '-':
+            return -self._factor()
+        if text == '(' or (text in CONVERSIONS and self._peek() == '('):
+            if text != '(':
+                self._take()
+            result = self._sum()
+            if self._take() != ')':
+                raise ValueError(text)
+            return result
+        if text[:1].isdigit():
+            return float(text.replace('_', ''))
+        name = [text]
+        while self._peek() == '.':
+            self._take()
+            name.append(self._take())
+        if name[-1] == 'pi':
+            return math.pi
+        if len(name) == 2 and name[0] == 'size' and name[1] in VIEW_EXTENT:
+            return float(VIEW_EXTENT[name[1]])
+        raise ValueError(text)
+
+def evaluate(texts: List[str]) -> Optional[float]:
+    return _Expression(texts).value() if texts else None
+
+def _split_arguments(texts: List[str]) -> Dict[str, List[str]]:
+    """Labelled arguments of a call's token texts, without the outer parentheses"""
+    arguments, label, current, depth = {}, '', [], 0
+    for position, text in enumerate(texts):
+        if text in ('(', '['):
+            depth += 1
+        elif text in (')', ']'):
+            depth -= 1
+        if depth == 0 and text == ',':
+            arguments[label] = current
+            label, current = '', []
+        elif depth == 0 and not current and position + 1 < len(texts) and texts[position + 1] == ':':
+            label = text
+        elif not (depth == 0 and text == ':' and not current and label):
+            current.append(text)
+    arguments[label] = current
+    return arguments
+
+def frame_rate(index: SwiftIndex, closure: Scope) -> Optional[float]:
+    """Frames per second of a TimelineView schedule, or None if it is not periodic"""
+    close = closure.start - 1
+    open_paren = index.call_open(close)
+    if open_paren is None:
+        return DISPLAY_FPS
+    texts = [t.text for t in index.tokens[open_paren + 1:close]]
+    if 'explicit' in texts:
+        return None
+    if 'everyMinute' in texts:
+        return 1 / 60
+    for schedule, label in (('animation', 'minimumInterval'), ('periodic', 'by')):
+        if schedule not in texts:
+            continue
+        start = texts.index(schedule) + 1
+        if start < len(texts) and texts[start] == '(':
+            depth, end = 0, start
+            for end in range(start, len(texts)):
+                depth += texts[end] == '('
+                depth -= texts[end] == ')'
+                if depth == 0:
+                    break
+            interval = evaluate(_split_arguments(texts[start + 1:end]).get(label, []))
+            if interval and interval > 0:
+                return 1 / interval
+        return DISPLAY_FPS
+    return DISPLAY_FPS
+
+def loop_iterations(index: SwiftIndex, scope: Scope) -> int:
+    """Estimated iterations of a for-in loop"""
+    tokens = index.tokens
+    position, depth = scope.start - 1, 0
+    while position > 0:
+        text = tokens[position].text
+        depth += text in (')', ']')
+        depth -= text in ('(', '[')
+        if depth == 0 and text == 'in' and tokens[position].kind == 'keyword':
+            break
+        position -= 1
+    texts = [t.text for t in tokens[position + 1:scope.start]]
+    if 'where' in texts:
+        texts = texts[:texts.index('where')]
+    while len(texts) > 2 and texts[0] == '(' and texts[-1] == ')':
+        texts = texts[1:-1]
+
+    if texts[:2] == ['stride', '(']:
+        arguments = _split_arguments(texts[2:-1])
+        start, step = evaluate(arguments.get('from', [])), evaluate(arguments.get('by', []))
+        end = evaluate(arguments.get('through', arguments.get('to', [])))
+        if None not in (start, end, step) and step:
+            return max(0, int((end - start) / step) + ('through' in arguments))
+        return DEFAULT_ITERATIONS
+    # The tokenizer reads `0..<3` as `0..` `<` `3`, so ranges are split in the source text
+    source = index.content[tokens[position + 1].start:tokens[scope.start].start]
+    bounds = RANGE.match(source)
+    if bounds:
+        lower, upper = (evaluate([t.text for t in swift_tokens.tokenize(side)]) for side in bounds.group(1, 3))
+        if lower is not None and upper is not None:
+            return max(0, int(upper - lower) + (bounds.group(2) == '...'))
+    return DEFAULT_ITERATIONS
+
+def _multiplier(index: SwiftIndex, scope: Scope, root: Scope, memo: Dict[int, int]) -> int:
+    """Iterations per frame of the code in scope, relative to root"""
+    if scope is root or scope is None:
+        return 1
+    if id(scope) in memo:
+        return memo[id(scope)]
+    own = 1
+    if scope.kind == 'control' and scope.keyword == 'for':
+        own = loop_iterations(index, scope)
+    elif scope.kind == 'control' and scope.keyword in ('while', 'repeat'):
+        own = DEFAULT_ITERATIONS
+    elif scope.kind == 'closure' and scope.callee in ITERATING_CALLEES:
+        own = DEFAULT_ITERATIONS
+    elif scope.kind == 'closure' and scope.callee in DEFERRED_CALLEES:
+        own = 0
+    memo[id(scope)] = own * _multiplier(index, scope.parent, root, memo)
+    return memo[id(scope)]
+
+def classify_token(index: SwiftIndex, position: int) -> Optional[tuple]:
+    """(category, detail) of per-frame work starting at the token"""
+    tokens = index.tokens
+    token = tokens[position]
+    text = token.text
+
+    def at(offset: int) -> str:
+        return tokens[position + offset].text if 0 <= position + offset < len(tokens) else ''
+
+    if token.kind == 'string':
+        return ('allocation', 'string interpolation builds a String') if '\\(' in text else None
+    if text == '[':
+        if at(-1) not in ('(', ':', '=', ',', 'return') or at(1) in (']', ':'):
+            return None
+        close = swift_tokens.matching_close(tokens, position)
+        inner = tokens[position + 1:close]
+        if inner[0].text[:1].isupper() and all(t.kind == 'identifier' or t.text in ('.', ':') for t in inner):
+            # A type, as in `[CGPoint]()` or `let points: [CGPoint]`
+            return ('allocation', 'empty collection initializer allocates') if at(close - position + 1) == '(' else None
+        return 'allocation', 'array literal allocates'
+    if token.kind != 'identifier':
+        return None
+    calls = at(1) in ('(', '{')
+    if at(-1) == '.':
+        if text in PATH_ELEMENTS and at(1) == '(':
+            return 'path_element', f".{text}()"
+        if text in GROWTH_METHODS and at(1) == '(':
+            return 'array_growth', f".{text}()"
+        if text in ALLOCATING_METHODS and calls:
+            return 'allocation', f".{text}() builds a new collection"
+        return None
+    if text == 'Path' and calls:
+        return 'path', 'Path rebuilt per frame'
+    if text == 'Task' and (calls or at(1) == '.'):
+        return 'allocation', 'Task created per frame'
+    if text in ALLOCATING_TYPES and calls:
+        return 'allocation', f"{text}() allocates"
+    if text in TRIG_FUNCTIONS and at(1) == '(':
+        return 'trigonometry', f"{text}()"
+    return None
+
+def _members(index: SwiftIndex, owner: Optional[Scope]) -> Dict[str, Scope]:
+    """Functions and computed properties declared in owner, by name"""
+    if owner is None:
+        return {}
+    return {
+        d.name: d for d in index.declarations
+        if d.parent is owner and d.start is not None and d.kind in ('function', 'property') and d.name != 'body'
+    }
+
+def _member_use(tokens: List[Token], position: int, members: Dict[str, Scope]) -> bool:
+    """Whether the token calls one of the view's functions or reads a computed property"""
+    token = tokens[position]
+    if token.kind != 'identifier' or token.text not in members:
+        return False
+    previous = tokens[position - 1].text if position else ''
+    following = tokens[position + 1].text if position + 1 < len(tokens) else ''
+    if previous == '.':
+        return position > 1 and tokens[position - 2].text == 'self'
+    # Declarations and argument labels that share the member's name
+    return previous not in ('func', 'let', 'var') and not (following == ':' and previous in ('(', ','))
+
+def scan_frame(index: SwiftIndex, start: int, end: int, root: Scope, members: Dict[str, Scope],
+               multiplier: int = 1, via: str = '', depth: int = 0, visited: Set[str] = None) -> List[Dict[str, Any]]:
+    """Every costed operation between start and end, with its iterations per frame"""
+    tokens = index.tokens
+    visited = visited or set()
+    memo: Dict[int, int] = {}
+    operations = []
+    position = start + 1
+    while position < end:
+        token = tokens[position]
+        iterations = multiplier * _multiplier(index, index.scope_at(position), root, memo)
+        hazard = classify_token(index, position) if iterations else None
+        if hazard:
+            operations.append({
+                'line': index.line(position),
+                'category': hazard[0],
+                'detail': hazard[1],
+                'iterations': iterations,
+                'operations': OPERATION_COSTS[hazard[0]] * iterations,
+                'via': via,
+            })
+        elif iterations and depth < MAX_CALL_DEPTH and token.text not in visited and _member_use(tokens, position, members):
+            member = members[token.text]
+            operations.extend(scan_frame(
+                index, member.start, member.end, member, members, iterations,
+                f"{via} → {token.text}" if via else token.text, depth + 1, visited | {token.text}
+            ))
+        position += 1
+    return operations
+
+def analyze_index(index: SwiftIndex) -> List[Dict[str, Any]]:
+    """Per-frame closures in a file, with their frame rate and costed operations"""
+    contexts = []
+    ordinals: Dict[str, int] = {}
+    for scope in index.scopes:
+        if scope.kind != 'closure' or scope.callee != 'TimelineView':
+            continue
+        # Nested timelines are costed with their outer one
+        if any(s.kind == 'closure' and s.callee == 'TimelineView' for s in scope.parent.ancestors()):
+            continue
+        fps = frame_rate(index, scope)
+        if fps is None:
+            continue
+        function = index.function_at(scope.start)
+        ordinals[function] = ordinals.get(function, 0) + 1
+        operations = scan_frame(index, scope.start, scope.end, scope, _members(index, scope.enclosing_type()))
+        per_frame = sum(op['operations'] for op in operations)
+        contexts.append({
+            'key': f"{function}#{ordinals[function]}",
+            'line': scope.line,
+            'function': function,
+            'fps': round(fps, 2),
+            'ops_per_frame': per_frame,
+            'ops_per_second': round(per_frame * fps),
+            'operations': operations,
+        })
+    return contexts
+
+def read_revision(ref: str, path: str) -> Optional[str]:
+    result = subprocess.run(['git', 'show', f"{ref}:{path}"], capture_output=True, text=True)
+    return result.stdout if result.returncode == 0 else None
+
+def analyze_frame_cost(files: List[str], added_lines: Dict[str, Set[int]], base_ref: Optional[str] = None,
+                       budget: int = FRAME_OPS_BUDGET, admit: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
+    """Per-frame closures in changed Swift files and how much heavier the PR makes them"""
+    results = {'contexts': [], 'findings': [], 'by_category': {}, 'issues': []}
+
+    for path in files:
+        if not path.endswith('.swift') or not os.path.exists(path):
+            continue
+        if admit and not admit(path):
+            continue
+        try:
+            contexts = analyze_index(index_file(path))
+            base_content = read_revision(base_ref, path) if base_ref and contexts else None
+            base = {c['key']: c for c in analyze_index(SwiftIndex(base_content))} if base_content else {}
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error scanning {path} for per-frame work: {e}")
+            continue
+
+        added = added_lines.get(path, set())
+        for context in contexts:
+            base_context = base.get(context['key'])
+            base_ops = base_context['ops_per_second'] if base_context else None
+            new_findings = 0
+            for operation in context.pop('operations'):
+                if operation['category'] == 'path_element':
+                    continue
+                if operation['category'] == 'trigonometry' and operation['iterations'] <= 1:
+                    continue
+                finding = {
+                    'path': path,
+                    **operation,
+                    'function': context['function'],
+                    'context_line': context['line'],
+                    'fps': context['fps'],
+                    'new': operation['line'] in added,
+                }
+                new_findings += finding['new']
+                results['findings'].append(finding)
+                results['by_category'][finding['category']] = results['by_category'].get(finding['category'], 0) + 1
+
+            context = {'path': path, **context, 'base_ops_per_second': base_ops}
+            results['contexts'].append(context)
+            head_ops = context['ops_per_second']
+            where = f"{path}:{context['line']} in {context['function']} ({context['fps']:g} fps)"
+            if base_ops is not None and head_ops > base_ops * (1 + GROWTH_TOLERANCE) and head_ops - base_ops >= 100:
+                results['issues'].append(
+                    f"{where}: per-frame work grows from {base_ops:,} to {head_ops:,} operations/s"
+                    + (f" (new per-frame findings: {new_findings})" if new_findings else '')
+                )
+            elif base_ops is None and head_ops > budget:
+                results['issues'].append(
+                    f"{where}: new per-frame closure does {head_ops:,} operations/s, over the {budget:,} budget"
+                )
+
+    return results
@@ -108,6 +108,17 @@ class ReportGenerator:
             ]
         )
         
+        file_classes = metrics.get('file_classes', {})
+        if file_classes.get('by_kind'):
+            kinds = ', '.join(f"{kind}: {count}" for kind, count in sorted(file_classes['by_kind'].items()))
+            self.add_line(f"*Changed files by kind: {kinds}*")
+            self.add_line()
+        excluded = file_classes.get('excluded_from_code_analysis', [])
+        if excluded:
+            self.add_line(f"*{len(excluded)} generated or vendored files excluded from code analysis:* " +
+                          ', '.join(f"`{Path(f['path']).name}`" for f in excluded[:5]))
+            self.add_line()
+        
         # Complexity metrics
         complexity = metrics['complexity']
         self.add_line("### Complexity Analysis")
@@ -188,6 +199,38 @@ class ReportGenerator:
             ]
         )
         
+        line_coverage = testing.get('line_coverage')
+        if line_coverage:
+            self.add_line(f"**Line Coverage of Added Code** (`{line_coverage['format']}` export):")
+            percent = line_coverage['coverage_percent']
+            self.add_line(
+                f"{line_coverage['added_covered_lines']}/{line_coverage['added_executable_lines']} executable added lines covered"
+                + (f" ({percent:.1f}%)" if percent is not None else "")
+            )
+            self.add_line()
+            
+            components = line_coverage.get('components', {})
+            if components:
+                table_rows = []
+                for component, stats in sorted(components.items()):
+                    pct = stats['coverage_percent']
+                    table_rows.append([
+                        component,
+                        f"{stats['added_covered_lines']}/{stats['added_executable_lines']}",
+                        f"{pct:.1f}%" if pct is not None else "n/a"
+                    ])
+                self.add_table(["Component", "Covered Lines", "Coverage"], table_rows)
+            
+            uncovered_files = [
+                (path, stats) for path, stats in line_coverage.get('files', {}).items()
+                if stats['uncovered_ranges']
+            ]
+            if uncovered_files:
+                self.add_line("**⚠️ Uncovered Added Lines:**")
+                for path, stats in uncovered_files[:10]:
+                    self.add_line(f"- `{path}`: lines {', '.join(stats['uncovered_ranges'][:8])}")
+                self.add_line()
+        
         untested = testing.get('untested_components', [])
         if untested:
             self.add_line("**⚠️ Components Without Tests:**")
@@ -218,6 +261,29 @@ class ReportGenerator:
                     self.add_line(f"   - Files: {', '.join(dupe['files'][:3])}")
                 self.add_line()
     
+        # SwiftLint
+        swiftlint = metrics['safety'].get('swiftlint')
+        if swiftlint:
+            self.add_line("### SwiftLint (Added Lines)")
+            by_severity = swiftlint.get('by_severity', {})
+            self.add_table(
+                ["Metric", "Value"],
+                [
+                    ["Lint Score", f"{swiftlint['lint_score']}/100"],
+                    ["Violations on Added Lines", str(swiftlint['added_line_violations'])],
+                    ["Errors", str(by_severity.get('error', 0))],
+                    ["Warnings", str(by_severity.get('warning', 0))],
+                    ["Violations in Full Report", str(swiftlint['total_violations_in_report'])]
+                ]
+            )
+            
+            by_rule = swiftlint.get('by_rule', {})
+            if by_rule:
+                self.add_line("**Most Frequent Rules:**")
+                for rule_id, count in list(by_rule.items())[:10]:
+                    self.add_line(f"- `{rule_id}`: {count}")
+                self.add_line()
+    
     def generate_file_analysis_section(self, analysis: Dict[str, Any]):
         """Generate file-by-file analysis"""
         files = analysis['metrics'].get('files', {})
@@ -243,12 +309,14 @@ class ReportGenerator:
                 risk_level = file_metrics.get('risk_level', 'low')
                 risk_emoji = self.RISK_EMOJI.get(risk_level, '⚪')
                 
-                filename = Path(filepath).name
+                filename = f"`{Path(filepath).name}`"
+                if file_metrics.get('degraded'):
+                    filename += " ⏳"
                 changes = f"+{file_metrics['added']} -{file_metrics['deleted']}"
                 risk_count = len(file_metrics.get('risk_factors', []))
                 
                 table_rows.append([
-                    f"`{filename}`",
+                    filename,
                     changes,
                     f"{risk_emoji} {risk_level.title()}",
                     str(risk_count)
@@ -259,6 +327,15 @@ class ReportGenerator:
                 table_rows
             )
         
+        degraded = analysis['metrics'].get('budgets', {}).get('degraded_files', {})
+        if degraded:
+            self.add_line("### ⏳ Degraded Analysis")
+            self.add_line("These files exceeded the per-file or per-phase budgets and got a cheaper fallback analysis:")
+            for filepath, reasons in degraded.items():
+                details = '; '.join(f"{r['phase']}: {r['reason']}" for r in reasons)
+                self.add_line(f"- `{filepath}` ({details})")
+            self.add_line()
+        
         # Show high-risk files in detail
         high_risk_files = [(fp, fm) for fp, fm in files.items() if fm.get('risk_level') == 'high']
         
@@ -334,6 +411,519 @@ class ReportGenerator:
             self.add_line("> ⚠️ **Recording logic changes detected.** Verify sleep recording lifecycle and snore detection accuracy.")
             self.add_line()
     
+    def generate_realtime_section(self, analysis: Dict[str, Any]):
+        """Generate real-time audio thread safety section"""
+        realtime = analysis['metrics'].get('realtime_audio', {})
+        
+        if not realtime.get('contexts'):
+            return
+        
+        self.add_header("🎚️ Real-Time Audio Safety", 2)
+        self.add_line(f"Checked {len(realtime['contexts'])} render/tap callbacks in changed files.")
+        self.add_line()
+        
+        new_findings = [f for f in realtime['findings'] if f['new']]
+        if new_findings:
+            self.add_line("**🔴 HIGH: Unsafe Work Added to Audio-Thread Callbacks:**")
+            rows = [
+                [f"`{Path(f['path']).name}:{f['line']}`", f['category'].replace('_', ' ').capitalize(),
+                 f['detail'], f"{f['context']} (line {f['context_line']})"]
+                for f in new_findings[:20]
+            ]
+            self.add_table(["Location", "Hazard", "Detail", "Callback"], rows)
+            self.add_line("> Render and tap callbacks must not allocate, lock, log, dispatch or message "
+                          "Objective-C objects. Precompute outside the callback and hand data over through "
+                          "preallocated, lock-free storage.")
+            self.add_line()
+        elif not realtime['findings']:
+            self.add_line("✅ No allocation, locking, logging, dispatch or Objective-C messaging in audio callbacks")
+            self.add_line()
+        
+        existing = len(realtime['findings']) - len(new_findings)
+        if existing:
+            self.add_line(f"*{existing} real-time hazards in these callbacks predate this PR.*")
+            self.add_line()
+    
+    def generate_main_thread_section(self, analysis: Dict[str, Any]):
+        """Generate main-thread blocking section"""
+        main_thread = analysis['metrics'].get('main_thread', {})
+        
+        if not main_thread.get('findings'):
+            return
+        
+        self.add_header("🧵 Main-Thread Blocking", 2)
+        
+        new_findings = [f for f in main_thread['findings'] if f['new']]
+        if new_findings:
+            self.add_line("**⚠️ Blocking Work Added to Main-Thread Code:**")
+            rows = [
+                [f"`{Path(f['path']).name}:{f['line']}`", f"`{f['function']}`", f['detail'], f['context']]
+                for f in new_findings[:20]
+            ]
+            self.add_table(["Location", "Function", "Call", "Runs on Main Because"], rows)
+            self.add_line("> Move file I/O, decoding and audio session activation off the main actor "
+                          "(e.g. a `Task.detached` or a background actor) and publish the result back.")
+            self.add_line()
+        
+        existing = len(main_thread['findings']) - len(new_findings)
+        if existing:
+            by_category = ', '.join(f"{count} {category.replace('_', ' ')}"
+                                    for category, count in sorted(main_thread['by_category'].items()))
+            self.add_line(f"*{existing} blocking calls on main-thread paths in these files predate this PR ({by_category} in total).*")
+            self.add_line()
+    
+    def generate_frame_cost_section(self, analysis: Dict[str, Any]):
+        """Generate per-frame render cost section"""
+        frame_cost = analysis['metrics'].get('frame_cost', {})
+        
+        if not frame_cost.get('contexts'):
+            return
+        
+        self.add_header("🎞️ Per-Frame Render Cost", 2)
+        
+        rows = []
+        for context in frame_cost['contexts']:
+            base = context['base_ops_per_second']
+            if base is None:
+                change = "new"
+            elif context['ops_per_second'] > base:
+                change = f"⬆️ +{context['ops_per_second'] - base:,}"
+            elif context['ops_per_second'] < base:
+                change = f"⬇️ -{base - context['ops_per_second']:,}"
+            else:
+                change = "—"
+            rows.append([
+                f"`{Path(context['path']).name}:{context['line']}`",
+                f"`{context['function']}`",
+                f"{context['fps']:g}",
+                f"{context['ops_per_frame']:,}",
+                f"{context['ops_per_second']:,}",
+                change
+            ])
+        self.add_table(["Location", "Function", "FPS", "Ops/Frame", "Ops/s", "vs Base"], rows)
+        
+        new_findings = [f for f in frame_cost['findings'] if f['new']]
+        if new_findings:
+            self.add_line("**⚠️ Per-Frame Work Added:**")
+            rows = [
+                [f"`{Path(f['path']).name}:{f['line']}`", f['category'].replace('_', ' '), f['detail'],
+                 f"×{f['iterations']:,}" + (f" via `{f['via']}`" if f['via'] else ''), f"{f['operations'] * f['fps']:,.0f}"]
+                for f in new_findings[:20]
+            ]
+            self.add_table(["Location", "Category", "Work", "Per Frame", "Ops/s"], rows)
+            self.add_line("> Hoist allocations, paths and lookup tables out of the frame closure, "
+                          "or lower the `TimelineView` frame rate.")
+            self.add_line()
+        
+        if frame_cost.get('issues'):
+            for issue in frame_cost['issues']:
+                self.add_line(f"- ⚠️ {issue}")
+            self.add_line()
+    
+    def generate_lifecycle_section(self, analysis: Dict[str, Any]):
+        """Generate timer/task lifecycle section"""
+        lifecycle = analysis['metrics'].get('lifecycle', {})
+        
+        if not lifecycle.get('findings'):
+            return
+        
+        self.add_header("⏲️ Timer & Task Lifecycles", 2)
+        
+        new_findings = [f for f in lifecycle['findings'] if f['new']]
+        if new_findings:
+            self.add_line("**⚠️ Started but Never Stopped:**")
+            rows = [
+                [f"`{Path(f['path']).name}:{f['line']}`", f"`{f['function']}`", f['detail'], f['reason']]
+                for f in new_findings[:20]
+            ]
+            self.add_table(["Location", "Function", "Creates", "Problem"], rows)
+            self.add_line("> Keep a handle and invalidate or cancel it in `deinit`, `onDisappear` or the type's "
+                          "stop method, so nothing keeps running through an overnight session.")
+            self.add_line()
+        
+        existing = len(lifecycle['findings']) - len(new_findings)
+        if existing:
+            self.add_line(f"*{existing} unmatched timers, tasks or observers in these files predate this PR.*")
+            self.add_line()
+    
+    def generate_captures_section(self, analysis: Dict[str, Any]):
+        """Generate closure capture section"""
+        captures = analysis['metrics'].get('captures', {})
+        
+        if not captures.get('findings'):
+            return
+        
+        self.add_header("🔁 Closure Captures", 2)
+        
+        rows = [[f"`{name}`", str(count)] for name, count in sorted(captures['by_type'].items(), key=lambda x: -x[1])]
+        self.add_table(["Type", "Likely Cycles"], rows)
+        
+        new_findings = [f for f in captures['findings'] if f['new']]
+        if new_findings:
+            self.add_line("**⚠️ Strong `self` Captures in Changed Code:**")
+            rows = [
+                [f"`{Path(f['path']).name}:{f['line']}`", f"`{f['function']}`", f['detail']]
+                for f in new_findings[:20]
+            ]
+            self.add_table(["Location", "Function", "Kept By"], rows)
+            self.add_line("> Capture `[weak self]` (or `[unowned self]` when the closure cannot outlive the "
+                          "instance) so the service is released when the session ends.")
+            self.add_line()
+    
+    def generate_recording_storage_section(self, analysis: Dict[str, Any]):
+        """Generate sleep recording storage section"""
+        storage = analysis['metrics'].get('recording_storage', {})
+        
+        if not storage.get('recorders'):
+            return
+        
+        self.add_header("💾 Recording Storage", 2)
+        
+        rows = []
+        for recorder in storage['recorders']:
+            settings = recorder['settings']
+            described = ', '.join(
+                f"{settings[key]:g}{unit}" if isinstance(settings[key], float) else str(settings[key])
+                for key, unit in (('format', ''), ('sample_rate', ' Hz'), ('channels', ' ch'), ('bit_rate', ' bps'))
+                if key in settings
+            ).replace('kAudioFormat', '')
+            delta = recorder['delta_bytes_per_night']
+            rows.append([
+                f"`{Path(recorder['path']).name}:{recorder['line']}`",
+                described,
+                f"{recorder['bytes_per_hour'] / 1024 / 1024:.1f} MB",
+                f"{recorder['bytes_per_night'] / 1024 / 1024:.1f} MB",
+                f"{delta / 1024 / 1024:+.1f} MB" if delta is not None else "new",
+            ])
+        self.add_table(["Recorder", "Settings", "Per Hour", "Per Night", "Change"], rows)
+    
+    def generate_dsp_loops_section(self, analysis: Dict[str, Any]):
+        """Generate scalar DSP loop section"""
+        dsp = analysis['metrics'].get('dsp_loops', {})
+        
+        if not dsp.get('findings') and not dsp.get('codebase', {}).get('vectorizable'):
+            return
+        
+        self.add_header("🧮 Scalar DSP Loops", 2)
+        
+        if dsp.get('findings'):
+            rows = [
+                [
+                    f"`{Path(f['path']).name}:{f['line']}`",
+                    f"`{f['function']}`",
+                    ', '.join(f['operations']) or 'mixed',
+                    f"{f['ops_per_buffer']:,}",
+                    ', '.join(f"`{s}`" for s in f['suggestions']) if f['vectorizable'] else '—',
+                ]
+                for f in dsp['findings'][:20]
+            ]
+            self.add_table(["Loop", "Function", "Operations", "Ops per Buffer", "Replace With"], rows)
+        
+        codebase = dsp.get('codebase', {})
+        history = dsp.get('history', [])
+        if codebase:
+            trend = ''
+            if len(history) >= 2:
+                change = history[-1]['vectorizable'] - history[-2]['vectorizable']
+                trend = f" ({change:+d} since the previous run)"
+            self.add_line(f"**Codebase:** {codebase['loops']} buffer loops, "
+                          f"{codebase['vectorizable']} with a direct vDSP equivalent{trend}")
+            self.add_line()
+    
+    def generate_observation_section(self, analysis: Dict[str, Any]):
+        """Generate observation fan-out section"""
+        observation = analysis['metrics'].get('observation', {})
+        
+        if not observation.get('properties'):
+            return
+        
+        self.add_header("🔄 Observation Fan-Out", 2)
+        self.add_line(f"Indexed {observation['models']} observable models and {observation['views']} views.")
+        self.add_line()
+        
+        rows = []
+        for prop in sorted(observation['properties'], key=lambda p: -p['tree_size'])[:20]:
+            rate = prop['updates_per_second']
+            rows.append([
+                f"`{prop['model']}.{prop['property']}`",
+                ', '.join(f"`{v}`" for v in prop['views'][:5]) + (' …' if len(prop['views']) > 5 else '') or '—',
+                str(prop['tree_size']),
+                f"{prop['high_frequency']} ({rate:g}/s)" if rate else prop['high_frequency'] or '—',
+            ])
+        self.add_table(["Property", "Read By", "Views Re-evaluated", "Updated By"], rows)
+    
+    def generate_launch_section(self, analysis: Dict[str, Any]):
+        """Generate app launch path section"""
+        launch = analysis['metrics'].get('launch', {})
+        
+        if not launch.get('findings'):
+            return
+        
+        self.add_header("🚀 Launch Path", 2)
+        self.add_line(f"{launch['reachable']} initializers and methods run before the first frame, "
+                      f"from {', '.join(f'`{r}`' for r in launch['roots'])}.")
+        self.add_line()
+        if launch.get('singletons'):
+            self.add_line(f"Singletons and statics touched: {', '.join(f'`{s}`' for s in launch['singletons'])}")
+            self.add_line()
+        
+        new_findings = [f for f in launch['findings'] if f['new']]
+        if new_findings:
+            self.add_line("**⚠️ Launch-Time Work Added by This PR:**")
+            rows = [
+                [
+                    f"`{Path(f['path']).name}:{f['line']}`",
+                    f['detail'],
+                    ' → '.join(f"`{step}`" for step in f['chain']),
+                ]
+                for f in new_findings[:20]
+            ]
+            self.add_table(["Location", "Call", "Reached Via"], rows)
+            self.add_line("> Defer this work until after the first frame, e.g. in a `.task` or a `Task` "
+                          "started from the first screen, or make the owning service lazy.")
+            self.add_line()
+        
+        existing = len(launch['findings']) - len(new_findings)
+        if existing:
+            by_category = ', '.join(f"{count} {category.replace('_', ' ')}"
+                                    for category, count in sorted(launch['by_category'].items()))
+            self.add_line(f"*{existing} blocking calls already reachable from launch ({by_category} in total).*")
+            self.add_line()
+    
+    def generate_assets_section(self, analysis: Dict[str, Any]):
+        """Generate asset analysis section"""
+        assets = analysis['metrics'].get('assets', {})
+        audio = assets.get('audio', {})
+        loops = assets.get('loop_loudness', {})
+        duplicates = assets.get('duplicates', {})
+        images = assets.get('images', {})
+        
+        if not (audio.get('assets') or audio.get('budget_violations') or loops.get('assets')
+                or duplicates.get('duplicates') or images.get('images')):
+            return
+        
+        self.add_header("🔊 Asset Analysis", 2)
+        
+        if audio.get('assets'):
+            self.add_line("### Sound Assets")
+            table_rows = []
+            for path, asset in sorted(audio['assets'].items()):
+                table_rows.append([
+                    f"`{Path(path).name}`",
+                    asset['status'],
+                    f"{asset['size_delta_bytes'] / 1024:+.1f} KB",
+                    f"{asset['duration_seconds']:.1f}s" if 'duration_seconds' in asset else "-",
+                    f"{asset['bitrate_kbps']} kbps" if 'bitrate_kbps' in asset else "-",
+                    f"{asset['sample_rate']} Hz" if 'sample_rate' in asset else "-",
+                    asset.get('encoding', '-')
+                ])
+            self.add_table(
+                ["File", "Status", "Size Delta", "Duration", "Bitrate", "Sample Rate", "Encoding"],
+                table_rows
+            )
+            self.add_line(f"**Total Size Delta:** {audio['total_size_delta_bytes'] / 1024:+.1f} KB")
+            self.add_line()
+        
+        for violation in audio.get('budget_violations', []):
+            self.add_line(f"> ⚠️ **Size budget exceeded:** {violation}")
+            self.add_line()
+        
+        if loops.get('assets'):
+            self.add_line("### Loop Seams & Loudness")
+            table_rows = []
+            for path, result in sorted(loops['assets'].items()):
+                seam = result['seam']
+                lufs = result['integrated_lufs']
+                delta = result.get('loudness_delta_lu')
+                table_rows.append([
+                    f"`{Path(path).name}`",
+                    f"{lufs:.1f} LUFS" if lufs is not None else "silent",
+                    f"{delta:+.1f} LU" if delta is not None else "-",
+                    f"{result['peak_dbfs']:.1f} dBFS" if result['peak_dbfs'] is not None else "-",
+                    f"{seam['step_ratio']:.1f}x",
+                    f"{seam['level_jump_db']:.1f} dB",
+                    "🔴 Click" if seam['click'] else "🟢 Clean"
+                ])
+            self.add_table(
+                ["File", "Loudness", "vs Median", "Peak", "Seam Step", "Seam Level Jump", "Seam"],
+                table_rows
+            )
+            
+            if loops.get('reference_median_lufs') is None:
+                self.add_line("*No reference renders of other sounds, so loudness is not compared with the catalog.*")
+                self.add_line()
+            
+            for issue in loops.get('issues', []):
+                self.add_line(f"- ⚠️ {issue}")
+            if loops.get('issues'):
+                self.add_line()
+        
+        if duplicates.get('duplicates'):
+            self.add_line("### Duplicate Sounds")
+            table_rows = []
+            for duplicate in duplicates['duplicates']:
+                for match in duplicate['matches']:
+                    table_rows.append([
+                        f"`{Path(duplicate['path']).name}`",
+                        f"`{Path(match['path']).name}`",
+                        "Exact" if match['kind'] == 'exact' else "Near",
+                        f"{match['similarity']:.2f}",
+                        f"{duplicate['bytes'] / 1024:.0f} KB"
+                    ])
+            self.add_table(["Sound", "Duplicates", "Match", "Similarity", "Size"], table_rows)
+            self.add_line(
+                f"**Wasted:** {duplicates['wasted_bytes'] / 1024:.0f} KB "
+                f"({duplicates['sounds']} sounds fingerprinted, {duplicates['fingerprinted']} rescanned)"
+            )
+            self.add_line()
+        
+        if images.get('images'):
+            self.add_line("### Image Assets")
+            table_rows = []
+            for path, info in sorted(images['images'].items()):
+                dimensions = f"{info['width']}x{info['height']}" if info['width'] else "-"
+                table_rows.append([
+                    f"`{'/'.join(Path(path).parts[-2:])}`",
+                    info['format'].upper(),
+                    dimensions,
+                    f"{info['bytes'] / 1024:.0f} KB"
+                ])
+            self.add_table(["Image", "Format", "Dimensions", "Size"], table_rows)
+            
+            for issue in images.get('issues', []):
+                self.add_line(f"- ⚠️ {issue}")
+            if images.get('issues'):
+                self.add_line()
+    
+    def generate_localization_section(self, analysis: Dict[str, Any]):
+        """Generate string catalog section"""
+        catalogs = analysis['metrics'].get('localization', {}).get('catalogs', {})
+        
+        if not catalogs:
+            return
+        
+        self.add_header("🌍 Localization", 2)
+        
+        for path, catalog in sorted(catalogs.items()):
+            self.add_line(f"### `{Path(path).name}`")
+            self.add_table(
+                ["Metric", "Value"],
+                [
+                    ["Keys Added", str(len(catalog['added_keys']))],
+                    ["Keys Removed", str(len(catalog['removed_keys']))],
+                    ["Keys Modified", str(len(catalog['modified_keys']))],
+                    ["Keys Missing Translations", str(len(catalog['missing_translations']))],
+                    ["Size Change", f"{catalog['size_delta_bytes'] / 1024:+.1f} KB"]
+                ]
+            )
+            
+            if catalog['missing_by_locale']:
+                self.add_line("**Missing Translations by Locale:**")
+                for locale, count in sorted(catalog['missing_by_locale'].items()):
+                    self.add_line(f"- `{locale}`: {count}")
+                self.add_line()
+            
+            broken = {**catalog['removed_keys_still_referenced'], **catalog['stale_keys_referenced']}
+            if broken:
+                self.add_line("**⚠️ Removed or Stale Keys Still Used in Swift:**")
+                for key, files in list(broken.items())[:10]:
+                    self.add_line(f"- `{key}` in {', '.join(f'`{Path(f).name}`' for f in files[:3])}")
+                self.add_line()
+    
+    def generate_project_section(self, analysis: Dict[str, Any]):
+        """Generate Xcode project integrity section"""
+        project = analysis['metrics'].get('project', {})
+        
+        if not project:
+            return
+        
+        self.add_header("🧩 Xcode Project", 2)
+        
+        rows = []
+        for target, phases in project['targets'].items():
+            rows.append([target, str(phases.get('Sources', 0)), str(phases.get('Resources', 0))])
+        self.add_table(["Target", "Sources", "Resources"], rows)
+        
+        if project['missing_target_membership']:
+            self.add_line("**⚠️ Added Swift Files Missing From Their Target:**")
+            for missing in project['missing_target_membership']:
+                self.add_line(f"- `{missing['path']}` (expected in `{missing['expected_target']}`)")
+            self.add_line()
+        
+        new_dangling = [d for d in project['dangling_references'] if d['new']]
+        if new_dangling or project['broken_references']:
+            self.add_line("**⚠️ Dangling References:**")
+            for dangling in new_dangling:
+                self.add_line(f"- `{dangling['path']}` does not exist")
+            for broken in project['broken_references']:
+                self.add_line(f"- {broken}")
+            self.add_line()
+        
+        if project['duplicate_entries']:
+            self.add_line("**⚠️ Duplicate Build-Phase Entries:**")
+            for duplicate in project['duplicate_entries']:
+                self.add_line(f"- {duplicate}")
+            self.add_line()
+        
+        existing = len(project['dangling_references']) - len(new_dangling)
+        if existing:
+            self.add_line(f"*{existing} file references to missing paths predate this PR.*")
+            self.add_line()
+    
+    def generate_dead_code_section(self, analysis: Dict[str, Any]):
+        """Generate dead code section"""
+        dead = analysis['metrics'].get('dead_code', {})
+        
+        if not dead:
+            return
+        
+        self.add_header("🪦 Dead Code", 2)
+        
+        if dead['created']:
+            self.add_line("**⚠️ Declarations This PR Leaves Unreferenced:**")
+            rows = [
+                [f"`{Path(s['path']).name}:{s['line']}`", s['keyword'],
+                 f"`{s['container'] + '.' if s['container'] else ''}{s['name']}`", str(s['end_line'] - s['line'] + 1)]
+                for s in dead['created'][:20]
+            ]
+            self.add_table(["Location", "Kind", "Symbol", "Lines"], rows)
+        
+        if dead['removed']:
+            names = ', '.join(f"`{s['name']}`" for s in dead['removed'][:20])
+            self.add_line(f"**✅ Dead code removed or put back in use:** {names}")
+            self.add_line()
+        
+        targets = ', '.join(f"{target}: {totals['symbols']} symbols, {totals['lines']} lines"
+                            for target, totals in sorted(dead['by_target'].items()))
+        self.add_line(f"*{dead['dead']} unreferenced declarations across the shipping targets ({targets or 'none'}). "
+                      f"Indexed {dead['files']} files, {dead['reindexed']} re-read this run.*")
+        self.add_line()
+    
+    def generate_sound_references_section(self, analysis: Dict[str, Any]):
+        """Generate unreferenced sounds section"""
+        sounds = analysis['metrics'].get('sound_references', {})
+        
+        if not sounds:
+            return
+        
+        self.add_header("🔇 Unreferenced Sounds", 2)
+        
+        if sounds['unreferenced']:
+            rows = [
+                [f"`{Path(s['path']).name}`", f"{s['bytes'] / 1024:.0f} KB",
+                 "Yes" if s['bundled'] else "No", "🆕" if s['new'] else ""]
+                for s in sounds['unreferenced']
+            ]
+            self.add_table(["Sound", "Size", "Bundled", "This PR"], rows)
+            self.add_line(f"**Shipped Without References:** {sounds['unreferenced_bytes'] / 1024 / 1024:.2f} MB")
+            self.add_line()
+        
+        self.add_line(f"*{sounds['referenced']} of {sounds['sounds']} sounds named by string literals "
+                      f"({len(sounds['by_pattern'])} through interpolated patterns), "
+                      f"{len(sounds['dynamic_lookups'])} bundle lookups with computed names. "
+                      f"Indexed {sounds['files']} files, {sounds['reindexed']} re-read this run.*")
+        self.add_line()
+    
     def generate_comparison_section(self, comparison: Dict[str, Any]):
         """Generate PR comparison section"""
         if not comparison or 'quality_ranking' not in comparison:
@@ -471,6 +1061,100 @@ class ReportGenerator:
                 'recommendation': f"Fix {len(arch['solid_principles']['violations'])} architectural violations"
             })
         
+        realtime_new = [f for f in analysis['metrics'].get('realtime_audio', {}).get('findings', []) if f['new']]
+        if realtime_new:
+            recommendations.append({
+                'priority': 'HIGH',
+                'category': 'Real-Time Audio',
+                'recommendation': f"Move {len(realtime_new)} blocking or allocating operations out of audio render/tap callbacks"
+            })
+        
+        main_thread_new = [f for f in analysis['metrics'].get('main_thread', {}).get('findings', []) if f['new']]
+        if main_thread_new:
+            recommendations.append({
+                'priority': 'MEDIUM',
+                'category': 'Responsiveness',
+                'recommendation': f"Move {len(main_thread_new)} blocking calls off the main thread"
+            })
+        
+        dead_created = analysis['metrics'].get('dead_code', {}).get('created', [])
+        if dead_created:
+            recommendations.append({
+                'priority': 'LOW',
+                'category': 'Binary Size',
+                'recommendation': f"Remove or use {len(dead_created)} declarations nothing references"
+            })
+        
+        duplicate_sounds = analysis['metrics'].get('assets', {}).get('duplicates', {})
+        if duplicate_sounds.get('duplicates'):
+            recommendations.append({
+                'priority': 'MEDIUM',
+                'category': 'Bundle Size',
+                'recommendation': f"Drop {len(duplicate_sounds['duplicates'])} duplicate sounds and reuse the existing files "
+                                  f"({duplicate_sounds['wasted_bytes'] / 1024 / 1024:.1f} MB)"
+            })
+        
+        unreferenced_sounds = [s for s in analysis['metrics'].get('sound_references', {}).get('unreferenced', [])
+                               if s['new'] and s['bundled']]
+        if unreferenced_sounds:
+            recommendations.append({
+                'priority': 'LOW',
+                'category': 'Bundle Size',
+                'recommendation': f"Remove {len(unreferenced_sounds)} bundled sounds no code references, or add them to the sound catalog"
+            })
+        
+        launch_new = [f for f in analysis['metrics'].get('launch', {}).get('findings', []) if f['new']]
+        if launch_new:
+            recommendations.append({
+                'priority': 'HIGH',
+                'category': 'Launch Time',
+                'recommendation': f"Move {len(launch_new)} blocking calls off the launch path, after the first frame"
+            })
+        
+        if analysis['metrics'].get('observation', {}).get('issues'):
+            recommendations.append({
+                'priority': 'MEDIUM',
+                'category': 'Rendering',
+                'recommendation': "Read high-frequency properties in small leaf views, or move them to a separate observable model"
+            })
+        
+        if analysis['metrics'].get('dsp_loops', {}).get('issues'):
+            recommendations.append({
+                'priority': 'MEDIUM',
+                'category': 'Performance',
+                'recommendation': "Replace scalar buffer loops with the suggested vDSP calls"
+            })
+        
+        if analysis['metrics'].get('recording_storage', {}).get('issues'):
+            recommendations.append({
+                'priority': 'MEDIUM',
+                'category': 'Storage',
+                'recommendation': "Lower the recorder's bit rate, sample rate or channel count to keep a night of recording within budget"
+            })
+        
+        captures_new = [f for f in analysis['metrics'].get('captures', {}).get('findings', []) if f['new']]
+        if captures_new:
+            recommendations.append({
+                'priority': 'HIGH',
+                'category': 'Memory',
+                'recommendation': f"Capture self weakly in {len(captures_new)} closures that keep their owner alive"
+            })
+        
+        lifecycle_new = [f for f in analysis['metrics'].get('lifecycle', {}).get('findings', []) if f['new']]
+        if lifecycle_new:
+            recommendations.append({
+                'priority': 'HIGH',
+                'category': 'Battery',
+                'recommendation': f"Stop {len(lifecycle_new)} timers, tasks or observers that run until the app quits"
+            })
+        
+        if analysis['metrics'].get('frame_cost', {}).get('issues'):
+            recommendations.append({
+                'priority': 'MEDIUM',
+                'category': 'Battery',
+                'recommendation': "Reduce the per-frame work this PR adds to animated visualizations"
+            })
+        
         # Display recommendations
         if recommendations:
             # Sort by priority
@@ -551,6 +1235,20 @@ class ReportGenerator:
         self.generate_metrics_section(analysis)
         self.generate_file_analysis_section(analysis)
         self.generate_soundscape_section(analysis)
+        self.generate_realtime_section(analysis)
+        self.generate_main_thread_section(analysis)
+        self.generate_frame_cost_section(analysis)
+        self.generate_lifecycle_section(analysis)
+        self.generate_captures_section(analysis)
+        self.generate_recording_storage_section(analysis)
+        self.generate_dsp_loops_section(analysis)
+        self.generate_observation_section(analysis)
+        self.generate_launch_section(analysis)
+        self.generate_assets_section(analysis)
+        self.generate_localization_section(analysis)
+        self.generate_project_section(analysis)
+        self.generate_dead_code_section(analysis)
+        self.generate_sound_references_section(analysis)
         
         if comparison:
             self.generate_comparison_section(comparison)
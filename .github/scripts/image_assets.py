@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Image Asset Analysis for PR Assessment
+
+Walks the asset catalog sets touched by a PR, reads PNG and JPEG dimensions
+from file headers only (in parallel) and flags oversized images, missing
+scale variants and images that no Contents.json references.
+"""
+
+import json
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+VECTOR_EXTENSIONS = ('.pdf', '.svg')
+ASSET_SET_SUFFIXES = ('.imageset', '.appiconset')
+
+DEFAULT_MAX_PIXELS = 1024 * 1024
+DEFAULT_MAX_BYTES = 512 * 1024
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# JPEG start-of-frame markers carry the image dimensions (C4, C8 and CC are not SOF)
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+def read_image_header(filepath: str) -> Dict[str, Any]:
+    """Format and pixel dimensions from the PNG IHDR or JPEG SOF header"""
+    info = {'bytes': os.path.getsize(filepath), 'format': 'unknown', 'width': None, 'height': None}
+
+    with open(filepath, 'rb') as f:
+        head = f.read(24)
+
+        if head.startswith(PNG_SIGNATURE) and head[12:16] == b'IHDR':
+            info['format'] = 'png'
+            info['width'], info['height'] = struct.unpack('>II', head[16:24])
+
+        elif head.startswith(b'\xff\xd8'):
+            info['format'] = 'jpeg'
+            f.seek(2)
+            while True:
+                marker = f.read(2)
+                if len(marker) < 2 or marker[0] != 0xFF:
+                    break
+                if marker[1] in (0x01, 0xD0, 0xD1, 0xD2, 0xD3, 0xD4, 0xD5, 0xD6, 0xD7, 0xFF):
+                    f.seek(-1 if marker[1] == 0xFF else 0, 1)
+                    continue
+                segment = f.read(2)
+                if len(segment) < 2:
+                    info['error'] = 'truncated JPEG segment header'
+                    break
+                length = struct.unpack('>H', segment)[0]
+                if marker[1] in JPEG_SOF_MARKERS:
+                    frame = f.read(5)
+                    if len(frame) < 5:
+                        info['error'] = 'truncated JPEG frame header'
+                        break
+                    _, height, width = struct.unpack('>BHH', frame)
+                    info['width'], info['height'] = width, height
+                    break
+                f.seek(length - 2, 1)
+
+    extension = os.path.splitext(filepath)[1].lower().lstrip('.')
+    if info['format'] != 'unknown' and extension.replace('jpg', 'jpeg') != info['format']:
+        info['extension_mismatch'] = True
+
+    return info
+
+def find_asset_set(path: str) -> Optional[str]:
+    """The enclosing .imageset/.appiconset directory of a catalog path"""
+    parts = path.split('/')
+    for index in range(len(parts) - 1, -1, -1):
+        if parts[index].endswith(ASSET_SET_SUFFIXES):
+            return '/'.join(parts[:index + 1])
+    return None
+
+def analyze_asset_set(set_dir: str) -> Dict[str, Any]:
+    """Check one asset set's Contents.json against the files it contains"""
+    contents_path = os.path.join(set_dir, 'Contents.json')
+    result = {'missing_scales': [], 'orphaned_images': [], 'missing_files': []}
+
+    if not os.path.isdir(set_dir):
+        result['deleted'] = True
+        return result
+
+    files = {name for name in os.listdir(set_dir) if name.lower().endswith(IMAGE_EXTENSIONS + VECTOR_EXTENSIONS)}
+
+    try:
+        with open(contents_path, 'r', encoding='utf-8') as f:
+            entries = json.load(f).get('images', [])
+    except (OSError, ValueError) as e:
+        result['error'] = f"Unreadable Contents.json: {e}"
+        result['orphaned_images'] = sorted(files)
+        return result
+
+    referenced = {entry['filename'] for entry in entries if entry.get('filename')}
+    result['orphaned_images'] = sorted(files - referenced)
+    result['missing_files'] = sorted(referenced - files)
+
+    # Vector images and single-size app icons render at every scale
+    if set_dir.endswith('.imageset') and not any(name.lower().endswith(VECTOR_EXTENSIONS) for name in referenced):
+        filled = {entry['scale'] for entry in entries if entry.get('scale') and entry.get('filename')}
+        declared = {entry['scale'] for entry in entries if entry.get('scale')}
+        if filled:
+            result['missing_scales'] = sorted(declared - filled)
+
+    return result
+
+def analyze_image_assets(changed_files: List[Dict[str, Any]], max_pixels: int = DEFAULT_MAX_PIXELS,
+                         max_bytes: int = DEFAULT_MAX_BYTES) -> Dict[str, Any]:
+    """Header-only size checks and catalog consistency for changed images"""
+    set_dirs = set()
+    image_paths = []
+
+    for file_info in changed_files:
+        path = file_info['path']
+        set_dir = find_asset_set(path)
+        if set_dir:
+            set_dirs.add(set_dir)
+        if path.lower().endswith(IMAGE_EXTENSIONS) and os.path.exists(path):
+            image_paths.append(path)
+
+    # Every image in a touched set is checked, not only the changed files
+    for set_dir in set_dirs:
+        if os.path.isdir(set_dir):
+            for name in os.listdir(set_dir):
+                path = f"{set_dir}/{name}"
+                if name.lower().endswith(IMAGE_EXTENSIONS) and path not in image_paths:
+                    image_paths.append(path)
+
+    with ThreadPoolExecutor(max_workers=min(8, (os.cpu_count() or 1) * 2)) as pool:
+        headers = dict(zip(image_paths, pool.map(read_image_header, image_paths)))
+        sets = dict(zip(sorted(set_dirs), pool.map(analyze_asset_set, sorted(set_dirs))))
+
+    issues = []
+    for path, info in sorted(headers.items()):
+        if info['width'] and info['height'] and info['width'] * info['height'] > max_pixels:
+            issues.append(f"{path}: {info['width']}x{info['height']} exceeds the {max_pixels:,} pixel target")
+        if info['bytes'] > max_bytes:
+            issues.append(f"{path}: {info['bytes'] / 1024:.0f} KB exceeds the {max_bytes / 1024:.0f} KB target")
+        if info.get('error'):
+            issues.append(f"{path}: unreadable image ({info['error']})")
+        if info.get('extension_mismatch'):
+            issues.append(f"{path}: file extension does not match {info['format'].upper()} content")
+
+    for set_dir, result in sets.items():
+        if result['missing_scales']:
+            issues.append(f"{set_dir}: missing scale variants {', '.join(result['missing_scales'])}")
+        for name in result['orphaned_images']:
+            issues.append(f"{set_dir}/{name}: not referenced by Contents.json")
+        for name in result['missing_files']:
+            issues.append(f"{set_dir}: Contents.json references missing file {name}")
+
+    return {
+        'images': headers,
+        'asset_sets': sets,
+        'max_pixels': max_pixels,
+        'max_bytes': max_bytes,
+        'issues': issues,
+    }
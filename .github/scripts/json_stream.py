@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Incremental JSON reader for large analysis inputs
+
+Walks a JSON document chunk by chunk and decodes only the values under a
+requested prefix, so multi-megabyte coverage exports and lint reports never
+have to be loaded whole. Prefixes follow the ijson convention: object keys
+are joined with '.', array elements are 'item' and '*' matches any key.
+"""
+
+import json
+import re
+from typing import Any, IO, Iterator, List, Optional, Set, Tuple
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_STRUCTURAL = re.compile(r'["\[\]{}]')
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_DECODER = json.JSONDecoder()
+
+class JSONStreamReader:
+    """Pull-based reader over a text file object"""
+
+    CHUNK_SIZE = 1 << 16
+
+    def __init__(self, fp: IO[str], chunk_size: int = CHUNK_SIZE):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.keys = None
+
+    def _fill(self, size: int = 0) -> bool:
+        """Append the next chunk to the buffer, dropping consumed text"""
+        if self.eof:
+            return False
+        chunk = self.fp.read(max(size, self.chunk_size))
+        if not chunk:
+            self.eof = True
+            return False
+        if self.pos >= self.chunk_size:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        self.buf += chunk
+        return True
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character ('' at EOF)"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, char: str):
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found '{found}' in JSON stream")
+        self.pos += 1
+
+    def _match_string(self) -> re.Match:
+        while True:
+            match = _STRING.match(self.buf, self.pos)
+            if match:
+                self.pos = match.end()
+                return match
+            if not self._fill(len(self.buf) - self.pos):
+                raise ValueError("Unterminated string in JSON stream")
+
+    def _read_key(self) -> str:
+        if self._peek() != '"':
+            raise ValueError("Expected object key in JSON stream")
+        return json.loads(self._match_string().group())
+
+    def _next_separator(self, closing: str) -> bool:
+        """Consume ',' or the closing bracket; True if more members follow"""
+        char = self._peek()
+        self.pos += 1
+        if char == ',':
+            return True
+        if char == closing:
+            return False
+        raise ValueError(f"Unexpected '{char}' in JSON stream")
+
+    def decode_value(self) -> Any:
+        """Decode the next complete value with the C decoder"""
+        self._peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Grow geometrically so large values are not re-decoded per chunk
+                if not self._fill(len(self.buf) - self.pos):
+                    raise
+                continue
+            # A number that ends exactly at the buffer edge may continue in the next chunk
+            if end == len(self.buf) and not isinstance(value, (dict, list, str)) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def skip_value(self):
+        """Skip the next value without building Python objects for it"""
+        if self._peek() not in '[{':
+            self.decode_value()
+            return
+
+        depth = 0
+        while True:
+            match = _STRUCTURAL.search(self.buf, self.pos)
+            if not match:
+                self.pos = len(self.buf)
+                if not self._fill():
+                    raise ValueError("Unexpected end of JSON stream")
+                continue
+
+            self.pos = match.start()
+            char = match.group()
+            if char == '"':
+                self._match_string()
+                continue
+
+            self.pos += 1
+            depth += 1 if char in '[{' else -1
+            if depth == 0:
+                return
+
+    def _key_wanted(self, key: str, depth: int, target: List[str]) -> bool:
+        return self.keys is None or depth < len(target) - 1 or key in self.keys
+
+    def iter_prefix(self, prefix: str, keys: Optional[Set[str]] = None) -> Iterator[Tuple[List[str], Any]]:
+        """Yield (path, value) for every value whose path matches prefix
+
+        When keys is given, a trailing '*' only matches those keys and every
+        other member is skipped without being decoded.
+        """
+        target = prefix.split('.') if prefix else []
+        self.keys = keys
+        yield from self._walk([], target)
+
+    def _walk(self, path: List[str], target: List[str]) -> Iterator[Tuple[List[str], Any]]:
+        depth = len(path)
+        if depth == len(target):
+            yield path, self.decode_value()
+            return
+
+        wanted = target[depth]
+        char = self._peek()
+
+        if char == '{' and wanted != 'item':
+            self.pos += 1
+            if self._peek() == '}':
+                self.pos += 1
+                return
+            while True:
+                key = self._read_key()
+                self._expect(':')
+                if wanted == key or (wanted == '*' and self._key_wanted(key, depth, target)):
+                    yield from self._walk(path + [key], target)
+                else:
+                    self.skip_value()
+                if not self._next_separator('}'):
+                    return
+
+        elif char == '[' and wanted == 'item':
+            self.pos += 1
+            if self._peek() == ']':
+                self.pos += 1
+                return
+            while True:
+                yield from self._walk(path + ['item'], target)
+                if not self._next_separator(']'):
+                    return
+
+        else:
+            self.skip_value()
+
+def items(fp: IO[str], prefix: str) -> Iterator[Any]:
+    """Yield each value located at prefix"""
+    for _, value in JSONStreamReader(fp).iter_prefix(prefix):
+        yield value
+
+def kvitems(fp: IO[str], prefix: str, keys: Optional[Set[str]] = None) -> Iterator[Tuple[str, Any]]:
+    """Yield (key, value) for each member of the object(s) at prefix
+
+    Passing keys restricts decoding to those members; the rest are skipped.
+    """
+    target = f"{prefix}.*" if prefix else '*'
+    for path, value in JSONStreamReader(fp).iter_prefix(target, keys):
+        yield path[-1], value
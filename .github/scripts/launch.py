@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+App Launch-Path Analysis for PR Assessment
+
+Everything the `@main` App builds before its first frame adds to cold launch
+time. That covers its stored `@State` roots, its `init`, the app delegate's
+`didFinishLaunching` and the root `.onAppear`, plus every initializer,
+singleton and method those reach synchronously. This analyzer builds that
+initialization graph across the project. It flags synchronous file I/O,
+audio session activation and network or SDK setup reachable from launch, and
+gives the call chain that leads there. Closures handed to `Task`, dispatch
+queues or completion handlers run after launch and are not followed.
+"""
+
+import bisect
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from main_thread import CATEGORIES as MAIN_THREAD_CATEGORIES, INLINE_CALLEES, blocking_call
+from swift_index import Scope, SwiftIndex, index_file, tracked_swift_files
+
+CATEGORIES = {
+    **MAIN_THREAD_CATEGORIES,
+    'sdk_setup': 'SDK setup',
+    'network': 'Network request',
+}
+
+# Third-party SDK entry points and the calls that start them
+SDK_TYPES = {'FirebaseApp', 'Purchases', 'Superwall', 'Mixpanel', 'Amplitude', 'SentrySDK', 'Crashlytics',
+             'GADMobileAds', 'AppsFlyerLib', 'Adapty', 'OneSignal'}
+SDK_SETUP_CALLS = {'configure', 'start', 'initialize', 'setup', 'activate'}
+
+# (type, member) pairs that go to the network
+NETWORK_CALLS = {('Product', 'products'), ('AppStore', 'sync'), ('URLSession', 'shared'),
+                 ('Transaction', 'currentEntitlements')}
+
+# Closures that run before the enclosing call returns; `Task` bodies run after launch
+LAUNCH_INLINE = INLINE_CALLEES - {'Task', 'run'}
+
+LAUNCH_DELEGATE_METHODS = ('didFinishLaunchingWithOptions', 'willFinishLaunchingWithOptions')
+
+# A body of code the graph walks: (path, index, boundary scope, owning type, token positions)
+Unit = Tuple[str, SwiftIndex, Scope, str, List[int]]
+
+def _text(index: SwiftIndex, position: int) -> str:
+    return index.tokens[position].text if 0 <= position < len(index.tokens) else ''
+
+def launch_call(index: SwiftIndex, position: int) -> Optional[tuple]:
+    """(category, detail) if the token at position starts launch-slowing work"""
+    hazard = blocking_call(index, position)
+    if hazard:
+        return hazard
+    text = _text(index, position)
+    if _text(index, position + 1) != '.' or _text(index, position - 1) == '.':
+        return None
+    member = _text(index, position + 2)
+    if text in SDK_TYPES and member in SDK_SETUP_CALLS:
+        return 'sdk_setup', f"{text}.{member}()"
+    if (text, member) in NETWORK_CALLS:
+        return 'network', f"{text}.{member}"
+    return None
+
+def _type_level(index: SwiftIndex, type_scope: Scope) -> List[int]:
+    """Token positions in a type body outside its members: the stored property initializers"""
+    positions = []
+    for position in range(type_scope.start + 1, type_scope.end):
+        for scope in index.scope_at(position).ancestors():
+            if scope is type_scope:
+                positions.append(position)
+                break
+            if scope.kind != 'closure':
+                break
+    return positions
+
+def _line_positions(index: SwiftIndex) -> Dict[int, List[int]]:
+    lines: Dict[int, List[int]] = {}
+    for position in range(len(index.tokens)):
+        lines.setdefault(index.line(position), []).append(position)
+    return lines
+
+def _constructs(index: SwiftIndex, positions: List[int], names: Set[str]) -> bool:
+    """Whether a property line is initialized by a project type's constructor, as in `static let shared = Store()`"""
+    texts = [_text(index, p) for p in positions]
+    if '=' not in texts:
+        return False
+    value = texts[texts.index('=') + 1:]
+    if value[:1] == ['.']:
+        # `static let shared: Store = .init()`
+        return value[1:3] == ['init', '('] and bool(names.intersection(texts[:texts.index('=')]))
+    return bool(value) and value[0] in names and (value[1:2] == ['('] or value[1:4] == ['.', 'init', '('])
+
+def index_project(paths: List[str], admit: Optional[Callable[[str], bool]] = None) -> Dict[str, Dict[str, Any]]:
+    """Types across the project: member bodies, instance initializers, statics, singletons and property types"""
+    indexes = {}
+    for path in paths:
+        if not path.endswith('.swift') or 'Test' in path:
+            continue
+        if admit and not admit(path):
+            continue
+        try:
+            indexes[path] = index_file(path)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error indexing {path} for launch analysis: {e}")
+
+    names = {t.name for index in indexes.values() for t in index.types() if t.start is not None}
+    types: Dict[str, Dict[str, Any]] = {}
+    for path, index in indexes.items():
+        lines = _line_positions(index)
+        for type_scope in index.types():
+            if type_scope.start is None:
+                continue
+            entry = types.setdefault(type_scope.name, {
+                'scopes': [], 'members': {}, 'instance': [], 'statics': set(), 'singletons': set(), 'property_types': {},
+            })
+            entry['scopes'].append((path, index, type_scope))
+
+            properties = sorted((d for d in index.declarations if d.kind == 'property' and d.parent is type_scope),
+                                key=lambda d: d.line)
+            for declaration in properties:
+                declared = next((_text(index, p) for p in lines.get(declaration.line, [])
+                                 if _text(index, p) in names and _text(index, p) != declaration.name), None)
+                if declared:
+                    entry['property_types'][declaration.name] = declared
+                if 'static' in declaration.modifiers:
+                    entry['statics'].add(declaration.name)
+                    if _constructs(index, lines.get(declaration.line, []), names):
+                        entry['singletons'].add(declaration.name)
+
+            # Stored property initializers run with every init; static and lazy ones on first access
+            declarations = sorted((d for d in index.declarations if d.parent is type_scope), key=lambda d: d.line)
+            starts = [d.line for d in declarations]
+            instance: List[int] = []
+            deferred: Dict[str, List[int]] = {}
+            for position in _type_level(index, type_scope):
+                owner = bisect.bisect_right(starts, index.line(position)) - 1
+                if owner < 0 or declarations[owner].kind != 'property':
+                    # Function signatures and nested type headers
+                    continue
+                declaration = declarations[owner]
+                if {'static', 'lazy'}.intersection(declaration.modifiers):
+                    deferred.setdefault(declaration.name, []).append(position)
+                else:
+                    instance.append(position)
+            if instance:
+                entry['instance'].append((path, index, type_scope, type_scope.name, instance))
+            for name, positions in deferred.items():
+                entry['members'].setdefault(name, []).append((path, index, type_scope, type_scope.name, positions))
+
+        for scope in index.declarations:
+            if scope.kind not in ('function', 'property') or scope.start is None:
+                continue
+            if scope.parent is None or scope.parent.kind != 'type':
+                continue
+            unit = (path, index, scope, scope.parent.name, list(range(scope.start + 1, scope.end)))
+            types[scope.parent.name]['members'].setdefault(scope.name, []).append(unit)
+    return types
+
+def _runs_inline(index: SwiftIndex, closure: Scope) -> bool:
+    """Whether a closure runs while its enclosing code does"""
+    if closure.callee in LAUNCH_INLINE:
+        return True
+    # { ... }() such as a lazy property initializer
+    return closure.callee is None and _text(index, closure.end + 1) == '('
+
+def _deferred(index: SwiftIndex, position: int, boundary: Scope) -> bool:
+    """Whether the token sits in a closure that runs after launch, e.g. a `Task` or completion handler"""
+    for scope in index.scope_at(position).ancestors():
+        if scope is boundary:
+            return False
+        if scope.kind == 'closure' and not _runs_inline(index, scope):
+            return True
+    return False
+
+def _receiver(index: SwiftIndex, position: int) -> int:
+    """Token position of the receiver of the member at position: `engine` in `engine?.start()`"""
+    receiver = position - 2
+    while _text(index, receiver) in ('?', '!'):
+        receiver -= 1
+    return receiver
+
+def _type_of(types: Dict[str, Dict[str, Any]], index: SwiftIndex, position: int, owner: str,
+             locals_: Dict[str, str]) -> Optional[Tuple[str, bool]]:
+    """(type, is_static) of the expression ending at position, for the members of a receiver chain"""
+    text = _text(index, position)
+    if text == 'self':
+        return owner, False
+    if text == 'Self':
+        return owner, True
+    if _text(index, position - 1) == '.':
+        outer = _type_of(types, index, _receiver(index, position), owner, locals_)
+        if outer is None or outer[0] not in types:
+            return None
+        declared = types[outer[0]]['property_types'].get(text)
+        return (declared, False) if declared else None
+    if text in locals_:
+        return locals_[text], False
+    if text in types.get(owner, {}).get('property_types', {}):
+        return types[owner]['property_types'][text], False
+    if text in types:
+        return text, True
+    return None
+
+def _calls(types: Dict[str, Dict[str, Any]], unit: Unit) -> Tuple[List[tuple], List[tuple]]:
+    """(edges, hazards) of a unit: the members and initializers it reaches and the launch-slowing calls in it"""
+    path, index, boundary, owner, positions = unit
+    edges, hazards = [], []
+    locals_: Dict[str, str] = {}
+    members = types.get(owner, {}).get('members', {})
+    for position in positions:
+        if _deferred(index, position, boundary):
+            continue
+        token = index.tokens[position]
+        text = token.text
+        line = index.line(position)
+
+        hazard = launch_call(index, position)
+        if hazard:
+            hazards.append((line, hazard))
+
+        if text in ('let', 'var') and index.tokens[position + 1].kind == 'identifier':
+            # let engine = AudioEngine()
+            for p in range(position + 2, min(position + 12, len(index.tokens))):
+                if index.line(p) != line:
+                    break
+                if _text(index, p) in types:
+                    locals_[_text(index, position + 1)] = _text(index, p)
+                    break
+            continue
+        if token.kind != 'identifier':
+            continue
+
+        follows_dot = _text(index, position - 1) == '.'
+        calls = _text(index, position + 1) == '('
+        if not follows_dot and text in types and (calls or _text(index, position + 1) == '{'):
+            edges.append(((text, 'init'), path, line))
+        elif follows_dot:
+            receiver = _type_of(types, index, _receiver(index, position), owner, locals_)
+            if receiver is None or receiver[0] not in types:
+                continue
+            target = types[receiver[0]]
+            if text == 'init' and calls:
+                edges.append(((receiver[0], 'init'), path, line))
+            elif text in target['members'] and (calls or not receiver[1] or text in target['statics']):
+                edges.append(((receiver[0], text), path, line))
+        elif text in members and text not in locals_ and (calls or _text(index, position - 1) != 'func'):
+            edges.append(((owner, text), path, line))
+    return edges, hazards
+
+def _units(types: Dict[str, Dict[str, Any]], node: Tuple[str, str]) -> List[Unit]:
+    type_name, member = node
+    entry = types.get(type_name)
+    if entry is None:
+        return []
+    if member == 'init':
+        return entry['instance'] + entry['members'].get('init', [])
+    return entry['members'].get(member, [])
+
+def launch_roots(types: Dict[str, Dict[str, Any]]) -> Dict[Tuple[str, str], List[Unit]]:
+    """Code that runs before the first frame: App init and stored roots, app delegate launch, root onAppear"""
+    roots: Dict[Tuple[str, str], List[Unit]] = {}
+    for name, entry in types.items():
+        for path, index, scope in entry['scopes']:
+            if '@main' not in scope.attributes or 'App' not in scope.inherits:
+                continue
+            roots[(name, 'init')] = _units(types, (name, 'init'))
+            for position in range(scope.start + 1, scope.end):
+                if _text(index, position) == '@UIApplicationDelegateAdaptor' and _text(index, position + 2) in types:
+                    delegate = _text(index, position + 2)
+                    roots[(delegate, 'init')] = _units(types, (delegate, 'init'))
+                    roots[(delegate, 'didFinishLaunching')] = [
+                        unit for unit in types[delegate]['members'].get('application', [])
+                        if any(_text(unit[1], p) in LAUNCH_DELEGATE_METHODS
+                               for p in range(unit[2].start - 1, 0, -1) if unit[1].line(p) >= unit[2].line)
+                    ]
+            appear = [
+                (path, index, closure, name, list(range(closure.start + 1, closure.end)))
+                for closure in index.scopes
+                if closure.kind == 'closure' and closure.callee == 'onAppear' and scope.start < closure.start < scope.end
+            ]
+            if appear:
+                roots[(name, 'onAppear')] = appear
+    return roots
+
+def _label(node: Tuple[str, str]) -> str:
+    type_name, member = node
+    if member == 'onAppear':
+        return f"{type_name}.body.onAppear"
+    if member == 'didFinishLaunching':
+        return f"{type_name}.application(didFinishLaunchingWithOptions:)"
+    return f"{type_name}.{member}"
+
+def launch_graph(types: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Breadth-first walk from the launch roots: reached nodes, how each was reached and the hazards found"""
+    roots = launch_roots(types)
+    parents: Dict[Tuple[str, str], Optional[tuple]] = {root: None for root in roots}
+    hazards: Dict[Tuple[str, int], Dict[str, Any]] = {}
+    queue = deque(roots)
+    while queue:
+        node = queue.popleft()
+        for unit in roots.get(node) or _units(types, node):
+            edges, found = _calls(types, unit)
+            for line, (category, detail) in found:
+                hazards.setdefault((unit[0], line), {'node': node, 'category': category, 'detail': detail})
+            for target, path, line in edges:
+                if target not in parents and (target in roots or _units(types, target)):
+                    parents[target] = (node, path, line)
+                    queue.append(target)
+    return {'roots': list(roots), 'parents': parents, 'hazards': hazards}
+
+def chain(parents: Dict[Tuple[str, str], Optional[tuple]], node: Tuple[str, str]) -> List[tuple]:
+    """(node, call path, call line) from the launch root down to node"""
+    steps = []
+    while node is not None:
+        link = parents[node]
+        steps.append((node, link[1] if link else None, link[2] if link else None))
+        node = link[0] if link else None
+    return list(reversed(steps))
+
+def analyze_launch(files: List[str], added_lines: Dict[str, Set[int]],
+                   codebase_files: Optional[List[str]] = None,
+                   admit: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
+    """Launch-slowing work reachable from the @main App, flagging chains a PR adds to"""
+    codebase_files = tracked_swift_files() if codebase_files is None else codebase_files
+    types = index_project(sorted(set(codebase_files) | set(files)), admit)
+    graph = launch_graph(types)
+    parents = graph['parents']
+    results = {
+        'roots': [_label(root) for root in graph['roots']],
+        'reachable': len(parents),
+        'singletons': sorted(_label(n) for n in parents if n[1] in types.get(n[0], {}).get('singletons', set())),
+        'findings': [],
+        'by_category': {},
+        'issues': [],
+    }
+
+    for (path, line), hazard in sorted(graph['hazards'].items()):
+        steps = chain(parents, hazard['node'])
+        labels = [_label(node) for node, _, _ in steps]
+        new = line in added_lines.get(path, set()) or any(
+            call_line in added_lines.get(call_path, set()) for _, call_path, call_line in steps if call_path)
+        finding = {
+            'path': path,
+            'line': line,
+            'category': hazard['category'],
+            'detail': hazard['detail'],
+            'chain': labels,
+            'new': new,
+        }
+        results['findings'].append(finding)
+        results['by_category'][finding['category']] = results['by_category'].get(finding['category'], 0) + 1
+        if new:
+            results['issues'].append(
+                f"{path}:{line}: {CATEGORIES[finding['category']].lower()} ({finding['detail']}) runs at launch via "
+                f"{' → '.join(labels)}"
+            )
+
+    return results
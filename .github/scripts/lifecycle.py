@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Timer, Task and Observer Lifecycle Analysis for PR Assessment
+
+Sleep sessions run all night, so anything a type starts must be stopped.
+This analyzer pairs every repeating timer, long-running unstructured `Task`,
+block-based notification observer, display link, dispatch timer source and
+self-rescheduling `asyncAfter` loop with the invalidation, cancellation or
+removal that ends it. That stop has to happen in `deinit`, in `onDisappear`
+or in a stop/cancel-style method of the same type. Creations in changed code
+with no such stop are reported with their locations.
+"""
+
+import os
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import swift_tokens
+from swift_index import Scope, SwiftIndex, index_file
+
+KINDS = {
+    'timer': 'Repeating timer',
+    'task': 'Long-running Task',
+    'observer': 'Notification observer',
+    'display_link': 'Display link',
+    'dispatch_source': 'Dispatch timer source',
+    'dispatch_loop': 'Self-rescheduling dispatch loop',
+}
+
+# Calls that end each kind, made on the stored handle
+STOP_CALLS = {
+    'timer': {'invalidate'},
+    'task': {'cancel'},
+    'display_link': {'invalidate'},
+    'dispatch_source': {'cancel'},
+}
+
+# Methods that run when the owner stops, by name prefix
+STOP_PREFIXES = ('stop', 'cancel', 'invalidate', 'end', 'finish', 'pause', 'reset', 'teardown', 'tearDown',
+                 'cleanup', 'cleanUp', 'dismiss', 'close', 'disable', 'deactivate', 'remove', 'dismantle',
+                 'viewWillDisappear', 'viewDidDisappear', 'applicationWillTerminate', 'sceneDidDisconnect')
+
+# Closures that run when a view goes away
+STOP_CALLBACKS = {'onDisappear'}
+
+# Loop keywords that keep a Task body running until it is cancelled
+LOOP_KEYWORDS = {'while', 'repeat'}
+
+def _text(index: SwiftIndex, position: int) -> str:
+    return index.tokens[position].text if 0 <= position < len(index.tokens) else ''
+
+def _arguments_end(index: SwiftIndex, position: int) -> int:
+    """Token index of the `)` closing the arguments of the call at position, or position itself"""
+    if _text(index, position + 1) == '(':
+        return swift_tokens.matching_close(index.tokens, position + 1)
+    return position
+
+def _call_closure(index: SwiftIndex, position: int) -> Optional[Scope]:
+    """The closure passed to the call at position, as a labelled or trailing argument"""
+    end = _arguments_end(index, position) + 1
+    for scope in index.closures_after(position):
+        if scope.start > end:
+            break
+        if scope.parent is index.scope_at(position):
+            return scope
+    return None
+
+def _handle(index: SwiftIndex, start: int) -> tuple:
+    """(handle name, how it is bound) for the expression starting at start
+
+    Bound is 'property' for `name =` or `self.name =`, 'local' for `let name =`,
+    'discarded' when the result is dropped and 'returned' when handed to the caller.
+    """
+    previous = _text(index, start - 1)
+    if previous == 'return':
+        return None, 'returned'
+    if previous != '=':
+        return None, 'discarded'
+    name = _text(index, start - 2)
+    if name == '_':
+        return None, 'discarded'
+    if name in ('?', '!'):
+        name = _text(index, start - 3)
+    declared = _text(index, start - 3) in ('let', 'var')
+    if _text(index, start - 3) == ':' or _text(index, start - 4) == ':':
+        # let name: Type = ...
+        position = start - 2
+        while position > 0 and _text(index, position) not in ('let', 'var', ';', '{', '}'):
+            position -= 1
+        if _text(index, position) in ('let', 'var'):
+            return _text(index, position + 1), 'local' if index.scope_at(position).kind != 'type' else 'property'
+    if declared:
+        return name, 'local' if index.scope_at(start).kind != 'type' else 'property'
+    return name, 'property'
+
+def _type_name(scope: Scope) -> str:
+    owner = scope.enclosing_type()
+    return owner.name if owner else '<top level>'
+
+def in_stop_path(index: SwiftIndex, position: int) -> Optional[str]:
+    """Name of the deinit, stop method or onDisappear closure the token is in"""
+    for scope in index.scope_at(position).ancestors():
+        if scope.kind == 'closure' and scope.callee in STOP_CALLBACKS:
+            return f".{scope.callee}"
+        if scope.kind == 'function':
+            if scope.name == 'deinit' or scope.name.startswith(STOP_PREFIXES):
+                return scope.name
+            return None
+    return None
+
+def _unwrapped(index: SwiftIndex, position: int, name: str) -> str:
+    """The property behind a local binding: `if let observer = interruptionObserver` gives interruptionObserver"""
+    owner = index.owner(index.scope_at(position))
+    if owner is None or owner.start is None:
+        return name
+    for p in range(position - 1, owner.start, -1):
+        if _text(index, p) == name and _text(index, p - 1) in ('let', 'var', 'for') \
+                and _text(index, p + 1) in ('=', 'in') and index.tokens[p + 2].kind == 'identifier':
+            target = p + 2 + 2 * (_text(index, p + 2) == 'self' and _text(index, p + 3) == '.')
+            return _text(index, target)
+    return name
+
+def find_stops(index: SwiftIndex) -> List[Dict[str, Any]]:
+    """Every invalidate/cancel/removeObserver call, with its handle and whether it is on a stop path"""
+    stops = []
+    tokens = index.tokens
+    for position, token in enumerate(tokens):
+        if token.kind != 'identifier' or _text(index, position + 1) != '(':
+            continue
+        if token.text == 'removeObserver':
+            argument = _text(index, position + 2)
+            handle = _text(index, position + 4) if argument == 'self' and _text(index, position + 3) == '.' else argument
+            call = 'removeObserver'
+        elif _text(index, position - 1) == '.' and token.text in ('invalidate', 'cancel'):
+            receiver = position - 2
+            while _text(index, receiver) in ('?', '!'):
+                receiver -= 1
+            handle, call = _text(index, receiver), token.text
+        else:
+            continue
+        stops.append({
+            'type': _type_name(index.scope_at(position)),
+            'handle': _unwrapped(index, position, handle),
+            'call': call,
+            'position': position,
+            'stop_path': in_stop_path(index, position),
+        })
+    return stops
+
+def _closure_parameter(index: SwiftIndex, closure: Scope) -> Optional[str]:
+    """First parameter of a closure: `{ timer in` or `{ [weak self] timer in`"""
+    position = closure.start + 1
+    if _text(index, position) == '[':
+        while position < closure.end and _text(index, position) != ']':
+            position += 1
+        position += 1
+    if _text(index, position + 1) == 'in' or _text(index, position + 1) == ',':
+        return _text(index, position)
+    return None
+
+def _contains(index: SwiftIndex, scope: Scope, texts: Set[str], kind: str = None) -> bool:
+    return any(
+        t.text in texts and (kind is None or t.kind == kind)
+        for t in index.tokens[scope.start + 1:scope.end]
+    )
+
+def _runs_until_cancelled(index: SwiftIndex, closure: Scope) -> bool:
+    """Whether a Task body loops: `while`, `repeat` or `for await`"""
+    tokens = index.tokens
+    return any(
+        tokens[p].kind == 'keyword' and (tokens[p].text in LOOP_KEYWORDS or (tokens[p].text == 'for' and tokens[p + 1].text == 'await'))
+        for p in range(closure.start + 1, closure.end)
+    )
+
+def _reschedules_unconditionally(index: SwiftIndex, closure: Scope, function: str) -> bool:
+    """Whether a dispatched closure calls its enclosing function again with no guard or if around it"""
+    tokens = index.tokens
+    if _contains(index, closure, {'guard'}, 'keyword'):
+        return False
+    for p in range(closure.start + 1, closure.end):
+        if tokens[p].text != function or _text(index, p + 1) != '(':
+            continue
+        if _text(index, p - 1) == '.' and _text(index, p - 2) != 'self':
+            continue
+        conditional = False
+        for scope in index.scope_at(p).ancestors():
+            if scope is closure:
+                break
+            conditional |= scope.kind == 'control' and scope.keyword in ('if', 'switch', 'else')
+        if not conditional:
+            return True
+    return False
+
+def _expression_start(index: SwiftIndex, position: int) -> int:
+    """First token of the member chain ending at position, e.g. `NotificationCenter` in `NotificationCenter.default.addObserver`"""
+    start = position
+    while _text(index, start - 1) == '.' and index.tokens[start - 2].kind in ('identifier', 'keyword'):
+        start -= 2
+    return start
+
+def find_creations(index: SwiftIndex) -> List[Dict[str, Any]]:
+    """Timers, tasks, observers and loops that keep running until something stops them"""
+    creations = []
+    for position, token in enumerate(index.tokens):
+        if token.kind not in ('identifier', 'keyword'):
+            continue
+        text, following = token.text, _text(index, position + 1)
+        kind, detail, closure = None, '', None
+
+        if text == 'Timer' and following == '.' and _text(index, position + 2) == 'scheduledTimer':
+            end = _arguments_end(index, position + 2)
+            if any(index.tokens[p].text == 'repeats' and _text(index, p + 2) == 'false' for p in range(position, end)):
+                continue
+            kind, detail = 'timer', 'Timer.scheduledTimer'
+            closure = _call_closure(index, position + 2)
+        elif text == 'CADisplayLink' and following == '(':
+            kind, detail = 'display_link', 'CADisplayLink'
+        elif text == 'DispatchSource' and following == '.' and _text(index, position + 2) == 'makeTimerSource':
+            kind, detail = 'dispatch_source', 'DispatchSource.makeTimerSource'
+        elif text == 'Task' and _text(index, position - 1) != '.' and (following in ('{', '(') or (
+                following == '.' and _text(index, position + 2) == 'detached')):
+            closure = _call_closure(index, position + 2 if following == '.' else position)
+            if closure is None or not _runs_until_cancelled(index, closure):
+                continue
+            kind, detail = 'task', 'Task.detached' if following == '.' else 'Task {}'
+        elif text == 'addObserver' and _text(index, position - 1) == '.' and following == '(' \
+                and _text(index, position + 2) == 'forName':
+            kind, detail = 'observer', 'addObserver(forName:)'
+        elif text in ('asyncAfter', 'async') and _text(index, position - 1) == '.' and following == '(':
+            closure = _call_closure(index, position)
+            function = index.owner(index.scope_at(position))
+            if closure is None or function is None or function.kind != 'function':
+                continue
+            if not _reschedules_unconditionally(index, closure, function.name):
+                continue
+            kind, detail = 'dispatch_loop', f".{text} re-runs {function.name}()"
+        if kind is None:
+            continue
+
+        handle, bound = _handle(index, _expression_start(index, position))
+        creations.append({
+            'kind': kind,
+            'detail': detail,
+            'position': position,
+            'line': index.line(position),
+            'type': _type_name(index.scope_at(position)),
+            'function': index.function_at(position),
+            'handle': handle,
+            'bound': bound,
+            'closure': closure,
+        })
+    return creations
+
+def pair(creation: Dict[str, Any], stops: List[Dict[str, Any]], index: SwiftIndex) -> Optional[str]:
+    """Why the creation is never stopped, or None if a stop path ends it"""
+    kind, handle, bound = creation['kind'], creation['handle'], creation['bound']
+    same_type = [s for s in stops if s['type'] == creation['type']]
+
+    if kind == 'dispatch_loop':
+        return 'reschedules itself with no exit condition, so it runs until the app quits'
+    if bound == 'returned':
+        return None
+
+    closure = creation['closure']
+    if kind == 'timer' and closure is not None:
+        parameter = _closure_parameter(index, closure)
+        if parameter and any(s['handle'] == parameter and s['call'] == 'invalidate'
+                             and closure.start < s['position'] < closure.end for s in stops):
+            return None
+
+    if kind == 'observer':
+        removals = [s for s in same_type if s['call'] == 'removeObserver' and s['handle'] != 'self']
+        if bound == 'discarded':
+            return 'observer token is discarded, so the observer can never be removed'
+        if any(s['stop_path'] and (s['handle'] == handle or bound == 'local') for s in removals):
+            return None
+        return 'observer is never removed in deinit or a stop method'
+
+    if bound == 'discarded':
+        what = 'timer' if kind in ('timer', 'display_link', 'dispatch_source') else 'task'
+        return f"{what} is never stored, so nothing can {'invalidate' if what == 'timer' else 'cancel'} it"
+
+    calls = STOP_CALLS[kind]
+    matching = [s for s in same_type if s['handle'] == handle and s['call'] in calls]
+    if any(s['stop_path'] for s in matching):
+        return None
+    verb = '/'.join(sorted(calls))
+    if matching:
+        functions = sorted({index.function_at(s['position']).split('.')[-1] for s in matching})
+        return f"`{handle}` is only {verb}d in {', '.join(functions)}, not in deinit, onDisappear or a stop method"
+    return f"`{handle}` is never {verb}d"
+
+def analyze_index(index: SwiftIndex) -> Dict[str, Any]:
+    """Unmatched creations in one file, plus how many were paired with a stop"""
+    stops = find_stops(index)
+    unmatched, paired = [], 0
+    for creation in find_creations(index):
+        reason = pair(creation, stops, index)
+        if reason is None:
+            paired += 1
+            continue
+        unmatched.append({
+            'line': creation['line'],
+            'type': creation['type'],
+            'function': creation['function'],
+            'kind': creation['kind'],
+            'detail': creation['detail'],
+            'handle': creation['handle'],
+            'reason': reason,
+        })
+    return {'findings': unmatched, 'paired': paired}
+
+def analyze_lifecycles(files: List[str], added_lines: Dict[str, Set[int]],
+                       admit: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
+    """Find timers, tasks and observers in changed Swift files that nothing stops"""
+    results = {'findings': [], 'paired': 0, 'by_kind': {}, 'issues': []}
+
+    for path in files:
+        if not path.endswith('.swift') or not os.path.exists(path):
+            continue
+        if admit and not admit(path):
+            continue
+        try:
+            analysis = analyze_index(index_file(path))
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error scanning {path} for lifecycle leaks: {e}")
+            continue
+
+        results['paired'] += analysis['paired']
+        added = added_lines.get(path, set())
+        for finding in analysis['findings']:
+            finding = {'path': path, **finding, 'new': finding['line'] in added}
+            results['findings'].append(finding)
+            results['by_kind'][finding['kind']] = results['by_kind'].get(finding['kind'], 0) + 1
+            if finding['new']:
+                results['issues'].append(
+                    f"{path}:{finding['line']} in {finding['function']}: {KINDS[finding['kind']].lower()} "
+                    f"({finding['detail']}) {finding['reason']}"
+                )
+
+    return results
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Localization Catalog Analysis for PR Assessment
+
+Diffs the base and head versions of changed `.xcstrings` catalogs key by
+key. Changed keys are taken from the diff hunks, and only those entries are
+decoded from either version, so the work scales with the number of changed
+keys rather than the size of the catalog.
+"""
+
+import json
+import os
+import re
+import subprocess
+from collections import defaultdict
+from typing import Any, Dict, IO, Iterable, List, Optional, Set, Tuple
+
+import json_stream
+from audio_assets import git_blob_size
+
+CATALOG_EXTENSION = '.xcstrings'
+SWIFT_ROOT = 'SoundScape'
+
+# Xcode writes catalog entries at four spaces and locales at eight
+ENTRY_KEY = re.compile(r'^    ("(?:[^"\\]|\\.)*") : \{')
+LOCALE_KEY = re.compile(r'^        "([A-Za-z0-9_-]+)" : \{')
+
+SWIFT_STRING = re.compile(r'"((?:[^"\\\n]|\\.)*)"')
+SWIFT_INTERPOLATION = re.compile(r'\\\((?:[^()]|\([^()]*\))*\)')
+FORMAT_SPECIFIER = re.compile(r'%(?:\d+\$)?(?:ll|l|h|hh|q|z|t|j)?[@dDiuUxXoOfFeEgGcCsSaAp]')
+PLACEHOLDER = '\u0000'
+
+def changed_keys_from_diff(diff_lines: Iterable[str]) -> Tuple[Set[str], Set[int], Set[int]]:
+    """Catalog keys whose entries the diff touches
+
+    Changes whose entry header lies outside the hunk context cannot be
+    attributed from the diff alone; their base and head line numbers are
+    returned so the owning keys can be found with a line scan.
+    """
+    keys = set()
+    base_lines = set()
+    head_lines = set()
+    owner = None
+    base_line = head_line = 0
+
+    for line in diff_lines:
+        if line.startswith('@@'):
+            match = re.match(r'@@ -(\d+)(?:,\d+)? \+(\d+)', line)
+            base_line, head_line = (int(match.group(1)), int(match.group(2))) if match else (0, 0)
+            owner = None
+            continue
+        if not line or line[0] not in ' +-':
+            continue
+
+        marker, content = line[0], line[1:]
+        match = ENTRY_KEY.match(content)
+        if match:
+            owner = json.loads(match.group(1))
+            if marker != ' ':
+                keys.add(owner)
+        elif marker != ' ':
+            if owner is not None:
+                keys.add(owner)
+            elif content.startswith('    '):
+                (head_lines if marker == '+' else base_lines).add(head_line if marker == '+' else base_line)
+
+        if marker != '+':
+            base_line += 1
+        if marker != '-':
+            head_line += 1
+
+    return keys, base_lines, head_lines
+
+def owners_of_lines(stream: Optional[IO[str]], line_numbers: Set[int]) -> Set[str]:
+    """Keys of the entries containing the given line numbers (text scan only)"""
+    owners = set()
+    if stream is None or not line_numbers:
+        return owners
+
+    owner = None
+    last = max(line_numbers)
+    for number, line in enumerate(stream, 1):
+        match = ENTRY_KEY.match(line)
+        if match:
+            owner = json.loads(match.group(1))
+        if number in line_numbers and owner is not None:
+            owners.add(owner)
+        if number >= last:
+            break
+    return owners
+
+def split_file_diffs(diff_content: str) -> Dict[str, List[str]]:
+    """Split a unified diff into hunk lines per new-side path"""
+    sections = defaultdict(list)
+    current = None
+    in_header = False
+
+    for line in diff_content.split('\n'):
+        if line.startswith('diff --git '):
+            current = None
+            in_header = True
+        elif in_header and line.startswith('+++ '):
+            target = line[4:].strip()
+            if target.startswith('b/'):
+                current = target[2:]
+            in_header = False
+        elif in_header and line.startswith('--- '):
+            source = line[4:].strip()
+            # Deleted catalogs have no new side; attribute them to the old path
+            current = source[2:] if source.startswith('a/') else None
+        elif current is not None and not in_header:
+            sections[current].append(line)
+
+    return dict(sections)
+
+def open_revision(ref: Optional[str], path: str) -> Tuple[Optional[IO[str]], Optional[subprocess.Popen]]:
+    """Text stream of path at ref (or the working tree when ref is None)"""
+    if ref is None:
+        if not os.path.exists(path):
+            return None, None
+        return open(path, 'r', encoding='utf-8'), None
+
+    process = subprocess.Popen(
+        ['git', 'show', f"{ref}:{path}"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        encoding='utf-8'
+    )
+    return process.stdout, process
+
+def read_entries(ref: Optional[str], path: str, keys: Set[str]) -> Dict[str, Any]:
+    """Decode only the requested catalog entries"""
+    stream, process = open_revision(ref, path)
+    if stream is None:
+        return {}
+
+    entries = {}
+    try:
+        for key, entry in json_stream.kvitems(stream, 'strings', keys):
+            entries[key] = entry
+            if len(entries) == len(keys):
+                break
+    except ValueError:
+        # Missing at this revision (git show printed nothing) or malformed
+        entries = {}
+    finally:
+        stream.close()
+        if process:
+            process.wait()
+
+    return entries
+
+def catalog_locales(path: str) -> Tuple[str, Set[str]]:
+    """Source language and every locale used in the head catalog"""
+    source_language = 'en'
+    locales = set()
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            match = LOCALE_KEY.match(line)
+            if match:
+                locales.add(match.group(1))
+            elif line.startswith('  "sourceLanguage"'):
+                source_language = json.loads(line.split(':', 1)[1].strip().rstrip(','))
+    return source_language, locales
+
+def translated_locales(entry: Dict[str, Any]) -> Set[str]:
+    """Locales with a translated string unit (or translated plural variations)"""
+    def is_translated(node: Any) -> bool:
+        if not isinstance(node, dict):
+            return False
+        unit = node.get('stringUnit')
+        if unit:
+            return unit.get('state') == 'translated'
+        return any(is_translated(child) for child in node.values())
+
+    return {locale for locale, data in entry.get('localizations', {}).items() if is_translated(data)}
+
+def normalize_literal(text: str) -> str:
+    """Collapse format specifiers and Swift interpolations to one placeholder"""
+    text = SWIFT_INTERPOLATION.sub(PLACEHOLDER, text)
+    return FORMAT_SPECIFIER.sub(PLACEHOLDER, text)
+
+def find_swift_references(keys: Set[str], root: str = SWIFT_ROOT) -> Dict[str, List[str]]:
+    """Swift files containing a string literal that matches each key"""
+    wanted = {normalize_literal(key): key for key in keys}
+    references = defaultdict(list)
+    if not wanted:
+        return {}
+
+    for directory, _, files in os.walk(root):
+        for name in files:
+            if not name.endswith('.swift'):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            except (OSError, UnicodeDecodeError):
+                continue
+            for literal in SWIFT_STRING.findall(content):
+                key = wanted.get(normalize_literal(literal.replace('\\"', '"')))
+                if key is not None and path not in references[key]:
+                    references[key].append(path)
+
+    return dict(references)
+
+def analyze_catalog(path: str, diff_lines: List[str], base_ref: str) -> Dict[str, Any]:
+    """Key-by-key diff of one catalog between base and head"""
+    keys, base_lines, head_lines = changed_keys_from_diff(diff_lines)
+
+    for ref, line_numbers in ((base_ref, base_lines), (None, head_lines)):
+        if line_numbers:
+            stream, process = open_revision(ref, path)
+            try:
+                keys |= owners_of_lines(stream, line_numbers)
+            finally:
+                if stream:
+                    stream.close()
+                if process:
+                    process.wait()
+
+    base_entries = read_entries(base_ref, path, keys) if keys else {}
+    head_entries = read_entries(None, path, keys) if keys else {}
+
+    added = sorted(key for key in keys if key in head_entries and key not in base_entries)
+    removed = sorted(key for key in keys if key in base_entries and key not in head_entries)
+    modified = sorted(key for key in keys if key in base_entries and key in head_entries
+                      and base_entries[key] != head_entries[key])
+
+    source_language, locales = catalog_locales(path) if os.path.exists(path) else ('en', set())
+    target_locales = locales - {source_language}
+
+    missing_translations = {}
+    missing_by_locale = defaultdict(int)
+    stale_keys = []
+    for key in added + modified:
+        entry = head_entries[key]
+        if entry.get('extractionState') == 'stale':
+            stale_keys.append(key)
+        if entry.get('shouldTranslate') is False:
+            continue
+        missing = sorted(target_locales - translated_locales(entry))
+        if missing:
+            missing_translations[key] = missing
+            for locale in missing:
+                missing_by_locale[locale] += 1
+
+    references = find_swift_references(set(removed) | set(stale_keys))
+
+    base_size = git_blob_size(base_ref, path)
+    head_size = os.path.getsize(path) if os.path.exists(path) else 0
+
+    return {
+        'source_language': source_language,
+        'locales': sorted(locales),
+        'changed_keys': len(added) + len(removed) + len(modified),
+        'added_keys': added,
+        'removed_keys': removed,
+        'modified_keys': modified,
+        'missing_translations': missing_translations,
+        'missing_by_locale': dict(missing_by_locale),
+        'removed_keys_still_referenced': {key: references[key] for key in removed if key in references},
+        'stale_keys_referenced': {key: references[key] for key in stale_keys if key in references},
+        'size_base_bytes': base_size,
+        'size_head_bytes': head_size,
+        'size_delta_bytes': head_size - base_size,
+        'keys_found_by_line_scan': bool(base_lines or head_lines),
+    }
+
+def analyze_localization(changed_files: List[Dict[str, Any]], diff_content: str, base_ref: str) -> Dict[str, Any]:
+    """Analyze every changed string catalog"""
+    catalogs = [f['path'] for f in changed_files if f['path'].endswith(CATALOG_EXTENSION)]
+    if not catalogs:
+        return {}
+
+    sections = split_file_diffs(diff_content)
+    results = {path: analyze_catalog(path, sections.get(path, []), base_ref) for path in catalogs}
+
+    issues = []
+    for path, result in results.items():
+        for key, files in result['removed_keys_still_referenced'].items():
+            issues.append(f"{path}: removed key \"{key}\" is still used in {', '.join(files)}")
+        for key, files in result['stale_keys_referenced'].items():
+            issues.append(f"{path}: key \"{key}\" is marked stale but used in {', '.join(files)}")
+        if result['missing_translations']:
+            counts = ', '.join(f"{locale}: {count}" for locale, count in sorted(result['missing_by_locale'].items()))
+            issues.append(f"{path}: {len(result['missing_translations'])} changed keys lack translations ({counts})")
+
+    return {'catalogs': results, 'issues': issues}
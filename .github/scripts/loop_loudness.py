@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Seamless-Loop and Loudness Check for Ambient Sound Assets
+
+Computes integrated loudness (ITU-R BS.1770 with K-weighting applied in the
+frequency domain), sample peak and loop-seam discontinuity for changed sound
+assets. Samples are read from memory-mapped WAV buffers in fixed-size
+chunks, so hour-long renders never have to fit in memory.
+
+This stage is optional and needs NumPy. MP3 assets are analyzed through a
+PCM/WAV render of the same name in --pcm-renders, or rendered on the fly
+when ffmpeg is installed.
+"""
+
+import math
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# A loop seam is a click when its sample step is this many times the average step
+CLICK_RATIO = 10.0
+# Steps quieter than this are inaudible regardless of the ratio
+CLICK_FLOOR_DBFS = -50.0
+# Window compared on both sides of the seam
+SEAM_WINDOW_SECONDS = 0.05
+# Level difference between the end and the start of the loop that is audible as a jump
+MAX_SEAM_LEVEL_JUMP_DB = 3.0
+# Allowed deviation from the median loudness of the catalog
+MAX_LOUDNESS_JUMP_LU = 3.0
+
+SEGMENT_SECONDS = 0.1  # 400 ms gating blocks are built from four 100 ms segments
+CHUNK_SEGMENTS = 600   # one minute of audio per chunk
+
+def read_wav_header(filepath: str) -> Dict[str, Any]:
+    """Locate the fmt and data chunks of a RIFF/WAVE file"""
+    with open(filepath, 'rb') as f:
+        riff, _, wave = struct.unpack('<4sI4s', f.read(12))
+        if riff != b'RIFF' or wave != b'WAVE':
+            raise ValueError(f"{filepath} is not a RIFF/WAVE file")
+
+        fmt = None
+        while True:
+            chunk_header = f.read(8)
+            if len(chunk_header) < 8:
+                raise ValueError(f"{filepath} has no data chunk")
+            chunk_id, chunk_size = struct.unpack('<4sI', chunk_header)
+
+            if chunk_id == b'fmt ':
+                body = f.read(chunk_size)
+                format_tag, channels, sample_rate, _, _, bits = struct.unpack('<HHIIHH', body[:16])
+                if format_tag == 0xFFFE and len(body) >= 26:
+                    format_tag = struct.unpack('<H', body[24:26])[0]
+                fmt = {'format_tag': format_tag, 'channels': channels,
+                       'sample_rate': sample_rate, 'bits': bits}
+            elif chunk_id == b'data':
+                if fmt is None:
+                    raise ValueError(f"{filepath} has data before fmt chunk")
+                fmt['data_offset'] = f.tell()
+                fmt['data_bytes'] = chunk_size
+                return fmt
+            else:
+                f.seek(chunk_size, 1)
+
+            if chunk_size % 2:
+                f.seek(1, 1)
+
+class PCMBuffer:
+    """Memory-mapped WAV samples returned as float64 chunks in [-1, 1]"""
+
+    def __init__(self, filepath: str):
+        header = read_wav_header(filepath)
+        self.channels = header['channels']
+        self.sample_rate = header['sample_rate']
+        bits = header['bits']
+        width = bits // 8
+        self.frames = header['data_bytes'] // (width * self.channels)
+
+        if header['format_tag'] == 3:
+            dtype = {4: '<f4', 8: '<f8'}[width]
+            self.scale = 1.0
+        elif width == 3:
+            dtype = 'u1'
+            self.scale = float(1 << 23)
+        else:
+            dtype = {1: 'u1', 2: '<i2', 4: '<i4'}[width]
+            self.scale = float(1 << (bits - 1))
+
+        shape = (self.frames, self.channels, 3) if width == 3 else (self.frames, self.channels)
+        self.width = width
+        self.format_tag = header['format_tag']
+        self.samples = np.memmap(filepath, dtype=dtype, mode='r',
+                                 offset=header['data_offset'], shape=shape)
+
+    def read(self, start: int, stop: int):
+        raw = self.samples[start:stop]
+        if self.width == 3:
+            raw = raw.astype(np.int32)
+            values = raw[..., 0] | (raw[..., 1] << 8) | (raw[..., 2] << 16)
+            values = np.where(values >= 1 << 23, values - (1 << 24), values)
+            return values.astype(np.float64) / self.scale
+        if self.width == 1 and self.format_tag != 3:
+            return (raw.astype(np.float64) - 128.0) / 128.0
+        return raw.astype(np.float64) / self.scale
+
+def _biquad_power(b: Tuple[float, ...], a: Tuple[float, ...], omega):
+    z = np.exp(-1j * omega)
+    numerator = b[0] + b[1] * z + b[2] * z * z
+    denominator = a[0] + a[1] * z + a[2] * z * z
+    return np.abs(numerator / denominator) ** 2
+
+def k_weighting_power(sample_rate: int, segment_length: int):
+    """Squared magnitude of the BS.1770 K-weighting filter at rfft bins
+
+    Filter design follows libebur128, which reproduces the BS.1770 reference
+    coefficients at 48 kHz and re-derives them for other sample rates.
+    """
+    omega = 2 * np.pi * np.fft.rfftfreq(segment_length)
+
+    # Stage 1: high-shelf (+4 dB above ~1.7 kHz)
+    fc, gain, q = 1681.974450955533, 3.999843853973347, 0.7071752369554196
+    k = math.tan(math.pi * fc / sample_rate)
+    vh = 10 ** (gain / 20)
+    vb = vh ** 0.4996667741545416
+    a0 = 1 + k / q + k * k
+    shelf_b = ((vh + vb * k / q + k * k) / a0, 2 * (k * k - vh) / a0, (vh - vb * k / q + k * k) / a0)
+    shelf_a = (1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0)
+
+    # Stage 2: RLB high-pass (~38 Hz)
+    fc, q = 38.13547087602444, 0.5003270373238773
+    k = math.tan(math.pi * fc / sample_rate)
+    a0 = 1 + k / q + k * k
+    highpass_b = (1.0, -2.0, 1.0)
+    highpass_a = (1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0)
+
+    return _biquad_power(shelf_b, shelf_a, omega) * _biquad_power(highpass_b, highpass_a, omega)
+
+def _to_dbfs(value: float) -> Optional[float]:
+    return round(20 * math.log10(value), 2) if value > 0 else None
+
+def analyze_pcm(filepath: str) -> Dict[str, Any]:
+    """Integrated loudness, peak and loop-seam metrics for a WAV file"""
+    pcm = PCMBuffer(filepath)
+    segment = max(1, int(pcm.sample_rate * SEGMENT_SECONDS))
+    weights = k_weighting_power(pcm.sample_rate, segment)
+
+    # Parseval weights for a one-sided spectrum: interior bins count twice
+    parseval = np.full(weights.shape, 2.0)
+    parseval[0] = 1.0
+    if segment % 2 == 0:
+        parseval[-1] = 1.0
+    weights = weights * parseval / (segment * segment)
+
+    segment_energy = []
+    peak = 0.0
+    abs_step_sum = 0.0
+    previous = None
+    chunk_frames = segment * CHUNK_SEGMENTS
+
+    for start in range(0, pcm.frames, chunk_frames):
+        chunk = pcm.read(start, min(start + chunk_frames, pcm.frames))
+        peak = max(peak, float(np.abs(chunk).max(initial=0.0)))
+
+        steps = np.abs(np.diff(chunk, axis=0))
+        abs_step_sum += float(steps.max(axis=1).sum())
+        if previous is not None:
+            abs_step_sum += float(np.abs(chunk[0] - previous).max())
+        previous = chunk[-1]
+
+        whole = (len(chunk) // segment) * segment
+        if whole:
+            blocks = chunk[:whole].reshape(-1, segment, pcm.channels)
+            spectrum = np.fft.rfft(blocks, axis=1)
+            power = (spectrum.real ** 2 + spectrum.imag ** 2) * weights[None, :, None]
+            segment_energy.append(power.sum(axis=1))
+
+    integrated = None
+    if segment_energy:
+        energy = np.concatenate(segment_energy).sum(axis=1)
+        if len(energy) >= 4:
+            # 400 ms blocks with 75% overlap
+            blocks = np.convolve(energy, np.full(4, 0.25), mode='valid')
+            with np.errstate(divide='ignore'):
+                block_loudness = -0.691 + 10 * np.log10(blocks)
+            gated = blocks[block_loudness > -70.0]
+            if len(gated):
+                relative_gate = -0.691 + 10 * math.log10(gated.mean()) - 10.0
+                with np.errstate(divide='ignore'):
+                    gated = gated[-0.691 + 10 * np.log10(gated) > relative_gate]
+                if len(gated):
+                    integrated = round(-0.691 + 10 * math.log10(gated.mean()), 2)
+
+    window = max(1, min(int(pcm.sample_rate * SEAM_WINDOW_SECONDS), pcm.frames // 2))
+    head = pcm.read(0, window)
+    tail = pcm.read(pcm.frames - window, pcm.frames)
+    step = float(np.abs(head[0] - tail[-1]).max()) if pcm.frames else 0.0
+    mean_step = abs_step_sum / max(1, pcm.frames - 1)
+    head_rms = float(np.sqrt(np.mean(head ** 2))) if len(head) else 0.0
+    tail_rms = float(np.sqrt(np.mean(tail ** 2))) if len(tail) else 0.0
+    level_jump = abs(20 * math.log10(head_rms / tail_rms)) if head_rms > 0 and tail_rms > 0 else 0.0
+    step_ratio = step / mean_step if mean_step > 0 else 0.0
+
+    return {
+        'duration_seconds': round(pcm.frames / pcm.sample_rate, 2),
+        'sample_rate': pcm.sample_rate,
+        'channels': pcm.channels,
+        'integrated_lufs': integrated,
+        'peak_dbfs': _to_dbfs(peak),
+        'seam': {
+            'step_dbfs': _to_dbfs(step),
+            'step_ratio': round(step_ratio, 2),
+            'level_jump_db': round(level_jump, 2),
+            'click': step_ratio > CLICK_RATIO and step > 10 ** (CLICK_FLOOR_DBFS / 20),
+        },
+    }
+
+def render_to_wav(filepath: str, output_dir: str) -> Optional[str]:
+    """Decode an asset to WAV with ffmpeg, if available"""
+    if shutil.which('ffmpeg') is None:
+        return None
+    output = os.path.join(output_dir, os.path.splitext(os.path.basename(filepath))[0] + '.wav')
+    result = subprocess.run(
+        ['ffmpeg', '-v', 'error', '-y', '-i', filepath, '-f', 'wav', output],
+        capture_output=True,
+        text=True
+    )
+    return output if result.returncode == 0 else None
+
+def analyze_loop_loudness(asset_paths: List[str], render_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Check changed sound assets for loop clicks and loudness jumps"""
+    if np is None:
+        return {'unavailable': 'numpy is not installed'}
+
+    renders = {}
+    if render_dir and os.path.isdir(render_dir):
+        for name in os.listdir(render_dir):
+            if name.lower().endswith('.wav'):
+                renders[os.path.splitext(name)[0]] = os.path.join(render_dir, name)
+
+    results = {}
+    skipped = []
+    with tempfile.TemporaryDirectory(prefix='loop_check_') as temp_dir:
+        for path in asset_paths:
+            stem = os.path.splitext(os.path.basename(path))[0]
+            if path.lower().endswith('.wav') and os.path.exists(path):
+                source = path
+            else:
+                source = renders.get(stem) or (render_to_wav(path, temp_dir) if os.path.exists(path) else None)
+
+            if source is None:
+                skipped.append(path)
+                continue
+
+            try:
+                results[path] = analyze_pcm(source)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Error analyzing loop/loudness for {path}: {e}")
+                skipped.append(path)
+
+    # Reference loudness: the local renders of the sounds the PR does not change
+    changed_stems = {os.path.splitext(os.path.basename(a))[0] for a in asset_paths}
+    reference = {}
+    for stem, render in sorted(renders.items()):
+        if stem in changed_stems:
+            continue
+        try:
+            reference[stem] = analyze_pcm(render)['integrated_lufs']
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error analyzing reference render {render}: {e}")
+            skipped.append(render)
+    loudness_values = [v for v in reference.values() if v is not None]
+    # Without references there is no catalog to compare against
+    median = float(np.median(loudness_values)) if loudness_values else None
+
+    issues = []
+    for path, result in results.items():
+        seam = result['seam']
+        if seam['click']:
+            issues.append(f"{path}: loop seam click ({seam['step_dbfs']} dBFS step, {seam['step_ratio']}x average)")
+        if seam['level_jump_db'] > MAX_SEAM_LEVEL_JUMP_DB:
+            issues.append(f"{path}: level jumps {seam['level_jump_db']} dB across the loop seam")
+        if median is not None and result['integrated_lufs'] is not None:
+            result['loudness_delta_lu'] = round(result['integrated_lufs'] - median, 2)
+            if abs(result['loudness_delta_lu']) > MAX_LOUDNESS_JUMP_LU:
+                issues.append(
+                    f"{path}: {result['integrated_lufs']} LUFS is {result['loudness_delta_lu']:+.1f} LU from the catalog median"
+                )
+        if result['peak_dbfs'] is not None and result['peak_dbfs'] >= -0.1:
+            issues.append(f"{path}: peak {result['peak_dbfs']} dBFS is clipping")
+
+    return {
+        'assets': results,
+        'skipped': skipped,
+        'reference_median_lufs': round(median, 2) if median is not None else None,
+        'reference_renders': len(loudness_values),
+        'issues': issues,
+    }
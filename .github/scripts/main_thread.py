@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Main-Thread Blocking Analysis for PR Assessment
+
+Walks `@MainActor` types and functions, SwiftUI `View` bodies and the
+closures SwiftUI runs on the main thread (`.onAppear`, `.task`, ...), and
+flags synchronous work there that stalls UI: file I/O, bulk `UserDefaults`
+reads, JSON decoding and audio session activation. Each finding names the
+function it is in and whether the PR added the line.
+"""
+
+import os
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from swift_index import Scope, SwiftIndex, index_file
+
+SWIFT_ROOT = 'SoundScape'
+
+# Types whose members run on the main actor
+MAIN_ACTOR_PROTOCOLS = {'View', 'App', 'Scene', 'UIViewController', 'UIView', 'UIViewRepresentable',
+                        'UIViewControllerRepresentable', 'UIApplicationDelegate'}
+
+# SwiftUI modifiers whose closures run on the main thread
+MAIN_CALLBACKS = {
+    'onAppear', 'onDisappear', 'task', 'onChange', 'onReceive', 'onTapGesture', 'onLongPressGesture',
+    'onSubmit', 'onOpenURL', 'refreshable', 'onContinueUserActivity', 'onPreferenceChange',
+}
+
+# Closures that run synchronously in the caller's context
+INLINE_CALLEES = {
+    'map', 'compactMap', 'flatMap', 'filter', 'reduce', 'forEach', 'first', 'contains', 'allSatisfy',
+    'sorted', 'sort', 'min', 'max', 'removeAll', 'firstIndex', 'lastIndex', 'withAnimation', 'Task',
+    'run', 'withCheckedContinuation', 'withCheckedThrowingContinuation', 'withTransaction',
+}
+
+CATEGORIES = {
+    'file_io': 'Synchronous file I/O',
+    'user_defaults': 'Bulk UserDefaults read',
+    'json_decoding': 'JSON decoding',
+    'audio_session': 'Audio session activation',
+}
+
+FILE_READ_INITIALIZERS = {'Data', 'String', 'NSData', 'NSString', 'NSDictionary', 'NSArray', 'UIImage'}
+# FileManager methods that only build directory URLs
+FILE_MANAGER_LOOKUPS = {'urls', 'url'}
+BULK_DEFAULTS_READS = {'data', 'array', 'dictionary', 'stringArray', 'dictionaryRepresentation'}
+DECODERS = {'JSONDecoder', 'PropertyListDecoder', 'NSKeyedUnarchiver'}
+AUDIO_SESSION_CALLS = {'setActive', 'setCategory'}
+
+# Declarations whose @MainActor attribute or UI conformance isolates the named type
+MAIN_ACTOR_KEYWORDS = {'class', 'struct', 'enum', 'actor'}
+MAIN_PROTOCOL_KEYWORDS = {'class', 'struct', 'extension'}
+
+def main_actor_types(index: SwiftIndex) -> Set[str]:
+    """Names of types an index declares @MainActor or conforming to a UI protocol"""
+    names = set()
+    for scope in index.types():
+        if scope.keyword in MAIN_ACTOR_KEYWORDS and '@MainActor' in scope.attributes:
+            names.add(scope.name)
+        elif scope.keyword in MAIN_PROTOCOL_KEYWORDS and set(scope.inherits) & MAIN_ACTOR_PROTOCOLS:
+            names.add(scope.name)
+    return names
+
+def project_main_actor_types(root: str = SWIFT_ROOT, admit: Optional[Callable[[str], bool]] = None) -> Set[str]:
+    """Names of types declared @MainActor or conforming to a UI protocol anywhere under root"""
+    names = set()
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            if not filename.endswith('.swift'):
+                continue
+            if admit and not admit(path):
+                continue
+            try:
+                # Shared with the per-file analyzers, so each file is tokenized once
+                names.update(main_actor_types(index_file(path)))
+            except (OSError, UnicodeDecodeError):
+                continue
+    return names
+
+def main_context(index: SwiftIndex, scope: Scope, main_types: Set[str]) -> Optional[str]:
+    """Why code in scope runs on the main thread, or None if it may not"""
+    for current in scope.ancestors():
+        if current.kind == 'closure':
+            if '@MainActor' in current.attributes:
+                return '@MainActor closure'
+            callee = current.callee or ''
+            if callee in MAIN_CALLBACKS:
+                return f".{callee} closure"
+            if callee in ('async', 'asyncAfter', 'sync'):
+                return 'DispatchQueue.main' if current.receiver.endswith('main') else None
+            if callee == 'detached':
+                return None
+            if not (callee in INLINE_CALLEES or callee[:1].isupper()):
+                # Completion handlers and other escaping closures may run anywhere
+                return None
+        elif current.kind in ('function', 'property', 'accessor'):
+            if 'nonisolated' in current.modifiers:
+                return None
+            if '@MainActor' in current.attributes:
+                return f"@MainActor {current.name}"
+            owner = current.enclosing_type()
+            if current.kind == 'property' and current.name == 'body' and owner and 'View' in owner.inherits:
+                return f"{owner.name}.body"
+        elif current.kind == 'type':
+            if '@MainActor' in current.attributes:
+                return f"@MainActor {current.name}"
+            if set(current.inherits) & MAIN_ACTOR_PROTOCOLS:
+                return f"{current.name} ({', '.join(sorted(set(current.inherits) & MAIN_ACTOR_PROTOCOLS))})"
+            if current.name in main_types:
+                return f"@MainActor {current.name}"
+            # Nested types do not inherit isolation from the outer type
+            return None
+    return None
+
+def blocking_call(index: SwiftIndex, position: int) -> Optional[tuple]:
+    """(category, detail) if the token at position starts a main-thread blocking call"""
+    tokens = index.tokens
+    token = tokens[position]
+    text = token.text
+
+    def at(offset: int) -> str:
+        return tokens[position + offset].text if 0 <= position + offset < len(tokens) else ''
+
+    if token.kind != 'identifier':
+        return None
+    if text == 'FileManager' and at(1) == '.' and at(2) == 'default':
+        method = at(4) if at(3) == '.' else ''
+        if method in FILE_MANAGER_LOOKUPS:
+            return None
+        return 'file_io', f"FileManager.default.{method}" if method else 'FileManager.default'
+    if text in FILE_READ_INITIALIZERS and at(1) == '(' and at(2) in ('contentsOf', 'contentsOfFile'):
+        return 'file_io', f"{text}({at(2)}:)"
+    if text == 'FileHandle':
+        return 'file_io', 'FileHandle'
+    if at(-1) == '.' and text == 'write' and at(1) == '(' and at(2) in ('to', 'toFile'):
+        return 'file_io', f".write({at(2)}:)"
+    if at(-1) == '.' and text in BULK_DEFAULTS_READS and at(1) == '(':
+        receiver = at(-2) if at(-2) not in ('?', '!') else at(-3)
+        if receiver.endswith(('Defaults', 'defaults', 'standard')):
+            return 'user_defaults', f"UserDefaults.{text}()"
+    if text in DECODERS:
+        return 'json_decoding', text
+    if text == 'JSONSerialization' and at(1) == '.' and at(2) == 'jsonObject':
+        return 'json_decoding', 'JSONSerialization.jsonObject'
+    if at(-1) == '.' and text in AUDIO_SESSION_CALLS and at(1) == '(':
+        return 'audio_session', f".{text}()"
+    return None
+
+def analyze_index(index: SwiftIndex, main_types: Set[str]) -> List[Dict[str, Any]]:
+    findings = []
+    for position in range(len(index.tokens)):
+        hazard = blocking_call(index, position)
+        if not hazard:
+            continue
+        scope = index.scope_at(position)
+        reason = main_context(index, scope, main_types)
+        if reason is None:
+            continue
+        findings.append({
+            'line': index.line(position),
+            'function': index.function_at(position),
+            'category': hazard[0],
+            'detail': hazard[1],
+            'context': reason,
+        })
+    return findings
+
+def analyze_main_thread(files: List[str], added_lines: Dict[str, Set[int]],
+                        main_types: Optional[Set[str]] = None,
+                        admit: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
+    """Find blocking work on the main thread in changed Swift files"""
+    if main_types is None:
+        main_types = project_main_actor_types(admit=admit)
+    results = {'findings': [], 'by_category': {}, 'issues': []}
+
+    for path in files:
+        if not path.endswith('.swift') or not os.path.exists(path):
+            continue
+        if admit and not admit(path):
+            continue
+        try:
+            findings = analyze_index(index_file(path), main_types)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error scanning {path} for main-thread blocking: {e}")
+            continue
+
+        added = added_lines.get(path, set())
+        for finding in findings:
+            finding = {'path': path, **finding, 'new': finding['line'] in added}
+            results['findings'].append(finding)
+            results['by_category'][finding['category']] = results['by_category'].get(finding['category'], 0) + 1
+            if finding['new']:
+                results['issues'].append(
+                    f"{path}:{finding['line']} in {finding['function']}: {CATEGORIES[finding['category']].lower()} "
+                    f"({finding['detail']}) on the main thread via {finding['context']}"
+                )
+
+    return results
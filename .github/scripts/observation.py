@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+SwiftUI Observation Fan-Out Analysis for PR Assessment
+
+A change to an observed property re-evaluates every view that reads it.
+Those views then rebuild the view trees under them. With `@Observable`,
+only the views that read that particular property are invalidated. With an
+`ObservableObject`, any `@Published` change invalidates every view that holds
+the object. This analyzer indexes the models and views across the project:
+which views bind which models (`@Environment(Model.self)`, `@Bindable`,
+`@ObservedObject` and stored references), which properties each view reads,
+and which views each view's body builds. For the properties a PR adds,
+writes or starts reading, it reports how many views each one invalidates. It
+flags properties that timers, audio taps or playback observers update many
+times a second when they are observed by large view trees.
+"""
+
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from frame_cost import evaluate
+from swift_index import Scope, SwiftIndex, index_file, tracked_swift_files
+
+# Callbacks that fire many times a second
+HIGH_FREQUENCY_CALLEES = {
+    'scheduledTimer': 'timer',
+    'installTap': 'audio tap',
+    'addPeriodicTimeObserver': 'playback time observer',
+}
+
+# `\(binding.property` inside a string literal
+INTERPOLATED_READ = re.compile(r'\\\(\s*\$?(\w+)\s*\.\s*(\w+)')
+
+# Views re-evaluated, counting the trees under the readers, before a high-frequency property is flagged
+FANOUT_THRESHOLD = 5
+
+def _text(index: SwiftIndex, position: int) -> str:
+    return index.tokens[position].text if 0 <= position < len(index.tokens) else ''
+
+def _model_kind(scope: Scope) -> Optional[str]:
+    if scope.keyword == 'class' and '@Observable' in scope.attributes:
+        return 'observable'
+    if 'ObservableObject' in scope.inherits:
+        return 'object'
+    return None
+
+def _observed_properties(index: SwiftIndex, model: Scope, kind: str) -> Dict[str, int]:
+    """Properties whose changes reach observers, with their declaration lines"""
+    return {
+        d.name: d.line for d in index.declarations
+        if d.kind == 'property' and d.parent is model and d.keyword == 'var'
+        and not {'static', 'private'}.intersection(d.modifiers)
+        and '@ObservationIgnored' not in d.attributes and (kind == 'observable' or '@Published' in d.attributes)
+    }
+
+def _arguments(index: SwiftIndex, closure: Scope) -> Dict[str, List[str]]:
+    """Labelled arguments of the call a trailing closure is passed to"""
+    close = closure.start - 1
+    open_paren = index.call_open(close)
+    if open_paren is None:
+        return {}
+    arguments, label, depth = {}, None, 0
+    for position in range(open_paren + 1, close):
+        text = _text(index, position)
+        if depth == 0 and text == ',':
+            label = None
+        elif depth == 0 and label is None and _text(index, position + 1) == ':':
+            label = text
+            arguments[label] = []
+        elif label is not None and not (depth == 0 and text == ':' and not arguments[label]):
+            arguments[label].append(text)
+        depth += text in ('(', '[')
+        depth -= text in (')', ']')
+    return arguments
+
+def _source(index: SwiftIndex, closure: Scope) -> Optional[tuple]:
+    """(callback, seconds between calls) for a high-frequency callback closure, else None"""
+    if closure.kind != 'closure' or closure.callee not in HIGH_FREQUENCY_CALLEES:
+        return None
+    arguments = _arguments(index, closure)
+    if closure.callee == 'scheduledTimer' and arguments.get('repeats') != ['true']:
+        # A one-shot timer fires once
+        return None
+    interval = arguments.get('withTimeInterval') or arguments.get('forInterval') or []
+    if 'seconds' in interval:
+        # CMTime(seconds: 0.1, preferredTimescale: 600)
+        start = interval.index('seconds') + 2
+        end = interval.index(',', start) if ',' in interval[start:] else len(interval) - 1
+        interval = interval[start:end]
+    return HIGH_FREQUENCY_CALLEES[closure.callee], evaluate(interval) if interval else None
+
+def _writes(index: SwiftIndex, model: Scope, properties: Dict[str, int]) -> List[tuple]:
+    """(property, token index) of every assignment to a property inside the model"""
+    writes = []
+    for position in range(model.start + 1, model.end):
+        name = _text(index, position)
+        if name not in properties:
+            continue
+        if _text(index, position - 1) == '.' and 'self' not in (_text(index, position - 2), _text(index, position - 3)):
+            # other.name, but self.name and self?.name are this instance
+            continue
+        following, after = _text(index, position + 1), _text(index, position + 2)
+        if (following == '=' and after != '=') or (following in ('+', '-', '*', '/') and after == '='):
+            if index.scope_at(position).kind != 'type':
+                writes.append((name, position))
+    return writes
+
+def _final_tick(index: SwiftIndex, position: int, callback: Scope) -> bool:
+    """Whether position sits in a branch of the callback, or of a method it calls, that invalidates the timer"""
+    for scope in index.scope_at(position).ancestors():
+        if scope is callback:
+            return False
+        if scope.kind == 'control' and any(
+                _text(index, p) == 'invalidate' and _text(index, p + 1) == '(' for p in range(scope.start, scope.end)):
+            return True
+    return False
+
+def _update_source(index: SwiftIndex, position: int, model: Scope,
+                   ticks: Dict[str, tuple]) -> Optional[tuple]:
+    """(callback, interval) of the high-frequency callback a write runs in, directly or via a method"""
+    for scope in index.scope_at(position).ancestors():
+        if scope is model:
+            break
+        source = _source(index, scope)
+        if source:
+            return None if _final_tick(index, position, scope) else source
+        if scope.kind == 'function' and scope.name in ticks:
+            return None if _final_tick(index, position, scope) else ticks[scope.name]
+    return None
+
+def index_models(index: SwiftIndex, path: str) -> Dict[str, Dict[str, Any]]:
+    """Observable models declared in one file, with property writes and how often they happen"""
+    models = {}
+    for model in index.types():
+        kind = _model_kind(model)
+        if kind is None or model.start is None:
+            continue
+        properties = _observed_properties(index, model, kind)
+
+        # Methods called from inside high-frequency callbacks also run at that rate
+        ticks = {}
+        for scope in index.scopes:
+            source = _source(index, scope)
+            if source and model.start < scope.start < model.end:
+                for position in range(scope.start + 1, scope.end):
+                    if _text(index, position + 1) == '(' and index.tokens[position].kind == 'identifier' \
+                            and not _final_tick(index, position, scope):
+                        ticks.setdefault(_text(index, position), source)
+
+        entry = {'path': path, 'kind': kind, 'properties': {}}
+        for name, line in properties.items():
+            entry['properties'][name] = {'line': line, 'write_lines': [], 'high_frequency': None, 'interval': None}
+        for name, position in _writes(index, model, properties):
+            prop = entry['properties'][name]
+            prop['write_lines'].append(index.line(position))
+            source = _update_source(index, position, model, ticks)
+            if source and (prop['interval'] is None or (source[1] or 1) < prop['interval']):
+                prop['high_frequency'], prop['interval'] = source
+        models[model.name] = entry
+    return models
+
+def index_views(index: SwiftIndex, path: str, models: Dict[str, Dict[str, Any]],
+                view_names: Set[str]) -> Dict[str, Dict[str, Any]]:
+    """Views declared in one file: the models they bind, what they read and the views they build"""
+    views = {}
+    for view in index.types():
+        if view.name not in view_names or view.start is None:
+            continue
+        bindings: Dict[str, str] = {}
+        for position in range(view.start + 1, view.end):
+            if _text(index, position) not in ('var', 'let') or index.scope_at(position) is not view:
+                continue
+            line = index.line(position)
+            first = position
+            while first > 0 and index.line(first - 1) == line:
+                first -= 1
+            last = position
+            while last + 1 < len(index.tokens) and index.line(last + 1) == line:
+                last += 1
+            bound = next((_text(index, p) for p in range(first, last + 1) if _text(index, p) in models), None)
+            if bound:
+                bindings[_text(index, position + 1)] = bound
+
+        reads: Dict[str, Dict[str, List[int]]] = {}
+        children: Set[str] = set()
+        for position in range(view.start + 1, view.end):
+            if index.tokens[position].kind == 'string':
+                for name, prop in INTERPOLATED_READ.findall(index.tokens[position].text):
+                    if name in bindings and prop in models[bindings[name]]['properties']:
+                        reads.setdefault(bindings[name], {}).setdefault(prop, []).append(index.line(position))
+                continue
+            text = _text(index, position).lstrip('$')
+            if text in bindings and _text(index, position + 1) == '.':
+                model, prop = bindings[text], _text(index, position + 2)
+            elif text in models and _text(index, position + 1) == '.' and _text(index, position + 2) == 'shared' \
+                    and _text(index, position + 3) == '.':
+                model, prop = text, _text(index, position + 4)
+            else:
+                if text in view_names and text != view.name and _text(index, position + 1) in ('(', '{'):
+                    children.add(text)
+                continue
+            if prop in models[model]['properties']:
+                reads.setdefault(model, {}).setdefault(prop, []).append(index.line(position))
+        views[view.name] = {'path': path, 'bindings': bindings, 'reads': reads, 'children': children}
+    return views
+
+def build_index(paths: List[str], admit: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
+    """Models and views across the project"""
+    indexes = {}
+    for path in paths:
+        if not path.endswith('.swift') or not os.path.exists(path):
+            continue
+        if admit and not admit(path):
+            continue
+        try:
+            indexes[path] = index_file(path)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error indexing {path} for observation: {e}")
+
+    models, view_names = {}, set()
+    for path, index in indexes.items():
+        models.update(index_models(index, path))
+        view_names.update(t.name for t in index.types() if 'View' in t.inherits and t.keyword == 'struct')
+    views = {}
+    for path, index in indexes.items():
+        views.update(index_views(index, path, models, view_names))
+    return {'models': models, 'views': views}
+
+def view_tree(views: Dict[str, Dict[str, Any]], roots: Set[str]) -> Set[str]:
+    """The roots plus every view their bodies build, transitively"""
+    seen, stack = set(), list(roots)
+    while stack:
+        name = stack.pop()
+        if name in seen or name not in views:
+            continue
+        seen.add(name)
+        stack.extend(views[name]['children'])
+    return seen
+
+def invalidated_views(project: Dict[str, Any], model: str, prop: str) -> Set[str]:
+    """Views whose body re-runs when model.prop changes"""
+    views = project['views']
+    if project['models'][model]['kind'] == 'object':
+        # objectWillChange fires for every @Published property
+        return {name for name, view in views.items() if model in view['bindings'].values()}
+    return {name for name, view in views.items() if prop in view['reads'].get(model, {})}
+
+def analyze_observation(files: List[str], added_lines: Dict[str, Set[int]],
+                        codebase_files: Optional[List[str]] = None,
+                        admit: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
+    """Fan-out of the observed properties a PR adds, writes or starts reading"""
+    codebase_files = tracked_swift_files() if codebase_files is None else codebase_files
+    project = build_index(sorted(set(codebase_files) | set(files)), admit)
+    models, views = project['models'], project['views']
+    results = {'models': len(models), 'views': len(views), 'properties': [], 'issues': []}
+
+    changed = {}
+    for name, model in models.items():
+        added = added_lines.get(model['path'], set())
+        for prop, info in model['properties'].items():
+            if info['line'] in added or added & set(info['write_lines']):
+                changed[(name, prop)] = info['line']
+    for view in views.values():
+        added = added_lines.get(view['path'], set())
+        for model, props in view['reads'].items():
+            for prop, lines in props.items():
+                if added & set(lines):
+                    changed.setdefault((model, prop), models[model]['properties'][prop]['line'])
+
+    for (model, prop), line in sorted(changed.items()):
+        info = models[model]['properties'][prop]
+        readers = invalidated_views(project, model, prop)
+        tree = view_tree(views, readers)
+        rate = 1 / info['interval'] if info['interval'] else None
+        entry = {
+            'path': models[model]['path'],
+            'line': line,
+            'model': model,
+            'property': prop,
+            'views': sorted(readers),
+            'tree_size': len(tree),
+            'high_frequency': info['high_frequency'],
+            'updates_per_second': rate,
+        }
+        results['properties'].append(entry)
+        if info['high_frequency'] and len(tree) >= FANOUT_THRESHOLD:
+            how_often = f"{rate:g} times a second" if rate else "continuously"
+            results['issues'].append(
+                f"{entry['path']}:{line}: {model}.{prop} is updated {how_often} by a {info['high_frequency']} "
+                f"and re-evaluates {len(tree)} views ({len(readers)} read it directly)"
+            )
+
+    return results
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Path Rules for PR Assessment
+
+Classifies repository paths by ordered rules, CODEOWNERS style: when several
+rules match a path, the one listed last wins. A rule is either a substring
+(`contains`) or a glob with `*`, `?` and `**`. Globs without a slash match
+at any depth, globs with one are anchored at the repository root, and a glob
+whose last segment has no wildcard also matches everything beneath it.
+
+Rules are compiled once into a segment automaton. Results are memoized per
+directory in a trie-shaped cache, so paths that share directories only pay
+for their file name.
+"""
+
+import fnmatch
+import re
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+DOUBLE_STAR = '**'
+
+class PathRule(NamedTuple):
+    label: str
+    kind: str     # 'contains' or 'glob'
+    pattern: str
+
+class CompiledGlob(NamedTuple):
+    segments: Tuple[Optional[re.Pattern], ...]   # None stands for `**`
+    matches_contents: bool
+
+def compile_glob(pattern: str) -> CompiledGlob:
+    """Split a CODEOWNERS-style glob into per-segment matchers"""
+    if not pattern.strip('/'):
+        raise ValueError(f"empty path glob '{pattern}'")
+    anchored = '/' in pattern.rstrip('/')
+    directory_only = pattern.endswith('/')
+    parts = [part for part in pattern.strip('/').split('/') if part]
+    if not anchored:
+        parts.insert(0, DOUBLE_STAR)
+
+    segments = []
+    for part in parts:
+        if part == DOUBLE_STAR:
+            if not segments or segments[-1] is not None:
+                segments.append(None)
+        else:
+            segments.append(re.compile(fnmatch.translate(part)))
+
+    last = parts[-1]
+    matches_contents = directory_only or last == DOUBLE_STAR or not any(c in last for c in '*?[')
+    return CompiledGlob(tuple(segments), matches_contents)
+
+class PathRuleMatcher:
+    """Ordered path rules compiled into a memoized segment automaton"""
+
+    def __init__(self, rules: Iterable[Tuple[str, str, str]]):
+        self.rules = [PathRule(*rule) for rule in rules]
+        self.globs: Dict[int, CompiledGlob] = {}
+        self.segment_literals: List[Tuple[int, str]] = []
+        self.spanning_literals: List[Tuple[int, str]] = []
+
+        for index, rule in enumerate(self.rules):
+            if rule.kind == 'glob':
+                self.globs[index] = compile_glob(rule.pattern)
+            elif rule.kind == 'contains':
+                # A literal without a slash can only match inside one segment
+                target = self.spanning_literals if '/' in rule.pattern else self.segment_literals
+                target.append((index, rule.pattern))
+            else:
+                raise ValueError(f"unknown path rule kind '{rule.kind}' for '{rule.pattern}'")
+
+        start = set()
+        for index in self.globs:
+            self._advance_epsilon(start, index, 0)
+        # Directory -> (automaton states, rule ids matched by the directory or its segments)
+        self._directories: Dict[str, Tuple[FrozenSet[Tuple[int, int]], FrozenSet[int]]] = {
+            '': (frozenset(start), frozenset()),
+        }
+        self._segments: Dict[str, FrozenSet[int]] = {}
+        self._paths: Dict[str, List[str]] = {}
+
+    def _advance_epsilon(self, states: Set[Tuple[int, int]], index: int, position: int):
+        states.add((index, position))
+        segments = self.globs[index].segments
+        # `**` may match zero segments
+        if position < len(segments) and segments[position] is None:
+            self._advance_epsilon(states, index, position + 1)
+
+    def _step(self, states: FrozenSet[Tuple[int, int]], segment: str) -> Set[Tuple[int, int]]:
+        following = set()
+        for index, position in states:
+            segments = self.globs[index].segments
+            if position >= len(segments):
+                continue
+            matcher = segments[position]
+            if matcher is None:
+                self._advance_epsilon(following, index, position)
+            elif matcher.match(segment):
+                self._advance_epsilon(following, index, position + 1)
+        return following
+
+    def _complete(self, states: Iterable[Tuple[int, int]]) -> Set[int]:
+        return {index for index, position in states if position == len(self.globs[index].segments)}
+
+    def _segment_matches(self, segment: str) -> FrozenSet[int]:
+        if segment not in self._segments:
+            self._segments[segment] = frozenset(
+                index for index, literal in self.segment_literals if literal in segment
+            )
+        return self._segments[segment]
+
+    def _directory(self, directory: str) -> Tuple[FrozenSet[Tuple[int, int]], FrozenSet[int]]:
+        cached = self._directories.get(directory)
+        if cached is not None:
+            return cached
+        parent, _, name = directory.rpartition('/')
+        parent_states, parent_matches = self._directory(parent)
+        states = self._step(parent_states, name)
+        # A completed glob on a directory covers its contents when its last segment is literal
+        matched = {index for index in self._complete(states) if self.globs[index].matches_contents}
+        result = (frozenset(states), parent_matches | matched | self._segment_matches(name))
+        self._directories[directory] = result
+        return result
+
+    def matching_rules(self, path: str) -> Set[int]:
+        """Indexes of every rule that matches path"""
+        directory, _, name = path.rpartition('/')
+        states, matched = self._directory(directory)
+        result = set(matched)
+        result |= self._segment_matches(name)
+        result |= self._complete(self._step(states, name))
+        result.update(index for index, literal in self.spanning_literals if literal in path)
+        return result
+
+    def labels(self, path: str) -> List[str]:
+        """Labels of the rules matching path, highest precedence first"""
+        if path not in self._paths:
+            labels = []
+            for index in sorted(self.matching_rules(path), reverse=True):
+                if self.rules[index].label not in labels:
+                    labels.append(self.rules[index].label)
+            self._paths[path] = labels
+        return self._paths[path]
+
+    def classify(self, path: str, default: str = 'Other') -> str:
+        labels = self.labels(path)
+        return labels[0] if labels else default
+
+    def classify_all(self, paths: Iterable[str]) -> Dict[str, List[str]]:
+        """Labels for every path in one pass over the shared directory cache"""
+        return {path: self.labels(path) for path in paths}
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Xcode Project Analysis for PR Assessment
+
+Parses `project.pbxproj` (OpenStep plist) in-process into an index of file
+references, group paths and target build phases. Indexes are cached per git
+blob SHA, so the base revision is parsed at most once across runs. The
+analysis reports added Swift files missing from their target, dangling
+references and duplicate build-phase entries introduced by the PR.
+"""
+
+import json
+import os
+import re
+import subprocess
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+PROJECT_PATH = 'SoundScape/SoundScape.xcodeproj/project.pbxproj'
+CACHE_DIR = '.pr-analysis-cache/pbxproj'
+
+# Bump when the cached index layout changes
+INDEX_VERSION = 1
+
+# Expected target for added Swift files, by longest matching path prefix
+TARGET_ROOTS = [
+    ('SoundScape/SoundScapeWidget/', 'SoundScapeWidgetExtension'),
+    ('SoundScape/Tests/', 'SoundScapeTests'),
+    ('SoundScape/', 'SoundScape'),
+]
+
+EMPTY_INDEX = {'files': {}, 'targets': {}, 'broken_references': [], 'duplicates': [], 'cache_hit': False}
+
+# Source trees that do not resolve to a path in the repository
+EXTERNAL_SOURCE_TREES = {'BUILT_PRODUCTS_DIR', 'SDKROOT', 'DEVELOPER_DIR'}
+
+TOKEN = re.compile(r'''
+    (?P<skip>\s+|//[^\n]*|/\*.*?\*/)
+  | "(?P<quoted>(?:[^"\\]|\\.)*)"
+  | (?P<bare>[A-Za-z0-9_$+/:.\-]+)
+  | (?P<punct>[{}()=;,])
+''', re.S | re.X)
+
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '"': '"', '\\': '\\', "'": "'"}
+
+def _unescape(text: str) -> str:
+    if '\\' not in text:
+        return text
+    return re.sub(r'\\(U[0-9a-fA-F]{4}|.)', lambda m: chr(int(m.group(1)[1:], 16)) if len(m.group(1)) == 5
+                  else ESCAPES.get(m.group(1), m.group(1)), text)
+
+def tokenize(text: str) -> List[Tuple[str, str]]:
+    """Split an OpenStep plist into (kind, value) tokens, dropping comments"""
+    tokens = []
+    position = 0
+    for match in TOKEN.finditer(text):
+        if match.start() != position:
+            raise ValueError(f"Unexpected character at offset {position}")
+        position = match.end()
+        kind = match.lastgroup
+        if kind == 'skip':
+            continue
+        value = match.group(kind)
+        tokens.append(('string' if kind != 'punct' else 'punct', _unescape(value) if kind == 'quoted' else value))
+    if position != len(text):
+        raise ValueError(f"Unexpected character at offset {position}")
+    return tokens
+
+def parse_plist(text: str) -> Any:
+    """Parse OpenStep plist text into dicts, lists and strings"""
+    tokens = tokenize(text)
+    index = 0
+
+    def expect(value: str):
+        nonlocal index
+        if index >= len(tokens) or tokens[index] != ('punct', value):
+            raise ValueError(f"Expected '{value}' at token {index}")
+        index += 1
+
+    def parse_value() -> Any:
+        nonlocal index
+        if index >= len(tokens):
+            raise ValueError("Unexpected end of input")
+        kind, value = tokens[index]
+        index += 1
+        if kind == 'string':
+            return value
+        if value == '{':
+            result = {}
+            while tokens[index] != ('punct', '}'):
+                key = parse_value()
+                expect('=')
+                result[key] = parse_value()
+                expect(';')
+            index += 1
+            return result
+        if value == '(':
+            result = []
+            while tokens[index] != ('punct', ')'):
+                result.append(parse_value())
+                if tokens[index] == ('punct', ','):
+                    index += 1
+            index += 1
+            return result
+        raise ValueError(f"Unexpected '{value}' at token {index - 1}")
+
+    return parse_value()
+
+def build_index(plist: Dict[str, Any]) -> Dict[str, Any]:
+    """Resolve file paths and target build phases from the object graph"""
+    objects = plist.get('objects', {})
+    project = objects.get(plist.get('rootObject'), {})
+    broken = []
+
+    # Walk groups from the main group, accumulating paths relative to the project directory
+    files = {}
+    pending = [(project.get('mainGroup'), project.get('projectDirPath', ''))]
+    while pending:
+        object_id, parent_path = pending.pop()
+        node = objects.get(object_id)
+        if node is None:
+            broken.append(f"group child {object_id} does not exist")
+            continue
+        tree = node.get('sourceTree', '<group>')
+        path = node.get('path', '')
+        if tree in EXTERNAL_SOURCE_TREES:
+            resolved = None
+        elif tree == '<group>':
+            resolved = os.path.normpath(os.path.join(parent_path, path)) if path else parent_path
+        elif tree == 'SOURCE_ROOT':
+            resolved = os.path.normpath(os.path.join(project.get('projectDirPath', ''), path))
+        else:
+            resolved = path
+        if 'children' in node:
+            pending.extend((child, resolved) for child in node['children'])
+        else:
+            files[object_id] = resolved
+
+    targets = {}
+    for target_id in project.get('targets', []):
+        target = objects.get(target_id)
+        if target is None:
+            broken.append(f"target {target_id} does not exist")
+            continue
+        phases = {}
+        for phase_id in target.get('buildPhases', []):
+            phase = objects.get(phase_id)
+            if phase is None:
+                broken.append(f"{target.get('name')}: build phase {phase_id} does not exist")
+                continue
+            name = phase.get('name') or phase.get('isa', '').replace('PBX', '').replace('BuildPhase', '')
+            entries = []
+            for build_file_id in phase.get('files', []):
+                build_file = objects.get(build_file_id)
+                if build_file is None:
+                    broken.append(f"{target.get('name')}/{name}: build file {build_file_id} does not exist")
+                    continue
+                reference = build_file.get('fileRef') or build_file.get('productRef')
+                if reference not in objects:
+                    broken.append(f"{target.get('name')}/{name}: build file {build_file_id} references missing {reference}")
+                entries.append([build_file_id, reference])
+            phases[name] = entries
+        targets[target.get('name', target_id)] = phases
+
+    return {
+        'version': INDEX_VERSION,
+        'object_count': len(objects),
+        'files': files,
+        'targets': targets,
+        'broken_references': broken,
+    }
+
+def duplicate_entries(index: Dict[str, Any]) -> List[str]:
+    """Build-phase entries that list the same file more than once"""
+    duplicates = []
+    for target, phases in index['targets'].items():
+        for phase, entries in phases.items():
+            by_reference = defaultdict(int)
+            for build_file_id, reference in entries:
+                by_reference[reference] += 1
+            for reference, count in by_reference.items():
+                if count > 1:
+                    path = index['files'].get(reference) or reference
+                    duplicates.append(f"{target}/{phase}: {path} listed {count} times")
+    return duplicates
+
+def blob_sha(ref: Optional[str], path: str) -> Optional[str]:
+    """Git blob SHA of path at ref, or of the working tree file when ref is None"""
+    command = ['git', 'hash-object', path] if ref is None else ['git', 'rev-parse', f"{ref}:{path}"]
+    result = subprocess.run(command, capture_output=True, text=True)
+    return result.stdout.strip() if result.returncode == 0 else None
+
+def load_index(ref: Optional[str], path: str = PROJECT_PATH, cache_dir: str = CACHE_DIR) -> Optional[Dict[str, Any]]:
+    """Parsed project index for path at ref, reusing the cache entry for its blob"""
+    sha = blob_sha(ref, path)
+    if sha is None:
+        return None
+
+    cache_path = os.path.join(cache_dir, f"{sha}.json")
+    try:
+        with open(cache_path, 'r') as f:
+            index = json.load(f)
+        if index.get('version') == INDEX_VERSION:
+            index['cache_hit'] = True
+            return index
+    except (OSError, ValueError):
+        pass
+
+    if ref is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+    else:
+        text = subprocess.run(['git', 'cat-file', 'blob', sha], capture_output=True, text=True, check=True).stdout
+
+    start = time.time()
+    index = build_index(parse_plist(text))
+    index['duplicates'] = duplicate_entries(index)
+    index['parse_seconds'] = round(time.time() - start, 3)
+    index['blob_sha'] = sha
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cache_path, 'w') as f:
+            json.dump(index, f)
+    except OSError as e:
+        print(f"Warning: could not cache project index: {e}")
+
+    index['cache_hit'] = False
+    return index
+
+def expected_target(path: str) -> Optional[str]:
+    for prefix, target in TARGET_ROOTS:
+        if path.startswith(prefix):
+            return target
+    return None
+
+def tracked_files(ref: str) -> Set[str]:
+    """Every path tracked at ref"""
+    result = subprocess.run(['git', 'ls-tree', '-r', '--name-only', ref], capture_output=True, text=True)
+    return set(result.stdout.split('\n')) if result.returncode == 0 else set()
+
+def analyze_project(changed_files: List[Dict[str, Any]], base_ref: str, path: str = PROJECT_PATH) -> Dict[str, Any]:
+    """Target membership and reference integrity for the PR's project changes"""
+    changed_paths = [f['path'] for f in changed_files]
+    project_changed = path in changed_paths
+    base_files = tracked_files(base_ref)
+    added_swift = [p for p in changed_paths if p.endswith('.swift') and p not in base_files and os.path.exists(p)]
+
+    if not (project_changed or added_swift) or not os.path.exists(path):
+        return {}
+
+    head = load_index(None, path)
+    base = (load_index(base_ref, path) if project_changed else head) or EMPTY_INDEX
+
+    # Index paths are relative to the directory containing the .xcodeproj
+    root = os.path.dirname(os.path.dirname(path))
+    head_files = {ref: os.path.join(root, p) if p else None for ref, p in head['files'].items()}
+
+    members = defaultdict(set)
+    for target, phases in head['targets'].items():
+        for entries in phases.values():
+            for _, reference in entries:
+                file_path = head_files.get(reference)
+                if file_path:
+                    members[file_path].add(target)
+
+    missing_membership = []
+    for file_path in added_swift:
+        target = expected_target(file_path)
+        if target and target not in members.get(file_path, set()):
+            missing_membership.append({'path': file_path, 'expected_target': target,
+                                       'targets': sorted(members.get(file_path, set()))})
+
+    # A missing path is new if the reference is new or its file existed at base
+    dangling = []
+    for reference, file_path in head_files.items():
+        if file_path and not os.path.exists(file_path):
+            is_new = reference not in base['files'] or file_path in base_files
+            dangling.append({'path': file_path, 'reference': reference, 'new': is_new})
+
+    new_broken = sorted(set(head['broken_references']) - set(base['broken_references']))
+    new_duplicates = sorted(set(head['duplicates']) - set(base['duplicates']))
+
+    issues = [f"{m['path']} is not compiled by the {m['expected_target']} target" for m in missing_membership]
+    issues += [f"{path}: file reference to missing {d['path']}" for d in dangling if d['new']]
+    issues += [f"{path}: {b}" for b in new_broken]
+    issues += [f"{path}: duplicate build-phase entry, {d}" for d in new_duplicates]
+
+    return {
+        'project': path,
+        'project_changed': project_changed,
+        'object_count': head['object_count'],
+        'targets': {name: {phase: len(entries) for phase, entries in phases.items()}
+                    for name, phases in head['targets'].items()},
+        'added_swift_files': len(added_swift),
+        'missing_target_membership': missing_membership,
+        'dangling_references': dangling,
+        'broken_references': new_broken,
+        'duplicate_entries': new_duplicates,
+        'cache': {'head': head['cache_hit'], 'base': base['cache_hit']},
+        'issues': issues,
+    }
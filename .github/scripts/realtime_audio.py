@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Real-Time Audio Thread Analysis for PR Assessment
+
+Finds closures that Core Audio runs on its real-time threads (AVAudioSourceNode
+render blocks, AVAudioSinkNode receivers, installTap blocks and closures typed
+as render blocks) and flags work inside them that can block or allocate:
+allocation, locking, collection growth, logging, dispatching to queues and
+Objective-C messaging. Any of these can miss the render deadline and glitch
+playback.
+"""
+
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import swift_tokens
+from swift_index import index_file
+from swift_tokens import Token
+
+# Constructors and methods whose closure argument runs on an audio thread,
+# with the argument labels that closure may be passed under
+REALTIME_CALLS = {
+    'AVAudioSourceNode': ('renderBlock',),
+    'AVAudioSinkNode': ('receiverBlock',),
+    'installTap': ('block',),
+    'setManualRenderingInputPCMFormat': ('inputBlock',),
+}
+
+# Closures declared with one of these types are render callbacks
+REALTIME_BLOCK_TYPES = {
+    'AVAudioSourceNodeRenderBlock', 'AVAudioSinkNodeReceiverBlock', 'AVAudioNodeTapBlock',
+    'AURenderBlock', 'AUInternalRenderBlock', 'AURenderPullInputBlock', 'AVAudioIONodeInputBlock',
+}
+
+CATEGORIES = {
+    'allocation': 'Allocation',
+    'locking': 'Locking',
+    'collection_growth': 'Collection growth',
+    'logging': 'Logging',
+    'dispatch': 'Dispatch / concurrency',
+    'objc': 'Objective-C messaging',
+}
+
+# Free functions, called as name(...)
+FUNCTION_HAZARDS = {
+    'print': 'logging', 'debugPrint': 'logging', 'dump': 'logging', 'NSLog': 'logging', 'os_log': 'logging',
+    'malloc': 'allocation', 'calloc': 'allocation', 'realloc': 'allocation',
+    'pthread_mutex_lock': 'locking', 'os_unfair_lock_lock': 'locking', 'objc_sync_enter': 'locking',
+}
+
+# Methods, called as .name(...) or with a trailing closure
+METHOD_HAZARDS = {
+    'append': 'collection_growth', 'insert': 'collection_growth', 'reserveCapacity': 'collection_growth',
+    'merge': 'collection_growth', 'updateValue': 'collection_growth',
+    'allocate': 'allocation', 'map': 'allocation', 'compactMap': 'allocation', 'flatMap': 'allocation',
+    'filter': 'allocation', 'sorted': 'allocation', 'joined': 'allocation', 'components': 'allocation',
+    'lock': 'locking', 'withLock': 'locking', 'wait': 'locking', 'sync': 'locking',
+    'perform': 'objc', 'setValue': 'objc', 'post': 'objc',
+}
+
+# Type names that signal the hazard wherever they appear
+TYPE_HAZARDS = {
+    'DispatchQueue': 'dispatch', 'DispatchGroup': 'dispatch', 'OperationQueue': 'dispatch',
+    'MainActor': 'dispatch', 'Task': 'dispatch',
+    'NSLock': 'locking', 'NSRecursiveLock': 'locking', 'NSCondition': 'locking',
+    'DispatchSemaphore': 'locking', 'OSAllocatedUnfairLock': 'locking',
+    'NotificationCenter': 'objc', 'UserDefaults': 'objc',
+}
+
+# Initializers that allocate heap storage
+ALLOCATING_TYPES = {
+    'Array', 'ContiguousArray', 'Dictionary', 'Set', 'String', 'Data', 'AVAudioPCMBuffer',
+    'NSMutableArray', 'NSMutableData', 'NSMutableDictionary', 'NSString', 'NSNumber',
+}
+
+# Objective-C class prefixes, and the C types and constants that share them
+OBJC_PREFIX = re.compile(r'^(?:NS|UI|CA|AV)[A-Z]')
+OBJC_SAFE_NAMES = {
+    'AVAudioFrameCount', 'AVAudioFramePosition', 'AVAudioPacketCount', 'AVAudioChannelCount',
+    'AVAudioNodeBus', 'AVAudioFormat', 'NSEC_PER_SEC', 'NSEC_PER_MSEC',
+}
+
+def realtime_closures(tokens: List[Token]) -> List[Dict[str, Any]]:
+    """Closures run on an audio thread, as token ranges with the API that runs them"""
+    closures = []
+    for index, token in enumerate(tokens):
+        start = None
+        if token.text in REALTIME_CALLS and token.kind == 'identifier':
+            start = _closure_argument(tokens, index, REALTIME_CALLS[token.text])
+        elif token.text in REALTIME_BLOCK_TYPES and index + 2 < len(tokens):
+            # let render: AURenderBlock = { ... }
+            if tokens[index - 1].text == ':' and tokens[index + 1].text == '=' and tokens[index + 2].text == '{':
+                start = index + 2
+        if start is not None:
+            closures.append({
+                'context': token.text,
+                'start': start,
+                'end': swift_tokens.matching_close(tokens, start),
+                'offset': token.start,
+            })
+    return closures
+
+def _closure_argument(tokens: List[Token], index: int, labels: tuple) -> Optional[int]:
+    """Token index of the `{` opening the closure passed to the call at index"""
+    following = index + 1
+    if following < len(tokens) and tokens[following].text == '(':
+        close = swift_tokens.matching_close(tokens, following)
+        for position in range(following + 1, close - 1):
+            if tokens[position].text in labels and tokens[position + 1].text == ':' and tokens[position + 2].text == '{':
+                return position + 2
+        following = close + 1
+    if following < len(tokens) and tokens[following].text == '{':
+        return following
+    return None
+
+def classify_token(tokens: List[Token], index: int) -> Optional[tuple]:
+    """(category, detail) if the token at index is real-time unsafe"""
+    token = tokens[index]
+    previous = tokens[index - 1] if index else None
+    following = tokens[index + 1] if index + 1 < len(tokens) else None
+    calls = following is not None and following.text in ('(', '{')
+
+    if token.kind == 'string' and '\\(' in token.text:
+        return 'allocation', 'string interpolation builds a String'
+    if token.kind == 'keyword' and token.text == 'await':
+        return 'dispatch', 'await may suspend the render thread'
+    if token.kind == 'attribute' and token.text == '#selector':
+        return 'objc', '#selector dispatches through the Objective-C runtime'
+    if token.kind != 'identifier':
+        if token.text == '[' and _is_collection_literal_init(tokens, index):
+            return 'allocation', 'empty collection initializer allocates'
+        return None
+
+    name = token.text
+    if previous is not None and previous.text == '.':
+        if name in METHOD_HAZARDS and calls:
+            return METHOD_HAZARDS[name], f".{name}()"
+        return None
+    if name in FUNCTION_HAZARDS and calls:
+        return FUNCTION_HAZARDS[name], f"{name}()"
+    if name in TYPE_HAZARDS:
+        if name == 'Task' and not calls and not (following and following.text == '.'):
+            return None
+        return TYPE_HAZARDS[name], name
+    if name in ALLOCATING_TYPES and calls:
+        return 'allocation', f"{name}() allocates"
+    if OBJC_PREFIX.match(name) and name not in OBJC_SAFE_NAMES:
+        return 'objc', f"{name} is an Objective-C class"
+    return None
+
+def _is_collection_literal_init(tokens: List[Token], index: int) -> bool:
+    """`[Element]()` or `[Key: Value]()`"""
+    window = [t.text for t in tokens[index + 1:index + 6]]
+    if ']' not in window:
+        return False
+    close = index + 1 + window.index(']')
+    inner = tokens[index + 1:close]
+    return (
+        close + 1 < len(tokens) and tokens[close + 1].text == '('
+        and 0 < len(inner) <= 3 and inner[0].kind == 'identifier'
+        and all(t.kind == 'identifier' or t.text == ':' for t in inner)
+    )
+
+def scan_closure(tokens: List[Token], start: int, end: int) -> List[tuple]:
+    """(token index, category, detail) for every unsafe token in the closure"""
+    findings = []
+    index = start + 1
+    while index < end:
+        hazard = classify_token(tokens, index)
+        if hazard:
+            findings.append((index, *hazard))
+            if hazard[0] == 'dispatch':
+                # The dispatched closure runs elsewhere; skip its body
+                index = _skip_dispatched_closure(tokens, index, end)
+        index += 1
+    return findings
+
+def _skip_dispatched_closure(tokens: List[Token], index: int, end: int) -> int:
+    position = index + 1
+    while position < end and tokens[position].text not in ('{', ';', '}'):
+        if tokens[position].text in ('(', '['):
+            position = swift_tokens.matching_close(tokens, position)
+        position += 1
+    if position < end and tokens[position].text == '{':
+        return swift_tokens.matching_close(tokens, position)
+    return index
+
+def analyze_source(content: str) -> Dict[str, Any]:
+    """Real-time contexts in Swift source and the unsafe work inside them"""
+    return analyze_tokens(swift_tokens.tokenize(content), swift_tokens.line_offsets(content))
+
+def analyze_tokens(tokens: List[Token], offsets: List[int]) -> Dict[str, Any]:
+    contexts = []
+    findings = []
+    seen: Set[int] = set()
+
+    for closure in realtime_closures(tokens):
+        line = swift_tokens.line_number(offsets, closure['offset'])
+        contexts.append({'context': closure['context'], 'line': line})
+        for index, category, detail in scan_closure(tokens, closure['start'], closure['end']):
+            # Nested real-time closures are scanned once
+            if index in seen:
+                continue
+            seen.add(index)
+            findings.append({
+                'line': swift_tokens.line_number(offsets, tokens[index].start),
+                'category': category,
+                'detail': detail,
+                'context': closure['context'],
+                'context_line': line,
+            })
+    return {'contexts': contexts, 'findings': findings}
+
+def analyze_realtime_safety(files: List[str], added_lines: Dict[str, Set[int]],
+                            admit: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
+    """Scan changed Swift files for unsafe work in audio-thread callbacks"""
+    results = {'contexts': [], 'findings': [], 'by_category': {}, 'issues': []}
+
+    for path in files:
+        if not path.endswith('.swift') or not os.path.exists(path):
+            continue
+        if admit and not admit(path):
+            continue
+        try:
+            index = index_file(path)
+            analysis = analyze_tokens(index.tokens, index.offsets)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error scanning {path} for real-time hazards: {e}")
+            continue
+
+        added = added_lines.get(path, set())
+        for context in analysis['contexts']:
+            results['contexts'].append({'path': path, **context})
+        for finding in analysis['findings']:
+            finding = {'path': path, **finding, 'new': finding['line'] in added}
+            results['findings'].append(finding)
+            results['by_category'][finding['category']] = results['by_category'].get(finding['category'], 0) + 1
+            if finding['new']:
+                results['issues'].append(
+                    f"{path}:{finding['line']}: {CATEGORIES[finding['category']].lower()} "
+                    f"({finding['detail']}) in {finding['context']} callback"
+                )
+
+    return results
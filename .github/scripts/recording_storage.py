@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Recording Storage Footprint Analysis for PR Assessment
+
+Every night of sleep recording is written to disk, so a small change to the
+`AVAudioRecorder` settings can multiply the storage a user's phone gives up
+each week. This analyzer reads the recorder settings dictionaries in the
+recording services at the base and head refs. It resolves the constants they
+use and any segment length, then estimates the bytes written per hour and per
+night. PRs that grow the footprint, or that push a changed recorder over the
+per-night budget, are reported.
+"""
+
+import math
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from frame_cost import evaluate, read_revision
+from swift_index import SwiftIndex
+
+RECORDER_FILES = {'SleepRecordingService.swift', 'SoundEventDetector.swift'}
+
+NIGHT_HOURS = 8
+DEFAULT_NIGHT_BUDGET_BYTES = 150 * 1024 * 1024
+GROWTH_TOLERANCE = 0.10
+
+# Container header and sample tables written once per recorded file
+FILE_OVERHEAD_BYTES = 4096
+
+SETTINGS_KEYS = {
+    'AVFormatIDKey': 'format',
+    'AVSampleRateKey': 'sample_rate',
+    'AVNumberOfChannelsKey': 'channels',
+    'AVEncoderBitRateKey': 'bit_rate',
+    'AVEncoderBitRatePerChannelKey': 'bit_rate_per_channel',
+    'AVLinearPCMBitDepthKey': 'bit_depth',
+    'AVEncoderAudioQualityKey': 'quality',
+}
+
+# What AVAudioRecorder uses for keys the dictionary leaves out
+DEFAULT_SETTINGS = {'format': 'kAudioFormatLinearPCM', 'sample_rate': 44100.0, 'channels': 1, 'bit_depth': 16}
+
+# Typical encoded bits per sample and channel when no bit rate is given
+COMPRESSED_BITS_PER_SAMPLE = {
+    'kAudioFormatMPEG4AAC': 1.5,
+    'kAudioFormatMPEG4AAC_LD': 1.5,
+    'kAudioFormatMPEG4AAC_ELD': 1.0,
+    'kAudioFormatMPEG4AAC_HE': 0.75,
+    'kAudioFormatMPEG4AAC_HE_V2': 0.5,
+    'kAudioFormatOpus': 1.0,
+    'kAudioFormatAppleIMA4': 4.0,
+    'kAudioFormatULaw': 8.0,
+    'kAudioFormatALaw': 8.0,
+    'kAudioFormatAppleLossless': 9.0,
+}
+
+# Scale on the typical bit rate for each AVAudioQuality
+QUALITY_SCALE = {'min': 0.5, 'low': 0.75, 'medium': 1.0, 'high': 1.25, 'max': 1.5}
+
+SEGMENT_CONSTANT = re.compile(r'segment\w*(duration|length|seconds|interval)', re.I)
+
+def _text(index: SwiftIndex, position: int) -> str:
+    return index.tokens[position].text if 0 <= position < len(index.tokens) else ''
+
+def _value_tokens(index: SwiftIndex, position: int, stop: Set[str]) -> List[str]:
+    """Token texts from position to the first depth-0 stop token or the end of the line"""
+    texts, depth = [], 0
+    line = index.line(position)
+    while position < len(index.tokens) and index.line(position) == line:
+        text = _text(index, position)
+        if depth == 0 and text in stop:
+            break
+        depth += text in ('(', '[')
+        depth -= text in (')', ']')
+        if depth < 0:
+            break
+        texts.append(text)
+        position += 1
+    return texts
+
+def _resolve(texts: List[str], constants: Dict[str, float]) -> Optional[float]:
+    """Numeric value of an expression, with the named constants substituted"""
+    resolved = []
+    for text in texts:
+        if text in constants:
+            if resolved and resolved[-1] == '.':
+                # self.sampleRate, Self.sampleRate, Config.sampleRate
+                del resolved[-2:]
+            resolved.append(str(constants[text]))
+        else:
+            resolved.append(text)
+    return evaluate(resolved)
+
+def find_constants(index: SwiftIndex) -> Dict[str, float]:
+    """Numeric `let`/`var` values in the file, in declaration order so later ones can use earlier ones"""
+    constants = {}
+    for position, token in enumerate(index.tokens):
+        if token.text not in ('let', 'var') or index.tokens[position + 1].kind != 'identifier':
+            continue
+        name = _text(index, position + 1)
+        value = position + 2
+        if _text(index, value) == ':':
+            # let name: Type = ...
+            while _text(index, value) not in ('=', '{', '') and index.line(value) == index.line(position):
+                value += 1
+        if _text(index, value) != '=':
+            continue
+        number = _resolve(_value_tokens(index, value + 1, {',', ';', '}'}), constants)
+        if number is not None:
+            constants[name] = number
+    return constants
+
+def _settings_value(field: str, texts: List[str], constants: Dict[str, float]):
+    if field == 'format':
+        return next((t for t in texts if t.startswith('kAudioFormat')), None)
+    if field == 'quality':
+        return next((t for t in texts if t in QUALITY_SCALE), None)
+    return _resolve(texts, constants)
+
+def find_settings(index: SwiftIndex, constants: Dict[str, float]) -> List[Dict[str, Any]]:
+    """Recorder settings dictionaries: the `AV...Key:` entries of each dictionary literal"""
+    dictionaries: Dict[int, Dict[str, Any]] = {}
+    for position, token in enumerate(index.tokens):
+        field = SETTINGS_KEYS.get(token.text)
+        if field is None or _text(index, position + 1) != ':':
+            continue
+        depth, opening = 0, None
+        for p in range(position - 1, -1, -1):
+            text = _text(index, p)
+            if text in (')', ']', '}'):
+                depth += 1
+            elif text in ('(', '[', '{'):
+                if depth == 0:
+                    opening = p
+                    break
+                depth -= 1
+        if opening is None or _text(index, opening) != '[':
+            continue
+        entry = dictionaries.setdefault(opening, {
+            'line': index.line(opening),
+            'function': index.function_at(opening),
+            'settings': {},
+        })
+        value = _settings_value(field, _value_tokens(index, position + 2, {',', ']'}), constants)
+        if value is not None:
+            entry['settings'][field] = value
+    return [dictionaries[p] for p in sorted(dictionaries)]
+
+def segment_seconds(index: SwiftIndex, constants: Dict[str, float]) -> Optional[float]:
+    """Length of each recorded file: `record(forDuration:)` or a segment-length constant"""
+    for position, token in enumerate(index.tokens):
+        if token.text == 'record' and _text(index, position + 1) == '(' and _text(index, position + 2) == 'forDuration':
+            seconds = _resolve(_value_tokens(index, position + 4, {',', ')'}), constants)
+            if seconds:
+                return seconds
+    for name, value in constants.items():
+        if SEGMENT_CONSTANT.search(name) and value > 0:
+            return value
+    return None
+
+def bytes_per_second(settings: Dict[str, Any]) -> float:
+    """Encoded bytes per second of audio for a settings dictionary"""
+    settings = {**DEFAULT_SETTINGS, **settings}
+    channels = settings['channels']
+    if settings.get('bit_rate'):
+        return settings['bit_rate'] / 8
+    if settings.get('bit_rate_per_channel'):
+        return settings['bit_rate_per_channel'] * channels / 8
+    bits = COMPRESSED_BITS_PER_SAMPLE.get(settings['format'])
+    if bits is None:
+        return settings['sample_rate'] * channels * settings['bit_depth'] / 8
+    return settings['sample_rate'] * channels * bits * QUALITY_SCALE.get(settings.get('quality'), 1.0) / 8
+
+def footprint(content: str) -> Dict[str, Dict[str, Any]]:
+    """Recorders in a Swift source, keyed `function#ordinal`, with bytes per hour and per night"""
+    index = SwiftIndex(content)
+    constants = find_constants(index)
+    segment = segment_seconds(index, constants)
+    recorders, ordinals = {}, {}
+    for entry in find_settings(index, constants):
+        rate = bytes_per_second(entry['settings'])
+        night_seconds = NIGHT_HOURS * 3600
+        files_per_night = math.ceil(night_seconds / segment) if segment else 1
+        ordinal = ordinals[entry['function']] = ordinals.get(entry['function'], 0) + 1
+        recorders[f"{entry['function']}#{ordinal}"] = {
+            **entry,
+            'segment_seconds': segment,
+            'bytes_per_second': rate,
+            'bytes_per_hour': int(rate * 3600 + FILE_OVERHEAD_BYTES * files_per_night / NIGHT_HOURS),
+            'bytes_per_night': int(rate * night_seconds + FILE_OVERHEAD_BYTES * files_per_night),
+        }
+    return recorders
+
+def analyze_recording_storage(files: List[str], added_lines: Dict[str, Set[int]], base_ref: Optional[str] = None,
+                              budget_bytes: int = DEFAULT_NIGHT_BUDGET_BYTES,
+                              admit: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
+    """Per-night disk use of the recorders in changed recording services, against the base ref"""
+    results = {'recorders': [], 'issues': []}
+
+    for path in files:
+        if os.path.basename(path) not in RECORDER_FILES or not os.path.exists(path):
+            continue
+        if admit and not admit(path):
+            continue
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                head = footprint(f.read())
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error reading recorder settings from {path}: {e}")
+            continue
+        base_content = read_revision(base_ref, path) if base_ref else None
+        base = footprint(base_content) if base_content else {}
+
+        added = added_lines.get(path, set())
+        for key, recorder in head.items():
+            previous = base.get(key)
+            base_night = previous['bytes_per_night'] if previous else None
+            if base_ref:
+                changed = previous is None or previous['settings'] != recorder['settings'] \
+                    or previous['segment_seconds'] != recorder['segment_seconds']
+            else:
+                changed = recorder['line'] in added
+            entry = {
+                'path': path,
+                **recorder,
+                'base_bytes_per_night': base_night,
+                'delta_bytes_per_night': recorder['bytes_per_night'] - base_night if base_night is not None else None,
+                'new': changed,
+            }
+            results['recorders'].append(entry)
+
+            night_mb = recorder['bytes_per_night'] / 1024 / 1024
+            location = f"{path}:{recorder['line']} in {recorder['function']}"
+            if base_night and recorder['bytes_per_night'] > base_night * (1 + GROWTH_TOLERANCE):
+                results['issues'].append(
+                    f"{location}: recording grows from {base_night / 1024 / 1024:.1f} MB to {night_mb:.1f} MB "
+                    f"per {NIGHT_HOURS}-hour night ({recorder['bytes_per_night'] / base_night - 1:+.0%})"
+                )
+            elif entry['new'] and recorder['bytes_per_night'] > budget_bytes:
+                results['issues'].append(
+                    f"{location}: recording uses {night_mb:.1f} MB per {NIGHT_HOURS}-hour night, "
+                    f"over the {budget_bytes / 1024 / 1024:.0f} MB budget"
+                )
+
+    return results
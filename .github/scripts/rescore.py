@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Re-Scoring of Stored PR Analyses
+
+Recomputes quality scores, grades and threshold verdicts for stored
+pr-*-analysis.json files from the raw facts they record, with the current
+or a tuned scoring configuration. Only the analysis files are read (and,
+with --in-place, rewritten); git and the source tree are never touched.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+from scoring import merge_config, score_facts
+
+def load_config(path: str) -> Dict[str, Any]:
+    """Scoring overrides from a TOML or JSON file, merged over the defaults"""
+    if path.endswith('.toml'):
+        if tomllib is None:
+            raise ValueError(f"{path}: TOML scoring configs need Python 3.11+")
+        with open(path, 'rb') as f:
+            return merge_config(tomllib.load(f))
+    with open(path, 'r', encoding='utf-8') as f:
+        return merge_config(json.load(f))
+
+def load_analyses(paths: List[Path]) -> tuple:
+    """(analyses with raw facts, paths of analyses written before facts were recorded)"""
+    analyses, without_facts = [], []
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                analysis = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error reading {path}: {e}")
+            continue
+        if not analysis.get('raw_facts'):
+            without_facts.append(str(path))
+            continue
+        analyses.append({'path': path, 'analysis': analysis})
+    return analyses, without_facts
+
+def rescore(paths: List[Path], config: Dict[str, Any], in_place: bool = False) -> Dict[str, Any]:
+    """Score every analysis in one pass and compare with its stored score"""
+    analyses, without_facts = load_analyses(paths)
+    scores = score_facts([entry['analysis']['raw_facts'] for entry in analyses], config)
+
+    results = []
+    for entry, score in zip(analyses, scores):
+        analysis = entry['analysis']
+        previous = analysis['metrics'].get('quality_score', {})
+        results.append({
+            'file': str(entry['path']),
+            'pr_number': analysis.get('pr_number'),
+            'previous_overall': previous.get('overall'),
+            'previous_grade': previous.get('grade'),
+            **score,
+        })
+        if in_place:
+            analysis['metrics']['quality_score'] = {
+                'overall': score['overall'],
+                'breakdown': score['breakdown'],
+                'grade': score['grade'],
+            }
+            with open(entry['path'], 'w') as f:
+                json.dump(analysis, f, indent=2)
+
+    return {
+        'results': results,
+        'without_facts': without_facts,
+        'grade_changes': sum(1 for r in results if r['grade'] != r['previous_grade']),
+        'failing': sum(1 for r in results if not r['passed']),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Recompute quality scores of stored PR analyses')
+    parser.add_argument('--analysis-dir', required=True, help='Directory searched recursively for pr-*-analysis.json')
+    parser.add_argument('--config', help='TOML or JSON file overriding scoring weights, grade cutoffs and thresholds')
+    parser.add_argument('--output', help='Write per-analysis scores and verdicts to this JSON file')
+    parser.add_argument('--in-place', action='store_true', help='Replace the stored quality_score in each analysis file')
+
+    args = parser.parse_args()
+
+    try:
+        config = load_config(args.config) if args.config else merge_config(None)
+    except (OSError, ValueError) as e:
+        print(f"Error loading scoring config: {e}")
+        return 1
+
+    paths = sorted(Path(args.analysis_dir).rglob('pr-*-analysis.json'))
+    if not paths:
+        print("❌ No analysis files found")
+        return 1
+
+    print(f"📐 Rescoring {len(paths)} stored analyses...")
+    summary = rescore(paths, config, args.in_place)
+
+    for result in summary['results']:
+        if result['grade'] != result['previous_grade']:
+            print(f"   PR #{result['pr_number']}: {result['previous_grade']} → {result['grade']} "
+                  f"({result['previous_overall']} → {result['overall']:.2f})")
+    if summary['without_facts']:
+        print(f"   ⚠️  Skipped {len(summary['without_facts'])} analyses recorded without raw facts")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+    print(f"\n✅ Rescored {len(summary['results'])} analyses")
+    print(f"   Grade changes: {summary['grade_changes']}")
+    print(f"   Failing thresholds: {summary['failing']}")
+    if args.output:
+        print(f"   Results saved to: {args.output}")
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
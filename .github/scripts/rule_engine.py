@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+ReDoS-Safe Rule Engine for PR Assessment
+
+Checks every rule pattern for super-linear backtracking when it is loaded.
+Patterns that pass run as ordinary regexes. Unsafe patterns are replaced by a
+verified rewrite or a token-level matcher (see swift_tokens.py), or, failing
+both, run line by line on truncated lines. Every rule also has a per-file
+match-time budget. Patterns that can backtrack exponentially are rejected,
+because a single line could outrun any budget.
+
+The check is conservative. An unbounded repeat is flagged when its character
+set overlaps what follows it (the engine must backtrack to find the boundary),
+when it overlaps what precedes it (scans from successive start positions
+overlap), or when it contains another unbounded repeat (exponential).
+"""
+
+import re
+import string
+import time
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+import swift_tokens
+
+DEFAULT_RULE_SECONDS = 1.0
+
+# Lines longer than this are truncated when a guarded rule scans them
+GUARDED_LINE_LIMIT = 4096
+
+EXPONENTIAL = "nested unbounded repeat (exponential backtracking)"
+
+# Verified linear equivalents of known unsafe patterns
+REWRITES = {
+    r'init\([^)]*\)': r'init\([^()]*\)',
+}
+
+# Unsafe (or imprecise) patterns answered by a token-level matcher instead
+TOKEN_EQUIVALENTS = {
+    r'do\s*{[^}]*try[^}]*}\s*catch': 'do_catch_with_try',
+    r'!\s*(?![=])': 'force_unwrap',
+}
+
+# Representative characters used to compare character sets
+ALPHABET = frozenset(string.printable + 'é中')
+
+_CATEGORY_PATTERNS = {
+    sre_constants.CATEGORY_DIGIT: r'\d',
+    sre_constants.CATEGORY_NOT_DIGIT: r'\D',
+    sre_constants.CATEGORY_SPACE: r'\s',
+    sre_constants.CATEGORY_NOT_SPACE: r'\S',
+    sre_constants.CATEGORY_WORD: r'\w',
+    sre_constants.CATEGORY_NOT_WORD: r'\W',
+}
+CATEGORY_SETS = {
+    category: frozenset(c for c in ALPHABET if re.match(pattern, c))
+    for category, pattern in _CATEGORY_PATTERNS.items()
+}
+
+EMPTY: FrozenSet[str] = frozenset()
+UNBOUNDED = sre_constants.MAXREPEAT
+REPEATS = {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT}
+if hasattr(sre_constants, 'POSSESSIVE_REPEAT'):
+    REPEATS.add(sre_constants.POSSESSIVE_REPEAT)
+ZERO_WIDTH = {sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT}
+
+def _char_set(op, av) -> Optional[FrozenSet[str]]:
+    """Characters a single-character node matches, or None if not single-character"""
+    if op == sre_constants.LITERAL:
+        return frozenset({chr(av)})
+    if op == sre_constants.NOT_LITERAL:
+        return ALPHABET - {chr(av)}
+    if op == sre_constants.ANY:
+        return ALPHABET - {'\n'}
+    if op == sre_constants.CATEGORY:
+        return CATEGORY_SETS.get(av, ALPHABET)
+    if op == sre_constants.IN:
+        chars = set()
+        negate = False
+        for item_op, item_av in av:
+            if item_op == sre_constants.NEGATE:
+                negate = True
+            elif item_op == sre_constants.LITERAL:
+                chars.add(chr(item_av))
+            elif item_op == sre_constants.RANGE:
+                chars.update(c for c in ALPHABET if item_av[0] <= ord(c) <= item_av[1])
+            elif item_op == sre_constants.CATEGORY:
+                chars.update(CATEGORY_SETS.get(item_av, ALPHABET))
+        return ALPHABET - chars if negate else frozenset(chars)
+    return None
+
+def _children(op, av) -> List[list]:
+    if op == sre_constants.SUBPATTERN:
+        return [list(av[-1])]
+    if op == sre_constants.BRANCH:
+        return [list(branch) for branch in av[1]]
+    if op in REPEATS:
+        return [list(av[2])]
+    if op == getattr(sre_constants, 'ATOMIC_GROUP', None):
+        return [list(av)]
+    return []
+
+def _nullable(items: list) -> bool:
+    return all(_node_nullable(op, av) for op, av in items)
+
+def _node_nullable(op, av) -> bool:
+    if op in ZERO_WIDTH:
+        return True
+    if op in REPEATS:
+        return av[0] == 0 or _nullable(list(av[2]))
+    if op == sre_constants.BRANCH:
+        return any(_nullable(list(branch)) for branch in av[1])
+    if op == sre_constants.SUBPATTERN or op == getattr(sre_constants, 'ATOMIC_GROUP', None):
+        return _nullable(_children(op, av)[0])
+    return _char_set(op, av) is None and op != sre_constants.GROUPREF
+
+def _first(items: list) -> FrozenSet[str]:
+    """Characters that can start a match of items"""
+    result = set()
+    for op, av in items:
+        result |= _node_first(op, av)
+        if not _node_nullable(op, av):
+            break
+    return frozenset(result)
+
+def _last(items: list) -> FrozenSet[str]:
+    """Characters that can end a match of items"""
+    result = set()
+    for op, av in reversed(items):
+        result |= _node_last(op, av)
+        if not _node_nullable(op, av):
+            break
+    return frozenset(result)
+
+def _node_first(op, av) -> FrozenSet[str]:
+    chars = _char_set(op, av)
+    if chars is not None:
+        return chars
+    if op in ZERO_WIDTH:
+        return EMPTY
+    return frozenset().union(*(_first(child) for child in _children(op, av))) if _children(op, av) else ALPHABET
+
+def _node_last(op, av) -> FrozenSet[str]:
+    chars = _char_set(op, av)
+    if chars is not None:
+        return chars
+    if op in ZERO_WIDTH:
+        return EMPTY
+    return frozenset().union(*(_last(child) for child in _children(op, av))) if _children(op, av) else ALPHABET
+
+def _all_chars(items: list) -> FrozenSet[str]:
+    """Every character items could consume"""
+    result = set()
+    for op, av in items:
+        chars = _char_set(op, av)
+        if chars is not None:
+            result |= chars
+        elif op not in ZERO_WIDTH:
+            children = _children(op, av)
+            result |= ALPHABET if not children else frozenset().union(*(_all_chars(c) for c in children))
+    return frozenset(result)
+
+def _has_unbounded(items: list) -> bool:
+    for op, av in items:
+        if op in REPEATS and av[1] == UNBOUNDED:
+            return True
+        if any(_has_unbounded(child) for child in _children(op, av)):
+            return True
+    return False
+
+def _walk(items: list, before: FrozenSet[str], after: FrozenSet[str], hazards: List[str]):
+    for index, (op, av) in enumerate(items):
+        # Characters that can precede / follow this node within its context
+        preceding = set()
+        for prev_op, prev_av in reversed(items[:index]):
+            preceding |= _node_last(prev_op, prev_av)
+            if not _node_nullable(prev_op, prev_av):
+                break
+        else:
+            preceding |= before
+        following = set()
+        for next_op, next_av in items[index + 1:]:
+            following |= _node_first(next_op, next_av)
+            if not _node_nullable(next_op, next_av):
+                break
+        else:
+            following |= after
+
+        if op in REPEATS and av[1] == UNBOUNDED:
+            body = list(av[2])
+            body_chars = _all_chars(body)
+            if _has_unbounded(body):
+                hazards.append(EXPONENTIAL)
+            if body_chars & following:
+                hazards.append("repeat overlaps what follows it (polynomial backtracking)")
+            if op != getattr(sre_constants, 'POSSESSIVE_REPEAT', None) and (
+                    body_chars & frozenset(preceding) or (index == 0 and before is ALPHABET)):
+                hazards.append("repeat overlaps what precedes it (quadratic rescans)")
+
+        for child in _children(op, av):
+            _walk(child, frozenset(preceding), frozenset(following), hazards)
+
+def check_pattern(pattern: str) -> List[str]:
+    """Reasons pattern may match in super-linear time (empty if it is linear)"""
+    parsed = sre_parse.parse(pattern)
+    hazards = []
+    # An unanchored search may start anywhere, so anything can precede the pattern
+    _walk(list(parsed), ALPHABET, EMPTY, hazards)
+    return sorted(set(hazards))
+
+class SourceFile:
+    """File content with lazily computed tokens and lines"""
+
+    def __init__(self, content: str):
+        self.content = content
+        self._tokens = None
+        self._lines = None
+
+    @property
+    def tokens(self) -> List[swift_tokens.Token]:
+        if self._tokens is None:
+            self._tokens = swift_tokens.tokenize(self.content)
+        return self._tokens
+
+    @property
+    def lines(self) -> List[str]:
+        if self._lines is None:
+            self._lines = self.content.split('\n')
+        return self._lines
+
+class CompiledRule:
+    """A rule pattern with the strategy chosen for it at load time"""
+
+    def __init__(self, pattern: str, hazards: Optional[List[str]] = None):
+        self.pattern = pattern
+        self.hazards = check_pattern(pattern) if hazards is None else hazards
+        self.mode = 'regex'
+        self.regex = None
+        self.matcher = None
+
+        if pattern in TOKEN_EQUIVALENTS:
+            self.mode = 'tokens'
+            self.matcher = swift_tokens.MATCHERS[TOKEN_EQUIVALENTS[pattern]]
+        elif self.hazards and pattern in REWRITES and not check_pattern(REWRITES[pattern]):
+            self.mode = 'rewritten'
+            self.regex = re.compile(REWRITES[pattern])
+        elif EXPONENTIAL in self.hazards:
+            raise ValueError(f"Pattern {pattern!r} can backtrack exponentially; remove the nested unbounded repeat")
+        elif self.hazards:
+            self.mode = 'guarded'
+            self.regex = re.compile(pattern)
+        else:
+            self.regex = re.compile(pattern)
+
+    def count(self, source: SourceFile, deadline: Optional[float] = None) -> Tuple[int, bool]:
+        """Match count and whether the scan finished within the deadline"""
+        if self.mode == 'tokens':
+            try:
+                return self.matcher(source.tokens, deadline), True
+            except swift_tokens.MatchBudgetExceeded:
+                return 0, False
+
+        if self.mode == 'guarded':
+            total = 0
+            # Guarded patterns are at most polynomial on one truncated line, so checking between lines bounds them
+            for line in source.lines:
+                if deadline and time.monotonic() > deadline:
+                    return total, False
+                total += len(self.regex.findall(line[:GUARDED_LINE_LIMIT]))
+            return total, True
+
+        # Linear patterns cannot blow up, so one call is bounded by file size
+        total = len(self.regex.findall(source.content))
+        return total, not deadline or time.monotonic() <= deadline
+
+    def describe(self) -> Dict[str, Any]:
+        return {'mode': self.mode, 'hazards': self.hazards}
+
+class RuleEngine:
+    """Compiles rule patterns once and counts matches within time budgets"""
+
+    def __init__(self, rule_seconds: float = DEFAULT_RULE_SECONDS):
+        self.rule_seconds = rule_seconds
+        self.rules: Dict[str, CompiledRule] = {}
+
+    def load(self, patterns, hazards: Optional[Dict[str, List[str]]] = None) -> 'RuleEngine':
+        """Compile patterns, reusing hazard checks already known for them"""
+        hazards = hazards or {}
+        for pattern in patterns:
+            self.compile(pattern, hazards.get(pattern))
+        return self
+
+    def compile(self, pattern: str, hazards: Optional[List[str]] = None) -> CompiledRule:
+        if pattern not in self.rules:
+            self.rules[pattern] = CompiledRule(pattern, hazards)
+        return self.rules[pattern]
+
+    def count(self, pattern: str, source: SourceFile, file_deadline: Optional[float] = None) -> Tuple[int, bool]:
+        """Match count for one rule, bounded by the rule and file budgets"""
+        deadline = time.monotonic() + self.rule_seconds
+        if file_deadline:
+            deadline = min(deadline, file_deadline)
+        return self.compile(pattern).count(source, deadline)
+
+    def report(self) -> Dict[str, Any]:
+        """Rules that needed a rewrite, a token matcher or guarding"""
+        return {pattern: rule.describe() for pattern, rule in self.rules.items() if rule.mode != 'regex'}
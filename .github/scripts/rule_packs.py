@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Rule Packs for PR Assessment
+
+Loads risk rules, Swift pattern rules and component mappings from the TOML
+(or YAML, when PyYAML is installed) packs in `.github/rules/`. Packs are
+validated and compiled, including the rule engine's backtracking checks, once
+per content hash. The compiled result is cached on disk. Packs are listed
+and hashed once per process; loading again returns the same rule set unless
+a reload is asked for, which recompiles only if a pack file changed.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+from file_classifier import glob_to_regex
+from path_rules import PathRuleMatcher, compile_glob
+from rule_engine import EXPONENTIAL, TOKEN_EQUIVALENTS, RuleEngine, check_pattern
+
+RULE_PACKS_DIR = str(Path(__file__).resolve().parent.parent / 'rules')
+CACHE_DIR = '.pr-analysis-cache/rules'
+
+# Bump when the compiled layout changes
+PACK_VERSION = 3
+
+PACK_EXTENSIONS = ('.toml', '.yml', '.yaml')
+RISK_LEVELS = ('high', 'medium', 'low')
+PATTERN_GROUPS = ('good', 'bad')
+DEFAULT_FILE_TYPES = ['swift']
+
+def pack_files(directory: str) -> List[str]:
+    if not os.path.isdir(directory):
+        raise ValueError(f"Rule pack directory {directory} does not exist")
+    files = sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(PACK_EXTENSIONS))
+    if not files:
+        raise ValueError(f"Rule pack directory {directory} has no {'/'.join(PACK_EXTENSIONS)} packs")
+    return files
+
+def content_hash(files: List[str]) -> str:
+    digest = hashlib.sha256(f"v{PACK_VERSION}".encode())
+    for path in files:
+        digest.update(os.path.basename(path).encode() + b'\0')
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+def read_pack(path: str) -> Dict[str, Any]:
+    if path.endswith('.toml'):
+        if tomllib is None:
+            raise ValueError(f"{path}: TOML rule packs need Python 3.11+")
+        with open(path, 'rb') as f:
+            return tomllib.load(f)
+    if yaml is None:
+        raise ValueError(f"{path}: YAML rule packs need PyYAML (pip install pyyaml)")
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f) or {}
+
+def _string_list(value: Any, where: str, field: str) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"{where}: '{field}' must be a string or a list of strings")
+    return value
+
+def compile_rule(raw: Dict[str, Any], pack_id: str, where: str) -> Dict[str, Any]:
+    """Validate one rule and normalize it for the dispatch table"""
+    rule_id = raw.get('id')
+    if not rule_id:
+        raise ValueError(f"{where}: rule without an 'id'")
+    where = f"{where}: rule '{rule_id}'"
+
+    pattern = raw.get('pattern')
+    if not isinstance(pattern, str) or not pattern:
+        raise ValueError(f"{where}: missing 'pattern'")
+    try:
+        re.compile(pattern)
+    except re.error as e:
+        raise ValueError(f"{where}: invalid pattern: {e}")
+
+    hazards = check_pattern(pattern)
+    if EXPONENTIAL in hazards and pattern not in TOKEN_EQUIVALENTS:
+        raise ValueError(f"{where}: pattern can backtrack exponentially; remove the nested unbounded repeat")
+
+    rule = {
+        'id': f"{pack_id}/{rule_id}",
+        'pattern': pattern,
+        'paths': _string_list(raw.get('paths'), where, 'paths'),
+        'exclude': _string_list(raw.get('exclude'), where, 'exclude'),
+        'file_types': _string_list(raw.get('file_types'), where, 'file_types') or DEFAULT_FILE_TYPES,
+        'hazards': hazards,
+    }
+
+    if 'level' in raw:
+        if raw['level'] not in RISK_LEVELS:
+            raise ValueError(f"{where}: level must be one of {', '.join(RISK_LEVELS)}")
+        rule.update(kind='risk', level=raw['level'])
+    elif 'group' in raw:
+        if raw['group'] not in PATTERN_GROUPS:
+            raise ValueError(f"{where}: group must be one of {', '.join(PATTERN_GROUPS)}")
+        rule.update(kind='pattern', group=raw['group'], name=raw.get('name', rule_id))
+    else:
+        raise ValueError(f"{where}: needs a risk 'level' or a pattern 'group'")
+
+    return rule
+
+def compile_packs(files: List[str]) -> Dict[str, Any]:
+    """Validate and normalize every pack into one compiled rule set"""
+    rules = []
+    components = []
+    layers = []
+    path_rules = []
+    seen = set()
+
+    for path in files:
+        pack = read_pack(path)
+        pack_id = pack.get('pack', {}).get('id') or Path(path).stem
+        for raw in pack.get('rules', []):
+            rule = compile_rule(raw, pack_id, os.path.basename(path))
+            if rule['id'] in seen:
+                raise ValueError(f"{os.path.basename(path)}: duplicate rule id '{rule['id']}'")
+            seen.add(rule['id'])
+            rules.append(rule)
+        for raw in pack.get('components', []):
+            if not raw.get('name') or not raw.get('match'):
+                raise ValueError(f"{os.path.basename(path)}: components need a 'name' and 'match'")
+            components.append([raw['name'], _string_list(raw['match'], os.path.basename(path), 'match')])
+        for raw in pack.get('layers', []):
+            if not raw.get('name') or not raw.get('match'):
+                raise ValueError(f"{os.path.basename(path)}: layers need a 'name' and 'match'")
+            layers.append([raw['name'], _string_list(raw['match'], os.path.basename(path), 'match')])
+        for raw in pack.get('path_rules', []):
+            if not raw.get('path') or not raw.get('component'):
+                raise ValueError(f"{os.path.basename(path)}: path_rules need a 'path' and 'component'")
+            try:
+                compile_glob(raw['path'])
+            except (ValueError, re.error) as e:
+                raise ValueError(f"{os.path.basename(path)}: path rule '{raw['path']}': {e}")
+            path_rules.append([raw['component'], 'glob', raw['path']])
+
+    # Lowest precedence first: layers, then components (the first listed wins),
+    # then path rules, where the last listed wins as in CODEOWNERS
+    ordered = [[name, 'contains', match] for name, matches in reversed(layers) for match in matches]
+    ordered += [[name, 'contains', match] for name, matches in reversed(components) for match in matches]
+    ordered += path_rules
+
+    return {'version': PACK_VERSION, 'rules': rules, 'components': components, 'layers': layers,
+            'path_rules': ordered}
+
+class RuleSet:
+    """Compiled rules with a per-file-type dispatch table"""
+
+    def __init__(self, compiled: Dict[str, Any], digest: str, cache_hit: bool = False):
+        self.rules = compiled['rules']
+        self.components: Dict[str, List[str]] = {name: matches for name, matches in compiled['components']}
+        self.layers: Dict[str, List[str]] = {name: matches for name, matches in compiled['layers']}
+        self.path_rules = PathRuleMatcher(compiled['path_rules'])
+        self.digest = digest
+        self.cache_hit = cache_hit
+        self._engine: Optional[RuleEngine] = None
+        self._by_path: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+
+        # Rules grouped by file type; path globs are compiled once here
+        self.dispatch: Dict[str, List[Tuple[Dict[str, Any], list, list]]] = {}
+        for rule in self.rules:
+            entry = (rule, [glob_to_regex(g) for g in rule['paths']], [glob_to_regex(g) for g in rule['exclude']])
+            for file_type in rule['file_types']:
+                self.dispatch.setdefault(file_type, []).append(entry)
+
+    @property
+    def risk_patterns(self) -> Dict[str, List[str]]:
+        patterns = {level: [] for level in RISK_LEVELS}
+        for rule in self.rules:
+            if rule['kind'] == 'risk':
+                patterns[rule['level']].append(rule['pattern'])
+        return patterns
+
+    @property
+    def swift_patterns(self) -> Dict[str, Dict[str, str]]:
+        patterns = {group: {} for group in PATTERN_GROUPS}
+        for rule in self.rules:
+            if rule['kind'] == 'pattern':
+                patterns[rule['group']][rule['name']] = rule['pattern']
+        return patterns
+
+    def rules_for(self, path: str, file_type: str = 'swift') -> List[Dict[str, Any]]:
+        """Rules that apply to path, in pack order (memoized per path)"""
+        key = (file_type, path)
+        if key not in self._by_path:
+            self._by_path[key] = [
+                rule for rule, includes, excludes in self.dispatch.get(file_type, [])
+                if (not includes or any(r.match(path) for r in includes))
+                and not any(r.match(path) for r in excludes)
+            ]
+        return self._by_path[key]
+
+    def engine(self, rule_seconds: float) -> RuleEngine:
+        """Rule engine for these rules, reusing the compiled hazard checks"""
+        if self._engine is None:
+            hazards = {rule['pattern']: rule['hazards'] for rule in self.rules}
+            self._engine = RuleEngine(rule_seconds).load(hazards, hazards)
+        self._engine.rule_seconds = rule_seconds
+        return self._engine
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'content_hash': self.digest,
+            'rules': len(self.rules),
+            'components': len(self.components),
+            'cache_hit': self.cache_hit,
+        }
+
+_loaded: Dict[str, RuleSet] = {}
+
+def load_rule_packs(directory: str = RULE_PACKS_DIR, cache_dir: str = CACHE_DIR, reload: bool = False) -> RuleSet:
+    """Rule set for directory, hashed once per process; reload recompiles it if pack content changed"""
+    current = _loaded.get(directory)
+    if current is not None and not reload:
+        return current
+
+    files = pack_files(directory)
+    digest = content_hash(files)
+    if current is not None and current.digest == digest:
+        return current
+
+    cache_path = os.path.join(cache_dir, f"{digest}.json")
+    compiled = None
+    try:
+        with open(cache_path, 'r') as f:
+            compiled = json.load(f)
+        if compiled.get('version') != PACK_VERSION:
+            compiled = None
+    except (OSError, ValueError):
+        pass
+
+    cache_hit = compiled is not None
+    if compiled is None:
+        compiled = compile_packs(files)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(cache_path, 'w') as f:
+                json.dump(compiled, f)
+        except OSError as e:
+            print(f"Warning: could not cache compiled rule packs: {e}")
+
+    _loaded[directory] = RuleSet(compiled, digest, cache_hit)
+    return _loaded[directory]
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Quality Scoring for PR Assessment
+
+Derives the quality score, grade and threshold verdict of an analysis from
+the raw facts it records: per-function complexity, rule hits and line
+counts. Many analyses are scored in one pass over flat columns, vectorized
+with numpy when it is installed, so weights and cutoffs can be tuned against
+stored history without analyzing any PR again.
+"""
+
+import copy
+import math
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from swiftlint_ingest import SEVERITY_PENALTY
+
+FACTS_VERSION = 1
+
+# Quality thresholds; failing one fails the workflow
+THRESHOLDS = {
+    'minimum_overall_score': 60,  # F grade cutoff
+    'minimum_test_coverage_score': 50,  # Must have some tests
+    'maximum_avg_complexity': 15,  # Reasonable complexity limit
+    'minimum_architecture_score': 60,  # Basic architecture quality
+    'maximum_high_risk_files': 10,  # Limit dangerous code
+    'minimum_duplication_score': 70,  # Allow some duplication
+}
+
+# Warning thresholds (won't fail, but will warn)
+WARNING_THRESHOLDS = {
+    'recommended_overall_score': 80,
+    'recommended_test_coverage_score': 70,
+    'recommended_avg_complexity': 7,
+    'recommended_architecture_score': 80,
+    'recommended_high_risk_files': 3,
+    'recommended_duplication_score': 85,
+}
+
+# Every tunable input to scoring; --config files override any of these
+SCORING = {
+    'weights': {'complexity': 1.0, 'architecture': 1.0, 'testing': 1.0, 'reusability': 1.0, 'lint': 1.0},
+    'grade_cutoffs': {'A': 90, 'B': 80, 'C': 70, 'D': 60},
+    'complexity_penalty': 5,  # points per unit of average cyclomatic complexity
+    'violation_penalty': 10,  # points per layer dependency violation
+    'separation_scores': {'layered': 80, 'single_layer': 40},
+    # (minimum test-to-code ratio, score), best first; the last entry is the floor
+    'coverage_ratio_scores': [[0.5, 90], [0.3, 70], [0.1, 50], [0.0, 20]],
+    # (minimum measured line coverage percent, test quality label), best first
+    'coverage_percent_qualities': [[80, 'excellent'], [60, 'good'], [40, 'moderate'], [0, 'poor']],
+    'lint_penalties': dict(SEVERITY_PENALTY),
+    'high_risk_hits': 3,  # files with more high-level rule hits are high risk
+    'medium_risk_hits': 5,  # files with more medium-level rule hits are at least medium risk
+    'critical_complexity': 20,
+    'thresholds': dict(THRESHOLDS),
+    'warning_thresholds': dict(WARNING_THRESHOLDS),
+}
+
+# (check, score column, 'min' or 'max', failure threshold, warning threshold)
+THRESHOLD_CHECKS = [
+    ('overall_score', 'overall', 'min', 'minimum_overall_score', 'recommended_overall_score'),
+    ('test_coverage', 'testing', 'min', 'minimum_test_coverage_score', 'recommended_test_coverage_score'),
+    ('avg_complexity', 'avg_complexity', 'max', 'maximum_avg_complexity', 'recommended_avg_complexity'),
+    ('architecture', 'architecture', 'min', 'minimum_architecture_score', 'recommended_architecture_score'),
+    ('high_risk_files', 'high_risk_files', 'max', 'maximum_high_risk_files', 'recommended_high_risk_files'),
+    ('duplication', 'reusability', 'min', 'minimum_duplication_score', 'recommended_duplication_score'),
+]
+
+# Failures that do not depend on a threshold: (check, count column)
+COUNT_FAILURES = [
+    ('layer_violations', 'violations'),
+    ('critical_complexity', 'critical_functions'),
+    ('blocking_issues', 'blocking_issues'),
+]
+
+def merge_config(overrides: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """SCORING with overrides applied; tables are merged key by key"""
+    config = copy.deepcopy(SCORING)
+    for key, value in (overrides or {}).items():
+        if key not in config:
+            raise ValueError(f"Unknown scoring setting '{key}'")
+        if isinstance(config[key], dict):
+            if not isinstance(value, dict):
+                raise ValueError(f"Scoring setting '{key}' must be a table")
+            config[key].update(value)
+        else:
+            config[key] = value
+    return config
+
+def collect_facts(metrics: Dict[str, Any], functions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """The raw facts scoring reads, taken from a finished analysis"""
+    testing = metrics.get('testing', {})
+    reusability = metrics.get('patterns', {}).get('reusability', {})
+    architecture = metrics.get('architecture', {})
+    swiftlint = metrics.get('safety', {}).get('swiftlint')
+
+    rule_hits = []
+    for path, file_metrics in metrics.get('files', {}).items():
+        for factor in file_metrics.get('risk_factors', []):
+            rule_hits.append({
+                'file': path,
+                'rule': factor.get('rule', factor['pattern']),
+                'level': factor['level'],
+                'count': factor['count'],
+            })
+
+    return {
+        'version': FACTS_VERSION,
+        'functions': functions,
+        'rule_hits': rule_hits,
+        'lines': {
+            'code_added': testing.get('code_lines_added', 0),
+            'test_added': testing.get('test_lines_added', 0),
+            'analyzed': reusability.get('total_lines_analyzed', 0),
+            'duplicate': reusability.get('duplicate_lines', 0),
+        },
+        'coverage_percent': testing.get('line_coverage', {}).get('coverage_percent'),
+        'layer_violations': len(architecture.get('solid_principles', {}).get('violations', [])),
+        'layers': architecture.get('separation_of_concerns', {}).get('layers', 0),
+        'lint_by_severity': swiftlint['by_severity'] if swiftlint else None,
+        'blocking_issues': len(metrics.get('realtime_audio', {}).get('issues', [])),
+    }
+
+class FactColumns:
+    """Facts of many analyses as flat columns, one row per analysis"""
+
+    def __init__(self, facts: List[Dict[str, Any]]):
+        self.rows = len(facts)
+        self.function_rows, self.complexity = [], []
+        self.file_rows, self.file_high_hits = [], []
+        self.code_added, self.test_added, self.coverage = [], [], []
+        self.analyzed, self.duplicate = [], []
+        self.violations, self.layers, self.blocking_issues = [], [], []
+        self.has_lint = []
+        self.severity_counts: Dict[str, List[int]] = {}
+
+        for row, fact in enumerate(facts):
+            for function in fact['functions']:
+                self.function_rows.append(row)
+                self.complexity.append(function['complexity'])
+
+            high_hits = {}
+            for hit in fact['rule_hits']:
+                high_hits.setdefault(hit['file'], 0)
+                if hit['level'] == 'high':
+                    high_hits[hit['file']] += hit['count']
+            self.file_rows.extend([row] * len(high_hits))
+            self.file_high_hits.extend(high_hits.values())
+
+            lines = fact['lines']
+            self.code_added.append(lines['code_added'])
+            self.test_added.append(lines['test_added'])
+            self.analyzed.append(lines['analyzed'])
+            self.duplicate.append(lines['duplicate'])
+            coverage = fact.get('coverage_percent')
+            self.coverage.append(math.nan if coverage is None else coverage)
+            self.violations.append(fact['layer_violations'])
+            self.layers.append(fact['layers'])
+            self.blocking_issues.append(fact['blocking_issues'])
+
+            lint = fact.get('lint_by_severity')
+            self.has_lint.append(lint is not None)
+            for severity, count in (lint or {}).items():
+                self.severity_counts.setdefault(severity, [0] * self.rows)[row] = count
+
+def _grade(overall: float, cutoffs: List[tuple]) -> str:
+    return next((letter for letter, cutoff in cutoffs if overall >= cutoff), 'F')
+
+def _score_python(columns: FactColumns, config: Dict[str, Any]) -> Dict[str, List]:
+    rows = range(columns.rows)
+    complexity_sum, function_count, critical = [0] * columns.rows, [0] * columns.rows, [0] * columns.rows
+    for row, cc in zip(columns.function_rows, columns.complexity):
+        complexity_sum[row] += cc
+        function_count[row] += 1
+        critical[row] += cc > config['critical_complexity']
+    high_risk = [0] * columns.rows
+    for row, hits in zip(columns.file_rows, columns.file_high_hits):
+        high_risk[row] += hits > config['high_risk_hits']
+
+    steps = config['coverage_ratio_scores']
+    out = {name: [] for name in ('avg_complexity', 'complexity', 'architecture', 'testing', 'reusability', 'lint')}
+    for row in rows:
+        avg = round(complexity_sum[row] / function_count[row], 2) if function_count[row] else 0
+        out['avg_complexity'].append(avg)
+        out['complexity'].append(100 - min(avg * config['complexity_penalty'], 100))
+
+        solid = max(0, 100 - columns.violations[row] * config['violation_penalty'])
+        separation = config['separation_scores']['layered' if columns.layers[row] >= 2 else 'single_layer']
+        out['architecture'].append(int((solid + separation) / 2))
+
+        if not math.isnan(columns.coverage[row]):
+            out['testing'].append(round(columns.coverage[row]))
+        else:
+            code = columns.code_added[row]
+            ratio = round(columns.test_added[row] / code, 2) if code > 0 else 0
+            out['testing'].append(next((score for minimum, score in steps if ratio >= minimum), steps[-1][1]))
+
+        analyzed = columns.analyzed[row]
+        out['reusability'].append(round((1 - columns.duplicate[row] / analyzed) * 100, 2) if analyzed > 0 else 100)
+
+        penalty = sum(config['lint_penalties'].get(severity, 1) * counts[row]
+                      for severity, counts in columns.severity_counts.items())
+        out['lint'].append(max(0, 100 - penalty))
+
+    weights = config['weights']
+    out['overall'] = []
+    for row in rows:
+        components = ['complexity', 'architecture', 'testing', 'reusability'] + (['lint'] if columns.has_lint[row] else [])
+        total = sum(weights[name] for name in components)
+        out['overall'].append(sum(weights[name] * out[name][row] for name in components) / total)
+    out['critical_functions'] = critical
+    out['high_risk_files'] = high_risk
+    return out
+
+def _score_numpy(columns: FactColumns, config: Dict[str, Any]) -> Dict[str, Any]:
+    rows = columns.rows
+    function_rows = np.asarray(columns.function_rows, dtype=np.intp)
+    complexity = np.asarray(columns.complexity, dtype=float)
+    function_count = np.bincount(function_rows, minlength=rows)
+    complexity_sum = np.bincount(function_rows, weights=complexity, minlength=rows)
+    critical = np.bincount(function_rows, weights=complexity > config['critical_complexity'], minlength=rows)
+    file_rows = np.asarray(columns.file_rows, dtype=np.intp)
+    high_hits = np.asarray(columns.file_high_hits, dtype=float)
+    high_risk = np.bincount(file_rows, weights=high_hits > config['high_risk_hits'], minlength=rows)
+
+    out = {}
+    avg = np.divide(complexity_sum, function_count, out=np.zeros(rows), where=function_count > 0)
+    out['avg_complexity'] = np.round(avg, 2)
+    out['complexity'] = 100 - np.minimum(out['avg_complexity'] * config['complexity_penalty'], 100)
+
+    solid = np.maximum(0, 100 - np.asarray(columns.violations) * config['violation_penalty'])
+    separation = np.where(np.asarray(columns.layers) >= 2,
+                          config['separation_scores']['layered'], config['separation_scores']['single_layer'])
+    out['architecture'] = np.floor((solid + separation) / 2)
+
+    code = np.asarray(columns.code_added, dtype=float)
+    ratio = np.round(np.divide(np.asarray(columns.test_added, dtype=float), code,
+                               out=np.zeros(rows), where=code > 0), 2)
+    steps = config['coverage_ratio_scores']
+    testing = np.full(rows, float(steps[-1][1]))
+    for minimum, score in reversed(steps):
+        testing = np.where(ratio >= minimum, score, testing)
+    coverage = np.asarray(columns.coverage, dtype=float)
+    out['testing'] = np.where(np.isnan(coverage), testing, np.round(coverage))
+
+    analyzed = np.asarray(columns.analyzed, dtype=float)
+    duplicate = np.asarray(columns.duplicate, dtype=float)
+    reuse = np.divide(duplicate, analyzed, out=np.zeros(rows), where=analyzed > 0)
+    out['reusability'] = np.where(analyzed > 0, np.round((1 - reuse) * 100, 2), 100)
+
+    penalty = np.zeros(rows)
+    for severity, counts in columns.severity_counts.items():
+        penalty += config['lint_penalties'].get(severity, 1) * np.asarray(counts, dtype=float)
+    out['lint'] = np.maximum(0, 100 - penalty)
+
+    weights = config['weights']
+    has_lint = np.asarray(columns.has_lint, dtype=bool)
+    total = sum(weights[name] for name in ('complexity', 'architecture', 'testing', 'reusability'))
+    weighted = sum(weights[name] * out[name] for name in ('complexity', 'architecture', 'testing', 'reusability'))
+    out['overall'] = (weighted + np.where(has_lint, weights['lint'] * out['lint'], 0)) / \
+        (total + np.where(has_lint, weights['lint'], 0))
+    out['critical_functions'] = critical
+    out['high_risk_files'] = high_risk
+    return {name: column.tolist() for name, column in out.items()}
+
+def score_facts(facts: List[Dict[str, Any]], config: Optional[Dict[str, Any]] = None,
+                vectorized: bool = True) -> List[Dict[str, Any]]:
+    """Quality score, grade and threshold verdict for each set of facts"""
+    config = config or SCORING
+    columns = FactColumns(facts)
+    if vectorized and np is not None:
+        out = _score_numpy(columns, config)
+    else:
+        out = _score_python(columns, config)
+    out['violations'] = columns.violations
+    out['blocking_issues'] = columns.blocking_issues
+
+    cutoffs = sorted(config['grade_cutoffs'].items(), key=lambda item: item[1], reverse=True)
+    results = []
+    for row in range(columns.rows):
+        overall = out['overall'][row]
+        values = {**{name: out[name][row] for name in out}, 'overall': round(overall, 2)}
+        breakdown = {
+            'complexity': values['complexity'],
+            'architecture': int(values['architecture']),
+            'testing': int(values['testing']),
+            'reusability': values['reusability'],
+        }
+        if columns.has_lint[row]:
+            breakdown['lint'] = int(values['lint'])
+
+        failures, warnings = [], []
+        for check, column, direction, threshold, warning in THRESHOLD_CHECKS:
+            value = values[column]
+            limit, recommended = config['thresholds'][threshold], config['warning_thresholds'][warning]
+            if (value < limit) if direction == 'min' else (value > limit):
+                failures.append(check)
+            elif (value < recommended) if direction == 'min' else (value > recommended):
+                warnings.append(check)
+        failures.extend(check for check, column in COUNT_FAILURES if values[column] > 0)
+
+        results.append({
+            'overall': round(overall, 2),
+            'grade': _grade(overall, cutoffs),
+            'breakdown': breakdown,
+            'avg_complexity': values['avg_complexity'],
+            'high_risk_files': int(values['high_risk_files']),
+            'counts': {check: int(values[column]) for check, column in COUNT_FAILURES},
+            'passed': not failures,
+            'failures': failures,
+            'warnings': warnings,
+        })
+    return results
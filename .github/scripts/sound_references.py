@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Unreferenced Sound Analysis for PR Assessment
+
+Sounds are loaded by name: catalog models hold file names as string
+literals, and `Bundle.main.url(forResource:withExtension:)` resolves them at
+run time. This analyzer keeps an index of the string literals and resource
+lookups in every Swift file of the app target, cached per git blob SHA in
+`.pr-analysis-cache/sound-references.json`. It cross-references the index
+with the files in Resources/Sounds and the app's Resources build phase. A
+bundled sound that no literal names still ships in the app. It is reported
+with its size. A literal names a sound by its file name, or by the name
+without the extension when it is the `forResource:` argument. An
+interpolated literal such as `"ASMR-gentle-tap-\\(n).mp3"` is matched as a
+pattern. Changed Swift files are also indexed at the base ref, so the
+sounds a PR leaves without references are warnings.
+"""
+
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from audio_assets import AUDIO_EXTENSIONS, SOUNDS_DIR
+from blob_cache import BlobCache, index_sources, tracked_blobs
+from dead_code import target_membership
+from pbxproj import blob_sha, load_index
+from swift_index import SwiftIndex, tracked_swift_files
+
+INDEX_PATH = '.pr-analysis-cache/sound-references.json'
+
+# Bump when the cached entry layout changes
+INDEX_VERSION = 1
+
+# Target whose bundle the sounds ship in
+APP_TARGET = 'SoundScape'
+
+# Argument labels of the Bundle lookups
+LOOKUP_LABELS = ('forResource', 'withExtension', 'ofType')
+
+INTERPOLATION = re.compile(r'\\\((?:[^()]|\([^()]*\))*\)')
+
+# Characters a pattern needs outside its interpolations and extension before it is matched against sounds
+MIN_PATTERN_TEXT = 3
+
+def _literal(text: str) -> str:
+    """Body of a string literal token"""
+    text = text.strip('#')
+    quotes = 3 if text.startswith('"""') else 1
+    return text[quotes:-quotes].strip('\n') if len(text) >= 2 * quotes else ''
+
+def _argument(index: SwiftIndex, position: int) -> List[Any]:
+    """Tokens of the argument after a `label:` at position"""
+    tokens, depth = [], 0
+    for token in index.tokens[position + 2:]:
+        if depth == 0 and token.text in (',', ')'):
+            break
+        depth += token.text in ('(', '[')
+        depth -= token.text in (')', ']')
+        tokens.append(token)
+    return tokens
+
+def index_source(content: str) -> Dict[str, Any]:
+    """String literals and Bundle resource lookups in one Swift source"""
+    index = SwiftIndex(content)
+    literals: Dict[str, List[int]] = {}
+    lookups = []
+    for position, token in enumerate(index.tokens):
+        if token.kind == 'string':
+            body = _literal(token.text)
+            if body:
+                literals.setdefault(body, []).append(index.line(position))
+        elif token.text == 'forResource' and position + 1 < len(index.tokens) \
+                and index.tokens[position + 1].text == ':':
+            argument = _argument(index, position)
+            lookup = {'line': index.line(position), 'resource': None, 'extension': None, 'expression': ''}
+            if len(argument) == 1 and argument[0].kind == 'string':
+                lookup['resource'] = _literal(argument[0].text)
+            else:
+                lookup['expression'] = ''.join(t.text for t in argument)
+            # The extension label follows within the same call
+            for offset in range(position + 2 + len(argument), min(position + 12 + len(argument), len(index.tokens) - 1)):
+                if index.tokens[offset].text in LOOKUP_LABELS[1:] and index.tokens[offset + 1].text == ':':
+                    extension = _argument(index, offset)
+                    if len(extension) == 1 and extension[0].kind == 'string':
+                        lookup['extension'] = _literal(extension[0].text)
+                    break
+            lookups.append(lookup)
+    return {'literals': literals, 'lookups': lookups}
+
+def bundled_sounds() -> Dict[str, bool]:
+    """Every sound in the sounds directory or the app's Resources phase, and whether it is bundled"""
+    project = load_index(None) or {'files': {}, 'targets': {}}
+    sounds = {}
+    for _, reference in project['targets'].get(APP_TARGET, {}).get('Resources', []):
+        path = project['files'].get(reference)
+        if path and path.lower().endswith(AUDIO_EXTENSIONS):
+            sounds[os.path.join('SoundScape', path)] = True
+    if os.path.isdir(SOUNDS_DIR):
+        for name in os.listdir(SOUNDS_DIR):
+            if name.lower().endswith(AUDIO_EXTENSIONS):
+                sounds.setdefault(os.path.join(SOUNDS_DIR, name), False)
+    return sounds
+
+def _patterns(literals: Set[str]) -> List[re.Pattern]:
+    """Interpolated literals as patterns over file names"""
+    patterns = []
+    for body in literals:
+        parts = INTERPOLATION.split(body)
+        text = ''.join(parts)
+        if text.lower().endswith(AUDIO_EXTENSIONS):
+            text = text[:text.rfind('.')]
+        if len(parts) > 1 and len(text) >= MIN_PATTERN_TEXT:
+            patterns.append(re.compile('.+'.join(re.escape(part) for part in parts)))
+    return patterns
+
+def references(sound: str, literals: Set[str], resources: Set[str], patterns: List[re.Pattern],
+               resource_patterns: List[re.Pattern]) -> Optional[str]:
+    """How a sound file is named from code: 'literal', 'pattern' or None"""
+    name = os.path.basename(sound)
+    # Sound ids often equal the name, so the name without extension only counts in a lookup
+    stem = os.path.splitext(name)[0]
+    if name in literals or stem in resources:
+        return 'literal'
+    if any(p.fullmatch(name) for p in patterns) or any(p.fullmatch(stem) for p in resource_patterns):
+        return 'pattern'
+    return None
+
+def reference_kinds(sounds: Dict[str, bool], entries: Dict[str, Dict[str, Any]]) -> Dict[str, Optional[str]]:
+    """How each sound is named across the indexed files, or None"""
+    literals = {body for entry in entries.values() for body in entry['literals']}
+    resources = {lookup['resource'] for entry in entries.values() for lookup in entry['lookups'] if lookup['resource']}
+    patterns, resource_patterns = _patterns(literals), _patterns(resources)
+    return {sound: references(sound, literals, resources, patterns, resource_patterns) for sound in sounds}
+
+def analyze_sound_references(files: List[str], base_ref: Optional[str] = None,
+                             index_path: str = INDEX_PATH,
+                             admit: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
+    """Bundled sounds no app code names, with their size, and those the PR leaves unreferenced"""
+    cache = BlobCache(index_path, INDEX_VERSION, 'sound reference index')
+    changed = {path for path in files if path.endswith('.swift')}
+    blobs = tracked_blobs()
+    # Deleted files stay in, with their base targets, so the references they took away count
+    paths = sorted(set(blobs or tracked_swift_files()) | changed)
+    members = target_membership(paths)
+    deleted = [path for path in changed if not os.path.exists(path)]
+    if base_ref and deleted:
+        members.update(target_membership(deleted, base_ref))
+    app_files = [path for path, targets in members.items() if APP_TARGET in targets]
+    head_entries, base_entries = index_sources(cache, index_source, app_files, changed, blobs, base_ref, admit)
+
+    sounds = {path: bundled for path, bundled in bundled_sounds().items() if os.path.exists(path)}
+    head = reference_kinds(sounds, head_entries)
+    base = reference_kinds(sounds, base_entries) if base_ref else head
+
+    results = []
+    for path, bundled in sorted(sounds.items()):
+        if head[path]:
+            continue
+        new_sound = base_ref is not None and path in files and blob_sha(base_ref, path) is None
+        results.append({
+            'path': path,
+            'bytes': os.path.getsize(path),
+            'bundled': bundled,
+            # Unreferenced because of this PR: a new sound, or one whose last reference it removed
+            'new': bool(base_ref) and (new_sound or base[path] is not None),
+        })
+
+    dynamic = [
+        {'path': path, 'line': lookup['line'], 'expression': lookup['expression'], 'extension': lookup['extension']}
+        for path, entry in sorted(head_entries.items()) for lookup in entry['lookups'] if not lookup['resource']
+    ]
+
+    issues = [
+        f"{s['path']} ({s['bytes'] / 1024:.0f} KB) ships in the app bundle but no code references it"
+        for s in results if s['new'] and s['bundled']
+    ]
+    return {
+        'sounds': len(sounds),
+        'bundled': sum(sounds.values()),
+        'referenced': sum(1 for how in head.values() if how),
+        'by_pattern': sorted(path for path, how in head.items() if how == 'pattern'),
+        'unreferenced': results,
+        'unreferenced_bytes': sum(s['bytes'] for s in results if s['bundled']),
+        'dynamic_lookups': dynamic,
+        'files': len(head_entries),
+        'reindexed': cache.built,
+        'issues': issues,
+    }
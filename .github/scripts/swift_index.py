@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Swift Scope Index for PR Assessment
+
+Builds a scope tree from the Swift token stream. The tree covers types,
+functions, properties and their accessors, control-flow blocks, and closures
+along with the call they are passed to. Analyzers use it to answer questions
+like "which function is this line in" or "which closure is this call inside"
+without a full Swift parser. Indexes are cached per file, so every analyzer in
+a run shares one tokenization.
+"""
+
+import bisect
+import os
+import subprocess
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import swift_tokens
+from swift_tokens import Token
+
+TYPE_KEYWORDS = {'class', 'struct', 'enum', 'extension', 'actor', 'protocol'}
+FUNCTION_KEYWORDS = {'func', 'init', 'deinit', 'subscript'}
+PROPERTY_KEYWORDS = {'var', 'let'}
+DECLARATION_KEYWORDS = TYPE_KEYWORDS | FUNCTION_KEYWORDS | PROPERTY_KEYWORDS
+CONTROL_KEYWORDS = {'if', 'guard', 'for', 'while', 'switch', 'catch', 'else', 'do', 'repeat', 'defer'}
+ACCESSORS = {'get', 'set', 'willSet', 'didSet'}
+MODIFIERS = {
+    'public', 'private', 'fileprivate', 'internal', 'open', 'package', 'static', 'class', 'final',
+    'override', 'mutating', 'nonmutating', 'lazy', 'weak', 'unowned', 'nonisolated', 'convenience',
+    'required', 'dynamic', 'indirect', 'optional', 'consuming', 'borrowing',
+}
+
+# A declaration keeps scanning across a line break only after one of these
+CONTINUATIONS = {':', ',', '.', '->', '&', '<', '=', '(', '['}
+
+class Scope:
+    """A braced region of Swift source, or a declaration without a body"""
+
+    __slots__ = ('kind', 'keyword', 'name', 'attributes', 'modifiers', 'inherits', 'callee', 'receiver',
+                 'label', 'start', 'end', 'line', 'parent', 'children')
+
+    def __init__(self, kind: str, keyword: str = '', name: str = '', parent: 'Scope' = None, line: int = 0):
+        self.kind = kind            # file, type, function, property, accessor, control or closure
+        self.keyword = keyword      # declaration or control keyword
+        self.name = name
+        self.attributes: List[str] = []
+        self.modifiers: List[str] = []
+        self.inherits: List[str] = []
+        self.callee: Optional[str] = None     # closures: the call they are passed to
+        self.receiver: str = ''               # closures: tokens before the callee, e.g. DispatchQueue.main
+        self.label: Optional[str] = None      # closures: argument label
+        self.start: Optional[int] = None      # token index of `{`
+        self.end: Optional[int] = None        # token index of the matching `}`
+        self.line = line
+        self.parent = parent
+        self.children: List['Scope'] = []
+
+    def ancestors(self) -> Iterator['Scope']:
+        scope = self
+        while scope is not None:
+            yield scope
+            scope = scope.parent
+
+    def enclosing_type(self) -> Optional['Scope']:
+        return next((s for s in self.ancestors() if s.kind == 'type'), None)
+
+    def __repr__(self):
+        return f"Scope({self.kind} {self.keyword} {self.name or self.callee or ''} @{self.line})"
+
+class SwiftIndex:
+    """Scope tree and declarations of one Swift source file"""
+
+    def __init__(self, content: str):
+        self.content = content
+        self.tokens: List[Token] = swift_tokens.tokenize(content)
+        self.offsets = swift_tokens.line_offsets(content)
+        self.lines = [swift_tokens.line_number(self.offsets, t.start) for t in self.tokens]
+        self.root = Scope('file')
+        self.scopes: List[Scope] = []          # braced scopes, ordered by start
+        self.declarations: List[Scope] = []    # every type, function and type-level property
+        self._open_paren: Dict[int, int] = {}
+        self._build()
+        self._starts = [scope.start for scope in self.scopes]
+
+    # Lookups
+
+    def line(self, index: int) -> int:
+        return self.lines[index] if index < len(self.lines) else self.lines[-1] if self.lines else 1
+
+    def scope_at(self, index: int) -> Scope:
+        """Innermost braced scope containing the token at index"""
+        position = bisect.bisect_right(self._starts, index) - 1
+        scope = self.scopes[position] if position >= 0 else self.root
+        while scope is not self.root and not (scope.start < index < scope.end):
+            scope = scope.parent
+        return scope
+
+    def owner(self, scope: Scope) -> Optional[Scope]:
+        """Nearest function, property or accessor enclosing scope"""
+        return next((s for s in scope.ancestors() if s.kind in ('function', 'property', 'accessor')), None)
+
+    def qualified_name(self, scope: Optional[Scope]) -> str:
+        """Type-qualified name of a declaration, e.g. `ContentView.body`"""
+        if scope is None:
+            return '<top level>'
+        parts = []
+        for ancestor in scope.ancestors():
+            if ancestor.kind in ('type', 'function', 'property') and ancestor.name:
+                parts.append(ancestor.name)
+        return '.'.join(reversed(parts)) or '<top level>'
+
+    def function_at(self, index: int) -> str:
+        return self.qualified_name(self.owner(self.scope_at(index)))
+
+    def types(self) -> List[Scope]:
+        return [d for d in self.declarations if d.kind == 'type']
+
+    def call_open(self, close: int) -> Optional[int]:
+        """Token index of the `(` matching the `)` at close, or None if close is not a matched `)`"""
+        return self._open_paren.get(close)
+
+    def closures_after(self, index: int) -> Iterator[Scope]:
+        """Closures starting after the token at index, in source order"""
+        for scope in self.scopes[bisect.bisect_right(self._starts, index):]:
+            if scope.kind == 'closure':
+                yield scope
+
+    # Construction
+
+    def _build(self):
+        tokens = self.tokens
+        stack = [self.root]
+        opening = []
+        for index, token in enumerate(tokens):
+            if token.text == '(':
+                opening.append(index)
+            elif token.text == ')' and opening:
+                self._open_paren[index] = opening.pop()
+
+        paren_callees: List[Optional[str]] = []
+        control_depth: Optional[int] = None
+        control_keyword = ''
+        attributes: List[str] = []
+        modifiers: List[str] = []
+        index = 0
+
+        while index < len(tokens):
+            token = tokens[index]
+            text = token.text
+            scope = stack[-1]
+
+            if token.kind == 'attribute' and text.startswith('@'):
+                attributes.append(text)
+                if index + 1 < len(tokens) and tokens[index + 1].text == '(' and tokens[index + 1].start == token.end:
+                    index = swift_tokens.matching_close(tokens, index + 1)
+                index += 1
+                continue
+
+            if text in MODIFIERS and self._is_modifier(index):
+                modifiers.append(text)
+                index += 1
+                continue
+
+            if self._is_declaration(index):
+                declaration, body, resume = self._declaration(index, scope, attributes, modifiers)
+                attributes, modifiers = [], []
+                if declaration.kind != 'property' or scope.kind in ('type', 'file'):
+                    self.declarations.append(declaration)
+                if body is not None:
+                    declaration.start = body
+                    self._open(declaration, stack)
+                    index = body + 1
+                else:
+                    index = resume
+                continue
+
+            attributes, modifiers = [], []
+
+            if token.kind == 'keyword' and text in CONTROL_KEYWORDS:
+                control_depth, control_keyword = len(paren_callees), text
+            elif text in ('(', '['):
+                previous = tokens[index - 1] if index else None
+                callee = previous.text if text == '(' and previous and previous.kind in ('identifier', 'keyword') else None
+                paren_callees.append(callee)
+            elif text in (')', ']'):
+                if paren_callees:
+                    paren_callees.pop()
+            elif text == '{':
+                if control_depth == len(paren_callees):
+                    block = Scope('control', control_keyword, parent=scope, line=self.line(index))
+                    control_depth = None
+                elif scope.kind == 'property' and index and tokens[index - 1].text in ACCESSORS:
+                    block = Scope('accessor', tokens[index - 1].text, tokens[index - 1].text, scope, self.line(index))
+                else:
+                    block = self._closure(index, scope, paren_callees)
+                block.start = index
+                self._open(block, stack)
+            elif text == '}':
+                self._close(index, stack)
+            index += 1
+
+        while len(stack) > 1:
+            self._close(len(tokens) - 1, stack)
+
+    def _open(self, scope: Scope, stack: List[Scope]):
+        scope.parent.children.append(scope)
+        self.scopes.append(scope)
+        stack.append(scope)
+
+    def _close(self, index: int, stack: List[Scope]):
+        if len(stack) > 1:
+            stack.pop().end = index
+
+    def _is_modifier(self, index: int) -> bool:
+        following = self.tokens[index + 1] if index + 1 < len(self.tokens) else None
+        if following is None or (index and self.tokens[index - 1].text == '.'):
+            return False
+        if self.tokens[index].text == 'class':
+            return following.text in ('func', 'var', 'let', 'subscript') or following.text in MODIFIERS
+        return (following.text in DECLARATION_KEYWORDS or following.text in MODIFIERS
+                or following.kind == 'attribute' or following.text == 'actor')
+
+    def _is_declaration(self, index: int) -> bool:
+        token = self.tokens[index]
+        if index and self.tokens[index - 1].text in ('.', '\\'):
+            return False
+        following = self.tokens[index + 1] if index + 1 < len(self.tokens) else None
+        if token.text == 'actor':
+            return token.kind == 'identifier' and following is not None and following.kind == 'identifier'
+        if token.text in ('deinit', 'subscript'):
+            # Not tokenizer keywords, so rule out uses as plain identifiers
+            return following is not None and following.text in ('{', '(', '<')
+        return token.kind == 'keyword' and token.text in DECLARATION_KEYWORDS
+
+    def _declaration(self, index: int, parent: Scope, attributes: List[str],
+                     modifiers: List[str]) -> Tuple[Scope, Optional[int], int]:
+        """The declaration at index, the token index of its body `{` (if any) and where to resume"""
+        tokens = self.tokens
+        keyword = tokens[index].text
+        kind = 'type' if keyword in TYPE_KEYWORDS else 'function' if keyword in FUNCTION_KEYWORDS else 'property'
+        declaration = Scope(kind, keyword, parent=parent, line=self.line(index))
+        declaration.attributes = list(attributes)
+        declaration.modifiers = list(modifiers)
+
+        position = index + 1
+        if keyword in ('init', 'deinit', 'subscript'):
+            declaration.name = keyword
+        elif position < len(tokens):
+            name = [tokens[position].text]
+            position += 1
+            # Dotted extension names: extension Foo.Bar
+            while kind == 'type' and position + 1 < len(tokens) and tokens[position].text == '.':
+                name.append(tokens[position + 1].text)
+                position += 2
+            declaration.name = '.'.join(name) if name[0] not in ('(', '{') else ''
+            if name[0] in ('(', '{'):
+                position -= 1
+
+        if kind == 'type':
+            return self._type_body(declaration, position)
+        if kind == 'function':
+            return self._function_body(declaration, position)
+        return self._property_body(declaration, position)
+
+    def _type_body(self, declaration: Scope, position: int) -> Tuple[Scope, Optional[int], int]:
+        tokens = self.tokens
+        in_inheritance = False
+        depth = 0
+        while position < len(tokens):
+            text = tokens[position].text
+            if text == '<':
+                depth += 1
+            elif text == '>':
+                depth -= 1
+            elif depth == 0 and text == ':':
+                in_inheritance = True
+            elif text == 'where':
+                in_inheritance = False
+            elif text == '{':
+                return declaration, position, position + 1
+            elif text == '}' or (tokens[position].kind == 'keyword' and text in DECLARATION_KEYWORDS):
+                return declaration, None, position
+            elif in_inheritance and depth == 0 and tokens[position].kind == 'identifier':
+                if tokens[position - 1].text == '.':
+                    declaration.inherits[-1] += '.' + text
+                else:
+                    declaration.inherits.append(text)
+            position += 1
+        return declaration, None, position
+
+    def _function_body(self, declaration: Scope, position: int) -> Tuple[Scope, Optional[int], int]:
+        tokens = self.tokens
+        while position < len(tokens):
+            token = tokens[position]
+            if token.text in ('(', '['):
+                position = swift_tokens.matching_close(tokens, position) + 1
+                continue
+            if token.text == '{':
+                return declaration, position, position + 1
+            if (token.text == '}' or token.kind == 'attribute'
+                    or (token.kind == 'keyword' and token.text in DECLARATION_KEYWORDS)):
+                return declaration, None, position
+            position += 1
+        return declaration, None, position
+
+    def _property_body(self, declaration: Scope, position: int) -> Tuple[Scope, Optional[int], int]:
+        tokens = self.tokens
+        while position < len(tokens):
+            token = tokens[position]
+            previous = tokens[position - 1]
+            if token.text == '=':
+                return declaration, None, position + 1
+            if token.text == '{':
+                if self.line(position) == self.line(position - 1) or previous.text in CONTINUATIONS:
+                    return declaration, position, position + 1
+                return declaration, None, position
+            if self.line(position) > self.line(position - 1) and previous.text not in CONTINUATIONS \
+                    and token.text not in ('.', '->', '&'):
+                return declaration, None, position
+            if token.text in ('(', '[') and previous.text != ':':
+                position = swift_tokens.matching_close(tokens, position) + 1
+                continue
+            if (token.text in ('}', ')', ';', ',') or token.kind == 'attribute'
+                    or (token.kind == 'keyword' and token.text in DECLARATION_KEYWORDS | CONTROL_KEYWORDS)):
+                return declaration, None, position
+            position += 1
+        return declaration, None, position
+
+    def _closure(self, index: int, parent: Scope, paren_callees: List[Optional[str]]) -> Scope:
+        tokens = self.tokens
+        closure = Scope('closure', parent=parent, line=self.line(index))
+        previous = tokens[index - 1] if index else None
+
+        callee_index = None
+        if previous is not None and previous.text == ')' and (index - 1) in self._open_paren:
+            # foo(...) { }  -- trailing closure after an argument list
+            callee_index = self._open_paren[index - 1] - 1
+        elif previous is not None and previous.kind in ('identifier', 'keyword') and previous.text != 'in':
+            # foo { }  -- trailing closure without arguments
+            callee_index = index - 1
+        elif previous is not None and previous.text in (':', '(', ',') and paren_callees:
+            # foo(label: { })  -- closure argument
+            closure.callee = paren_callees[-1]
+            if previous.text == ':' and index >= 2:
+                closure.label = tokens[index - 2].text
+            callee_index = None
+
+        if callee_index is not None and callee_index >= 0 and tokens[callee_index].kind in ('identifier', 'keyword'):
+            closure.callee = tokens[callee_index].text
+            receiver = []
+            position = callee_index - 1
+            while position >= 1 and tokens[position].text == '.' and len(receiver) < 6:
+                receiver.insert(0, tokens[position - 1].text)
+                position -= 2
+            closure.receiver = '.'.join(receiver)
+
+        # { @MainActor in ... }
+        following = tokens[index + 1] if index + 1 < len(tokens) else None
+        if following is not None and following.kind == 'attribute':
+            closure.attributes.append(following.text)
+        return closure
+
+_cache: Dict[str, Tuple[Tuple[int, int], SwiftIndex]] = {}
+
+def index_file(path: str) -> SwiftIndex:
+    """Index of a Swift file, shared until the file changes on disk"""
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _cache.get(path)
+    if cached is None or cached[0] != key:
+        with open(path, 'r', encoding='utf-8') as f:
+            cached = (key, SwiftIndex(f.read()))
+        _cache[path] = cached
+    return cached[1]
+
+def tracked_swift_files() -> List[str]:
+    """Every Swift file git tracks in the working tree"""
+    result = subprocess.run(['git', 'ls-files', '*.swift'], capture_output=True, text=True)
+    return result.stdout.splitlines() if result.returncode == 0 else []
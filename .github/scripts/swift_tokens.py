@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Linear-Time Swift Tokenizer for PR Assessment
+
+Splits Swift source into identifiers, keywords, literals and punctuation in
+one left-to-right pass. Every alternative in the token pattern either
+consumes at least one character or always succeeds (unterminated strings
+and comments run to the end of the line or file), so the scan never revisits
+input. Token-level matchers built on it replace regex rules that would
+otherwise backtrack.
+"""
+
+import bisect
+import re
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+class Token(NamedTuple):
+    kind: str
+    text: str
+    start: int
+    end: int
+
+TOKEN = re.compile(r'''
+    (?P<space>\s+)
+  | (?P<comment>//[^\n]*|/\*(?:[^*]|\*(?!/))*(?:\*/|\Z))
+  | (?P<string>"""(?:[^"\\]|\\.|"(?!""))*(?:"""|\Z)|"(?:[^"\\\n]|\\.)*"?)
+  | (?P<number>\d[\w.]*)
+  | (?P<identifier>[A-Za-z_$][\w$]*|`[^`\n]*`?)
+  | (?P<attribute>@\w+|\#\w+)
+  | (?P<punct>.)
+''', re.S | re.X)
+
+KEYWORDS = {
+    'as', 'async', 'await', 'break', 'case', 'catch', 'class', 'continue', 'default', 'defer', 'do', 'else',
+    'enum', 'extension', 'fallthrough', 'false', 'for', 'func', 'guard', 'if', 'import', 'in', 'init', 'is',
+    'let', 'nil', 'protocol', 'repeat', 'return', 'self', 'Self', 'static', 'struct', 'super', 'switch',
+    'throw', 'throws', 'true', 'try', 'var', 'where', 'while',
+}
+
+# Tokens after which `!` is a postfix force unwrap rather than a prefix negation
+UNWRAP_OPERANDS = {')', ']', '?', '>'}
+
+# How many tokens a matcher processes between deadline checks
+DEADLINE_STRIDE = 4096
+
+def tokenize(content: str) -> List[Token]:
+    """Tokens of content, with whitespace and comments dropped"""
+    tokens = []
+    for match in TOKEN.finditer(content):
+        kind = match.lastgroup
+        if kind in ('space', 'comment'):
+            continue
+        text = match.group()
+        if kind == 'identifier' and text in KEYWORDS:
+            kind = 'keyword'
+        tokens.append(Token(kind, text, match.start(), match.end()))
+    return tokens
+
+def line_offsets(content: str) -> List[int]:
+    """Offsets at which each line after the first starts"""
+    return [match.end() for match in re.finditer('\n', content)]
+
+def line_number(offsets: List[int], position: int) -> int:
+    """1-based line of a character offset, given line_offsets() of the content"""
+    return bisect.bisect_right(offsets, position) + 1
+
+BRACKETS = {'(': ')', '[': ']', '{': '}'}
+
+def matching_close(tokens: List[Token], index: int) -> int:
+    """Index of the bracket closing tokens[index] (the last token if unbalanced)"""
+    opening = tokens[index].text
+    closing = BRACKETS[opening]
+    depth = 0
+    for position in range(index, len(tokens)):
+        text = tokens[position].text
+        if text == opening:
+            depth += 1
+        elif text == closing:
+            depth -= 1
+            if depth == 0:
+                return position
+    return len(tokens) - 1
+
+class MatchBudgetExceeded(Exception):
+    """A token matcher ran past its deadline"""
+
+def _check_deadline(index: int, deadline: Optional[float]):
+    if deadline and index % DEADLINE_STRIDE == 0 and time.monotonic() > deadline:
+        raise MatchBudgetExceeded()
+
+def count_force_unwraps(tokens: List[Token], deadline: Optional[float] = None) -> int:
+    """Postfix `!` directly after an operand, excluding `!=`, `try!` and `as!`"""
+    count = 0
+    for index in range(1, len(tokens)):
+        _check_deadline(index, deadline)
+        token = tokens[index]
+        if token.text != '!':
+            continue
+        previous = tokens[index - 1]
+        if previous.end != token.start:
+            continue
+        if previous.kind == 'keyword' and previous.text not in ('self', 'Self', 'super'):
+            continue
+        if previous.kind not in ('identifier', 'keyword') and previous.text not in UNWRAP_OPERANDS:
+            continue
+        following = tokens[index + 1] if index + 1 < len(tokens) else None
+        if following and following.text == '=' and following.start == token.end:
+            continue
+        count += 1
+    return count
+
+def count_do_catch_with_try(tokens: List[Token], deadline: Optional[float] = None) -> int:
+    """`do { ... } catch` blocks that contain a `try`, matched by brace depth"""
+    count = 0
+    # Each open brace records whether it opened a do block and whether a try was seen inside
+    stack = []
+    for index, token in enumerate(tokens):
+        _check_deadline(index, deadline)
+        if token.text == '{':
+            is_do = index > 0 and tokens[index - 1].text == 'do' and tokens[index - 1].kind == 'keyword'
+            stack.append([is_do, False])
+        elif token.text == '}' and stack:
+            is_do, saw_try = stack.pop()
+            if saw_try and stack:
+                stack[-1][1] = True
+            following = tokens[index + 1] if index + 1 < len(tokens) else None
+            if is_do and saw_try and following and following.text == 'catch':
+                count += 1
+        elif token.text == 'try' and token.kind == 'keyword' and stack:
+            stack[-1][1] = True
+    return count
+
+MATCHERS: Dict[str, Callable[[List[Token], Optional[float]], int]] = {
+    'force_unwrap': count_force_unwraps,
+    'do_catch_with_try': count_do_catch_with_try,
+}
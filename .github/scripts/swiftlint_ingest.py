@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+SwiftLint Report Ingestion for PR Assessment
+
+Consumes a `swiftlint lint --reporter json` report, indexes violations by
+file and line and keeps only those on lines the PR added, so lint findings
+can be merged into the per-file risk factors and the quality score.
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, List, Set
+
+import json_stream
+from coverage_ingest import RepoPathMatcher
+
+SEVERITY_LEVELS = {
+    'error': 'high',
+    'warning': 'medium',
+}
+
+# Penalty per violation on an added line when computing the lint score
+SEVERITY_PENALTY = {
+    'error': 10,
+    'warning': 2,
+}
+
+# Default-enabled SwiftLint rules that supersede our regex heuristics. When a
+# report is supplied, these patterns are skipped in analyze_code_quality.
+REGEX_EQUIVALENTS = {
+    'force_try': [r'try!\s', 'Force Try'],
+    'force_cast': [r'as!\s', 'Force Cast'],
+}
+
+class SwiftLintIngestor:
+    """Indexes SwiftLint violations on added lines"""
+
+    def __init__(self, added_lines: Dict[str, Set[int]]):
+        self.added_lines = added_lines
+        self.paths = RepoPathMatcher(added_lines)
+        self.violations: Dict[str, Dict[int, List[Dict[str, Any]]]] = defaultdict(lambda: defaultdict(list))
+        self.total_violations = 0
+
+    def ingest(self, filepath: str):
+        """Stream the report, keeping only violations on added lines"""
+        with open(filepath, 'r', encoding='utf-8') as f:
+            for violation in json_stream.items(f, 'item'):
+                self.total_violations += 1
+                path = self.paths.match(violation.get('file') or '')
+                line = violation.get('line')
+                if path is None or line not in self.added_lines[path]:
+                    continue
+                self.violations[path][line].append({
+                    'rule_id': violation.get('rule_id', 'unknown'),
+                    'severity': (violation.get('severity') or 'warning').lower(),
+                    'reason': violation.get('reason', ''),
+                })
+
+    def risk_factors(self, path: str) -> List[Dict[str, Any]]:
+        """Violations for a file grouped into analyze_code_quality risk factors"""
+        grouped = {}
+        for line, line_violations in sorted(self.violations.get(path, {}).items()):
+            for violation in line_violations:
+                key = (violation['rule_id'], violation['severity'])
+                if key not in grouped:
+                    grouped[key] = {
+                        'level': SEVERITY_LEVELS.get(violation['severity'], 'low'),
+                        'pattern': f"swiftlint:{violation['rule_id']}",
+                        'count': 0,
+                        'lines': [],
+                        'source': 'swiftlint',
+                    }
+                grouped[key]['count'] += 1
+                grouped[key]['lines'].append(line)
+        return list(grouped.values())
+
+    def summarize(self) -> Dict[str, Any]:
+        """Rule and severity totals with a 0-100 lint score"""
+        by_rule = defaultdict(int)
+        by_severity = defaultdict(int)
+        for file_violations in self.violations.values():
+            for line_violations in file_violations.values():
+                for violation in line_violations:
+                    by_rule[violation['rule_id']] += 1
+                    by_severity[violation['severity']] += 1
+
+        penalty = sum(SEVERITY_PENALTY.get(severity, 1) * count for severity, count in by_severity.items())
+
+        return {
+            'total_violations_in_report': self.total_violations,
+            'added_line_violations': sum(by_severity.values()),
+            'by_severity': dict(by_severity),
+            'by_rule': dict(sorted(by_rule.items(), key=lambda item: item[1], reverse=True)),
+            'files_with_violations': sorted(self.violations),
+            'lint_score': max(0, 100 - penalty),
+        }
+
+def superseded_patterns() -> Set[str]:
+    """Regex patterns and pattern names replaced by SwiftLint rules"""
+    return {pattern for patterns in REGEX_EQUIVALENTS.values() for pattern in patterns}
@@ -248,6 +248,36 @@ def test_threshold_checker():
             assert hasattr(checker, 'WARNING_THRESHOLDS'), "WARNING_THRESHOLDS should be defined"
             print("✅ Thresholds are properly defined")
             
+            # Stale summary metrics say all is well; the raw facts do not
+            analysis = {
+                'metrics': {
+                    'quality_score': {'overall': 95},
+                    'testing': {'coverage_score': 100},
+                    'architecture': {'architecture_score': 100, 'solid_principles': {'violations': []}},
+                    'complexity': {'avg_complexity': 2, 'high_complexity_functions': []},
+                    'patterns': {'reusability': {'duplication_score': 100}},
+                },
+                'raw_facts': {
+                    'version': 1,
+                    'functions': [{'file': 'Mixer.swift', 'function': 'mix', 'complexity': 25, 'nloc': 80}],
+                    'rule_hits': [],
+                    'lines': {'code_added': 10, 'test_added': 10, 'analyzed': 0, 'duplicate': 0},
+                    'coverage_percent': None,
+                    'layer_violations': 0,
+                    'layers': 2,
+                    'lint_by_severity': None,
+                    'blocking_issues': 0,
+                },
+            }
+            passed, failures, warnings = checker.check_analysis(analysis)
+            assert not passed
+            assert failures == [
+                "Average complexity 25 exceeds maximum threshold of 15",
+                "Found 1 functions with extremely high complexity (>20)",
+            ], failures
+            assert warnings == ["Overall score 70 is below recommended threshold of 80"], warnings
+            print("✅ Verdict derived from the scored raw facts")
+            
         except Exception as e:
             print(f"❌ Error testing check_quality_thresholds: {e}")
             return False
@@ -257,6 +287,1637 @@ def test_threshold_checker():
     
     return True
 
+def test_coverage_ingest():
+    """Test streaming coverage ingestion against fixture exports"""
+    print("\n🧪 Testing coverage ingestion...")
+    
+    repo_root = Path(__file__).parent.parent.parent
+    scripts_dir = repo_root / '.github' / 'scripts'
+    sys.path.insert(0, str(scripts_dir))
+    
+    try:
+        import analyze_pr
+        import coverage_ingest
+        
+        diff = (
+            "diff --git a/Sources/AudioEngine.swift b/Sources/AudioEngine.swift\n"
+            "--- a/Sources/AudioEngine.swift\n"
+            "+++ b/Sources/AudioEngine.swift\n"
+            "@@ -1,2 +1,4 @@\n"
+            " func play() {\n"
+            "+    start()\n"
+            "+    if muted { return }\n"
+            " }\n"
+        )
+        added_lines = analyze_pr.CodeAnalyzer.get_added_lines(diff)
+        assert added_lines == {'Sources/AudioEngine.swift': {2, 3}}, f"Unexpected added lines: {added_lines}"
+        print("✅ Added lines parsed from diff")
+        
+        fixture_dir = Path(tempfile.mkdtemp())
+        
+        # Line 1-2 executed, line 3 entered but never taken, line 4 gap
+        llvm_export = fixture_dir / 'coverage.json'
+        llvm_export.write_text(json.dumps({
+            'data': [{
+                'files': [
+                    {'filename': '/tmp/Other.swift', 'segments': [[1, 1, 9, True, True, False]]},
+                    {'filename': '/Users/ci/soundScape/Sources/AudioEngine.swift', 'segments': [
+                        [1, 14, 5, True, True, False],
+                        [3, 5, 0, True, True, False],
+                        [3, 20, 5, True, False, False],
+                        [4, 1, 0, False, False, False],
+                    ]},
+                ],
+                'functions': [{'name': 'play', 'regions': [[1, 14, 4, 1, 5, 0, 0, 0]]}],
+            }],
+            'type': 'llvm.coverage.json.export',
+            'version': '2.0.1',
+        }))
+        
+        result = coverage_ingest.ingest_coverage(
+            str(llvm_export), added_lines, analyze_pr.CodeAnalyzer.identify_component
+        )
+        assert result['format'] == 'llvm-cov', f"Unexpected format: {result['format']}"
+        file_stats = result['files']['Sources/AudioEngine.swift']
+        assert file_stats['added_executable_lines'] == 2, f"Unexpected stats: {file_stats}"
+        assert file_stats['added_covered_lines'] == 2, f"Unexpected stats: {file_stats}"
+        assert result['components']['AudioEngine']['coverage_percent'] == 100.0
+        print("✅ llvm-cov export mapped to added lines")
+        
+        xccov_export = fixture_dir / 'xccov.json'
+        xccov_export.write_text(json.dumps({
+            '/Users/ci/soundScape/Sources/AudioEngine.swift': [
+                {'line': 1, 'isExecutable': True, 'executionCount': 3},
+                {'line': 2, 'isExecutable': True, 'executionCount': 3},
+                {'line': 3, 'isExecutable': True, 'executionCount': 0},
+            ]
+        }))
+        
+        # Tiny chunks force values to straddle buffer boundaries
+        with open(xccov_export) as f:
+            entries = list(coverage_ingest.json_stream.JSONStreamReader(f, chunk_size=7).iter_prefix('*'))
+        assert len(entries) == 1 and len(entries[0][1]) == 3, "Streaming reader lost entries"
+        
+        result = coverage_ingest.ingest_coverage(
+            str(xccov_export), added_lines, analyze_pr.CodeAnalyzer.identify_component
+        )
+        file_stats = result['files']['Sources/AudioEngine.swift']
+        assert result['format'] == 'xccov', f"Unexpected format: {result['format']}"
+        assert file_stats['uncovered_ranges'] == ['3'], f"Unexpected stats: {file_stats}"
+        assert result['coverage_percent'] == 50.0, f"Unexpected coverage: {result['coverage_percent']}"
+        print("✅ xccov export mapped to added lines")
+        
+    except Exception as e:
+        print(f"❌ Error testing coverage ingestion: {e}")
+        return False
+    
+    return True
+
+def test_swiftlint_ingest():
+    """Test SwiftLint report ingestion keyed to added lines"""
+    print("\n🧪 Testing SwiftLint ingestion...")
+    
+    repo_root = Path(__file__).parent.parent.parent
+    scripts_dir = repo_root / '.github' / 'scripts'
+    sys.path.insert(0, str(scripts_dir))
+    
+    try:
+        import analyze_pr
+        import swiftlint_ingest
+        
+        report = Path(tempfile.mkdtemp()) / 'swiftlint.json'
+        report.write_text(json.dumps([
+            {'file': '/ci/Sources/AudioEngine.swift', 'line': 4, 'rule_id': 'force_cast',
+             'severity': 'Error', 'reason': 'Force casts should be avoided.'},
+            {'file': '/ci/Sources/AudioEngine.swift', 'line': 5, 'rule_id': 'line_length',
+             'severity': 'Warning', 'reason': 'Line should be 120 characters or less.'},
+            {'file': '/ci/Sources/AudioEngine.swift', 'line': 40, 'rule_id': 'force_cast',
+             'severity': 'Error', 'reason': 'Not on an added line.'},
+            {'file': '/ci/Sources/Unchanged.swift', 'line': 4, 'rule_id': 'todo',
+             'severity': 'Warning', 'reason': 'Not a changed file.'},
+        ]))
+        
+        ingestor = swiftlint_ingest.SwiftLintIngestor({'Sources/AudioEngine.swift': {4, 5, 6}})
+        ingestor.ingest(str(report))
+        summary = ingestor.summarize()
+        assert summary['total_violations_in_report'] == 4, f"Unexpected summary: {summary}"
+        assert summary['added_line_violations'] == 2, f"Unexpected summary: {summary}"
+        assert summary['lint_score'] == 88, f"Unexpected lint score: {summary['lint_score']}"
+        print("✅ Violations filtered to added lines")
+        
+        factors = ingestor.risk_factors('Sources/AudioEngine.swift')
+        levels = sorted(rf['level'] for rf in factors)
+        assert levels == ['high', 'medium'], f"Unexpected risk factors: {factors}"
+        assert analyze_pr.CodeAnalyzer.assess_risk_level(factors) == 'medium'
+        print("✅ Violations merged as risk factors")
+        
+    except Exception as e:
+        print(f"❌ Error testing SwiftLint ingestion: {e}")
+        return False
+    
+    return True
+
+def test_audio_assets():
+    """Test MP3 frame-header scanning on a synthetic stream"""
+    print("\n🧪 Testing audio asset scanner...")
+    
+    repo_root = Path(__file__).parent.parent.parent
+    scripts_dir = repo_root / '.github' / 'scripts'
+    sys.path.insert(0, str(scripts_dir))
+    
+    try:
+        import audio_assets
+        
+        # ID3v2.4 tag with a TIT2 frame, then 100 CBR frames (MPEG-1 Layer III, 128 kbps, 44.1 kHz)
+        title = b'\x03rain storm'
+        frame = b'TIT2' + len(title).to_bytes(4, 'big') + b'\x00\x00' + title
+        id3 = b'ID3\x04\x00\x00' + len(frame).to_bytes(4, 'big') + frame
+        header = b'\xff\xfb\x90\x64'
+        frame_length = 144 * 128000 // 44100
+        mp3 = Path(tempfile.mkdtemp()) / 'rain_storm.mp3'
+        mp3.write_bytes(id3 + (header + bytes(frame_length - 4)) * 100)
+        
+        info = audio_assets.scan_mp3(str(mp3))
+        assert info['format'] == 'MPEG-1 Layer III', f"Unexpected format: {info}"
+        assert info['frames'] == 100, f"Unexpected frame count: {info['frames']}"
+        assert info['sample_rate'] == 44100 and info['encoding'] == 'CBR', f"Unexpected stream info: {info}"
+        assert abs(info['duration_seconds'] - 100 * 1152 / 44100) < 0.01, f"Unexpected duration: {info}"
+        assert info['id3']['frames'].get('TIT2') == 'rain storm', f"Unexpected tags: {info['id3']}"
+        print(f"✅ MP3 scanned: {info['duration_seconds']}s at {info['bitrate_kbps']} kbps")
+        
+    except Exception as e:
+        print(f"❌ Error testing audio asset scanner: {e}")
+        return False
+    
+    return True
+
+def test_loop_loudness():
+    """Test loudness and loop-seam metrics on rendered WAV fixtures"""
+    print("\n🧪 Testing loop/loudness check...")
+    
+    repo_root = Path(__file__).parent.parent.parent
+    scripts_dir = repo_root / '.github' / 'scripts'
+    sys.path.insert(0, str(scripts_dir))
+    
+    try:
+        import loop_loudness
+        
+        if loop_loudness.np is None:
+            print("⚠️  NumPy not installed, skipping loop/loudness check")
+            return True
+        
+        import wave
+        np = loop_loudness.np
+        
+        def write_wav(path, samples, rate=48000):
+            with wave.open(str(path), 'wb') as f:
+                f.setnchannels(1)
+                f.setsampwidth(2)
+                f.setframerate(rate)
+                f.writeframes((samples * 32767).astype('<i2').tobytes())
+        
+        render_dir = Path(tempfile.mkdtemp())
+        t = np.arange(48000 * 5) / 48000
+        # Whole number of cycles loops cleanly; a truncated cycle clicks at the seam
+        write_wav(render_dir / 'pink_noise.wav', 0.1 * np.sin(2 * np.pi * 1000 * t))
+        write_wav(render_dir / 'calm_ocean.wav', 0.5 * np.sin(2 * np.pi * 100 * t[:-123]))
+        
+        clean = loop_loudness.analyze_pcm(str(render_dir / 'pink_noise.wav'))
+        assert abs(clean['integrated_lufs'] - (-23.0)) < 0.1, f"Unexpected loudness: {clean}"
+        assert not clean['seam']['click'], f"Clean loop reported a click: {clean['seam']}"
+        print(f"✅ 1 kHz sine at -20 dBFS measures {clean['integrated_lufs']} LUFS")
+        
+        result = loop_loudness.analyze_loop_loudness(
+            ['SoundScape/Resources/Sounds/calm_ocean.mp3'], str(render_dir)
+        )
+        ocean = result['assets']['SoundScape/Resources/Sounds/calm_ocean.mp3']
+        assert ocean['seam']['click'], f"Seam click not detected: {ocean['seam']}"
+        assert any('LU from the catalog median' in issue for issue in result['issues']), result['issues']
+        print("✅ Loop seam click and loudness jump detected")
+        
+        (render_dir / 'broken.wav').write_bytes(b'not a wav file')
+        alone = loop_loudness.analyze_loop_loudness([str(render_dir / 'calm_ocean.wav')])
+        assert alone['reference_median_lufs'] is None and 'loudness_delta_lu' not in alone['assets'][str(render_dir / 'calm_ocean.wav')], alone
+        guarded = loop_loudness.analyze_loop_loudness(['SoundScape/Resources/Sounds/calm_ocean.mp3'], str(render_dir))
+        assert str(render_dir / 'broken.wav') in guarded['skipped'] and guarded['reference_renders'] == 1, guarded['skipped']
+        print("✅ No loudness comparison without references; unreadable renders skipped")
+        
+    except Exception as e:
+        print(f"❌ Error testing loop/loudness check: {e}")
+        return False
+    
+    return True
+
+def test_image_assets():
+    """Test header-only image checks on a fixture asset catalog"""
+    print("\n🧪 Testing image asset analysis...")
+    
+    repo_root = Path(__file__).parent.parent.parent
+    scripts_dir = repo_root / '.github' / 'scripts'
+    sys.path.insert(0, str(scripts_dir))
+    
+    try:
+        import struct
+        import image_assets
+        
+        catalog = Path(tempfile.mkdtemp()) / 'Assets.xcassets'
+        imageset = catalog / 'SleepContent' / 'new_story_cover.imageset'
+        imageset.mkdir(parents=True)
+        (imageset / 'Contents.json').write_text(json.dumps({'images': [
+            {'filename': 'cover.png', 'idiom': 'universal', 'scale': '1x'},
+            {'idiom': 'universal', 'scale': '2x'},
+            {'idiom': 'universal', 'scale': '3x'},
+        ]}))
+        
+        png = image_assets.PNG_SIGNATURE + struct.pack('>I', 13) + b'IHDR' + struct.pack('>II', 2048, 2048)
+        (imageset / 'cover.png').write_bytes(png + bytes(64))
+        jpeg = b'\xff\xd8' + b'\xff\xe0' + struct.pack('>H', 16) + bytes(14) + b'\xff\xc0' + struct.pack('>HBHH', 17, 8, 600, 800)
+        (imageset / 'cover_old.jpg').write_bytes(jpeg + bytes(16))
+        
+        info = image_assets.read_image_header(str(imageset / 'cover_old.jpg'))
+        assert (info['format'], info['width'], info['height']) == ('jpeg', 800, 600), f"Unexpected JPEG header: {info}"
+        
+        result = image_assets.analyze_image_assets([{'path': str(imageset / 'Contents.json')}])
+        issues = '\n'.join(result['issues'])
+        assert 'exceeds the 1,048,576 pixel target' in issues, issues
+        assert 'missing scale variants 2x, 3x' in issues, issues
+        assert 'cover_old.jpg: not referenced by Contents.json' in issues, issues
+        print(f"✅ Found {len(result['issues'])} catalog issues from headers only")
+        
+        (imageset / 'cover_cut.jpg').write_bytes(b'\xff\xd8\xff\xe0\x00')
+        truncated = image_assets.analyze_image_assets([{'path': str(imageset / 'cover_cut.jpg')}])
+        assert any('cover_cut.jpg: unreadable image' in issue for issue in truncated['issues']), truncated['issues']
+        print("✅ Truncated JPEG reported as unreadable")
+        
+    except Exception as e:
+        print(f"❌ Error testing image asset analysis: {e}")
+        return False
+    
+    return True
+
+def test_localization():
+    """Test catalog key extraction from diff hunks"""
+    print("\n🧪 Testing localization analysis...")
+    
+    repo_root = Path(__file__).parent.parent.parent
+    scripts_dir = repo_root / '.github' / 'scripts'
+    sys.path.insert(0, str(scripts_dir))
+    
+    try:
+        import io
+        import localization
+        
+        hunk = [
+            '@@ -10,7 +10,12 @@',
+            '     "%lld min" : {',
+            '-      "extractionState" : "manual",',
+            '+      "extractionState" : "stale",',
+            '     },',
+            '+    "Sleep well" : {',
+            '+',
+            '+    },',
+            '@@ -200,3 +205,3 @@',
+            '             "state" : "translated",',
+            '-            "value" : "Ngủ ngon"',
+            '+            "value" : "Chúc ngủ ngon"',
+        ]
+        keys, base_lines, head_lines = localization.changed_keys_from_diff(hunk)
+        assert keys == {'%lld min', 'Sleep well'}, f"Unexpected keys: {keys}"
+        assert base_lines == {201} and head_lines == {206}, f"Unexpected lines: {base_lines} {head_lines}"
+        print("✅ Changed keys attributed from hunks")
+        
+        catalog = '{\n  "strings" : {\n    "Good night" : {\n      "localizations" : {\n        "vi" : {\n'
+        owners = localization.owners_of_lines(io.StringIO(catalog), {5})
+        assert owners == {'Good night'}, f"Unexpected owners: {owners}"
+        
+        entry = {'localizations': {
+            'vi': {'stringUnit': {'state': 'translated', 'value': 'x'}},
+            'th': {'stringUnit': {'state': 'new', 'value': ''}},
+        }}
+        assert localization.translated_locales(entry) == {'vi'}
+        assert localization.normalize_literal('\\(count) nights') == localization.normalize_literal('%lld nights')
+        print("✅ Translation states and interpolated keys resolved")
+        
+    except Exception as e:
+        print(f"❌ Error testing localization analysis: {e}")
+        return False
+    
+    return True
+
+def test_pbxproj():
+    """Test the OpenStep plist parser and project index"""
+    print("\n🧪 Testing Xcode project parser...")
+    
+    repo_root = Path(__file__).parent.parent.parent
+    scripts_dir = repo_root / '.github' / 'scripts'
+    sys.path.insert(0, str(scripts_dir))
+    
+    try:
+        import pbxproj
+        
+        project = """// !$*UTF8*$!
+{
+	objects = {
+		B1 /* A.swift in Sources */ = {isa = PBXBuildFile; fileRef = F1 /* A.swift */; };
+		B2 /* A.swift in Sources */ = {isa = PBXBuildFile; fileRef = F1 /* A.swift */; };
+		B3 = {isa = PBXBuildFile; fileRef = F9; };
+		F1 /* A.swift */ = {isa = PBXFileReference; path = "A.swift"; sourceTree = "<group>"; };
+		G0 = {isa = PBXGroup; children = (G1, ); sourceTree = "<group>"; };
+		G1 /* Sources */ = {isa = PBXGroup; children = (F1 /* A.swift */, ); path = Sources; sourceTree = "<group>"; };
+		P1 = {isa = PBXSourcesBuildPhase; files = (B1, B2, B3, ); };
+		T1 = {isa = PBXNativeTarget; buildPhases = (P1, ); name = App; };
+		R1 = {isa = PBXProject; mainGroup = G0; projectDirPath = ""; targets = (T1, ); };
+	};
+	rootObject = R1 /* Project object */;
+}
+"""
+        plist = pbxproj.parse_plist(project)
+        assert plist['objects']['F1']['path'] == 'A.swift'
+        print("✅ OpenStep plist parsed")
+        
+        index = pbxproj.build_index(plist)
+        assert index['files'] == {'F1': 'Sources/A.swift'}, f"Unexpected files: {index['files']}"
+        assert [ref for _, ref in index['targets']['App']['Sources']] == ['F1', 'F1', 'F9']
+        assert any('F9' in broken for broken in index['broken_references'])
+        assert pbxproj.duplicate_entries(index) == ['App/Sources: Sources/A.swift listed 2 times']
+        print("✅ Group paths, membership, dangling and duplicate entries resolved")
+        
+        assert pbxproj.expected_target('SoundScape/SoundScapeWidget/Widget.swift') == 'SoundScapeWidgetExtension'
+        assert pbxproj.expected_target('SoundScape/Sources/App/ContentView.swift') == 'SoundScape'
+        print("✅ Expected targets resolved")
+        
+    except Exception as e:
+        print(f"❌ Error testing Xcode project parser: {e}")
+        return False
+    
+    return True
+
+def test_file_classifier():
+    """Test changed-file classification and routing"""
+    print("\n🧪 Testing file classifier...")
+    
+    repo_root = Path(__file__).parent.parent.parent
+    scripts_dir = repo_root / '.github' / 'scripts'
+    sys.path.insert(0, str(scripts_dir))
+    
+    try:
+        import tempfile
+        import file_classifier
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            attributes_path = os.path.join(tmp_dir, '.gitattributes')
+            with open(attributes_path, 'w') as f:
+                f.write("Generated/** linguist-generated\n*.pb.swift -linguist-generated\n")
+            attributes = file_classifier.GitAttributes(attributes_path)
+            assert attributes.lookup('Generated/Assets.swift', 'linguist-generated') is True
+            assert attributes.lookup('Sources/Model.pb.swift', 'linguist-generated') is False
+            assert attributes.lookup('Sources/View.swift', 'linguist-generated') is None
+            print("✅ .gitattributes linguist lookup works")
+            
+            generated = os.path.join(tmp_dir, 'Strings.swift')
+            with open(generated, 'w') as f:
+                f.write("// Generated by SwiftGen - DO NOT EDIT\nenum L10n {}\n")
+            handwritten = os.path.join(tmp_dir, 'View.swift')
+            with open(handwritten, 'w') as f:
+                f.write("import SwiftUI\n\n// The waveform is regenerated by the timer; do not edit it from the view\n")
+            
+            classifier = file_classifier.FileClassifier(attributes)
+            assert classifier.classify(generated)['analyzers'] == ['project', 'symbols']
+            assert classifier.classify(handwritten)['analyzers'] == ['code', 'project', 'symbols']
+            assert classifier.classify(os.path.join(tmp_dir, 'Gone.swift'))['analyzers'] == ['project', 'symbols']
+            assert file_classifier.sniff(handwritten) == (False, False)
+            assert file_classifier.sniff(generated) == (False, True)
+            opted_out = os.path.join(tmp_dir, 'Model.pb.swift')
+            with open(opted_out, 'w') as f:
+                f.write("// @generated by protoc\nstruct Model {}\n")
+            assert classifier.classify(opted_out)['analyzers'] == ['code', 'project', 'symbols']
+            assert classifier.classify('Pods/Lib/Lib.swift')['vendored'] is True
+            assert classifier.classify('Sounds/rain.mp3')['analyzers'] == ['audio']
+            print("✅ Generated, vendored and deleted files routed")
+            
+            routes, summary = file_classifier.route_files(
+                [{'path': handwritten}, {'path': generated}, {'path': 'Package.resolved'}], classifier
+            )
+            assert [f['path'] for f in routes['code']] == [handwritten]
+            assert len(summary['excluded_from_code_analysis']) == 2
+            print("✅ Files grouped by analyzer")
+        
+    except Exception as e:
+        print(f"❌ Error testing file classifier: {e}")
+        return False
+    
+    return True
+
+def test_budgets():
+    """Test per-file budgets and the fallback analysis"""
+    print("\n🧪 Testing analysis budgets...")
+    
+    repo_root = Path(__file__).parent.parent.parent
+    scripts_dir = repo_root / '.github' / 'scripts'
+    sys.path.insert(0, str(scripts_dir))
+    
+    try:
+        import tempfile
+        import budgets
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            small = os.path.join(tmp_dir, 'Small.swift')
+            with open(small, 'w') as f:
+                f.write("// Small\nlet x = 1\n\n")
+            large = os.path.join(tmp_dir, 'Table.swift')
+            with open(large, 'w') as f:
+                f.write("let row = 1\n" * 200)
+            
+            budget = budgets.AnalysisBudget(max_file_bytes=10 * 1024, max_file_lines=100, phase_seconds=60)
+            assert budget.check_file(small) is None
+            assert 'line budget' in budget.check_file(large)
+            print("✅ Line budget enforced")
+            
+            budget.start_phase('quality')
+            assert budget.phase_exhausted('quality') is None
+            budget.phase_started['quality'] -= 120
+            assert budget.over_budget(small, 'quality') is not None
+            print("✅ Phase budget enforced")
+            
+            budget.degrade(large, 'quality', 'too long')
+            budget.degrade(large, 'quality', 'too long')
+            assert budget.summary()['degraded_files'][large] == [{'phase': 'quality', 'reason': 'too long'}]
+            
+            def scan(files, admit=None):
+                admitted = []
+                for path in files:
+                    if admit(path):
+                        admitted.append(path)
+                        # The first file uses up the phase
+                        budget.phase_started['scan'] -= 120
+                return {'admitted': admitted}
+            later = os.path.join(tmp_dir, 'Later.swift')
+            with open(later, 'w') as f:
+                f.write("let y = 2\n")
+            assert budget.run_phase('scan', scan, [small, later]) == {'admitted': [small]}
+            assert budget.degraded[later] == [{'phase': 'scan', 'reason': 'scan phase exceeded its 60s budget'}]
+            assert 'scan' in budget.summary()['phase_seconds']
+            print("✅ Phase stops admitting files once its budget runs out")
+            
+            import dsp_loops
+            result = budget.run_phase('dsp_loops', dsp_loops.analyze_dsp_loops, [], {}, None, [small, large],
+                                      os.path.join(tmp_dir, 'history.json'))
+            assert result['codebase'] == {'loops': 0, 'vectorizable': 0}
+            assert 'line budget' in budget.degraded[large][-1]['reason'], budget.degraded[large]
+            print("✅ Whole-project scans skip files over the size budgets")
+            
+            assert budget.run_phase('assets', scan, [large], sized=False) == {'admitted': [large]}
+            print("✅ Binary asset phases obey only the phase budget")
+            
+            counts = budgets.fallback_line_counts(small)
+            assert (counts['total_lines'], counts['comment_lines'], counts['blank_lines']) == (3, 1, 1), counts
+            truncated = budgets.fallback_line_counts(large, max_bytes=120)
+            assert truncated['truncated'] and truncated['total_lines'] == 10, truncated
+            print("✅ Fallback line counts computed")
+        
+    except Exception as e:
+        print(f"❌ Error testing analysis budgets: {e}")
+        return False
+    
+    return True
+
+def test_rule_engine():
+    """Test load-time ReDoS checks and token-level matchers"""
+    print("\n🧪 Testing rule engine...")
+    
+    repo_root = Path(__file__).parent.parent.parent
+    scripts_dir = repo_root / '.github' / 'scripts'
+    sys.path.insert(0, str(scripts_dir))
+    
+    try:
+        import time
+        import rule_engine
+        import swift_tokens
+        
+        assert rule_engine.check_pattern(r'\.task\s*{') == []
+        assert rule_engine.check_pattern(r'static\s+var\s+\w+\s*=') == []
+        assert rule_engine.check_pattern(r'(a+)+b'), "Nested repeat not flagged"
+        assert rule_engine.check_pattern(r'init\([^)]*\)'), "Overlapping rescans not flagged"
+        print("✅ Super-linear patterns flagged at load time")
+        
+        engine = rule_engine.RuleEngine().load([r'init\([^)]*\)', r'do\s*{[^}]*try[^}]*}\s*catch', r'print\('])
+        modes = {pattern: rule.mode for pattern, rule in engine.rules.items()}
+        assert modes == {
+            r'init\([^)]*\)': 'rewritten',
+            r'do\s*{[^}]*try[^}]*}\s*catch': 'tokens',
+            r'print\(': 'regex',
+        }, f"Unexpected modes: {modes}"
+        print("✅ Unsafe rules rewritten or routed to token matchers")
+        
+        source = rule_engine.SourceFile(
+            'let a = b!\n'
+            'if !flag && x != y { print(a) }\n'
+            'let c = try! load() as! Int\n'
+            'do { if ok { try run() } } catch { }\n'
+            'let s = "not! a unwrap" // nor! this\n'
+        )
+        assert swift_tokens.count_force_unwraps(source.tokens) == 1
+        assert engine.count(r'do\s*{[^}]*try[^}]*}\s*catch', source) == (1, True)
+        assert engine.count(r'print\(', source) == (1, True)
+        print("✅ Token matchers count force unwraps and do/catch blocks")
+        
+        hostile = rule_engine.SourceFile('do {' * 20000)
+        assert engine.count(r'do\s*{[^}]*try[^}]*}\s*catch', hostile, file_deadline=time.monotonic() - 1)[1] is False
+        print("✅ Match-time budget enforced")
+        
+        start = time.monotonic()
+        try:
+            rule_engine.RuleEngine(0.5).count(r'(\w+)+;', rule_engine.SourceFile('a' * 28))
+            raise AssertionError("Exponential rule accepted")
+        except ValueError:
+            pass
+        assert time.monotonic() - start < 0.5, "Exponential rule ran past its budget"
+        print("✅ Exponential rule rejected within its budget")
+        
+    except Exception as e:
+        print(f"❌ Error testing rule engine: {e}")
+        return False
+    
+    return True
+
+def test_rule_packs():
+    """Test rule pack validation, scoping and the compiled-pack cache"""
+    print("\n🧪 Testing rule packs...")
+    
+    repo_root = Path(__file__).parent.parent.parent
+    scripts_dir = repo_root / '.github' / 'scripts'
+    sys.path.insert(0, str(scripts_dir))
+    
+    try:
+        import rule_packs
+        
+        rules = rule_packs.load_rule_packs(str(repo_root / '.github' / 'rules'), tempfile.mkdtemp())
+        assert rules.risk_patterns['high'][0] == r'AVAudioSession\.sharedInstance'
+        assert rules.swift_patterns['bad']['Force Unwrap'] == r'!\s*(?![=])'
+        assert list(rules.components)[0] == 'AudioEngine'
+        print(f"✅ Loaded {len(rules.rules)} rules and {len(rules.components)} components")
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            packs = os.path.join(tmpdir, 'rules')
+            cache = os.path.join(tmpdir, 'cache')
+            os.makedirs(packs)
+            pack = os.path.join(packs, 'audio.toml')
+            with open(pack, 'w') as f:
+                f.write(
+                    '[[rules]]\nid = "tap"\nlevel = "high"\npattern = \'installTap\'\n'
+                    'paths = ["Sources/Audio/**"]\n'
+                    '[[rules]]\nid = "log"\nlevel = "low"\npattern = \'print\\(\'\n'
+                    'exclude = ["**/Tests/**"]\n'
+                )
+            
+            rules = rule_packs.load_rule_packs(packs, cache)
+            assert not rules.cache_hit
+            ids = lambda path: [rule['id'] for rule in rules.rules_for(path)]
+            assert ids('Sources/Audio/Engine.swift') == ['audio/tap', 'audio/log']
+            assert ids('Sources/UI/View.swift') == ['audio/log']
+            assert ids('SoundScape/Tests/EngineTests.swift') == []
+            assert rules.rules_for('Sources/Audio/Engine.swift', 'image') == []
+            print("✅ Rules dispatched by path glob and file type")
+            
+            assert rule_packs.load_rule_packs(packs, cache) is rules, "Unchanged packs were reloaded"
+            rule_packs._loaded.clear()
+            rules = rule_packs.load_rule_packs(packs, cache)
+            assert rules.cache_hit, "Compiled pack not reused"
+            
+            with open(pack, 'a') as f:
+                f.write('[[rules]]\nid = "timer"\nlevel = "medium"\npattern = \'Timer\\.\'\n')
+            assert rule_packs.load_rule_packs(packs, cache) is rules, "Packs re-hashed without a reload"
+            reloaded = rule_packs.load_rule_packs(packs, cache, reload=True)
+            assert len(reloaded.rules) == 3 and not reloaded.cache_hit
+            print("✅ Compiled packs cached by content hash, hashed once and reloaded on request")
+            
+            for missing in (os.path.join(tmpdir, 'rulez'), cache):
+                try:
+                    rule_packs.load_rule_packs(missing, cache)
+                    raise AssertionError(f"Rule directory without packs accepted: {missing}")
+                except ValueError:
+                    pass
+            print("✅ Missing or empty rule pack directory rejected")
+            
+            with open(pack, 'a') as f:
+                f.write('[[rules]]\nid = "tap"\nlevel = "urgent"\npattern = \'x\'\n')
+            try:
+                rule_packs.load_rule_packs(packs, cache, reload=True)
+                raise AssertionError("Invalid level accepted")
+            except ValueError as e:
+                assert "audio.toml: rule 'tap'" in str(e), str(e)
+            
+            with open(pack, 'w') as f:
+                f.write('[[rules]]\nid = "slow"\nlevel = "low"\npattern = \'(\\w+)+;\'\n')
+            try:
+                rule_packs.load_rule_packs(packs, cache, reload=True)
+                raise AssertionError("Exponential pattern accepted")
+            except ValueError as e:
+                assert "rule 'slow': pattern can backtrack exponentially" in str(e), str(e)
+            print("✅ Invalid rules rejected with the pack and rule named")
+        
+    except Exception as e:
+        print(f"❌ Error testing rule packs: {e}")
+        return False
+    
+    return True
+
+def test_path_rules():
+    """Test ordered path rules and component classification"""
+    print("\n🧪 Testing path rules...")
+    
+    repo_root = Path(__file__).parent.parent.parent
+    scripts_dir = repo_root / '.github' / 'scripts'
+    sys.path.insert(0, str(scripts_dir))
+    
+    try:
+        from path_rules import PathRuleMatcher
+        import benchmark_paths
+        
+        matcher = PathRuleMatcher([
+            ('UI', 'contains', 'View.swift'),
+            ('Audio', 'glob', 'SoundScape/Sources/Audio/**'),
+            ('Tests', 'glob', 'Tests'),
+            ('Swift', 'glob', '*.swift'),
+            ('Docs', 'glob', '/docs/*'),
+            ('Mixer', 'glob', 'SoundScape/Sources/Audio/Mixer*.swift'),
+        ])
+        assert matcher.classify('SoundScape/Sources/Audio/MixerView.swift') == 'Mixer'
+        assert matcher.labels('SoundScape/Sources/Audio/MixerView.swift') == ['Mixer', 'Swift', 'Audio', 'UI']
+        assert matcher.classify('SoundScape/Sources/Audio/Engine.swift') == 'Swift', "Last matching rule must win"
+        assert matcher.classify('SoundScape/Sources/Audio/Sounds/rain.mp3') == 'Audio'
+        assert matcher.classify('SoundScape/Tests/Fixtures/data.json') == 'Tests'
+        assert matcher.classify('docs/setup.md') == 'Docs'
+        assert matcher.classify('docs/guides/setup.md') == 'Other'
+        print("✅ CODEOWNERS-style precedence and ** globs")
+        
+        results = benchmark_paths.run_benchmark([2000])
+        assert not results[2000]['mismatches'], results[2000]['mismatches'][:3]
+        assert results[2000]['features_match']
+        print("✅ Components and affected features match the substring scan")
+        
+    except Exception as e:
+        print(f"❌ Error testing path rules: {e}")
+        return False
+    
+    return True
+
+def test_realtime_audio():
+    """Test detection of unsafe work in audio render and tap callbacks"""
+    print("\n🧪 Testing real-time audio analysis...")
+    
+    repo_root = Path(__file__).parent.parent.parent
+    scripts_dir = repo_root / '.github' / 'scripts'
+    sys.path.insert(0, str(scripts_dir))
+    
+    try:
+        from realtime_audio import analyze_realtime_safety
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = os.path.join(tmpdir, 'Engine.swift')
+            with open(engine, 'w') as f:
+                f.write(
+                    'func start() {\n'
+                    '    print("starting")\n'
+                    '    let node = AVAudioSourceNode { _, _, frameCount, buffers -> OSStatus in\n'
+                    '        let count: AVAudioFrameCount = frameCount\n'
+                    '        history.append(Float(count))\n'
+                    '        lock.lock()\n'
+                    '        DispatchQueue.main.async { print("rendered \\(count)") }\n'
+                    '        return noErr\n'
+                    '    }\n'
+                    '    mixer.installTap(onBus: 0, bufferSize: 1024, format: nil) { buffer, _ in\n'
+                    '        let copy = [Float]()\n'
+                    '    }\n'
+                    '}\n'
+                )
+            
+            result = analyze_realtime_safety([engine], {engine: {5, 6, 7}})
+            assert [c['context'] for c in result['contexts']] == ['AVAudioSourceNode', 'installTap']
+            found = [(f['line'], f['category']) for f in result['findings']]
+            assert found == [(5, 'collection_growth'), (6, 'locking'), (7, 'dispatch'), (11, 'allocation')], found
+            print("✅ Render and tap callbacks found; print outside them and in dispatched blocks ignored")
+            
+            assert len(result['issues']) == 3
+            assert not result['findings'][-1]['new']
+            print("✅ Only hazards on added lines reported as issues")
+        
+    except Exception as e:
+        print(f"❌ Error testing real-time audio analysis: {e}")
+        return False
+    
+    return True
+
+def test_main_thread():
+    """Test detection of blocking work on main-thread code paths"""
+    print("\n🧪 Testing main-thread blocking analysis...")
+    
+    repo_root = Path(__file__).parent.parent.parent
+    scripts_dir = repo_root / '.github' / 'scripts'
+    sys.path.insert(0, str(scripts_dir))
+    
+    try:
+        import main_thread
+        from main_thread import analyze_main_thread
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            view = os.path.join(tmpdir, 'MixView.swift')
+            with open(view, 'w') as f:
+                f.write(
+                    'struct MixView: View {\n'
+                    '    var body: some View {\n'
+                    '        List(mixes) { mix in Text(mix.name) }\n'
+                    '            .onAppear {\n'
+                    '                let data = try? Data(contentsOf: url)\n'
+                    '            }\n'
+                    '    }\n'
+                    '}\n'
+                    '@MainActor\n'
+                    'final class MixStore {\n'
+                    '    func load() {\n'
+                    '        mixes = try JSONDecoder().decode([Mix].self, from: blob)\n'
+                    '        Task.detached { _ = FileManager.default.contents(atPath: path) }\n'
+                    '    }\n'
+                    '    nonisolated func export() { try? AVAudioSession.sharedInstance().setActive(true) }\n'
+                    '}\n'
+                    'final class Exporter {\n'
+                    '    func run() { _ = UserDefaults.standard.dictionaryRepresentation() }\n'
+                    '    func volume() -> Any? { UserDefaults.standard.object(forKey: "volume") }\n'
+                    '}\n'
+                )
+            
+            result = analyze_main_thread([view], {view: {5}}, main_types=set())
+            found = [(f['line'], f['function'], f['category']) for f in result['findings']]
+            assert found == [
+                (5, 'MixView.body', 'file_io'),
+                (12, 'MixStore.load', 'json_decoding'),
+            ], found
+            print("✅ View bodies, .onAppear and @MainActor types walked; detached, nonisolated and plain code skipped")
+            
+            assert result['findings'][0]['context'] == '.onAppear closure'
+            assert len(result['issues']) == 1 and 'MixView.body' in result['issues'][0]
+            print("✅ Findings attributed to a function and a changed line")
+            
+            result = analyze_main_thread([view], {}, main_types={'Exporter'})
+            assert [f['function'] for f in result['findings'] if f['function'].startswith('Exporter')] == ['Exporter.run']
+            print("✅ @MainActor types declared in other files honoured; single-key UserDefaults reads not flagged")
+            
+            with open(os.path.join(tmpdir, 'Exporter.swift'), 'w') as f:
+                f.write('// @MainActor class Legacy was removed\nextension Exporter: UIViewRepresentable {}\n')
+            assert main_thread.project_main_actor_types(tmpdir) == {'MixView', 'MixStore', 'Exporter'}
+            print("✅ Project @MainActor types read from the Swift index, not comments")
+        
+    except Exception as e:
+        print(f"❌ Error testing main-thread analysis: {e}")
+        return False
+    
+    return True
+
+def test_frame_cost():
+    """Test per-frame cost estimates for TimelineView closures"""
+    print("\n🧪 Testing per-frame render cost analysis...")
+    
+    repo_root = Path(__file__).parent.parent.parent
+    scripts_dir = repo_root / '.github' / 'scripts'
+    sys.path.insert(0, str(scripts_dir))
+    
+    try:
+        import frame_cost
+        from swift_index import SwiftIndex
+        
+        base_source = (
+            'struct Glow: View {\n'
+            '    var body: some View {\n'
+            '        TimelineView(.animation(minimumInterval: 1.0 / 30.0)) { timeline in\n'
+            '            Canvas { context, size in\n'
+            '                for i in 0..<4 {\n'
+            '                    context.fill(dot(i), with: .color(.white))\n'
+            '                }\n'
+            '            }\n'
+            '        }\n'
+            '        .onAppear { Timer.scheduledTimer(withTimeInterval: 1, repeats: true) { _ in reset() } }\n'
+            '    }\n'
+            '    private func dot(_ i: Int) -> Path {\n'
+            '        Path(ellipseIn: CGRect(x: i, y: 0, width: 4, height: 4))\n'
+            '    }\n'
+            '    private func reset() { history.append(0) }\n'
+            '}\n'
+        )
+        head_source = base_source.replace(
+            '                for i in 0..<4 {\n',
+            '                for i in 0..<4 {\n'
+            '                    for x in stride(from: 0, through: size.width, by: 4) { _ = sin(Double(x)) }\n'
+        )
+        
+        context = frame_cost.analyze_index(SwiftIndex(base_source))[0]
+        assert context['function'] == 'Glow.body' and context['fps'] == 30
+        assert [(op['category'], op['iterations'], op['via']) for op in context['operations']] == [('path', 4, 'dot')]
+        assert context['ops_per_second'] == 4 * frame_cost.OPERATION_COSTS['path'] * 30
+        print("✅ Frame rate, loop bounds and helper calls read; timer callbacks left out")
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'Glow.swift')
+            with open(path, 'w') as f:
+                f.write(head_source)
+            
+            read_revision = frame_cost.read_revision
+            frame_cost.read_revision = lambda ref, revision_path: base_source
+            try:
+                result = frame_cost.analyze_frame_cost([path], {path: {6}}, 'base')
+            finally:
+                frame_cost.read_revision = read_revision
+            
+            finding = result['findings'][0]
+            assert finding['category'] == 'trigonometry' and finding['iterations'] == 4 * 101 and finding['new']
+            assert result['contexts'][0]['base_ops_per_second'] == 1200
+            assert len(result['issues']) == 1 and 'grows from 1,200' in result['issues'][0]
+            print(f"✅ Heavier frame flagged: {result['issues'][0].split(': ', 1)[1]}")
+            
+            result = frame_cost.analyze_frame_cost([path], {}, None, budget=1000)
+            assert 'over the 1,000 budget' in result['issues'][0]
+            print("✅ New per-frame closures checked against the operation budget")
+        
+    except Exception as e:
+        print(f"❌ Error testing per-frame cost analysis: {e}")
+        return False
+    
+    return True
+
+def test_lifecycle():
+    """Test pairing of timers, tasks and observers with their teardown"""
+    print("\n🧪 Testing timer/task lifecycle analysis...")
+    
+    repo_root = Path(__file__).parent.parent.parent
+    scripts_dir = repo_root / '.github' / 'scripts'
+    sys.path.insert(0, str(scripts_dir))
+    
+    try:
+        from lifecycle import analyze_index, analyze_lifecycles
+        from swift_index import SwiftIndex
+        
+        source = (
+            'final class Player {\n'
+            '    private var fadeTimer: Timer?\n'
+            '    private var pollTimer: Timer?\n'
+            '    private var loopTask: Task<Void, Never>?\n'
+            '    private var observer: NSObjectProtocol?\n'
+            '    func start() {\n'
+            '        pollTimer?.invalidate()\n'
+            '        fadeTimer = Timer.scheduledTimer(withTimeInterval: 1, repeats: true) { _ in self.fade() }\n'
+            '        pollTimer = Timer.scheduledTimer(withTimeInterval: 5, repeats: true) { _ in self.poll() }\n'
+            '        Timer.scheduledTimer(withTimeInterval: 2, repeats: false) { _ in self.fade() }\n'
+            '        Timer.scheduledTimer(withTimeInterval: 0.1, repeats: true) { timer in\n'
+            '            if self.done { timer.invalidate() }\n'
+            '        }\n'
+            '        loopTask = Task { while !Task.isCancelled { await self.tick() } }\n'
+            '        Task { while true { await self.tick() } }\n'
+            '        Task { await self.load() }\n'
+            '        observer = NotificationCenter.default.addObserver(forName: .x, object: nil, queue: nil) { _ in }\n'
+            '    }\n'
+            '    func stop() {\n'
+            '        fadeTimer?.invalidate()\n'
+            '        loopTask?.cancel()\n'
+            '    }\n'
+            '    deinit {\n'
+            '        if let observer = observer { NotificationCenter.default.removeObserver(observer) }\n'
+            '    }\n'
+            '}\n'
+        )
+        
+        result = analyze_index(SwiftIndex(source))
+        flagged = {(f['line'], f['kind']): f['reason'] for f in result['findings']}
+        assert set(flagged) == {(9, 'timer'), (15, 'task')}, flagged
+        assert 'only invalidated in start' in flagged[(9, 'timer')]
+        assert 'never stored' in flagged[(15, 'task')]
+        assert result['paired'] == 4
+        print("✅ Stored, self-invalidating and removed handles paired; one-shot timers and short tasks ignored")
+        
+        leaky = (
+            'final class Breather {\n'
+            '    func schedule() {\n'
+            '        NotificationCenter.default.addObserver(forName: .y, object: nil, queue: .main) { _ in }\n'
+            '        DispatchQueue.main.asyncAfter(deadline: .now() + 1) { self.schedule() }\n'
+            '    }\n'
+            '}\n'
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'Breather.swift')
+            with open(path, 'w') as f:
+                f.write(leaky)
+            
+            result = analyze_lifecycles([path], {path: {4}})
+            assert result['by_kind'] == {'observer': 1, 'dispatch_loop': 1}
+            assert [f['new'] for f in result['findings']] == [False, True]
+            assert len(result['issues']) == 1 and 'Breather.schedule' in result['issues'][0]
+            print(f"✅ Unmatched creation in changed code reported: {result['issues'][0].split(': ', 1)[1]}")
+        
+    except Exception as e:
+        print(f"❌ Error testing lifecycle analysis: {e}")
+        return False
+    
+    return True
+
+def test_captures():
+    """Test retain-cycle detection for closures that capture self"""
+    print("\n🧪 Testing closure capture analysis...")
+    
+    repo_root = Path(__file__).parent.parent.parent
+    scripts_dir = repo_root / '.github' / 'scripts'
+    sys.path.insert(0, str(scripts_dir))
+    
+    try:
+        from captures import analyze_captures
+        
+        source = (
+            'final class Recorder {\n'
+            '    var onLevel: ((Float) -> Void)?\n'
+            '    private var cancellables = Set<AnyCancellable>()\n'
+            '    private var timer: Timer?\n'
+            '    private let player = AVAudioPlayerNode()\n'
+            '    func start() {\n'
+            '        onLevel = { level in self.update(level) }\n'
+            '        timer = Timer.scheduledTimer(withTimeInterval: 1, repeats: true) { _ in self.tick() }\n'
+            '        $level.sink { value in self.update(value) }.store(in: &cancellables)\n'
+            '        NotificationCenter.default.addObserver(forName: .x, object: nil, queue: nil) { _ in self.tick() }\n'
+            '        player.scheduleFile(file, at: nil) { self.finished() }\n'
+            '        onLevel = { [weak self] level in self?.update(level) }\n'
+            '        $level.sink { [unowned self] v in self.update(v) }.store(in: &cancellables)\n'
+            '        items.forEach { self.update($0) }\n'
+            '        DispatchQueue.main.async { self.tick() }\n'
+            '        let local = { self.tick() }\n'
+            '        publisher.sink { v in self.update(v) }\n'
+            '    }\n'
+            '}\n'
+            'struct Meter {\n'
+            '    var onTap: (() -> Void)?\n'
+            '    mutating func bind() { onTap = { self.tap() } }\n'
+            '}\n'
+        )
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'Recorder.swift')
+            with open(path, 'w') as f:
+                f.write(source)
+            
+            result = analyze_captures([path], {path: {9, 12}})
+            found = [(f['line'], f['kind']) for f in result['findings']]
+            assert found == [(7, 'property'), (8, 'property'), (9, 'sink'), (10, 'observer'), (11, 'handler')], found
+            assert result['by_type'] == {'Recorder': 5}
+            print("✅ Stored closures, sinks, observers and handlers flagged; weak, non-escaping and struct captures ignored")
+            
+            assert len(result['issues']) == 1 and 'sink kept in `cancellables`' in result['issues'][0]
+            print(f"✅ New strong capture reported: {result['issues'][0].split(': ', 1)[1]}")
+        
+    except Exception as e:
+        print(f"❌ Error testing closure capture analysis: {e}")
+        return False
+    
+    return True
+
+def test_recording_storage():
+    """Test per-night storage estimates for recorder settings"""
+    print("\n🧪 Testing recording storage analysis...")
+    
+    repo_root = Path(__file__).parent.parent.parent
+    scripts_dir = repo_root / '.github' / 'scripts'
+    sys.path.insert(0, str(scripts_dir))
+    
+    try:
+        import recording_storage
+        
+        base_source = (
+            'final class SleepRecordingService {\n'
+            '    private enum Config {\n'
+            '        static let sampleRate: Double = 22_050\n'
+            '        static let segmentDuration: TimeInterval = 60 * 60\n'
+            '    }\n'
+            '    func startRecording() {\n'
+            '        let settings: [String: Any] = [\n'
+            '            AVFormatIDKey: Int(kAudioFormatMPEG4AAC),\n'
+            '            AVSampleRateKey: Config.sampleRate,\n'
+            '            AVNumberOfChannelsKey: 1,\n'
+            '            AVEncoderBitRateKey: 32000\n'
+            '        ]\n'
+            '    }\n'
+            '}\n'
+        )
+        head_source = base_source.replace(
+            '            AVEncoderBitRateKey: 32000\n',
+            '            AVLinearPCMBitDepthKey: 16\n'
+        ).replace('Int(kAudioFormatMPEG4AAC)', 'Int(kAudioFormatLinearPCM)')
+        
+        recorder = recording_storage.footprint(base_source)['SleepRecordingService.startRecording#1']
+        assert recorder['settings']['sample_rate'] == 22050 and recorder['segment_seconds'] == 3600
+        assert recorder['bytes_per_night'] == 32000 // 8 * 8 * 3600 + 8 * recording_storage.FILE_OVERHEAD_BYTES
+        print(f"✅ Settings and constants resolved: {recorder['bytes_per_night'] / 1024 / 1024:.1f} MB per night")
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'SleepRecordingService.swift')
+            with open(path, 'w') as f:
+                f.write(head_source)
+            
+            read_revision = recording_storage.read_revision
+            recording_storage.read_revision = lambda ref, revision_path: base_source
+            try:
+                result = recording_storage.analyze_recording_storage([path], {}, 'base')
+            finally:
+                recording_storage.read_revision = read_revision
+            
+            recorder = result['recorders'][0]
+            assert recorder['bytes_per_second'] == 22050 * 2 and recorder['new']
+            assert recorder['delta_bytes_per_night'] == recorder['bytes_per_night'] - recorder['base_bytes_per_night']
+            assert len(result['issues']) == 1 and 'per 8-hour night (+1002%)' in result['issues'][0]
+            print(f"✅ Growth against the base ref reported: {result['issues'][0].split(': ', 1)[1]}")
+            
+            result = recording_storage.analyze_recording_storage([path], {path: {7}}, None, budget_bytes=100 * 1024 * 1024)
+            assert '1211.3 MB per 8-hour night, over the 100 MB budget' in result['issues'][0]
+            print("✅ Changed recorders checked against the per-night budget")
+        
+    except Exception as e:
+        print(f"❌ Error testing recording storage analysis: {e}")
+        return False
+    
+    return True
+
+def test_dsp_loops():
+    """Test detection of scalar buffer loops with vDSP equivalents"""
+    print("\n🧪 Testing scalar DSP loop analysis...")
+    
+    repo_root = Path(__file__).parent.parent.parent
+    scripts_dir = repo_root / '.github' / 'scripts'
+    sys.path.insert(0, str(scripts_dir))
+    
+    try:
+        from dsp_loops import analyze_dsp_loops
+        
+        source = (
+            'final class Meter {\n'
+            '    func process(buffer: AVAudioPCMBuffer, gain: Float) {\n'
+            '        guard let channel = buffer.floatChannelData?[0] else { return }\n'
+            '        var sum: Float = 0\n'
+            '        for i in 0..<Int(buffer.frameLength) {\n'
+            '            sum += channel[i] * channel[i]\n'
+            '        }\n'
+            '        var peak: Float = 0\n'
+            '        for i in 0..<Int(buffer.frameLength) {\n'
+            '            if abs(channel[i]) > peak { peak = abs(channel[i]) }\n'
+            '        }\n'
+            '        for i in 0..<256 { output[i] = channel[i] * self.gain }\n'
+            '        for i in 0..<Int(buffer.frameLength) {\n'
+            '            channel[i] = sin(phase) * volume\n'
+            '            phase += 2.0 * Float.pi * frequency / sampleRate\n'
+            '        }\n'
+            '        for name in names { print(name) }\n'
+            '    }\n'
+            '    func detect(samples: [Float]) {\n'
+            '        var total: Float = 0\n'
+            '        for sample in samples { total += sample }\n'
+            '    }\n'
+            '}\n'
+        )
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'Meter.swift')
+            with open(path, 'w') as f:
+                f.write(source)
+            history_path = os.path.join(tmpdir, 'cache', 'dsp-loops-history.json')
+            
+            result = analyze_dsp_loops([path], {path: {5, 12, 13}}, 'HEAD', codebase_files=[path], history_path=history_path)
+            assert not os.path.exists(history_path) and result['history'] == []
+            loops = [(f['line'], f['operations'], f['vectorizable']) for f in result['findings']]
+            assert loops == [
+                (5, ['sum_of_squares'], True),
+                (9, ['peak'], True),
+                (12, ['scale'], True),
+                (13, [], False),
+                (21, ['sum'], True),
+            ], loops
+            assert result['findings'][2]['ops_per_buffer'] == 256 * 3
+            print("✅ Sum of squares, peak, scale and sum loops recognized; phase accumulator left alone")
+            
+            assert len(result['issues']) == 2 and 'vDSP.sumOfSquares' in result['issues'][0]
+            print(f"✅ New vectorizable loop reported: {result['issues'][0].split(': ', 1)[1]}")
+            
+            from dsp_loops import record_history
+            record_history({'loops': 3, 'vectorizable': 2}, 'aaa', history_path)
+            history = record_history(result['codebase'], 'bbb', history_path)
+            record_history(result['codebase'], 'bbb', history_path)
+            assert result['codebase'] == {'loops': 5, 'vectorizable': 4}
+            assert [entry['vectorizable'] for entry in history] == [2, 4]
+            print("✅ Codebase loop counts recorded once per commit")
+            
+            recorded = analyze_dsp_loops([], {}, 'HEAD', codebase_files=[path], history_path=history_path, record=True)
+            assert len(recorded['history']) == 3 and recorded['history'][-1]['loops'] == 5
+            print("✅ Pull request runs read the history; only recording runs append to it")
+        
+    except Exception as e:
+        print(f"❌ Error testing scalar DSP loop analysis: {e}")
+        return False
+    
+    return True
+
+def test_observation():
+    """Test observation fan-out of changed observable properties"""
+    print("\n🧪 Testing observation fan-out analysis...")
+    
+    repo_root = Path(__file__).parent.parent.parent
+    scripts_dir = repo_root / '.github' / 'scripts'
+    sys.path.insert(0, str(scripts_dir))
+    
+    try:
+        from observation import analyze_observation
+        
+        model = (
+            '@Observable\n'
+            'final class Recorder {\n'
+            '    var level: Float = 0\n'
+            '    var title: String = ""\n'
+            '    var countdown: Int = 0\n'
+            '    @ObservationIgnored var cache: [Float] = []\n'
+            '    private var timer: Timer?\n'
+            '    func start() {\n'
+            '        timer = Timer.scheduledTimer(withTimeInterval: 0.05, repeats: true) { [weak self] _ in\n'
+            '            self?.tick()\n'
+            '        }\n'
+            '        Timer.scheduledTimer(withTimeInterval: 1, repeats: false) { [weak self] _ in\n'
+            '            self?.countdown = 0\n'
+            '        }\n'
+            '    }\n'
+            '    private func tick() {\n'
+            '        level = Float.random(in: 0...1)\n'
+            '    }\n'
+            '}\n'
+        )
+        views = (
+            'struct RecordingScreen: View {\n'
+            '    @Environment(Recorder.self) private var recorder\n'
+            '    var body: some View {\n'
+            '        VStack {\n'
+            '            Text(recorder.title)\n'
+            '            Meter(value: recorder.level)\n'
+            '            Controls()\n'
+            '            History()\n'
+            '        }\n'
+            '    }\n'
+            '}\n'
+            'struct Meter: View {\n'
+            '    let value: Float\n'
+            '    var body: some View { Bar() }\n'
+            '}\n'
+            'struct Bar: View { var body: some View { Rectangle() } }\n'
+            'struct Controls: View { var body: some View { Button("Stop") {} } }\n'
+            'struct History: View { var body: some View { Text("History") } }\n'
+            'struct Badge: View {\n'
+            '    let recorder: Recorder\n'
+            '    var body: some View { Text("\\(recorder.countdown)") }\n'
+            '}\n'
+        )
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            model_path = os.path.join(tmpdir, 'Recorder.swift')
+            view_path = os.path.join(tmpdir, 'Views.swift')
+            with open(model_path, 'w') as f:
+                f.write(model)
+            with open(view_path, 'w') as f:
+                f.write(views)
+            
+            result = analyze_observation([model_path], {model_path: {3, 5, 13}, view_path: {5}},
+                                         codebase_files=[model_path, view_path])
+            assert result['models'] == 1 and result['views'] == 6, result
+            properties = {p['property']: p for p in result['properties']}
+            assert sorted(properties) == ['countdown', 'level', 'title'], sorted(properties)
+            
+            level = properties['level']
+            assert level['views'] == ['RecordingScreen'] and level['tree_size'] == 5, level
+            assert level['high_frequency'] == 'timer' and level['updates_per_second'] == 20, level
+            print("✅ Audio level written from a 20 Hz timer re-evaluates the whole recording screen")
+            
+            assert properties['title']['high_frequency'] is None
+            assert properties['countdown']['views'] == ['Badge'] and properties['countdown']['high_frequency'] is None
+            print("✅ One-shot timer writes and plain reads are not treated as high-frequency")
+            
+            assert len(result['issues']) == 1 and 'Recorder.level' in result['issues'][0], result['issues']
+            print(f"✅ Fan-out reported: {result['issues'][0].split(': ', 1)[1]}")
+        
+    except Exception as e:
+        print(f"❌ Error testing observation fan-out analysis: {e}")
+        return False
+    
+    return True
+
+def test_launch():
+    """Test launch-path tracing from the @main App"""
+    print("\n🧪 Testing launch path analysis...")
+    
+    repo_root = Path(__file__).parent.parent.parent
+    scripts_dir = repo_root / '.github' / 'scripts'
+    sys.path.insert(0, str(scripts_dir))
+    
+    try:
+        from launch import analyze_launch
+        
+        app = (
+            '@main\n'
+            'struct DemoApp: App {\n'
+            '    @UIApplicationDelegateAdaptor(AppDelegate.self) var appDelegate\n'
+            '    @State private var store = Store()\n'
+            '    var body: some Scene { WindowGroup { Text("Hi") } }\n'
+            '}\n'
+            'final class AppDelegate: NSObject, UIApplicationDelegate {\n'
+            '    func application(_ application: UIApplication,\n'
+            '                     didFinishLaunchingWithOptions options: [UIApplication.LaunchOptionsKey: Any]?) -> Bool {\n'
+            '        FirebaseApp.configure()\n'
+            '        return true\n'
+            '    }\n'
+            '}\n'
+        )
+        store = (
+            'final class Store {\n'
+            '    private let cache = Cache.shared\n'
+            '    init() {\n'
+            '        load()\n'
+            '        Task { await refresh() }\n'
+            '    }\n'
+            '    private func load() {\n'
+            '        let data = try? Data(contentsOf: url)\n'
+            '    }\n'
+            '    private func refresh() async {\n'
+            '        let products = try? await Product.products(for: ids)\n'
+            '    }\n'
+            '}\n'
+            'final class Cache {\n'
+            '    static let shared = Cache()\n'
+            '    static let directory = FileManager.default.urls(for: .cachesDirectory, in: .userDomainMask)[0]\n'
+            '    init() {\n'
+            '        _ = Cache.directory\n'
+            '        try? AVAudioSession.sharedInstance().setActive(true)\n'
+            '    }\n'
+            '}\n'
+        )
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            app_path = os.path.join(tmpdir, 'DemoApp.swift')
+            store_path = os.path.join(tmpdir, 'Store.swift')
+            with open(app_path, 'w') as f:
+                f.write(app)
+            with open(store_path, 'w') as f:
+                f.write(store)
+            
+            result = analyze_launch([app_path], {app_path: {4}}, codebase_files=[app_path, store_path])
+            findings = {f['detail']: f for f in result['findings']}
+            assert sorted(findings) == ['.setActive()', 'Data(contentsOf:)', 'FirebaseApp.configure()'], sorted(findings)
+            print("✅ File I/O, audio session and SDK setup reachable from launch found; Task bodies skipped")
+            
+            assert findings['.setActive()']['chain'] == ['DemoApp.init', 'Store.init', 'Cache.shared', 'Cache.init']
+            assert findings['Data(contentsOf:)']['chain'] == ['DemoApp.init', 'Store.init', 'Store.load']
+            assert findings['FirebaseApp.configure()']['chain'] == ['AppDelegate.application(didFinishLaunchingWithOptions:)']
+            print(f"✅ Chain recorded: {' → '.join(findings['.setActive()']['chain'])}")
+            
+            # Cache.directory is reached from Cache.init but only builds a URL
+            assert result['reachable'] == 9 and result['singletons'] == ['Cache.shared'], result
+            print("✅ Only statics holding a project instance listed as singletons; directory URL lookups not file I/O")
+            
+            assert len(result['issues']) == 2 and not findings['FirebaseApp.configure()']['new']
+            print("✅ Work pulled onto the launch path by the new @State root reported")
+        
+    except Exception as e:
+        print(f"❌ Error testing launch path analysis: {e}")
+        return False
+    
+    return True
+
+def test_dead_code():
+    """Test the declaration/reference index and dead symbol detection"""
+    print("\n🧪 Testing dead code analysis...")
+    
+    repo_root = Path(__file__).parent.parent.parent
+    scripts_dir = repo_root / '.github' / 'scripts'
+    sys.path.insert(0, str(scripts_dir))
+    
+    try:
+        from blob_cache import BlobCache
+        from dead_code import analyze_dead_code, dead_symbols, index_source
+        from file_classifier import route_files
+        
+        service = (
+            'protocol Playing {\n'
+            '    func play()\n'
+            '}\n'
+            'final class Player: Playing {\n'
+            '    func play() { fade() }\n'
+            '    private func fade() {}\n'
+            '    func legacyMix() {\n'
+            '        legacyMix()\n'
+            '    }\n'
+            '}\n'
+            'struct Settings: Codable {\n'
+            '    var volume: Float\n'
+            '}\n'
+            'extension Unused {}\n'
+            'struct Unused {}\n'
+        )
+        base_view = (
+            '@main struct DemoApp: App {\n'
+            '    var body: some Scene { WindowGroup { PlayerView(settings: Settings(volume: 1)) } }\n'
+            '}\n'
+            'struct PlayerView: View {\n'
+            '    let settings: Settings\n'
+            '    let player = Player()\n'
+            '    var body: some View { Button("Play") { player.play() } }\n'
+            '    func reset() { player.play() }\n'
+            '}\n'
+        )
+        head_view = (
+            '@main struct DemoApp: App {\n'
+            '    var body: some Scene { WindowGroup { PlayerView(settings: Settings(volume: 1)) } }\n'
+            '}\n'
+            'struct PlayerView: View {\n'
+            '    let settings: Settings\n'
+            '    let player = Player()\n'
+            '    var body: some View { Button("Play") { player.legacyMix() } }\n'
+            '    func reset() {}\n'
+            '    func shuffle() {}\n'
+            '}\n'
+        )
+        targets = {'Player.swift': {'SoundScape'}, 'PlayerView.swift': {'SoundScape'}}
+        
+        base = dead_symbols({'Player.swift': index_source(service), 'PlayerView.swift': index_source(base_view)}, targets)
+        head = dead_symbols({'Player.swift': index_source(service), 'PlayerView.swift': index_source(head_view)}, targets)
+        assert sorted(base) == ['Player.swift:Player.legacyMix', 'Player.swift:Unused', 'PlayerView.swift:PlayerView.reset'], sorted(base)
+        print("✅ Self-recursive and extension-only symbols are dead; protocol, Codable and View members are not")
+        
+        assert sorted(set(head) - set(base)) == ['PlayerView.swift:PlayerView.shuffle'], sorted(head)
+        assert sorted(set(base) - set(head)) == ['Player.swift:Player.legacyMix']
+        print("✅ Dead code created and removed by the change found")
+        
+        widget_only = dict(targets, **{'PlayerView.swift': {'SoundScapeWidgetExtension'}})
+        split = dead_symbols({'Player.swift': index_source(service), 'PlayerView.swift': index_source(base_view)},
+                             widget_only)
+        assert 'Player.swift:Player' in split, sorted(split)
+        print("✅ References from another target do not keep a symbol alive")
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index_path = os.path.join(tmpdir, 'cache', 'symbol-index.json')
+            cache = BlobCache(index_path, 1, 'symbol index')
+            assert cache.get('aaa', lambda: index_source(service)) == cache.get('aaa', lambda: None)
+            assert cache.get('bbb', lambda: index_source(base_view)) and cache.get('ccc', lambda: None) is None
+            assert cache.built == 2
+            cache.save({'aaa'})
+            assert set(BlobCache(index_path, 1, 'symbol index').blobs) == {'aaa'}
+            assert BlobCache(index_path, 2, 'symbol index').blobs == {}
+            print("✅ Symbol index cached per blob, unused blobs pruned, other versions ignored")
+            
+            # A PR that deletes the only file using Player leaves Player dead
+            cwd = os.getcwd()
+            try:
+                os.chdir(tmpdir)
+                git = lambda *args: subprocess.run(
+                    ['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args],
+                    capture_output=True, check=True
+                )
+                git('init', '-q')
+                os.makedirs('SoundScape/Sources')
+                with open('SoundScape/Sources/Player.swift', 'w') as f:
+                    f.write(service)
+                with open('SoundScape/Sources/PlayerView.swift', 'w') as f:
+                    f.write(base_view)
+                git('add', '.')
+                git('commit', '-qm', 'base')
+                git('rm', '-q', 'SoundScape/Sources/PlayerView.swift')
+                git('commit', '-qm', 'delete the view')
+                
+                routes, _ = route_files([{'path': 'SoundScape/Sources/PlayerView.swift'}])
+                result = analyze_dead_code([f['path'] for f in routes['symbols']], 'HEAD~1', index_path)
+                created = [f"{s['path']}:{s['name']}" for s in result['created']]
+                assert 'SoundScape/Sources/Player.swift:Player' in created, created
+                assert [s['name'] for s in result['removed']] == ['reset'], result['removed']
+            finally:
+                os.chdir(cwd)
+            print("✅ Deleted files count at the base: symbols they alone used become dead, their dead code is removed")
+        
+    except Exception as e:
+        print(f"❌ Error testing dead code analysis: {e}")
+        return False
+    
+    return True
+
+def test_audio_duplicates():
+    """Test exact and near-duplicate detection from MP3 frame fingerprints"""
+    print("\n🧪 Testing duplicate sound detection...")
+    
+    repo_root = Path(__file__).parent.parent.parent
+    scripts_dir = repo_root / '.github' / 'scripts'
+    sys.path.insert(0, str(scripts_dir))
+    
+    try:
+        import math
+        from audio_fingerprint import analyze_audio_duplicates, fingerprint_mp3
+        
+        def write_mp3(path, gains, bitrate_bits=0x90, title=b'rain'):
+            # MPEG-1 Layer III joint stereo at 44.1 kHz; global gain sits 41 bits into the side info
+            frame_length = 144 * {0x90: 128000, 0xB0: 192000}[bitrate_bits] // 44100
+            frames = []
+            for gain in gains:
+                side_info = 0
+                for block in range(4):
+                    side_info |= int(gain) << (256 - 41 - 59 * block - 8)
+                frames.append(b'\xff\xfb' + bytes([bitrate_bits, 0x64]) + side_info.to_bytes(32, 'big')
+                              + bytes(frame_length - 36))
+            tag = b'TIT2' + (len(title) + 1).to_bytes(4, 'big') + b'\x00\x00\x03' + title
+            path.write_bytes(b'ID3\x04\x00\x00' + len(tag).to_bytes(4, 'big') + tag + b''.join(frames))
+            return str(path)
+        
+        # 20 seconds whose level swells and falls, and a steady sound of the same length
+        swell = [150 + 20 * math.sin(i / 40) for i in range(760)]
+        steady = [150 + 20 * math.sin(i / 7) ** 9 for i in range(760)]
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            rain = write_mp3(tmp / 'rain.mp3', swell)
+            retagged = write_mp3(tmp / 'rain_copy.mp3', swell, title=b'rain (copy)')
+            reencoded = write_mp3(tmp / 'rain_192.mp3', [g - 12 for g in swell], bitrate_bits=0xB0)
+            ocean = write_mp3(tmp / 'ocean.mp3', steady)
+            
+            info = fingerprint_mp3(rain)
+            assert info['duration_seconds'] == 19.85 and len(info['envelope']) == 40, info
+            print(f"✅ Side-info envelope read: {len(info['envelope'])} points over {info['duration_seconds']}s")
+            
+            index_path = str(tmp / 'cache' / 'audio-fingerprints.json')
+            result = analyze_audio_duplicates([rain, retagged, reencoded, ocean], index_path=index_path)
+            by_path = {d['path']: {m['path']: m['kind'] for m in d['matches']} for d in result['duplicates']}
+            assert by_path[retagged][rain] == 'exact', by_path
+            assert by_path[reencoded][rain] == 'near', by_path
+            assert ocean not in by_path, by_path
+            print("✅ Re-tagged copy is exact, re-encode at another bitrate is near, different sound is distinct")
+            
+            again = analyze_audio_duplicates([rain, retagged, reencoded, ocean], index_path=index_path)
+            assert again['fingerprinted'] == 0 and again['duplicates'] == result['duplicates'], again
+            print("✅ Fingerprints reused from the cache")
+            
+            admitted = analyze_audio_duplicates([rain, retagged], index_path=index_path, admit=lambda path: path != retagged)
+            assert admitted['duplicates'] == [], admitted
+            print("✅ Sounds the budget does not admit are left out")
+    
+    except Exception as e:
+        print(f"❌ Error testing duplicate sound detection: {e}")
+        return False
+    
+    return True
+
+def test_sound_references():
+    """Test the string literal index and unreferenced sound detection"""
+    print("\n🧪 Testing unreferenced sound detection...")
+    
+    repo_root = Path(__file__).parent.parent.parent
+    scripts_dir = repo_root / '.github' / 'scripts'
+    sys.path.insert(0, str(scripts_dir))
+    
+    try:
+        from file_classifier import route_files
+        from sound_references import analyze_sound_references, index_source, reference_kinds
+        
+        catalog = (
+            'struct LocalSoundDataSource {\n'
+            '    let sounds = [\n'
+            '        Sound(id: "rain", fileName: "rain_storm.mp3"),\n'
+            '        Sound(id: "fire", fileName: "campfire.mp3"),\n'
+            '    ]\n'
+            '    let bonfire = Sound(id: "bonfire", fileName: "")\n'
+            '    func tap(_ n: Int) -> String { "ASMR-gentle-tap-\\(n).mp3" }\n'
+            '    func any(_ name: String) -> String { "\\(name).mp3" }\n'
+            '}\n'
+        )
+        player = (
+            'final class AudioEngine {\n'
+            '    func url(for sound: Sound) -> URL? {\n'
+            '        Bundle.main.url(forResource: sound.fileName.replacingOccurrences(of: ".mp3", with: ""), withExtension: "mp3")\n'
+            '    }\n'
+            '    let chime = Bundle.main.url(forResource: "chime", withExtension: "mp3")\n'
+            '}\n'
+        )
+        entry = index_source(player)
+        assert [(l['resource'], l['extension']) for l in entry['lookups']] == [(None, 'mp3'), ('chime', 'mp3')], entry
+        print("✅ Bundle lookups indexed with literal and dynamic resource names")
+        
+        sounds = {f"SoundScape/Resources/Sounds/{name}": True for name in (
+            'rain_storm.mp3', 'campfire.mp3', 'chime.mp3', 'ASMR-gentle-tap-2.mp3', 'bonfire.mp3')}
+        head = reference_kinds(sounds, {'Catalog.swift': index_source(catalog), 'Engine.swift': entry})
+        kinds = {Path(path).name: how for path, how in head.items()}
+        assert kinds == {'rain_storm.mp3': 'literal', 'campfire.mp3': 'literal', 'chime.mp3': 'literal',
+                         'ASMR-gentle-tap-2.mp3': 'pattern', 'bonfire.mp3': None}, kinds
+        print("✅ Sounds matched by file name, lookup name and interpolated pattern; ids and bare interpolation ignored")
+        
+        without_fire = reference_kinds(sounds, {'Catalog.swift': index_source(catalog.replace('campfire', 'bonfire'))})
+        assert without_fire['SoundScape/Resources/Sounds/campfire.mp3'] is None
+        print("✅ Removing the last literal leaves the sound unreferenced")
+        
+        # A PR that deletes the only file naming campfire.mp3 leaves it unreferenced
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index_path = os.path.join(tmpdir, 'cache', 'sound-references.json')
+            cwd = os.getcwd()
+            try:
+                os.chdir(tmpdir)
+                git = lambda *args: subprocess.run(
+                    ['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args],
+                    capture_output=True, check=True
+                )
+                git('init', '-q')
+                os.makedirs('SoundScape/Resources/Sounds')
+                os.makedirs('SoundScape/Sources')
+                with open('SoundScape/Resources/Sounds/campfire.mp3', 'wb') as f:
+                    f.write(b'ID3' + bytes(64))
+                with open('SoundScape/Sources/Catalog.swift', 'w') as f:
+                    f.write(catalog)
+                git('add', '.')
+                git('commit', '-qm', 'base')
+                git('rm', '-q', 'SoundScape/Sources/Catalog.swift')
+                git('commit', '-qm', 'delete the catalog')
+                
+                routes, _ = route_files([{'path': 'SoundScape/Sources/Catalog.swift'}])
+                result = analyze_sound_references([f['path'] for f in routes['symbols']], 'HEAD~1', index_path)
+                assert [(s['path'], s['new']) for s in result['unreferenced']] == [
+                    ('SoundScape/Resources/Sounds/campfire.mp3', True)], result['unreferenced']
+                assert result['reindexed'] == 1 and os.path.exists(index_path)
+            finally:
+                os.chdir(cwd)
+            print("✅ Deleting the last file naming a sound leaves it newly unreferenced")
+        
+    except Exception as e:
+        print(f"❌ Error testing unreferenced sound detection: {e}")
+        return False
+    
+    return True
+
+def test_rescore():
+    """Test re-scoring stored analyses from their raw facts"""
+    print("\n🧪 Testing rescoring...")
+    
+    repo_root = Path(__file__).parent.parent.parent
+    scripts_dir = repo_root / '.github' / 'scripts'
+    sys.path.insert(0, str(scripts_dir))
+    
+    try:
+        from scoring import merge_config, score_facts
+        from rescore import rescore
+        
+        facts = {
+            'version': 1,
+            'functions': [
+                {'file': 'A.swift', 'function': 'play', 'complexity': 4, 'nloc': 10},
+                {'file': 'A.swift', 'function': 'mix', 'complexity': 22, 'nloc': 60},
+            ],
+            'rule_hits': [{'file': 'A.swift', 'rule': 'risk/force-cast', 'level': 'high', 'count': 4}],
+            'lines': {'code_added': 100, 'test_added': 35, 'analyzed': 200, 'duplicate': 10},
+            'coverage_percent': None,
+            'layer_violations': 0,
+            'layers': 2,
+            'lint_by_severity': {'warning': 3},
+            'blocking_issues': 0,
+        }
+        
+        score = score_facts([facts])[0]
+        assert score == score_facts([facts], vectorized=False)[0]
+        assert score['avg_complexity'] == 13.0 and score['breakdown']['testing'] == 70
+        assert score['breakdown']['lint'] == 94 and score['high_risk_files'] == 1
+        assert score['grade'] == 'C' and 'critical_complexity' in score['failures']
+        print(f"✅ Scored facts: {score['overall']} ({score['grade']}), vectorized and scalar paths agree")
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = []
+            for pr in ('1', '2'):
+                path = Path(tmpdir) / f'pr-{pr}-analysis.json'
+                analysis = {'pr_number': pr, 'metrics': {'quality_score': {'overall': score['overall'], 'grade': 'C'}}}
+                if pr == '1':
+                    analysis['raw_facts'] = facts
+                path.write_text(json.dumps(analysis))
+                paths.append(path)
+            
+            config = merge_config({'grade_cutoffs': {'C': 60}, 'thresholds': {'minimum_overall_score': 80}})
+            summary = rescore(paths, config, in_place=True)
+            assert summary['without_facts'] == [str(paths[1])]
+            result = summary['results'][0]
+            assert result['grade'] == 'C' and summary['grade_changes'] == 0
+            assert 'overall_score' in result['failures'] and summary['failing'] == 1
+            
+            summary = rescore(paths, merge_config({'weights': {'lint': 0}, 'grade_cutoffs': {'B': 70}}))
+            assert summary['results'][0]['grade'] == 'B' and summary['grade_changes'] == 1
+            stored = json.loads(paths[0].read_text())['metrics']['quality_score']
+            assert stored['breakdown']['lint'] == 94
+            print("✅ Tuned weights, cutoffs and thresholds applied to stored analyses")
+            
+            try:
+                merge_config({'cutoffs': {}})
+                assert False, 'unknown setting accepted'
+            except ValueError:
+                pass
+            print("✅ Unknown scoring settings rejected")
+        
+    except Exception as e:
+        print(f"❌ Error testing rescoring: {e}")
+        return False
+    
+    return True
+
 def validate_workflow_syntax():
     """Validate workflow YAML syntax"""
     print("\n🧪 Validating workflow YAML...")
@@ -306,6 +1967,31 @@ def main():
         ("Comparison Script", test_comparison_script),
         ("Report Generator", test_report_generator),
         ("Threshold Checker", test_threshold_checker),
+        ("Coverage Ingestion", test_coverage_ingest),
+        ("SwiftLint Ingestion", test_swiftlint_ingest),
+        ("Audio Asset Scanner", test_audio_assets),
+        ("Loop/Loudness Check", test_loop_loudness),
+        ("Image Asset Analysis", test_image_assets),
+        ("Localization Analysis", test_localization),
+        ("Xcode Project Parser", test_pbxproj),
+        ("File Classifier", test_file_classifier),
+        ("Analysis Budgets", test_budgets),
+        ("Rule Engine", test_rule_engine),
+        ("Rule Packs", test_rule_packs),
+        ("Path Rules", test_path_rules),
+        ("Real-Time Audio Safety", test_realtime_audio),
+        ("Main-Thread Blocking", test_main_thread),
+        ("Per-Frame Render Cost", test_frame_cost),
+        ("Timer/Task Lifecycle", test_lifecycle),
+        ("Closure Captures", test_captures),
+        ("Recording Storage", test_recording_storage),
+        ("Scalar DSP Loops", test_dsp_loops),
+        ("Observation Fan-Out", test_observation),
+        ("Launch Path", test_launch),
+        ("Dead Code", test_dead_code),
+        ("Duplicate Sounds", test_audio_duplicates),
+        ("Unreferenced Sounds", test_sound_references),
+        ("Rescoring", test_rescore),
     ]
     
     results = []